@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Show the database schema version and apply pending migrations (opening a Database does the same)"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+
+from src.data.migrations import (
+    LATEST_VERSION, MIGRATIONS, MigrationError, current_version, delete_duplicate_betting_lines,
+    delete_games_without_team_ids, migrate
+)
+from src.utils.config import config
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None, help="Defaults to the configured DATABASE_URL")
+    parser.add_argument("--status", action="store_true", help="Only print the current and pending versions")
+    parser.add_argument("--delete-games-without-team-ids", action="store_true",
+                        help="Delete legacy games that have no team ids (they block migration 5) before migrating")
+    parser.add_argument("--delete-duplicate-betting-lines", action="store_true",
+                        help="Keep only the newest of duplicate betting lines (they block migration 7) before migrating")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url or config.get_database_url())
+    version = current_version(engine)
+    print(f"Schema version: {'unversioned' if version is None else version} (latest {LATEST_VERSION})")
+    for migration in MIGRATIONS:
+        if version is None or migration.version > version:
+            print(f"  pending {migration.version}: {migration.description}")
+    if args.status:
+        return 0
+
+    if args.delete_games_without_team_ids:
+        print(f"Deleted {delete_games_without_team_ids(engine)} games without team ids")
+    if args.delete_duplicate_betting_lines:
+        print(f"Deleted {delete_duplicate_betting_lines(engine)} duplicate betting lines")
+    try:
+        version = migrate(engine)
+    except MigrationError as e:
+        print(f"Migration failed: {e}")
+        return 1
+    print(f"Schema version now {version}")
+    return 0 if version == LATEST_VERSION else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
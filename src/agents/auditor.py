@@ -10,7 +10,6 @@ from src.data.models import (
 from src.data.storage import Database, BetModel, PickModel, DailyReportModel, GameModel
 from src.prompts import AUDITOR_PROMPT, build_auditor_user_prompt
 from src.utils.json_schemas import get_auditor_schema
-from sqlalchemy import func
 from src.utils.logging import get_logger
 from collections import defaultdict
 
@@ -260,7 +259,7 @@ class Auditor(BaseAgent):
         try:
             # Get picks for the day
             picks = session.query(PickModel).filter(
-                func.date(PickModel.created_at) == target_date
+                PickModel.pick_date == target_date
             ).all()
             
             total_picks = len(picks)
@@ -491,6 +490,7 @@ class Auditor(BaseAgent):
                 temperature=0.4,
                 parse_json=True,
                 response_format=get_auditor_schema(),
+                offline=True,
             )
             insights = response.get("insights") or fallback_insights
             recommendations = response.get("recommendations")
@@ -1,16 +1,17 @@
 """Base agent interface"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime, date
 from enum import Enum
-import json
 from dataclasses import asdict, is_dataclass
 
 from src.data.storage import Database, AgentLogModel
 from src.utils.logging import get_logger, AgentInteractionLogger
 from src.utils.config import config
 from src.utils.llm import LLMClient, get_llm_client
+from src.utils.payload_encoding import estimate_tokens, get_payload_encoding
+from src.prompts import compose_user_prompt
 
 
 def _make_json_serializable(obj: Any, _seen: Optional[set] = None) -> Any:
@@ -63,12 +64,20 @@ class BaseAgent(ABC):
         # Get agent-specific LLM client if not provided
         self.llm_client = llm_client or get_llm_client(agent_name=name)
         self.system_prompt = self._get_system_prompt()
+        # How input data is serialized into user prompts (llm.payload_encoding)
+        self.payload_encoding = get_payload_encoding(name)
+        self.reset_payload_stats()
         # Log which model is being used (at DEBUG level)
         self.logger.debug(f"🤖 Agent '{self.name}' initialized with model: {self.llm_client.model}")
     
     def log_action(self, action: str, data: Optional[Dict[str, Any]] = None) -> None:
         """Log agent action to database"""
         if self.db:
+            # Queue for the background writer; fall back to a direct commit if async writes are disabled
+            sink = self.db.get_agent_log_sink()
+            if sink is not None:
+                sink.submit(self.name, action, data)
+                return
             session = self.db.get_session()
             try:
                 log_entry = AgentLogModel(
@@ -120,13 +129,59 @@ class BaseAgent(ABC):
         """Get system prompt for this agent - override in subclasses"""
         return ""
     
+    def format_user_prompt(
+        self,
+        user_prompt: str,
+        input_data: Optional[Any] = None,
+        context: Optional[str] = None
+    ) -> str:
+        """
+        Compose the user prompt with input data in this agent's payload encoding, and record
+        how many characters the encoding saved over indented JSON
+        
+        input_data must already be JSON-serializable (see _make_json_serializable).
+        """
+        formatted_prompt = compose_user_prompt(user_prompt, input_data, context, encoding=self.payload_encoding)
+        if input_data is not None and self.payload_encoding.compact:
+            self._record_payload_savings(compose_user_prompt(user_prompt, input_data, context), formatted_prompt)
+        return formatted_prompt
+    
+    def _record_payload_savings(self, pretty_prompt: str, formatted_prompt: str) -> None:
+        """Count one prompt's size as indented JSON vs in the compact payload encoding"""
+        self.payload_stats["calls"] += 1
+        self.payload_stats["pretty_chars"] += len(pretty_prompt)
+        self.payload_stats["encoded_chars"] += len(formatted_prompt)
+        saved_tokens = estimate_tokens(pretty_prompt) - estimate_tokens(formatted_prompt)
+        self.logger.debug(
+            f"🗜️  {self.name} payload: {len(pretty_prompt):,} → {len(formatted_prompt):,} chars "
+            f"(~{saved_tokens:,} tokens saved)"
+        )
+    
+    def reset_payload_stats(self) -> None:
+        """Clear payload encoding savings (start of each workflow run)"""
+        self.payload_stats = {"calls": 0, "pretty_chars": 0, "encoded_chars": 0}
+    
+    def get_payload_savings(self) -> Dict[str, int]:
+        """Characters and estimated prompt tokens saved by compact payload encoding so far"""
+        saved_chars = self.payload_stats["pretty_chars"] - self.payload_stats["encoded_chars"]
+        return {
+            **self.payload_stats,
+            "saved_chars": saved_chars,
+            "saved_tokens": estimate_tokens(self.payload_stats["pretty_chars"])
+            - estimate_tokens(self.payload_stats["encoded_chars"]),
+        }
+    
     def call_llm(
         self,
         user_prompt: str,
         input_data: Optional[Dict[str, Any]] = None,
         temperature: float = 0.7,
         parse_json: bool = True,
-        response_format: Optional[Dict[str, Any]] = None
+        response_format: Optional[Dict[str, Any]] = None,
+        offline: bool = False,
+        context: Optional[str] = None,
+        stream_key: Optional[str] = None,
+        on_item: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Call LLM with agent's system prompt
@@ -137,6 +192,13 @@ class BaseAgent(ABC):
             temperature: Sampling temperature
             parse_json: Whether to parse response as JSON
             response_format: Optional response format (JSON schema) for structured output
+            offline: Nobody is waiting on the result; send through the Batch API when
+                llm.batch enables it for this agent
+            context: Per-call notes placed after the instructions, so the system prompt and
+                user_prompt stay a cacheable prefix (see compose_user_prompt)
+            stream_key: Top-level array in the JSON response to parse while it streams
+                (LLMClient.call_streaming); a truncated response keeps its complete elements
+            on_item: Called with each stream_key element as soon as it is complete
             
         Returns:
             LLM response (parsed JSON if parse_json=True)
@@ -144,29 +206,45 @@ class BaseAgent(ABC):
         if not self.system_prompt:
             raise ValueError(f"Agent {self.name} has no system prompt defined")
         
-        # Format user prompt with input data if provided
-        if input_data:
-            # Convert dataclasses and other non-serializable types to JSON-compatible format
-            serializable_data = _make_json_serializable(input_data)
-            formatted_prompt = f"""{user_prompt}
-
-Input data:
-{json.dumps(serializable_data, indent=2)}"""
-        else:
-            formatted_prompt = user_prompt
+        # Static instructions first, then per-call context and input data (cacheable prefix)
+        # Convert dataclasses and other non-serializable types to JSON-compatible format
+        serializable_data = _make_json_serializable(input_data) if input_data else None
+        formatted_prompt = self.format_user_prompt(user_prompt, serializable_data, context)
         
         self.logger.debug(f"Calling LLM for {self.name}")
         
         # Get usage stats before call
         usage_before = self.llm_client.get_usage_stats()
         
-        response = self.llm_client.call(
-            system_prompt=self.system_prompt,
-            user_prompt=formatted_prompt,
-            temperature=temperature,
-            parse_json=parse_json,
-            response_format=response_format
-        )
+        if offline:
+            response = self.llm_client.call_batch([{
+                "messages": [
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": formatted_prompt},
+                ],
+                "temperature": temperature,
+                "parse_json": parse_json,
+                "response_format": response_format,
+            }])[0]
+        elif stream_key:
+            response = self.llm_client.call_streaming(
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": formatted_prompt},
+                ],
+                array_key=stream_key,
+                on_item=on_item,
+                response_format=response_format,
+                temperature=temperature
+            )
+        else:
+            response = self.llm_client.call(
+                system_prompt=self.system_prompt,
+                user_prompt=formatted_prompt,
+                temperature=temperature,
+                parse_json=parse_json,
+                response_format=response_format
+            )
         
         # Get usage stats after call and log delta
         usage_after = self.llm_client.get_usage_stats()
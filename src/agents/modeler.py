@@ -13,14 +13,18 @@ from src.agents.modeler_notes import (
     format_model_notes,
 )
 from src.agents.modeler_validation import validate_score_team_consistency
+from src.data.cache_store import get_cache_store
 from src.data.models import Prediction
 from src.data.storage import Database
 from src.prompts import MODELER_PROMPT, MODEL_NOTES_PROMPT
 from src.utils.logging import get_logger
+from src.utils.llm_retry import LLMUnavailableError
 from src.utils.json_schemas import get_modeler_schema
 
 logger = get_logger("agents.modeler")
 
+CACHE_NAMESPACE = "modeler"
+
 
 class Modeler(BaseAgent):
     """Modeler agent for generating predictions"""
@@ -30,58 +34,12 @@ class Modeler(BaseAgent):
         super().__init__("Modeler", db, llm_client)
         # Cache configuration - only store 1 day of modeler output
         self.cache_ttl = timedelta(days=1)  # Cache for 1 day only
-        self.cache_file = Path("data/cache/modeler_cache.json")
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self.cache = self._load_cache()
-        # Clean up old cache entries on initialization
-        self._cleanup_old_cache()
+        self.cache = get_cache_store()
     
     def _get_system_prompt(self) -> str:
         """Get system prompt for Modeler"""
         return MODELER_PROMPT
     
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache from file"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load modeler cache: {e}")
-        return {}
-    
-    def _save_cache(self) -> None:
-        """Save cache to file"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, default=str, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to save modeler cache: {e}")
-    
-    def _cleanup_old_cache(self) -> None:
-        """Remove cache entries older than 1 day"""
-        if not self.cache:
-            return
-        
-        now = datetime.now()
-        keys_to_remove = []
-        
-        for key, entry in self.cache.items():
-            try:
-                cached_time = datetime.fromisoformat(entry.get('timestamp', ''))
-                age = now - cached_time
-                if age >= self.cache_ttl:
-                    keys_to_remove.append(key)
-            except Exception:
-                # Invalid timestamp, remove entry
-                keys_to_remove.append(key)
-        
-        if keys_to_remove:
-            for key in keys_to_remove:
-                del self.cache[key]
-            self._save_cache()
-            logger.debug(f"Cleaned up {len(keys_to_remove)} old modeler cache entries")
-    
     def _get_cache_key(self, researcher_output: Dict[str, Any], target_date: Optional[date]) -> str:
         """Generate cache key based on researcher output and date"""
         # Create a stable key from game IDs and date
@@ -92,38 +50,22 @@ class Modeler(BaseAgent):
         # Use hash for shorter keys
         return hashlib.md5(key_data.encode()).hexdigest()
     
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is still valid (within 1 day)"""
-        try:
-            cached_time = datetime.fromisoformat(cache_entry.get('timestamp', ''))
-            age = datetime.now() - cached_time
-            return age < self.cache_ttl
-        except Exception as e:
-            logger.debug(f"Invalid cache timestamp format: {e}")
-            return False
-    
     def _get_cached_predictions(self, researcher_output: Dict[str, Any], target_date: Optional[date]) -> Optional[Dict[str, Any]]:
         """Get cached predictions if available and valid"""
         cache_key = self._get_cache_key(researcher_output, target_date)
-        cache_entry = self.cache.get(cache_key)
+        cache_entry = self.cache.get_entry(CACHE_NAMESPACE, cache_key)
         
-        if cache_entry and self._is_cache_valid(cache_entry):
-            age = datetime.now() - datetime.fromisoformat(cache_entry['timestamp'])
+        if cache_entry and cache_entry.value:
+            age = datetime.now() - cache_entry.created_at
             logger.info(f"Using cached modeler predictions (age: {age})")
-            return cache_entry.get('predictions')
+            return cache_entry.value
         return None
     
     def _cache_predictions(self, researcher_output: Dict[str, Any], target_date: Optional[date], predictions: Dict[str, Any]) -> None:
         """Cache predictions for future use"""
         cache_key = self._get_cache_key(researcher_output, target_date)
         games = researcher_output.get("games", [])
-        self.cache[cache_key] = {
-            'timestamp': datetime.now().isoformat(),
-            'predictions': predictions,
-            'game_count': len(games),
-            'date': target_date.isoformat() if target_date else None
-        }
-        self._save_cache()
+        self.cache.set(CACHE_NAMESPACE, cache_key, predictions, ttl=self.cache_ttl, cache_date=target_date)
         logger.debug(f"Cached modeler predictions for {len(games)} games")
 
     def _prepare_betting_lines(self, betting_lines: Optional[List]) -> Dict[Any, List[Dict[str, Any]]]:
@@ -187,6 +129,19 @@ class Modeler(BaseAgent):
                 self.log_warning(f"⚠️  Batch {batch_num} failed to generate predictions")
         return (all_game_models, processed_game_ids, failed_batches)
 
+    def model_games(self, games: List[Dict[str, Any]], betting_lines: Optional[List] = None) -> List[Dict[str, Any]]:
+        """
+        Model a group of researched games without touching the slate-level cache
+
+        Used by the streaming pipeline to model each research batch as it lands; games without
+        advanced stats are skipped exactly as in process().
+        """
+        if not self.is_enabled():
+            return []
+        lines_by_game = self._prepare_betting_lines(betting_lines)
+        game_models, _, _ = self._process_all_batches(games, lines_by_game, None)
+        return game_models
+
     def _missing_game_ids(self, games: List[Dict[str, Any]], processed_game_ids: Set[str]) -> List[str]:
         """Return list of game IDs that were not in processed_game_ids."""
         missing = []
@@ -286,6 +241,10 @@ class Modeler(BaseAgent):
                         self.log_warning(f"⚠️  Batch {batch_num} attempt {attempt + 1} returned empty results, retrying...")
                     else:
                         self.log_error(f"❌ Batch {batch_num} failed after {max_retries + 1} attempts")
+            except LLMUnavailableError as e:
+                # LLMClient already retried the request; re-sending the batch would not help
+                self.log_error(f"❌ Batch {batch_num} failed, LLM unavailable: {e}")
+                break
             except Exception as e:
                 if attempt < max_retries:
                     self.log_warning(f"⚠️  Batch {batch_num} attempt {attempt + 1} failed with error: {e}, retrying...")
@@ -0,0 +1,438 @@
+"""Backtest the deterministic modeler against stored games, lines and final results.
+
+Streams GameInsightModel + BettingLineModel + GameModel.result rows for a date range in
+chunked queries, re-models each date's slate with the vectorized slate engine (optionally
+with overridden engine constants) across a process pool, and reports ATS/total hit rate,
+ROI and calibration of the win, cover and over/under probabilities.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.agents.modeler_engine import GameContext, TeamContext
+from src.agents.modeler_slate import (
+    DEFAULT_PARAMS, ModelParams, SlateColumns, calculate_slate_arrays, calculate_slate_edges
+)
+from src.data.models import BetType
+from src.data.storage import BettingLineModel, Database, GameInsightModel, GameModel, TeamModel
+from src.utils.config import config
+from src.utils.logging import get_logger
+from src.utils.team_resolver import get_team_resolver
+
+logger = get_logger("agents.modeler_backtest")
+
+CALIBRATION_BUCKETS = 10
+# Slates modeled ahead of the one being collected, per worker (bounds memory while streaming)
+SLATES_IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass
+class BacktestGame:
+    """One historical game: model inputs, closing market and final score."""
+    game_id: int
+    game_date: date
+    context: GameContext
+    home_score: int
+    away_score: int
+    spread_odds: Dict[str, int] = field(default_factory=dict)  # "home"/"away" -> American odds
+    total_odds: Dict[str, int] = field(default_factory=dict)   # "over"/"under" -> American odds
+
+
+def _score(result: Dict[str, Any], key: str, alias: str) -> Optional[int]:
+    value = result.get(key)
+    if value is None:
+        value = result.get(alias)
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _line_side(bet_type: BetType, team: Optional[str], home_name: str, away_name: str) -> Optional[str]:
+    """Map a stored line's team field to home/away (spreads) or over/under (totals)."""
+    team_lower = (team or "").lower().strip()
+    if bet_type == BetType.TOTAL:
+        if team_lower in ("over", "under"):
+            return team_lower
+        return "over"
+    if not team_lower:
+        return None
+    if team_lower in ("home", "away"):
+        return team_lower
+    # A game's first save stores the display name ("Duke Blue Devils"), later ones the normalized name
+    resolver = get_team_resolver()
+    if resolver.same_team(team, home_name):
+        return "home"
+    if resolver.same_team(team, away_name):
+        return "away"
+    return None
+
+
+def _build_game(
+    game: GameModel,
+    insight: GameInsightModel,
+    lines: List[BettingLineModel],
+    team_names: Dict[int, str],
+) -> Optional[BacktestGame]:
+    """Assemble a BacktestGame; None when stats or scores are missing."""
+    result = game.result or {}
+    home_score = _score(result, "home_score", "homeScore")
+    away_score = _score(result, "away_score", "awayScore")
+    if home_score is None or away_score is None:
+        return None
+
+    # team1 = home, team2 = away (same convention the coordinator uses when saving insights)
+    home_name = team_names.get(game.team1_id, "")
+    away_name = team_names.get(game.team2_id, "")
+    try:
+        home = TeamContext.from_dict(home_name, game.team1_id, insight.team1_stats or {})
+        away = TeamContext.from_dict(away_name, game.team2_id, insight.team2_stats or {})
+    except ValueError:
+        return None
+
+    # Latest line per (bet_type, side); lines arrive ordered by timestamp
+    spreads: Dict[str, Tuple[float, int]] = {}
+    totals: Dict[str, Tuple[float, int]] = {}
+    for line in lines:
+        side = _line_side(line.bet_type, line.team, home_name, away_name)
+        if side is None:
+            continue
+        if line.bet_type == BetType.SPREAD:
+            spreads[side] = (line.line, line.odds)
+        elif line.bet_type == BetType.TOTAL:
+            totals[side] = (line.line, line.odds)
+
+    market_spread_home = None
+    if "home" in spreads:
+        market_spread_home = float(spreads["home"][0])
+    elif "away" in spreads:
+        market_spread_home = -float(spreads["away"][0])
+    market_total = None
+    if totals:
+        market_total = float((totals.get("over") or totals.get("under"))[0])
+
+    context = GameContext(
+        game_id=str(game.id),
+        away=away,
+        home=home,
+        market_total=market_total,
+        market_spread_home=market_spread_home,
+        # The researcher's context notes are stored joined in matchup_notes; the live modeler
+        # reads the neutral-site flag from the same notes (GameContext.from_researcher_output)
+        is_neutral_site="neutral site" in (insight.matchup_notes or "").lower(),
+        is_rivalry=bool(insight.rivalry),
+    )
+    return BacktestGame(
+        game_id=game.id,
+        game_date=game.date,
+        context=context,
+        home_score=home_score,
+        away_score=away_score,
+        spread_odds={side: odds for side, (_, odds) in spreads.items()},
+        total_odds={side: odds for side, (_, odds) in totals.items()},
+    )
+
+
+def iter_backtest_games(
+    db: Database,
+    start_date: date,
+    end_date: date,
+    chunk_days: int = 14,
+) -> Iterator[Tuple[date, List[BacktestGame]]]:
+    """
+    Stream games with insights and final results, one (date, games) slate at a time.
+
+    Rows are loaded in windows of chunk_days so a full season never sits in one result set.
+    """
+    session = db.get_session()
+    try:
+        team_names = dict(session.query(TeamModel.id, TeamModel.normalized_team_name).all())
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(end_date, window_start + timedelta(days=chunk_days - 1))
+            rows = (
+                session.query(GameModel, GameInsightModel)
+                .join(GameInsightModel, GameInsightModel.game_id == GameModel.id)
+                .filter(GameModel.date >= window_start, GameModel.date <= window_end)
+                .filter(GameModel.result.isnot(None))
+                .order_by(GameModel.date, GameModel.id)
+                .all()
+            )
+            lines_by_game: Dict[int, List[BettingLineModel]] = defaultdict(list)
+            game_ids = [game.id for game, _ in rows]
+            for i in range(0, len(game_ids), 500):
+                for line in (
+                    session.query(BettingLineModel)
+                    .filter(BettingLineModel.game_id.in_(game_ids[i:i + 500]))
+                    .order_by(BettingLineModel.timestamp, BettingLineModel.id)
+                ):
+                    lines_by_game[line.game_id].append(line)
+
+            slates: Dict[date, List[BacktestGame]] = defaultdict(list)
+            for game, insight in rows:
+                bt_game = _build_game(game, insight, lines_by_game.get(game.id, []), team_names)
+                if bt_game is not None:
+                    slates[game.date].append(bt_game)
+            for slate_date in sorted(slates):
+                yield slate_date, slates[slate_date]
+
+            session.expunge_all()
+            window_start = window_end + timedelta(days=1)
+    finally:
+        session.close()
+
+
+def _profit(odds: Optional[int]) -> float:
+    """Profit in units for a 1-unit winning bet at American odds (default -110)."""
+    odds = odds or -110
+    return odds / 100.0 if odds > 0 else 100.0 / -odds
+
+
+def _grade(pick_value: float, line_value: float) -> int:
+    """+1 win / 0 push / -1 loss for a pick that needs pick_value > line_value."""
+    if pick_value > line_value:
+        return 1
+    if pick_value < line_value:
+        return -1
+    return 0
+
+
+def _market_lines(game: BacktestGame) -> List[Dict[str, Any]]:
+    """The home spread and the total as calculate_slate_edges line dicts."""
+    lines = []
+    if game.context.market_spread_home is not None:
+        lines.append({"bet_type": "spread", "line": game.context.market_spread_home, "team": "home",
+                      "odds": game.spread_odds.get("home", -110)})
+    if game.context.market_total is not None:
+        lines.append({"bet_type": "total", "line": game.context.market_total, "team": "over",
+                      "odds": game.total_odds.get("over", -110)})
+    return lines
+
+
+def evaluate_slate(
+    games: List[BacktestGame],
+    params: ModelParams = DEFAULT_PARAMS,
+    min_edge: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Model one slate and grade the model's side of each spread/total against the result.
+
+    A side is bet when the model disagrees with the market by more than min_edge points. Its
+    cover/over probability comes from the same edge path the live modeler uses, so margin_sd
+    and total_sd overrides show up in the probabilities and their calibration.
+    """
+    if not games:
+        return []
+    results = calculate_slate_arrays(SlateColumns.from_contexts([g.context for g in games]), params=params)
+    edges = calculate_slate_edges(results, [_market_lines(g) for g in games], params=params)
+    margins = results["margin"].tolist()
+    totals = results["total"].tolist()
+    home_probs = results["home_win_prob"].tolist()
+
+    records = []
+    for i, game in enumerate(games):
+        actual_margin = game.home_score - game.away_score
+        actual_total = game.home_score + game.away_score
+        record = {
+            "game_id": game.game_id,
+            "date": game.game_date,
+            "predicted_margin": margins[i],
+            "predicted_total": totals[i],
+            "home_win_prob": home_probs[i],
+            "actual_margin": actual_margin,
+            "actual_total": actual_total,
+            "ats_result": None,
+            "ats_odds": None,
+            "ats_prob": None,
+            "total_result": None,
+            "total_odds": None,
+            "total_prob": None,
+        }
+        probs = {edge["market_type"]: edge["model_estimated_probability"] for edge in edges[i]}
+
+        spread_home = game.context.market_spread_home
+        if spread_home is not None:
+            model_cover = margins[i] + spread_home
+            if abs(model_cover) > min_edge:
+                side = "home" if model_cover > 0 else "away"
+                cover = _grade(actual_margin + spread_home, 0.0)
+                record["ats_result"] = cover if side == "home" else -cover
+                record["ats_odds"] = game.spread_odds.get(side)
+                home_cover_prob = probs["SPREAD_HOME"]
+                record["ats_prob"] = home_cover_prob if side == "home" else 1.0 - home_cover_prob
+
+        market_total = game.context.market_total
+        if market_total is not None:
+            diff = totals[i] - market_total
+            if abs(diff) > min_edge:
+                side = "over" if diff > 0 else "under"
+                graded = _grade(actual_total, market_total)
+                record["total_result"] = graded if side == "over" else -graded
+                record["total_odds"] = game.total_odds.get(side)
+                record["total_prob"] = probs["TOTAL_OVER" if side == "over" else "TOTAL_UNDER"]
+        records.append(record)
+    return records
+
+
+def _evaluate_slate_job(job: Tuple[List[BacktestGame], ModelParams, float]) -> List[Dict[str, Any]]:
+    """Process-pool entry point (top-level so it pickles)."""
+    games, params, min_edge = job
+    return evaluate_slate(games, params, min_edge)
+
+
+def _market_summary(records: List[Dict[str, Any]], result_key: str, odds_key: str) -> Dict[str, Any]:
+    graded = [r for r in records if r[result_key] is not None]
+    wins = sum(1 for r in graded if r[result_key] > 0)
+    losses = sum(1 for r in graded if r[result_key] < 0)
+    pushes = len(graded) - wins - losses
+    units = sum(_profit(r[odds_key]) for r in graded if r[result_key] > 0) - losses
+    return {
+        "bets": len(graded),
+        "wins": wins,
+        "losses": losses,
+        "pushes": pushes,
+        "hit_rate": wins / (wins + losses) if (wins + losses) else 0.0,
+        "units": units,
+        "roi": units / len(graded) if graded else 0.0,
+    }
+
+
+def _calibration(outcomes: List[Tuple[float, int]]) -> List[Dict[str, Any]]:
+    """Bucket (predicted probability, 0/1 outcome) pairs by predicted probability."""
+    buckets = [{"count": 0, "predicted": 0.0, "actual": 0} for _ in range(CALIBRATION_BUCKETS)]
+    for prob, happened in outcomes:
+        bucket = buckets[min(CALIBRATION_BUCKETS - 1, int(prob * CALIBRATION_BUCKETS))]
+        bucket["count"] += 1
+        bucket["predicted"] += prob
+        bucket["actual"] += happened
+
+    calibration = []
+    for i, bucket in enumerate(buckets):
+        if not bucket["count"]:
+            continue
+        calibration.append({
+            "bucket": f"{i / CALIBRATION_BUCKETS:.1f}-{(i + 1) / CALIBRATION_BUCKETS:.1f}",
+            "games": bucket["count"],
+            "mean_predicted": bucket["predicted"] / bucket["count"],
+            "actual_rate": bucket["actual"] / bucket["count"],
+        })
+    return calibration
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate graded records into hit rate, ROI, error and calibration metrics."""
+    n = len(records)
+    home_wins = [(r["home_win_prob"], 1 if r["actual_margin"] > 0 else 0) for r in records]
+    brier = sum((prob - won) ** 2 for prob, won in home_wins)
+    # Pushes are neither a win nor a loss for the bet side, so they are left out
+    covers = [(r["ats_prob"], int(r["ats_result"] > 0)) for r in records if r["ats_result"]]
+    overs = [(r["total_prob"], int(r["total_result"] > 0)) for r in records if r["total_result"]]
+
+    return {
+        "games": n,
+        "dates": len({r["date"] for r in records}),
+        "ats": _market_summary(records, "ats_result", "ats_odds"),
+        "totals": _market_summary(records, "total_result", "total_odds"),
+        "margin_mae": sum(abs(r["predicted_margin"] - r["actual_margin"]) for r in records) / n if n else 0.0,
+        "total_mae": sum(abs(r["predicted_total"] - r["actual_total"]) for r in records) / n if n else 0.0,
+        "brier_score": brier / n if n else 0.0,
+        "calibration": _calibration(home_wins),
+        "ats_calibration": _calibration(covers),
+        "totals_calibration": _calibration(overs),
+    }
+
+
+def run_backtest(
+    start_date: date,
+    end_date: date,
+    params: Optional[ModelParams] = None,
+    db: Optional[Database] = None,
+    workers: Optional[int] = None,
+    min_edge: Optional[float] = None,
+    chunk_days: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Re-run the modeler over stored games between start_date and end_date (inclusive).
+
+    Args:
+        start_date: First game date
+        end_date: Last game date
+        params: Engine constant overrides (defaults reproduce the live modeler)
+        db: Database (defaults to the global instance)
+        workers: Worker processes; 1 runs in-process (default: backtest.workers or CPU count)
+        min_edge: Points of model/market disagreement required to grade a bet
+        chunk_days: Days of games loaded per query window
+
+    Returns:
+        Summary dict (see summarize) plus params and elapsed_seconds
+    """
+    if db is None:
+        from src.data.storage import get_database
+        db = get_database()
+    backtest_config = config.get('backtest', {}) or {}
+    params = params or DEFAULT_PARAMS
+    workers = workers or backtest_config.get('workers') or os.cpu_count() or 1
+    min_edge = backtest_config.get('min_edge', 0.0) if min_edge is None else min_edge
+    chunk_days = chunk_days or backtest_config.get('chunk_days', 14)
+
+    started = time.perf_counter()
+    slates = iter_backtest_games(db, start_date, end_date, chunk_days=chunk_days)
+    records: List[Dict[str, Any]] = []
+    if workers <= 1:
+        for _, games in slates:
+            records.extend(evaluate_slate(games, params, min_edge))
+    else:
+        # Sliding window of futures: slates keep streaming from the database instead of all
+        # being submitted (and held in memory) up front; results are collected in date order
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _, games in slates:
+                in_flight.append(executor.submit(_evaluate_slate_job, (games, params, min_edge)))
+                if len(in_flight) >= workers * SLATES_IN_FLIGHT_PER_WORKER:
+                    records.extend(in_flight.popleft().result())
+            while in_flight:
+                records.extend(in_flight.popleft().result())
+
+    summary = summarize(records)
+    summary["params"] = params.__dict__.copy()
+    summary["min_edge"] = min_edge
+    summary["elapsed_seconds"] = time.perf_counter() - started
+    logger.info(
+        f"📈 Backtest {start_date} → {end_date}: {summary['games']} games over {summary['dates']} dates "
+        f"in {summary['elapsed_seconds']:.2f}s"
+    )
+    return summary
+
+
+def format_backtest_report(summary: Dict[str, Any]) -> str:
+    """Render a backtest summary as plain text."""
+    lines = [
+        f"Games: {summary['games']} across {summary['dates']} dates ({summary['elapsed_seconds']:.2f}s)",
+        "Params: " + ", ".join(f"{k}={v}" for k, v in summary["params"].items()),
+    ]
+    for label, key in (("ATS", "ats"), ("Totals", "totals")):
+        m = summary[key]
+        lines.append(
+            f"{label}: {m['wins']}-{m['losses']}-{m['pushes']} "
+            f"({m['hit_rate']:.1%} hit rate), {m['units']:+.2f}u, ROI {m['roi']:+.1%}"
+        )
+    lines.append(
+        f"Margin MAE: {summary['margin_mae']:.2f}  Total MAE: {summary['total_mae']:.2f}  "
+        f"Brier: {summary['brier_score']:.4f}"
+    )
+    for label, key in (("home win prob", "calibration"), ("ATS cover prob", "ats_calibration"),
+                       ("total side prob", "totals_calibration")):
+        lines.append(f"Calibration ({label}):")
+        for bucket in summary[key]:
+            lines.append(
+                f"  {bucket['bucket']}: {bucket['games']:>5} games, "
+                f"predicted {bucket['mean_predicted']:.1%}, actual {bucket['actual_rate']:.1%}"
+            )
+    return "\n".join(lines)
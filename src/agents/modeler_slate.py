@@ -0,0 +1,467 @@
+"""Vectorized slate engine: models every game on a slate in one NumPy pass.
+
+Mirrors calculate_game_model in modeler_engine step for step so that each game's output is
+identical (bit-for-bit) to the scalar path. Arithmetic runs on float64 arrays in the same
+operation order as the scalar functions; transcendental functions (exp, erf) and decimal
+rounding go through the same libm/``round`` calls the scalar path uses, because NumPy's SIMD
+exp and ``np.round`` are not guaranteed to round identically.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.agents import modeler_engine as me
+from src.agents.modeler_engine import GameContext
+
+
+_exp = np.frompyfunc(math.exp, 1, 1)
+_erf = np.frompyfunc(math.erf, 1, 1)
+_SQRT2 = math.sqrt(2.0)
+
+
+def _as_float(values: Any) -> np.ndarray:
+    """Coerce frompyfunc object output back to a float64 array."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Python round() per element (np.round uses scale-and-rint, which can differ)."""
+    return np.array([round(v, ndigits) for v in values.tolist()], dtype=np.float64)
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Vectorized modeler_engine._norm_cdf."""
+    return 0.5 * (1.0 + _as_float(_erf(x / _SQRT2)))
+
+
+def _trend_adjustment(away_pace_trend: Optional[str], home_pace_trend: Optional[str]) -> float:
+    """Pace trend adjustment, same accumulation order as calculate_pace."""
+    trend_adj = 0.0
+    if away_pace_trend and away_pace_trend.lower() == "faster":
+        trend_adj += 0.8
+    elif away_pace_trend and away_pace_trend.lower() == "slower":
+        trend_adj -= 0.8
+
+    if home_pace_trend and home_pace_trend.lower() == "faster":
+        trend_adj += 0.8
+    elif home_pace_trend and home_pace_trend.lower() == "slower":
+        trend_adj -= 0.8
+    return trend_adj
+
+
+@dataclass(frozen=True)
+class ModelParams:
+    """Engine constants for the slate path. Defaults reproduce calculate_game_model."""
+    eff_baseline: float = me.EFF_BASELINE
+    margin_sd: float = me.MARGIN_SD
+    total_sd: float = me.TOTAL_SD
+    win_prob_scale: float = me.WIN_PROB_SCALE
+    pace_min: float = me.PACE_MIN
+    pace_max: float = me.PACE_MAX
+    dampening_threshold: float = 18.0
+    dampening_factor: float = 0.4
+    garbage_time_threshold: float = 22.0
+
+    @classmethod
+    def from_overrides(cls, overrides: Optional[Dict[str, float]] = None) -> "ModelParams":
+        """Build params from {name: value}; names are case-insensitive (EFF_BASELINE or eff_baseline)."""
+        known = {f.name for f in fields(cls)}
+        values = {}
+        for name, value in (overrides or {}).items():
+            key = name.lower()
+            if key not in known:
+                raise ValueError(f"Unknown model parameter '{name}'. Expected one of: {', '.join(sorted(known))}")
+            values[key] = float(value)
+        return cls(**values)
+
+
+DEFAULT_PARAMS = ModelParams()
+
+
+@dataclass
+class SlateColumns:
+    """Column arrays for a slate of GameContext objects (one row per game)."""
+    contexts: List[GameContext]
+    away_adjo: np.ndarray
+    away_adjd: np.ndarray
+    away_adjt: np.ndarray
+    home_adjo: np.ndarray
+    home_adjd: np.ndarray
+    home_adjt: np.ndarray
+    trend_adj: np.ndarray
+    market_total: np.ndarray        # NaN when the market total is unknown
+    market_spread_home: np.ndarray  # NaN when the market spread is unknown
+    is_neutral_site: np.ndarray
+    is_rivalry: np.ndarray
+    is_conference_game: np.ndarray
+    mismatch_adj: np.ndarray
+
+    @classmethod
+    def from_contexts(cls, contexts: Sequence[GameContext]) -> "SlateColumns":
+        """Pack GameContext objects into column arrays. Categorical inputs are resolved here."""
+        contexts = list(contexts)
+
+        def col(values: List[Any]) -> np.ndarray:
+            return np.array(values, dtype=np.float64)
+
+        def optional_col(values: List[Optional[float]]) -> np.ndarray:
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        is_conference_game = []
+        for ctx in contexts:
+            same_conf = bool(
+                ctx.away.conference and ctx.home.conference
+                and ctx.away.conference.lower().strip() == ctx.home.conference.lower().strip()
+            )
+            is_conference_game.append(same_conf)
+
+        return cls(
+            contexts=contexts,
+            away_adjo=col([c.away.adjo for c in contexts]),
+            away_adjd=col([c.away.adjd for c in contexts]),
+            away_adjt=col([c.away.adjt for c in contexts]),
+            home_adjo=col([c.home.adjo for c in contexts]),
+            home_adjd=col([c.home.adjd for c in contexts]),
+            home_adjt=col([c.home.adjt for c in contexts]),
+            trend_adj=col([_trend_adjustment(c.away.pace_trend, c.home.pace_trend) for c in contexts]),
+            market_total=optional_col([c.market_total for c in contexts]),
+            market_spread_home=optional_col([c.market_spread_home for c in contexts]),
+            is_neutral_site=np.array([bool(c.is_neutral_site) for c in contexts], dtype=bool),
+            is_rivalry=np.array([bool(c.is_rivalry) for c in contexts], dtype=bool),
+            is_conference_game=np.array(is_conference_game, dtype=bool),
+            mismatch_adj=col([me.calculate_mismatch_adjustment(c) for c in contexts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.contexts)
+
+
+def calculate_slate_arrays(
+    cols: SlateColumns,
+    has_adv_stats: bool = True,
+    params: ModelParams = DEFAULT_PARAMS,
+) -> Dict[str, np.ndarray]:
+    """
+    Run the deterministic model for every game in one pass.
+
+    Returns:
+        Dict of per-game arrays: final scores, margin, total, win probabilities, confidence,
+        plus every intermediate that calculate_game_model reports in its meta block.
+    """
+    # Pace suppression model
+    slower = np.minimum(cols.away_adjt, cols.home_adjt)
+    faster = np.maximum(cols.away_adjt, cols.home_adjt)
+    base_pace = (slower * 0.65) + (faster * 0.35)
+    final_pace = np.maximum(params.pace_min, np.minimum(params.pace_max, base_pace + cols.trend_adj))
+
+    # Multiplicative efficiency with tempo multiplier
+    away_pts_100 = (cols.away_adjo * cols.home_adjd) / params.eff_baseline
+    home_pts_100 = (cols.home_adjo * cols.away_adjd) / params.eff_baseline
+    tempo_multiplier = np.select(
+        [final_pace > 74.0, final_pace > 72.0, final_pace > 70.0],
+        [1.05, 1.03, 1.015],
+        default=1.0,
+    )
+    boosted = tempo_multiplier > 1.0
+    away_pts_100 = np.where(boosted, away_pts_100 * tempo_multiplier, away_pts_100)
+    home_pts_100 = np.where(boosted, home_pts_100 * tempo_multiplier, home_pts_100)
+
+    raw_away = (away_pts_100 / 100.0) * final_pace
+    raw_home = (home_pts_100 / 100.0) * final_pace
+    base_margin = raw_home - raw_away
+
+    # Home court, conference grudge and mismatch adjustments
+    grudge_applies = cols.is_conference_game | cols.is_rivalry
+    hca_reduction = np.where(grudge_applies, 1.0, 0.0)
+    grudge_total_adj = np.where(
+        grudge_applies,
+        np.select([final_pace > 72.0, final_pace > 68.0], [4.0, 3.0], default=2.0),
+        0.0,
+    )
+    hca_adj = np.where(cols.is_neutral_site, 0.0, 3.2) - hca_reduction
+    raw_margin = base_margin + hca_adj + cols.mismatch_adj
+
+    # Anti-blowout dampening
+    abs_raw_margin = np.abs(raw_margin)
+    threshold = params.dampening_threshold
+    damp_applied = abs_raw_margin > threshold
+    dampened = (threshold + ((abs_raw_margin - threshold) * params.dampening_factor)) * np.where(raw_margin >= 0, 1, -1)
+    dampened_margin = np.where(damp_applied, dampened, raw_margin)
+
+    # Total calibration toward market with pace awareness
+    raw_total = raw_home + raw_away + grudge_total_adj
+    market_total = np.where(np.isnan(cols.market_total), raw_total, cols.market_total)
+    regression = np.select(
+        [raw_total > 165.0, raw_total > 155.0, (raw_total >= 145.0) & (raw_total <= 155.0),
+         (raw_total >= 140.0) & (raw_total < 145.0)],
+        [0.15, 0.20, 0.15, 0.20],
+        default=0.35,
+    )
+    over_adj = np.select([raw_total > 165.0, raw_total > 155.0], [3.0, 1.5], default=0.0)
+    pace_adj = np.select([final_pace > 74.0, final_pace > 72.0, final_pace > 70.0], [2.5, 1.5, 0.5], default=0.0)
+    calibrated_total = raw_total - (regression * (raw_total - market_total)) + over_adj + pace_adj
+
+    garbage_time_applied = np.abs(dampened_margin) > params.garbage_time_threshold
+    calibrated_total = np.where(garbage_time_applied, calibrated_total - 4.0, calibrated_total)
+
+    # Final scores
+    away_score = _round((calibrated_total / 2.0) - (dampened_margin / 2.0), 1)
+    home_score = _round((calibrated_total / 2.0) + (dampened_margin / 2.0), 1)
+    margin = home_score - away_score
+    total = away_score + home_score
+
+    # Win probabilities (logistic on margin)
+    home_prob = 1.0 / (1.0 + _as_float(_exp(-margin / params.win_prob_scale)))
+    away_prob = 1.0 - home_prob
+    away_prob = np.maximum(0.0, np.minimum(1.0, away_prob))
+    home_prob = np.maximum(0.0, np.minimum(1.0, home_prob))
+
+    # Discrepancy shrinkage toward 0.5 for large model/market gaps
+    has_spread = ~np.isnan(cols.market_spread_home)
+    spread_diff = np.where(has_spread, np.abs(margin - (-np.nan_to_num(cols.market_spread_home))), 0.0)
+    total_diff = np.abs(total - market_total)
+    edge_mag = np.maximum(spread_diff, total_diff)
+    shrink_applied = edge_mag > 6.0
+    shrink_factor = np.where(edge_mag > 8.0, 0.50, np.where(shrink_applied, 0.75, 1.0))
+    home_prob_adjusted = 0.5 + (home_prob - 0.5) * shrink_factor
+    away_prob_adjusted = 1.0 - home_prob_adjusted
+    away_prob = np.where(shrink_applied, np.maximum(0.0, np.minimum(1.0, away_prob_adjusted)), away_prob)
+    home_prob = np.where(shrink_applied, np.maximum(0.0, np.minimum(1.0, home_prob_adjusted)), home_prob)
+
+    margin = _round(margin, 2)
+    away_prob = _round(away_prob, 2)
+    home_prob = _round(home_prob, 2)
+
+    # Confidence
+    if has_adv_stats:
+        base_conf = 0.45 + np.minimum(edge_mag, 12.0) / 40.0
+        base_conf = np.where(edge_mag > 6.0, base_conf - 0.05, base_conf)
+        confidence = np.maximum(0.3, np.minimum(0.9, base_conf))
+        confidence = np.where(np.abs(dampened_margin) > 20, 0.60, confidence)
+    else:
+        confidence = np.zeros(len(cols), dtype=np.float64)
+
+    return {
+        "away_score": away_score,
+        "home_score": home_score,
+        "margin": margin,
+        "total": total,
+        "away_win_prob": away_prob,
+        "home_win_prob": home_prob,
+        "confidence": confidence,
+        "edge_magnitude": edge_mag,
+        "base_pace": base_pace,
+        "final_pace": final_pace,
+        "base_margin": base_margin,
+        "hca_adjustment": hca_adj,
+        "raw_margin": raw_margin,
+        "raw_total": raw_total,
+        "calibrated_total": calibrated_total,
+        "raw_away_score": raw_away,
+        "raw_home_score": raw_home,
+        "away_pts_per_100": away_pts_100,
+        "home_pts_per_100": home_pts_100,
+        "dampening_applied": damp_applied,
+        "garbage_time_applied": garbage_time_applied,
+        "market_total_used": market_total,
+        "tempo_multiplier": tempo_multiplier,
+        "grudge_total_adj": grudge_total_adj,
+        "discrepancy_shrinkage_applied": shrink_applied,
+        "total_regression_pct": regression,
+        "shrink_factor": shrink_factor,
+    }
+
+
+def calculate_slate_edges(
+    results: Dict[str, np.ndarray],
+    betting_lines: Sequence[Optional[List[Dict[str, Any]]]],
+    params: ModelParams = DEFAULT_PARAMS,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Vectorized calculate_market_edges across the slate.
+
+    Args:
+        results: Output of calculate_slate_arrays
+        betting_lines: Per-game line dicts, aligned with the slate
+        params: Engine constants (margin_sd / total_sd are used here)
+
+    Returns:
+        Per-game edge lists in the same order calculate_market_edges would produce
+    """
+    # Flatten lines into rows; remember each emitted edge's (game, row, kind)
+    rows_game: List[int] = []
+    rows_line: List[float] = []
+    rows_odds: List[float] = []
+    rows_home: List[bool] = []
+    plan: List[List[tuple]] = []
+    for g, lines in enumerate(betting_lines):
+        game_plan: List[tuple] = []
+        for line in lines or []:
+            bet_type = line.get("bet_type")
+            line_value = line.get("line")
+            team = (line.get("team") or "").lower()
+            if bet_type == "spread" and line_value is not None:
+                kind = "spread"
+            elif bet_type == "total" and line_value is not None:
+                kind = "total"
+            elif bet_type == "moneyline":
+                kind = "moneyline"
+            else:
+                continue
+            game_plan.append((kind, len(rows_game), line_value))
+            rows_game.append(g)
+            rows_line.append(line_value if line_value is not None else 0.0)
+            rows_odds.append(line.get("odds", -110))
+            rows_home.append(bool(team and "home" in team))
+        plan.append(game_plan)
+
+    if not rows_game:
+        return [[] for _ in plan]
+
+    game_idx = np.array(rows_game, dtype=np.intp)
+    line_val = np.array(rows_line, dtype=np.float64)
+    odds = np.array(rows_odds, dtype=np.float64)
+    is_home = np.array(rows_home, dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = np.where(
+            odds == 0, 0.0,
+            np.where(odds > 0, 100.0 / (odds + 100.0), (-odds) / ((-odds) + 100.0)),
+        )
+
+    margin = results["margin"][game_idx]
+    total = results["total"][game_idx]
+    effective_line = np.where(is_home, -line_val, line_val)
+    prob_cover = 1.0 - _norm_cdf((effective_line - margin) / params.margin_sd)
+    spread_prob = np.maximum(0.0, np.minimum(1.0, prob_cover))
+    over_prob = 1.0 - _norm_cdf((line_val - total) / params.total_sd)
+    under_prob = 1.0 - over_prob
+    ml_prob = np.where(is_home, results["home_win_prob"][game_idx], results["away_win_prob"][game_idx])
+
+    implied_l = implied.tolist()
+    spread_prob_l = spread_prob.tolist()
+    over_prob_l = over_prob.tolist()
+    under_prob_l = under_prob.tolist()
+    ml_prob_l = ml_prob.tolist()
+    confidence_l = results["confidence"].tolist()
+
+    edges: List[List[Dict[str, Any]]] = []
+    for g, game_plan in enumerate(plan):
+        game_edges: List[Dict[str, Any]] = []
+        confidence = confidence_l[g]
+        for kind, r, line_value in game_plan:
+            imp_prob = implied_l[r]
+            if kind == "spread":
+                game_edges.append({
+                    "market_type": "SPREAD_HOME" if rows_home[r] else "SPREAD_AWAY",
+                    "market_line": f"{line_value}",
+                    "model_estimated_probability": spread_prob_l[r],
+                    "implied_probability": imp_prob,
+                    "edge": spread_prob_l[r] - imp_prob,
+                    "edge_confidence": confidence,
+                })
+            elif kind == "total":
+                for market_type, prob in (("TOTAL_OVER", over_prob_l[r]), ("TOTAL_UNDER", under_prob_l[r])):
+                    game_edges.append({
+                        "market_type": market_type,
+                        "market_line": f"{line_value}",
+                        "model_estimated_probability": max(0.0, min(1.0, prob)),
+                        "implied_probability": imp_prob,
+                        "edge": prob - imp_prob,
+                        "edge_confidence": confidence,
+                    })
+            else:
+                game_edges.append({
+                    "market_type": "MONEYLINE_HOME" if rows_home[r] else "MONEYLINE_AWAY",
+                    "market_line": "0",
+                    "model_estimated_probability": ml_prob_l[r],
+                    "implied_probability": imp_prob,
+                    "edge": ml_prob_l[r] - imp_prob,
+                    "edge_confidence": confidence,
+                })
+        edges.append(game_edges)
+    return edges
+
+
+def calculate_slate_models(
+    contexts: Sequence[GameContext],
+    betting_lines: Optional[Sequence[Optional[List[Dict[str, Any]]]]] = None,
+    has_adv_stats: bool = True,
+    params: ModelParams = DEFAULT_PARAMS,
+) -> List[Dict[str, Any]]:
+    """
+    Model a whole slate at once. Output matches [calculate_game_model(ctx, lines) ...] exactly
+    when params are the defaults.
+
+    Args:
+        contexts: GameContext per game
+        betting_lines: Per-game line dicts aligned with contexts (None = no lines for any game)
+        has_adv_stats: Passed through to confidence, as in calculate_game_model
+        params: Engine constants to use instead of the modeler_engine defaults
+
+    Returns:
+        List of game model dicts in the same order as contexts
+    """
+    cols = SlateColumns.from_contexts(contexts)
+    if len(cols) == 0:
+        return []
+    if betting_lines is None:
+        betting_lines = [None] * len(cols)
+    elif len(betting_lines) != len(cols):
+        raise ValueError(f"betting_lines has {len(betting_lines)} entries for {len(cols)} games")
+
+    results = calculate_slate_arrays(cols, has_adv_stats=has_adv_stats, params=params)
+    edges = calculate_slate_edges(results, betting_lines, params=params)
+    columns = {key: values.tolist() for key, values in results.items()}
+
+    models: List[Dict[str, Any]] = []
+    for i, ctx in enumerate(cols.contexts):
+        away_score = columns["away_score"][i]
+        home_score = columns["home_score"][i]
+        market_total_used = ctx.market_total if ctx.market_total is not None else columns["raw_total"][i]
+        shrink_applied = bool(columns["discrepancy_shrinkage_applied"][i])
+        predictions = {
+            "scores": {"away": away_score, "home": home_score},
+            "margin": columns["margin"][i],
+            "total": columns["total"][i],
+            "win_probs": {"away": columns["away_win_prob"][i], "home": columns["home_win_prob"][i]},
+            "confidence": columns["confidence"][i],
+        }
+        meta = {
+            "base_pace": columns["base_pace"][i],
+            "trend_adjustment": float(cols.trend_adj[i]),
+            "final_pace": columns["final_pace"][i],
+            "base_margin": columns["base_margin"][i],
+            "hca_adjustment": columns["hca_adjustment"][i],
+            "mismatch_adjustment": float(cols.mismatch_adj[i]),
+            "raw_margin": columns["raw_margin"][i],
+            "raw_total": columns["raw_total"][i],
+            "calibrated_total": columns["calibrated_total"][i],
+            "raw_away_score": columns["raw_away_score"][i],
+            "raw_home_score": columns["raw_home_score"][i],
+            "away_pts_per_100": columns["away_pts_per_100"][i],
+            "home_pts_per_100": columns["home_pts_per_100"][i],
+            "dampening_applied": bool(columns["dampening_applied"][i]),
+            "garbage_time_applied": bool(columns["garbage_time_applied"][i]),
+            "market_total_used": market_total_used,
+            "market_spread_home": ctx.market_spread_home,
+            "is_neutral_site": ctx.is_neutral_site,
+            "is_conference_game": bool(cols.is_conference_game[i]),
+            "is_rivalry": ctx.is_rivalry,
+            "tempo_multiplier": columns["tempo_multiplier"][i],
+            "grudge_total_adj": columns["grudge_total_adj"][i],
+            "discrepancy_shrinkage_applied": shrink_applied,
+            "total_regression_pct": columns["total_regression_pct"][i],
+            "edge_magnitude": columns["edge_magnitude"][i],
+            "shrink_factor": columns["shrink_factor"][i] if shrink_applied else 1.0,
+        }
+        models.append(me.build_model_output(
+            ctx.game_id, ctx.away.name, ctx.home.name, ctx.away.team_id, ctx.home.team_id,
+            predictions, away_score, home_score, edges[i], columns["edge_magnitude"][i], meta,
+        ))
+    return models
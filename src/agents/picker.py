@@ -7,6 +7,8 @@ from src.data.models import BetType
 from src.data.storage import Database
 from src.prompts import PICKER_PROMPT, build_picker_user_prompt
 from src.utils.logging import get_logger
+from src.utils.llm_retry import LLMUnavailableError
+from src.utils.llm_telemetry import llm_batch_context
 from src.utils.json_schemas import get_picker_schema
 
 logger = get_logger("agents.picker")
@@ -57,6 +59,32 @@ class Picker(BaseAgent):
             self.log_info(f"Filtered out {rejected} picks with extreme odds")
         return filtered
 
+    @property
+    def batch_size(self) -> int:
+        """Games per Picker LLM call"""
+        return self.config.get('picker_batch_size', 12)  # Process 12 games at a time
+
+    def pick_batch(
+        self,
+        researcher_games: List[Dict[str, Any]],
+        modeler_games: List[Dict[str, Any]],
+        historical_performance: Optional[Dict[str, Any]],
+        batch_num: int,
+    ) -> List[Dict[str, Any]]:
+        """Select picks for one picker-sized group of games (extreme odds filtered out)"""
+        if not self.is_enabled():
+            return []
+        self.log_info(f"📦 Processing batch {batch_num} ({len(researcher_games)} games)")
+        result = self._process_batch_with_retry(
+            {"games": researcher_games}, {"game_models": modeler_games}, historical_performance, batch_num, max_retries=2
+        )
+        picks = result.get("candidate_picks", []) if result else []
+        if picks:
+            self.log_info(f"✅ Batch {batch_num} completed: {len(picks)} picks")
+        else:
+            self.log_warning(f"⚠️  Batch {batch_num} failed to generate picks")
+        return self._filter_extreme_odds(picks)
+
     def _merge_batch_picks(
         self,
         researcher_games: List[Dict[str, Any]],
@@ -115,7 +143,7 @@ class Picker(BaseAgent):
         # Batch processing: split games into smaller chunks to avoid huge prompts
         # Similar to Researcher (batch_size=5) and Modeler (batch_size=3)
         # Use larger batch size (10-15) since picks are simpler than research/modeling
-        batch_size = self.config.get('picker_batch_size', 12)  # Process 12 games at a time
+        batch_size = self.batch_size
         
         if num_games <= batch_size:
             result = self._process_batch(
@@ -153,17 +181,22 @@ class Picker(BaseAgent):
         """Process a batch of games with retry mechanism"""
         for attempt in range(max_retries + 1):
             try:
-                batch_result = self._process_batch(
-                    researcher_output,
-                    modeler_output,
-                    historical_performance,
-                    batch_num,
-                    1  # total_batches not needed for individual batch
-                )
+                with llm_batch_context(f"picker-{batch_num}"):
+                    batch_result = self._process_batch(
+                        researcher_output,
+                        modeler_output,
+                        historical_performance,
+                        batch_num,
+                        1  # total_batches not needed for individual batch
+                    )
                 if batch_result and len(batch_result.get("candidate_picks", [])) > 0:
                     return batch_result
                 elif attempt < max_retries:
                     self.log_warning(f"Batch {batch_num} attempt {attempt + 1} returned no picks, retrying...")
+            except LLMUnavailableError as e:
+                # LLMClient already retried the request; re-sending the batch would not help
+                self.log_error(f"Batch {batch_num} failed, LLM unavailable: {e}")
+                break
             except Exception as e:
                 if attempt < max_retries:
                     self.log_warning(f"Batch {batch_num} attempt {attempt + 1} failed: {e}, retrying...")
@@ -196,18 +229,31 @@ class Picker(BaseAgent):
         from src.agents.base import _make_json_serializable
 
         serializable_data = _make_json_serializable(input_data)
-        full_user_prompt = build_picker_user_prompt(historical_performance, serializable_data)
+        full_user_prompt = build_picker_user_prompt(
+            historical_performance, serializable_data, encoding=self.payload_encoding
+        )
+        if self.payload_encoding.compact:
+            self._record_payload_savings(
+                build_picker_user_prompt(historical_performance, serializable_data), full_user_prompt
+            )
         
         self.log_info(f"Calling LLM for batch {batch_num} ({num_games} games)")
         
         # Get usage stats before call
         usage_before = self.llm_client.get_usage_stats()
         
-        response = self.llm_client.call(
-            system_prompt=self.system_prompt,
-            user_prompt=full_user_prompt,
+        # Stream the picks: each one is parsed as it arrives, and a cut-off response keeps the
+        # complete picks instead of failing the whole batch
+        response = self.llm_client.call_streaming(
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": full_user_prompt},
+            ],
+            array_key="candidate_picks",
+            on_item=lambda pick: self.logger.debug(
+                f"🎯 Batch {batch_num}: pick received for game {pick.get('game_id', 'Unknown')}"
+            ),
             temperature=0.5,
-            parse_json=True,
             response_format=get_picker_schema(),
             max_tokens=8192  # Gemini max output tokens
         )
@@ -219,6 +265,11 @@ class Picker(BaseAgent):
              self.log_info(f"💰 Picker batch {batch_num} token usage: {tokens_used:,}")
         
         picks = response.get("candidate_picks", [])
+        if response.get("truncated"):
+            self.log_warning(
+                f"⚠️  Batch {batch_num}: response cut off ({response.get('parse_error')}), "
+                f"keeping {len(picks)} complete picks"
+            )
         
         # Validate batch results
         if len(picks) < num_games:
@@ -96,6 +96,29 @@ class President(BaseAgent):
         """Get system prompt for President"""
         return PRESIDENT_PROMPT
 
+    def _default_unit_picks(
+        self,
+        approved_picks: List[Dict[str, Any]],
+        candidate_picks: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Default 1.0-unit picks for candidates a cut-off President response never reached"""
+        reviewed = {str(p.get("game_id")) for p in approved_picks}
+        defaults = []
+        for pick in candidate_picks:
+            if str(pick.get("game_id")) in reviewed:
+                continue
+            default_pick = pick.copy()
+            default_pick["units"] = 1.0
+            default_pick["best_bet"] = False
+            default_pick["final_decision_reasoning"] = "President response cut off before this pick. Default unit assignment."
+            defaults.append(default_pick)
+        if defaults:
+            self.log_warning(
+                f"⚠️  President response cut off after {len(approved_picks)} picks; "
+                f"{len(defaults)} picks get default units"
+            )
+        return defaults
+    
     def _apply_pick_safeguards(
         self,
         approved_picks: List[Dict[str, Any]],
@@ -237,10 +260,13 @@ class President(BaseAgent):
                 input_data=input_data,
                 temperature=0.3,  # Low temperature for consistent, rational decisions
                 parse_json=True,
-                response_format=get_president_schema()
+                response_format=get_president_schema(),
+                stream_key="approved_picks"
             )
             
             approved_picks = response.get("approved_picks", [])
+            if response.get("truncated"):
+                approved_picks.extend(self._default_unit_picks(approved_picks, candidate_picks))
             daily_report_summary = response.get("daily_report_summary", {})
             self._apply_pick_safeguards(approved_picks, candidate_picks, minified_picks)
             daily_report_summary = self._finalize_daily_summary(approved_picks, daily_report_summary)
@@ -1,25 +1,29 @@
 """Researcher agent for data gathering and game insights"""
 
-from typing import List, Optional, Dict, Any, Set, Tuple
-from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Dict, Any, Set, Tuple
+from datetime import date, timedelta
 import json
 import hashlib
-from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.agents.base import BaseAgent
-from src.data.models import Game, GameInsight
+from src.data.cache_store import get_cache_store
+from src.data.models import BetType, Game, GameInsight
 from src.data.scrapers.games_scraper import GamesScraper
 from src.data.scrapers.lines_scraper import LinesScraper
 from src.data.storage import Database
-from src.prompts import RESEARCHER_PROMPT, build_researcher_final_prompt
+from src.prompts import RESEARCHER_PROMPT, build_researcher_final_prompt, compose_user_prompt
 from src.utils.logging import get_logger
+from src.utils.llm_retry import LLMUnavailableError
+from src.utils.llm_telemetry import llm_batch_context
 from src.utils.team_normalizer import are_teams_matching
 from src.utils.web_browser import WebBrowser, get_web_browser
 from src.utils.json_schemas import get_researcher_schema
 
 logger = get_logger("agents.researcher")
 
+CACHE_NAMESPACE = "researcher"
+
 
 class Researcher(BaseAgent):
     """Researcher agent for gathering game data and insights"""
@@ -32,88 +36,101 @@ class Researcher(BaseAgent):
         self.web_browser = get_web_browser()
         # Cache configuration
         self.cache_ttl = timedelta(hours=24)  # Cache for 24 hours (research is less time-sensitive than lines)
-        self.cache_file = Path("data/cache/researcher_cache.json")
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self.cache = self._load_cache()
+        self.cache = get_cache_store()
     
     def _get_system_prompt(self) -> str:
         """Get system prompt for Researcher"""
         return RESEARCHER_PROMPT
     
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache from file"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load researcher cache: {e}")
-        return {}
-    
-    def _save_cache(self) -> None:
-        """Save cache to file"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, default=str, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to save researcher cache: {e}")
+    def _game_key(self, game: Game) -> str:
+        """Stable identifier for a game in research input/output"""
+        return str(game.id) if game.id else f"{game.team1}_{game.team2}_{game.date}"
     
-    def _get_cache_key(self, games: List[Game], target_date: Optional[date]) -> str:
-        """Generate cache key based on games and date"""
-        # Create a stable key from game IDs and date
-        game_ids = sorted([g.id for g in games if g.id])
-        date_str = target_date.isoformat() if target_date else "none"
-        key_data = f"{date_str}_{'_'.join(map(str, game_ids))}"
-        # Use hash for shorter keys
-        return hashlib.md5(key_data.encode()).hexdigest()
+    def _input_fingerprint(self, game: Game, betting_lines: Optional[List]) -> str:
+        """
+        Hash of the inputs research for one game depends on
+        
+        Covers the matchup, the game's spread and total numbers and the KenPom stats for both
+        teams, so a spread/total move or stats refresh invalidates that game only. Prices (juice,
+        moneylines) are left out: they move all day without changing what research finds.
+        """
+        lines = sorted(
+            (line.book, line.bet_type.value, line.team or "", line.line)
+            for line in (betting_lines or [])
+            if line.game_id == game.id and line.bet_type in (BetType.SPREAD, BetType.TOTAL)
+        )
+        kenpom_stats = {}
+        kenpom_scraper = getattr(self.web_browser, 'kenpom_scraper', None) if self.web_browser else None
+        if kenpom_scraper:
+            for team_name in (game.team1, game.team2):
+                try:
+                    kenpom_stats[team_name] = kenpom_scraper.get_team_stats(team_name, target_date=game.date)
+                except Exception as e:
+                    logger.debug(f"KenPom lookup for fingerprint failed for {team_name}: {e}")
+        payload = {
+            "game": [self._game_key(game), game.team1_id, game.team2_id, game.team1, game.team2, game.venue],
+            "lines": lines,
+            "kenpom": kenpom_stats,
+        }
+        return hashlib.md5(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
     
-    def _is_cache_valid(self, cache_entry: Dict[str, Any], target_date: Optional[date]) -> bool:
-        """Check if cache entry is valid for the target date (ignores timestamp age)"""
-        try:
-            # Check if cache entry has a date field
-            cached_date_str = cache_entry.get('date')
-            if cached_date_str is None:
-                return False
-            
-            # Parse the cached date
-            if isinstance(cached_date_str, str):
-                cached_date = date.fromisoformat(cached_date_str)
-            else:
-                cached_date = cached_date_str
-            
-            # If target_date is provided, check if it matches
-            if target_date is not None:
-                return cached_date == target_date
-            else:
-                # If no target_date provided, check if cached date exists (any date is valid)
-                return cached_date is not None
-        except Exception:
-            return False
+    def _get_cache_key(self, game: Game, target_date: date) -> str:
+        """Per-game cache key (the input fingerprint is stored alongside the insight)"""
+        return f"{target_date.isoformat()}:{self._game_key(game)}"
     
-    def _get_cached_insights(self, games: List[Game], target_date: Optional[date]) -> Optional[Dict[str, Any]]:
-        """Get cached insights if available and valid for the target date"""
-        cache_key = self._get_cache_key(games, target_date)
-        cache_entry = self.cache.get(cache_key)
-        
-        if cache_entry and self._is_cache_valid(cache_entry, target_date):
-            cached_date = cache_entry.get('date', 'unknown')
-            logger.info(f"Using cached researcher insights for date {cached_date}")
-            return cache_entry.get('insights')
-        return None
+    def _get_cached_insights(
+        self,
+        games: List[Game],
+        target_date: Optional[date],
+        fingerprints: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Cached insights by game key for games whose input fingerprint is unchanged"""
+        if target_date is None:
+            return {}
+        cached = {}
+        for game in games:
+            game_key = self._game_key(game)
+            entry = self.cache.get(CACHE_NAMESPACE, self._get_cache_key(game, target_date))
+            if entry and entry.get('fingerprint') == fingerprints.get(game_key) and entry.get('insight'):
+                cached[game_key] = entry['insight']
+        if cached:
+            logger.info(f"Using cached researcher insights for {len(cached)}/{len(games)} games on {target_date}")
+        return cached
     
-    def _cache_insights(self, games: List[Game], target_date: Optional[date], insights: Dict[str, Any]) -> None:
-        """Cache insights for future use"""
-        cache_key = self._get_cache_key(games, target_date)
-        self.cache[cache_key] = {
-            'timestamp': datetime.now().isoformat(),
-            'insights': insights,
-            'game_count': len(games),
-            'date': target_date.isoformat() if target_date else None
-        }
-        self._save_cache()
-        logger.debug(f"Cached researcher insights for {len(games)} games")
+    def _cache_insights(
+        self,
+        games: List[Game],
+        target_date: Optional[date],
+        insights: Dict[str, Dict[str, Any]],
+        fingerprints: Dict[str, str]
+    ) -> None:
+        """Cache each researched game's insight under its own key"""
+        if target_date is None:
+            return
+        stored = 0
+        for game in games:
+            game_key = self._game_key(game)
+            insight = insights.get(game_key)
+            if insight is None:
+                continue
+            self.cache.set(
+                CACHE_NAMESPACE,
+                self._get_cache_key(game, target_date),
+                {'fingerprint': fingerprints.get(game_key), 'insight': insight},
+                ttl=self.cache_ttl,
+                cache_date=target_date,
+            )
+            stored += 1
+        logger.debug(f"Cached researcher insights for {stored} games")
     
-    def process(self, games: List[Game], target_date: Optional[date] = None, betting_lines: Optional[List] = None, force_refresh: bool = False) -> Dict[str, Any]:
+    def process(
+        self,
+        games: List[Game],
+        target_date: Optional[date] = None,
+        betting_lines: Optional[List] = None,
+        force_refresh: bool = False,
+        on_insights: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Research games and return insights using LLM with batch processing
         
@@ -122,6 +139,9 @@ class Researcher(BaseAgent):
             target_date: Target date for research
             betting_lines: Optional pre-scraped betting lines (to avoid duplicate scraping)
             force_refresh: Force refresh even if cached
+            on_insights: Called on the calling thread with each group of finished insights as soon as
+                it is available (cached games first, then each batch as it completes, then fallbacks),
+                so downstream stages can start before the whole slate is researched
             
         Returns:
             LLM response with game insights in JSON format
@@ -130,41 +150,50 @@ class Researcher(BaseAgent):
             self.log_warning("Researcher agent is disabled")
             return {"games": []}
         
-        # Check cache first (unless force_refresh is True)
-        if not force_refresh:
-            cached_insights = self._get_cached_insights(games, target_date)
-            if cached_insights:
-                self.log_info(f"Using cached research insights for {len(games)} games")
-                return cached_insights
-        
+        # Check the per-game cache first (unless force_refresh is True)
+        fingerprints = {self._game_key(game): self._input_fingerprint(game, betting_lines) for game in games}
+        cached_insights: Dict[str, Dict[str, Any]] = {}
         if force_refresh:
             self.log_info("🔄 Force refresh enabled - bypassing cache")
+        else:
+            cached_insights = self._get_cached_insights(games, target_date, fingerprints)
         
-        self.log_info(f"Researching {len(games)} games using LLM (batch processing)")
-        
+        games_to_research = [game for game in games if self._game_key(game) not in cached_insights]
+        if games and not games_to_research:
+            self.log_info(f"Using cached research insights for all {len(games)} games")
+        elif cached_insights:
+            self.log_info(
+                f"Using cached research insights for {len(cached_insights)} games, "
+                f"researching {len(games_to_research)} new or changed games using LLM (batch processing)"
+            )
+        else:
+            self.log_info(f"Researching {len(games)} games using LLM (batch processing)")
+
         # Batch processing: split games into smaller chunks for better reliability and token efficiency
         batch_size = 5  # Process 5 games at a time
-        all_insights = []
+        batches = [games_to_research[i:i + batch_size] for i in range(0, len(games_to_research), batch_size)]
+        all_insights = list(cached_insights.values())
         failed_batches = []
-        # Track which games have been processed
-        processed_game_ids = set()
-        
-        for i in range(0, len(games), batch_size):
-            batch_games = games[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(games) + batch_size - 1) // batch_size
-            
-            self.log_info(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch_games)} games)")
-            
-            # Process batch with retry
-            batch_insights = self._process_batch_with_retry(
-                batch_games, 
-                target_date, 
-                betting_lines, 
-                batch_num,
-                max_retries=2
-            )
-            
+        # Track which games have been processed (cached games count as processed)
+        processed_game_ids = set(cached_insights)
+        researched_insights: Dict[str, Dict[str, Any]] = {}
+
+        if on_insights and cached_insights:
+            on_insights(list(cached_insights.values()))
+
+        def on_batch(batch_insights: List[Dict[str, Any]]) -> None:
+            if batch_insights:
+                on_insights(batch_insights)
+
+        batch_results = (
+            self._run_batches(batches, target_date, betting_lines, on_batch if on_insights else None)
+            if batches else {}
+        )
+
+        # Merge in batch order so output is independent of completion order
+        for batch_num in range(1, len(batches) + 1):
+            batch_insights = batch_results.get(batch_num, [])
+
             if batch_insights and len(batch_insights) > 0:
                 all_insights.extend(batch_insights)
                 # Track which games were successfully processed
@@ -172,6 +201,7 @@ class Researcher(BaseAgent):
                     game_id = insight.get('game_id')
                     if game_id:
                         processed_game_ids.add(str(game_id))
+                        researched_insights[str(game_id)] = insight
                 self.log_info(f"✅ Batch {batch_num} completed: {len(batch_insights)} insights")
             else:
                 failed_batches.append(batch_num)
@@ -180,15 +210,23 @@ class Researcher(BaseAgent):
         # CRITICAL: Create fallback entries for any games that failed to process
         # This ensures ALL games are passed to the next agent, even if data is unavailable
         missing_games = []
+        fallback_insights = []
         for game in games:
-            game_id_str = str(game.id) if game.id else f"{game.team1}_{game.team2}_{game.date}"
+            game_id_str = self._game_key(game)
             if game_id_str not in processed_game_ids:
                 # Create fallback entry with minimal data
                 fallback_insight = self._create_fallback_insight(game, target_date, betting_lines)
-                all_insights.append(fallback_insight)
+                fallback_insights.append(fallback_insight)
                 missing_games.append(game_id_str)
                 self.log_warning(f"⚠️  Created fallback insight for game {game_id_str} (data unavailable)")
-        
+        all_insights.extend(fallback_insights)
+        if on_insights and fallback_insights:
+            on_insights(fallback_insights)
+
+        # Restore input game order (fallbacks included); unknown game_ids keep their relative order at the end
+        game_positions = {self._game_key(game): idx for idx, game in enumerate(games)}
+        all_insights.sort(key=lambda insight: game_positions.get(str(insight.get('game_id')), len(games)))
+
         # Combine all insights
         result = {"games": all_insights}
         
@@ -205,11 +243,65 @@ class Researcher(BaseAgent):
                 f"This should not happen - all games should have entries."
             )
         
-        # Cache the results (even if incomplete, to avoid re-processing successful batches)
-        self._cache_insights(games, target_date, result)
+        # Cache successfully researched games individually; fallbacks are retried on the next run
+        self._cache_insights(games_to_research, target_date, researched_insights, fingerprints)
         
         return result
-    
+
+    def _run_batches(
+        self,
+        batches: List[List[Game]],
+        target_date: Optional[date],
+        betting_lines: Optional[List],
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Run research batches, concurrently when agents.researcher.max_concurrent_batches > 1
+
+        Each batch keeps its own retry loop, so a slow or failing batch never holds up the others.
+        on_batch, if given, receives each batch's insights in completion order on the calling thread.
+
+        Returns:
+            Mapping of 1-based batch number to that batch's insights (empty list on failure)
+        """
+        total_batches = len(batches)
+        max_in_flight = max(1, int(self.config.get('max_concurrent_batches', 1) or 1))
+        max_in_flight = min(max_in_flight, total_batches) if total_batches else 1
+        results: Dict[int, List[Dict[str, Any]]] = {}
+
+        if max_in_flight <= 1:
+            for batch_num, batch_games in enumerate(batches, start=1):
+                self.log_info(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch_games)} games)")
+                results[batch_num] = self._process_batch_with_retry(
+                    batch_games, target_date, betting_lines, batch_num, max_retries=2
+                )
+                if on_batch:
+                    on_batch(results[batch_num])
+            return results
+
+        self.log_info(f"Running {total_batches} batches with up to {max_in_flight} in flight")
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            future_to_batch = {}
+            for batch_num, batch_games in enumerate(batches, start=1):
+                self.log_info(f"📦 Submitting batch {batch_num}/{total_batches} ({len(batch_games)} games)")
+                future = executor.submit(
+                    self._process_batch_with_retry,
+                    batch_games, target_date, betting_lines, batch_num, 2
+                )
+                future_to_batch[future] = batch_num
+
+            for future in as_completed(future_to_batch):
+                batch_num = future_to_batch[future]
+                try:
+                    results[batch_num] = future.result()
+                except Exception as e:
+                    self.log_error(f"❌ Batch {batch_num} raised outside retry loop: {e}")
+                    results[batch_num] = []
+                if on_batch:
+                    on_batch(results[batch_num])
+
+        return results
+
     def _process_batch_with_retry(
         self, 
         batch_games: List[Game], 
@@ -225,7 +317,8 @@ class Researcher(BaseAgent):
         
         for attempt in range(max_retries + 1):
             try:
-                batch_result, input_data = self._process_batch(batch_games, target_date, betting_lines)
+                with llm_batch_context(f"researcher-{batch_num}"):
+                    batch_result, input_data = self._process_batch(batch_games, target_date, betting_lines)
                 if input_data_for_logging is None:
                     input_data_for_logging = input_data
                 
@@ -250,6 +343,10 @@ class Researcher(BaseAgent):
                     else:
                         self.log_error(f"❌ Batch {batch_num} failed after {max_retries + 1} attempts")
                     
+            except LLMUnavailableError as e:
+                # LLMClient already retried the request; re-sending the batch would not help
+                self.log_error(f"❌ Batch {batch_num} failed, LLM unavailable: {e}")
+                break
             except Exception as e:
                 # Log after first failure to help debug
                 if not first_failure_logged:
@@ -464,7 +561,9 @@ class Researcher(BaseAgent):
         
         # Get user prompt from prompts file
         from src.prompts import RESEARCHER_BATCH_PROMPT
-        user_prompt = RESEARCHER_BATCH_PROMPT.format(num_games=len(games))
+        user_prompt = RESEARCHER_BATCH_PROMPT
+        # Per-batch details go after the static prompt so every batch shares a cacheable prefix
+        context = f"This batch has {len(games)} games."
         
         try:
             # First call: LLM may request web searches
@@ -472,7 +571,8 @@ class Researcher(BaseAgent):
                 user_prompt=user_prompt,
                 input_data=input_data,
                 tools=tools,
-                temperature=0.3
+                temperature=0.3,
+                context=context
             )
             
             # If LLM requested tool calls, execute them and call again
@@ -579,17 +679,18 @@ class Researcher(BaseAgent):
                         "content": result_str
                     })
                 
-                # Call LLM again with tool results using proper function calling format
-                # Add explicit instruction to return JSON (not use tools again)
-                final_prompt = build_researcher_final_prompt(user_prompt, len(games))
-                
+                # Call LLM again with tool results using proper function calling format.
+                # The first call's messages are resent unchanged (so they hit the prompt cache) and
+                # the explicit instruction to return JSON (not use tools again) follows the results.
                 response = self.call_llm_with_tool_results(
-                    initial_user_prompt=final_prompt,
+                    initial_user_prompt=user_prompt,
                     input_data=input_data,
                     assistant_message=assistant_message,
                     tool_messages=tool_messages,
                     tools=None,  # Don't allow additional tool calls after receiving results
-                    temperature=0.3
+                    temperature=0.3,
+                    context=context,
+                    follow_up_prompt=build_researcher_final_prompt()
                 )
             
             # Ensure we have games in the response
@@ -1062,20 +1163,15 @@ class Researcher(BaseAgent):
         user_prompt: str,
         input_data: Optional[Dict[str, Any]] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        context: Optional[str] = None
     ) -> Dict[str, Any]:
         """Call LLM with tool support"""
         if not self.system_prompt:
             raise ValueError(f"Agent {self.name} has no system prompt defined")
         
-        # Format user prompt with input data if provided
-        if input_data:
-            formatted_prompt = f"""{user_prompt}
-
-Input data:
-{json.dumps(input_data, indent=2)}"""
-        else:
-            formatted_prompt = user_prompt
+        # Static instructions first, then per-batch context and input data (cacheable prefix)
+        formatted_prompt = self.format_user_prompt(user_prompt, input_data or None, context)
         
         self.logger.debug(f"Calling LLM for {self.name} with tools")
         
@@ -1113,20 +1209,23 @@ Input data:
         assistant_message: Optional[Dict[str, Any]] = None,
         tool_messages: List[Dict[str, Any]] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        context: Optional[str] = None,
+        follow_up_prompt: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Call LLM with tool results (for function calling continuation)"""
+        """
+        Call LLM with tool results (for function calling continuation)
+        
+        initial_user_prompt, input_data and context must match the first call so the request
+        starts with the same bytes; follow_up_prompt is appended after the tool results.
+        """
         if not self.system_prompt:
             raise ValueError(f"Agent {self.name} has no system prompt defined")
         
-        # Format user prompt with input data if provided
-        if input_data:
-            formatted_prompt = f"""{initial_user_prompt}
-
-Input data:
-{json.dumps(input_data, indent=2)}"""
-        else:
-            formatted_prompt = initial_user_prompt
+        # Same encoding as the first call; savings were already counted there
+        formatted_prompt = compose_user_prompt(
+            initial_user_prompt, input_data or None, context, encoding=self.payload_encoding
+        )
         
         # Build messages array for function calling continuation
         messages = [
@@ -1141,6 +1240,9 @@ Input data:
         # Add tool result messages
         if tool_messages:
             messages.extend(tool_messages)
+        
+        if follow_up_prompt:
+            messages.append({"role": "user", "content": follow_up_prompt})
             
         self.logger.debug(f"Calling LLM for {self.name} with tool results")
         
@@ -8,11 +8,11 @@ from pathlib import Path
 
 from src.agents.base import BaseAgent
 from src.data.models import BetResult, BetType, GameStatus
-from src.data.storage import Database, BetModel, PickModel, GameModel, TeamModel
+from src.data.storage import Database, BetModel, BettingLineModel, PickModel, GameModel, TeamModel
 from src.data.scrapers.games_scraper import GamesScraper
-from sqlalchemy import func
+from sqlalchemy import insert, update
 from src.utils.logging import get_logger
-from src.utils.team_normalizer import normalize_team_name, get_team_name_variations, determine_home_away_from_result
+from src.utils.team_normalizer import normalize_team_name, get_team_name_variations, determine_home_away_from_team_names
 
 logger = get_logger("agents.results_processor")
 
@@ -77,7 +77,7 @@ class ResultsProcessor(BaseAgent):
             session = self.db.get_session()
             try:
                 picks = session.query(PickModel).filter(
-                    func.date(PickModel.created_at) == yesterday
+                    PickModel.pick_date == yesterday
                 ).all()
                 
                 if picks:
@@ -91,12 +91,10 @@ class ResultsProcessor(BaseAgent):
                             self.logger.debug(f"Could not extract ID from pick object: {e}")
                             continue
                     
-                    all_settled = True
-                    for pick_id in pick_ids:
-                        bet = session.query(BetModel).filter_by(pick_id=pick_id).first()
-                        if bet and bet.result == BetResult.PENDING:
-                            all_settled = False
-                            break
+                    all_settled = session.query(BetModel.id).filter(
+                        BetModel.pick_id.in_(pick_ids),
+                        BetModel.result == BetResult.PENDING
+                    ).first() is None
                     
                     if all_settled and len(picks) > 0:
                         self.log_info(f"All bets for {yesterday} already settled, calculating stats from existing data")
@@ -115,8 +113,12 @@ class ResultsProcessor(BaseAgent):
         session = self.db.get_session()
         try:
             saved_count = 0
+            games = {
+                game.id: game
+                for game in session.query(GameModel).filter(GameModel.id.in_(list(games_with_results))).all()
+            }
             for game_id, result_data in games_with_results.items():
-                game = session.query(GameModel).filter_by(id=game_id).first()
+                game = games.get(game_id)
                 if game and result_data.get("result"):
                     # Only update if result doesn't exist or is different
                     if not game.result or game.result != result_data["result"]:
@@ -194,63 +196,26 @@ class ResultsProcessor(BaseAgent):
         
         try:
             # Query database games directly by date and get their IDs
-            # Use team references if available, otherwise fall back to old columns
-            try:
-                db_games = session.query(
-                    GameModel.id,
-                    GameModel.team1_id,
-                    GameModel.team2_id,
-                    GameModel.result
-                ).filter(
-                    func.date(GameModel.date) == game_date
-                ).all()
-                # Convert team IDs to names for backwards compatibility
-                from src.data.storage import TeamModel
-                team_map = {}
-                for game_id, team1_id, team2_id, result in db_games:
-                    if team1_id and team1_id not in team_map:
-                        team = session.query(TeamModel).filter_by(id=team1_id).first()
-                        if team:
-                            team_map[team1_id] = team.normalized_team_name
-                    if team2_id and team2_id not in team_map:
-                        team = session.query(TeamModel).filter_by(id=team2_id).first()
-                        if team:
-                            team_map[team2_id] = team.normalized_team_name
-                
-                # Convert to format expected by rest of code
-                db_games = [
-                    (game_id, team_map.get(team1_id, ''), team_map.get(team2_id, ''), result)
-                    for game_id, team1_id, team2_id, result in db_games
-                ]
-            except Exception:
-                # Fallback: query with team relationships
-                from src.data.storage import TeamModel
-                db_games = session.query(
-                    GameModel.id,
-                    GameModel.team1_id,
-                    GameModel.team2_id,
-                    GameModel.result
-                ).filter(
-                    func.date(GameModel.date) == game_date
-                ).all()
-                
-                # Convert team IDs to names
-                team_map = {}
-                for game_id, team1_id, team2_id, result in db_games:
-                    if team1_id and team1_id not in team_map:
-                        team = session.query(TeamModel).filter_by(id=team1_id).first()
-                        if team:
-                            team_map[team1_id] = team.normalized_team_name
-                    if team2_id and team2_id not in team_map:
-                        team = session.query(TeamModel).filter_by(id=team2_id).first()
-                        if team:
-                            team_map[team2_id] = team.normalized_team_name
-                
-                # Convert to format expected by rest of code
-                db_games = [
-                    (game_id, team_map.get(team1_id, ''), team_map.get(team2_id, ''), result)
-                    for game_id, team1_id, team2_id, result in db_games
-                ]
+            db_games = session.query(
+                GameModel.id,
+                GameModel.team1_id,
+                GameModel.team2_id,
+                GameModel.result
+            ).filter(
+                GameModel.date == game_date
+            ).all()
+            
+            # Convert team IDs to names for backwards compatibility (one query for all teams)
+            team_ids = {team_id for _, team1_id, team2_id, _ in db_games for team_id in (team1_id, team2_id) if team_id}
+            team_map = dict(
+                session.query(TeamModel.id, TeamModel.normalized_team_name).filter(TeamModel.id.in_(team_ids)).all()
+            )
+            
+            # Convert to format expected by rest of code
+            db_games = [
+                (game_id, team_map.get(team1_id, ''), team_map.get(team2_id, ''), result)
+                for game_id, team1_id, team2_id, result in db_games
+            ]
             
             self.log_info(f"Found {len(db_games)} games in database for {game_date}")
             
@@ -274,7 +239,9 @@ class ResultsProcessor(BaseAgent):
             
             # Match scraped games to database games by team names
             # Normalize team names for matching since ESPN uses raw names and database uses normalized names
-            from src.utils.team_normalizer import normalize_team_name, are_teams_matching
+            from src.utils.team_normalizer import normalize_team_name
+            from src.utils.team_resolver import get_team_resolver
+            resolver = get_team_resolver()
             
             # Build a list of scraped games with normalized team names for matching
             scraped_games_normalized = []
@@ -292,6 +259,12 @@ class ResultsProcessor(BaseAgent):
                             "result": scraped_game.result
                         })
             
+            # Index scraped games by canonical (team1, team2) so each database game is an O(1) lookup
+            scraped_by_pair = {}
+            for scraped in scraped_games_normalized:
+                pair = (resolver.canonical(scraped["team1"]), resolver.canonical(scraped["team2"]))
+                scraped_by_pair.setdefault(pair, scraped)
+            
             self.log_info(f"Found {len(scraped_games_normalized)} final games from ESPN with results for matching")
             
             # For each database game, use existing result or match with scraped result
@@ -323,18 +296,27 @@ class ResultsProcessor(BaseAgent):
                     scraped_result = None
                     matched_scraped = None
                     is_reverse_match = False
-                    for scraped in scraped_games_normalized:
-                        # Check if teams match (in either order)
-                        teams_match_forward = (are_teams_matching(norm_db_team1, scraped["norm_team1"]) and
-                                             are_teams_matching(norm_db_team2, scraped["norm_team2"]))
-                        teams_match_reverse = (are_teams_matching(norm_db_team1, scraped["norm_team2"]) and
-                                             are_teams_matching(norm_db_team2, scraped["norm_team1"]))
-                        
-                        if teams_match_forward or teams_match_reverse:
-                            scraped_result = scraped["result"]
-                            matched_scraped = scraped
-                            is_reverse_match = teams_match_reverse
-                            break
+                    db_key1, db_key2 = resolver.canonical(team1), resolver.canonical(team2)
+                    if (db_key1, db_key2) in scraped_by_pair:
+                        matched_scraped = scraped_by_pair[(db_key1, db_key2)]
+                    elif (db_key2, db_key1) in scraped_by_pair:
+                        matched_scraped = scraped_by_pair[(db_key2, db_key1)]
+                        is_reverse_match = True
+                    else:
+                        # Unresolved by canonical key: fall back to pairwise matching
+                        for scraped in scraped_games_normalized:
+                            # Check if teams match (in either order)
+                            teams_match_forward = (resolver.same_team(norm_db_team1, scraped["norm_team1"]) and
+                                                 resolver.same_team(norm_db_team2, scraped["norm_team2"]))
+                            teams_match_reverse = (resolver.same_team(norm_db_team1, scraped["norm_team2"]) and
+                                                 resolver.same_team(norm_db_team2, scraped["norm_team1"]))
+                            
+                            if teams_match_forward or teams_match_reverse:
+                                matched_scraped = scraped
+                                is_reverse_match = teams_match_reverse
+                                break
+                    if matched_scraped is not None:
+                        scraped_result = matched_scraped["result"]
                     
                     if scraped_result:
                         # If teams matched in reverse order, swap home/away scores and team names
@@ -381,14 +363,20 @@ class ResultsProcessor(BaseAgent):
     
     def _determine_bet_result_from_team_id(
         self,
-        pick_game_id: int,
+        game_teams: Optional[Tuple[int, int]],
         pick_bet_type,
         pick_line: float,
         pick_team_id: Optional[int],
         game_result: Dict[str, Any],
-        session
+        team_names: Dict[int, str]
     ) -> Optional[BetResult]:
-        """Determine bet result using team_id (simpler and more reliable)"""
+        """
+        Determine bet result using team_id (simpler and more reliable)
+        
+        Args:
+            game_teams: (team1_id, team2_id) of the pick's game, or None if the game is unknown
+            team_names: normalized_team_name by team id, preloaded by _load_settlement_data
+        """
         if not pick_team_id:
             return None  # Can't determine without team_id
         
@@ -404,15 +392,15 @@ class ResultsProcessor(BaseAgent):
         home_team_name = result_data.get("home_team", "")
         away_team_name = result_data.get("away_team", "")
         
-        # Get game to determine which team is home/away
-        from src.data.storage import GameModel, TeamModel
-        game = session.query(GameModel).filter_by(id=pick_game_id).first()
-        if not game:
+        if not game_teams:
+            return None
+        team1_id, team2_id = game_teams
+        if team1_id not in team_names or team2_id not in team_names:
             return None
         
         # Determine which database team is home/away using utility function
-        home_away_result = determine_home_away_from_result(
-            game.team1_id, game.team2_id, result_data, session
+        home_away_result = determine_home_away_from_team_names(
+            team1_id, team2_id, team_names[team1_id], team_names[team2_id], result_data
         )
         
         if home_away_result is None:
@@ -422,10 +410,10 @@ class ResultsProcessor(BaseAgent):
         team1_is_home, team2_is_home = home_away_result
         
         # Determine if pick_team_id is home or away
-        if game.team1_id == pick_team_id:
+        if team1_id == pick_team_id:
             pick_team_is_home = team1_is_home
             pick_team_is_away = not team1_is_home
-        elif game.team2_id == pick_team_id:
+        elif team2_id == pick_team_id:
             pick_team_is_home = team2_is_home
             pick_team_is_away = not team2_is_home
         else:
@@ -510,7 +498,7 @@ class ResultsProcessor(BaseAgent):
                 PickModel.book,
                 PickModel.selection_text
             ).filter(
-                func.date(PickModel.created_at) == pick_date
+                PickModel.pick_date == pick_date
             ).all()
             
             picks_data = []
@@ -557,6 +545,11 @@ class ResultsProcessor(BaseAgent):
                     "selection_text": selection_text or ""
                 })
         
+        # Load every bet, game, team and total line the picks need in one query each
+        bets, game_teams, team_names, total_lines = self._load_settlement_data(session, picks_data)
+        new_bets: Dict[int, Dict[str, Any]] = {}  # pick_id -> BetModel row to insert
+        bet_updates: List[Dict[str, Any]] = []  # BetModel rows (by id) to update
+        
         # Now process picks using extracted data (no longer need pick objects)
         for pick_data in picks_data:
             pick_id = pick_data["id"]
@@ -569,21 +562,19 @@ class ResultsProcessor(BaseAgent):
             pick_selection_text = pick_data.get("selection_text", "")
             
             # Get or create bet record for this pick
-            bet = session.query(BetModel).filter_by(pick_id=pick_id).first()
+            bet = bets.get(pick_id)
             if not bet:
                 # Create bet record for picks that don't have one yet
                 # This allows us to track all picks, not just "placed" ones
-                bet = BetModel(
-                    pick_id=pick_id,
-                    placed_at=datetime.now(),
-                    result=BetResult.PENDING
-                )
-                session.add(bet)
-                session.flush()  # Flush to get the bet ID
+                new_bets[pick_id] = {
+                    "pick_id": pick_id,
+                    "placed_at": datetime.now(),
+                    "result": BetResult.PENDING
+                }
             
             # Allow re-settlement if bet was previously settled (in case of logic fixes)
             # This allows fixing incorrectly settled bets when logic is updated
-            was_already_settled = bet.result != BetResult.PENDING
+            was_already_settled = bet is not None and bet[1] != BetResult.PENDING
             
             # Get game result
             game_result = games_with_results.get(pick_game_id)
@@ -598,7 +589,6 @@ class ResultsProcessor(BaseAgent):
             
             if pick_bet_type == BetType.TOTAL:
                 # CRITICAL: Look up betting line from database - this is the ONLY source of truth
-                from src.data.storage import BettingLineModel
                 pick_book = pick_data.get("book", "").lower() if pick_data.get("book") else ""
                 
                 if not pick_book:
@@ -633,16 +623,11 @@ class ResultsProcessor(BaseAgent):
                     continue
                 
                 # Match betting line by game_id, bet_type, book, AND direction
-                betting_line = session.query(BettingLineModel).filter(
-                    BettingLineModel.game_id == pick_game_id,
-                    BettingLineModel.bet_type == BetType.TOTAL,
-                    BettingLineModel.book == pick_book,
-                    BettingLineModel.team == expected_direction
-                ).first()
+                betting_line = total_lines.get((pick_game_id, pick_book, expected_direction))
                 
-                if betting_line:
-                    actual_line = betting_line.line
-                    betting_line_team = betting_line.team
+                if betting_line is not None:
+                    actual_line = betting_line
+                    betting_line_team = expected_direction
                 else:
                     # Fall back to pick data when no matching betting line is stored
                     actual_line = pick_line
@@ -704,15 +689,11 @@ class ResultsProcessor(BaseAgent):
                     continue
             else:
                 # For spread/moneyline, use team_id (REQUIRED)
+                game = game_teams.get(pick_game_id)
                 if not pick_team_id:
-                    game = session.query(GameModel).filter_by(id=pick_game_id).first()
                     if game:
-                        if pick_line < 0:
-                            pick_team_id = game.team1_id
-                        elif pick_line > 0:
-                            pick_team_id = game.team2_id
-                        else:
-                            pick_team_id = game.team1_id
+                        team1_id, team2_id = game
+                        pick_team_id = team2_id if pick_line > 0 else team1_id
                     if not pick_team_id:
                         self.log_error(
                             f"Cannot settle {pick_bet_type.value} bet for pick {pick_id} (game_id={pick_game_id}): "
@@ -722,23 +703,19 @@ class ResultsProcessor(BaseAgent):
                         continue
                 
                 bet_result = self._determine_bet_result_from_team_id(
-                    pick_game_id, pick_bet_type, actual_line, pick_team_id, game_result, session
+                    game, pick_bet_type, actual_line, pick_team_id, game_result, team_names
                 )
                 
                 if not bet_result:
                     # This means team_id doesn't match game teams - data integrity issue
-                    game = session.query(GameModel).filter_by(id=pick_game_id).first()
-                    pick_team = session.query(TeamModel).filter_by(id=pick_team_id).first()
-                    game_team1 = session.query(TeamModel).filter_by(id=game.team1_id).first() if game else None
-                    game_team2 = session.query(TeamModel).filter_by(id=game.team2_id).first() if game else None
-                    
+                    team1_id, team2_id = game if game else (None, None)
                     self.log_error(
                         f"Cannot settle {pick_bet_type.value} bet for pick {pick_id} (game_id={pick_game_id}): "
-                        f"Pick team_id={pick_team_id} ({pick_team.normalized_team_name if pick_team else 'Unknown'}) "
-                        f"does not match game teams (team1_id={game.team1_id if game else None} "
-                        f"({game_team1.normalized_team_name if game_team1 else 'Unknown'}), "
-                        f"team2_id={game.team2_id if game else None} "
-                        f"({game_team2.normalized_team_name if game_team2 else 'Unknown'})). "
+                        f"Pick team_id={pick_team_id} ({team_names.get(pick_team_id, 'Unknown')}) "
+                        f"does not match game teams (team1_id={team1_id} "
+                        f"({team_names.get(team1_id, 'Unknown')}), "
+                        f"team2_id={team2_id} "
+                        f"({team_names.get(team2_id, 'Unknown')})). "
                         f"This is a DATA INTEGRITY ERROR. Pick must be fixed before it can be graded. Skipping."
                     )
                     no_bet_result_count += 1
@@ -755,10 +732,16 @@ class ResultsProcessor(BaseAgent):
                 pick_stake_amount, pick_odds, bet_result
             )
             
-            bet.result = bet_result
-            bet.payout = payout
-            bet.profit_loss = profit_loss
-            bet.settled_at = datetime.now()
+            settlement = {
+                "result": bet_result,
+                "payout": payout,
+                "profit_loss": profit_loss,
+                "settled_at": datetime.now()
+            }
+            if bet:
+                bet_updates.append({"id": bet[0], **settlement})
+            else:
+                new_bets[pick_id].update(settlement)
             
             if was_already_settled:
                 re_settled_count += 1
@@ -783,9 +766,59 @@ class ResultsProcessor(BaseAgent):
             f"{no_bet_result_count} could not determine result"
         )
         
+        # Write every bet change in one bulk INSERT and one bulk UPDATE
+        if new_bets:
+            session.execute(insert(BetModel), list(new_bets.values()))
+        if bet_updates:
+            session.execute(update(BetModel), bet_updates)
         session.commit()
         return settled_count
     
+    def _load_settlement_data(
+        self,
+        session,
+        picks_data: List[Dict[str, Any]]
+    ) -> Tuple[Dict[int, Tuple[int, BetResult]], Dict[int, Tuple[int, int]], Dict[int, str], Dict[Tuple[int, str, str], float]]:
+        """
+        Bulk-load everything _settle_bets needs for a set of picks
+        
+        Returns:
+            Tuple of:
+            - bets: pick_id -> (bet_id, result)
+            - game_teams: game_id -> (team1_id, team2_id)
+            - team_names: team_id -> normalized_team_name (game teams and picked teams)
+            - total_lines: (game_id, book, "over"/"under") -> total line
+        """
+        pick_ids = [p["id"] for p in picks_data]
+        game_ids = {p["game_id"] for p in picks_data}
+        
+        bets = {
+            pick_id: (bet_id, result)
+            for bet_id, pick_id, result in session.query(
+                BetModel.id, BetModel.pick_id, BetModel.result
+            ).filter(BetModel.pick_id.in_(pick_ids)).all()
+        }
+        game_teams = {
+            game_id: (team1_id, team2_id)
+            for game_id, team1_id, team2_id in session.query(
+                GameModel.id, GameModel.team1_id, GameModel.team2_id
+            ).filter(GameModel.id.in_(game_ids)).all()
+        }
+        team_ids = {t for teams in game_teams.values() for t in teams} | {p["team_id"] for p in picks_data if p["team_id"]}
+        team_names = dict(
+            session.query(TeamModel.id, TeamModel.normalized_team_name).filter(TeamModel.id.in_(team_ids)).all()
+        )
+        total_lines = {
+            (game_id, book, team): line
+            for game_id, book, team, line in session.query(
+                BettingLineModel.game_id, BettingLineModel.book, BettingLineModel.team, BettingLineModel.line
+            ).filter(
+                BettingLineModel.game_id.in_(game_ids),
+                BettingLineModel.bet_type == BetType.TOTAL
+            ).all()
+        }
+        return bets, game_teams, team_names, total_lines
+    
     
     def _calculate_payout_from_attrs(
         self, 
@@ -877,6 +910,14 @@ class ResultsProcessor(BaseAgent):
                     unit_value = stake_amount / stake_units
                     break
         
+        # Load all bets for these picks in one query
+        bet_map = {
+            pick_id: (result, profit_loss)
+            for pick_id, result, profit_loss in session.query(
+                BetModel.pick_id, BetModel.result, BetModel.profit_loss
+            ).filter(BetModel.pick_id.in_(pick_ids)).all()
+        } if pick_ids else {}
+        
         # Now process picks using extracted data
         for pick_data in picks_data:
             pick_id = pick_data["id"]
@@ -886,17 +927,18 @@ class ResultsProcessor(BaseAgent):
             total_wagered_units += stake_units
             total_wagered_dollars += stake_dollars
             
-            bet = session.query(BetModel).filter_by(pick_id=pick_id).first()
+            bet = bet_map.get(pick_id)
             if bet:
-                if bet.result == BetResult.WIN:
+                result, profit_loss = bet
+                if result == BetResult.WIN:
                     wins += 1
-                    total_profit_loss_dollars += bet.profit_loss
-                    total_profit_loss_units += bet.profit_loss / unit_value if unit_value > 0 else 0
-                elif bet.result == BetResult.LOSS:
+                    total_profit_loss_dollars += profit_loss
+                    total_profit_loss_units += profit_loss / unit_value if unit_value > 0 else 0
+                elif result == BetResult.LOSS:
                     losses += 1
-                    total_profit_loss_dollars += bet.profit_loss
-                    total_profit_loss_units += bet.profit_loss / unit_value if unit_value > 0 else 0
-                elif bet.result == BetResult.PUSH:
+                    total_profit_loss_dollars += profit_loss
+                    total_profit_loss_units += profit_loss / unit_value if unit_value > 0 else 0
+                elif result == BetResult.PUSH:
                     pushes += 1
         
         # Calculate accuracy (wins / (wins + losses), excluding pushes)
@@ -0,0 +1,211 @@
+"""Background writer for AgentLogModel rows"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.utils.logging import get_logger
+
+logger = get_logger("data.agent_log_sink")
+
+
+class _FlushRequest:
+    """Queue marker asking the writer thread to write everything received so far"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AgentLogSink:
+    """
+    Queue-backed sink that bulk-inserts agent log rows from a single writer thread.
+
+    Agents call submit() on the hot path, which never touches the database. The writer
+    drains the queue and inserts a batch every `batch_size` rows or `flush_interval_ms`
+    milliseconds, whichever comes first. When the queue is full, new rows are dropped
+    and counted rather than blocking the pipeline.
+    """
+
+    label = "Agent log"
+    thread_name = "agent-log-sink"
+
+    def __init__(
+        self,
+        engine,
+        batch_size: int = 100,
+        flush_interval_ms: int = 500,
+        max_queue_size: int = 10000
+    ):
+        """
+        Initialize sink and start the writer thread
+
+        Args:
+            engine: SQLAlchemy engine to write to
+            batch_size: Rows per bulk insert
+            flush_interval_ms: Maximum time a row waits in memory before being written
+            max_queue_size: Bound on queued rows; rows beyond this are dropped
+        """
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue_size))
+        self._stats_lock = threading.Lock()
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, agent_name: str, action: str, data: Optional[Dict[str, Any]] = None,
+               timestamp: Optional[datetime] = None) -> bool:
+        """
+        Queue a log row for writing
+
+        Returns:
+            True if queued, False if dropped (sink closed or queue full)
+        """
+        return self._enqueue({
+            "agent_name": agent_name,
+            "timestamp": timestamp or datetime.now(),
+            "action": action,
+            "data_json": data,
+        })
+
+    def _enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a row without blocking; False if the sink is closed or the queue is full"""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+                dropped = self._dropped
+            # Warn on 1, 2, 4, 8... drops to avoid flooding the log during a burst
+            if dropped & (dropped - 1) == 0:
+                logger.warning(f"{self.label} queue full, dropped {dropped} row(s) so far")
+            return False
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Block until every row submitted before this call has been written
+
+        Returns:
+            True if the writer confirmed the flush within the timeout
+        """
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush pending rows and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"{self.label} queue still full at shutdown; pending rows may be lost")
+            return
+        self._thread.join(timeout)
+        stats = self.get_stats()
+        if stats["dropped"] or stats["failed"]:
+            logger.warning(
+                f"{self.label} sink closed: {stats['written']} written, "
+                f"{stats['dropped']} dropped (queue full), {stats['failed']} failed"
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get written/dropped/failed counters and current queue depth"""
+        with self._stats_lock:
+            return {
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "queued": self._queue.qsize(),
+            }
+
+    @property
+    def dropped_count(self) -> int:
+        """Number of rows dropped because the queue was full"""
+        with self._stats_lock:
+            return self._dropped
+
+    def _run(self) -> None:
+        """Writer loop: accumulate rows and bulk insert on size or time"""
+        pending: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None:
+                # Flush interval elapsed
+                self._write(pending)
+                pending = []
+                deadline = None
+            elif item is _STOP:
+                self._write(pending)
+                return
+            elif isinstance(item, _FlushRequest):
+                self._write(pending)
+                pending = []
+                deadline = None
+                item.done.set()
+            else:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) >= self.batch_size:
+                    self._write(pending)
+                    pending = []
+                    deadline = None
+
+    def _table(self):
+        """Table rows are inserted into"""
+        from src.data.storage import AgentLogModel
+        return AgentLogModel.__table__
+
+    def _prepare(self, rows: List[Dict[str, Any]]) -> None:
+        """Make rows insertable in place before a batch is written"""
+        for row in rows:
+            # Round-trip through JSON so one non-serializable payload can't fail the whole batch
+            if row["data_json"] is not None:
+                try:
+                    row["data_json"] = json.loads(json.dumps(row["data_json"], default=str))
+                except (TypeError, ValueError):
+                    row["data_json"] = {"unserializable": str(row["data_json"])[:1000]}
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert a batch of rows in one transaction"""
+        if not rows:
+            return
+        self._prepare(rows)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self._table().insert(), rows)
+            with self._stats_lock:
+                self._written += len(rows)
+        except Exception as e:
+            with self._stats_lock:
+                self._failed += len(rows)
+            logger.error(f"Failed to write {len(rows)} {self.label.lower()} rows: {e}")
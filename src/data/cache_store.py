@@ -0,0 +1,229 @@
+"""Keyed SQLite cache shared by agents and scrapers"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from src.utils.config import config
+from src.utils.logging import get_logger
+
+logger = get_logger("data.cache_store")
+
+DEFAULT_CACHE_PATH = "data/cache/cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    cache_date TEXT,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_namespace_date ON cache_entries (namespace, cache_date);
+"""
+
+TTL = Union[timedelta, float, int, None]
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its bookkeeping columns"""
+    value: Any
+    created_at: datetime
+    expires_at: Optional[datetime]
+    cache_date: Optional[date]
+
+
+def _ttl_seconds(ttl: TTL) -> Optional[float]:
+    if ttl is None:
+        return None
+    if isinstance(ttl, timedelta):
+        return ttl.total_seconds()
+    return float(ttl)
+
+
+def _date_str(value: Optional[Union[date, str]]) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+class CacheStore:
+    """
+    Namespaced key/value cache backed by one SQLite table.
+
+    Each entry is one row, so reads and writes touch only the entry involved instead of
+    rewriting a whole JSON file. Entries can carry a TTL (expires_at) and the date they
+    describe (cache_date), which is what evict_before() uses to drop old slates.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, retention_days: Optional[int] = None):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite file path (":memory:" for a private in-memory cache)
+            retention_days: Evict entries whose cache_date is older than this many days on open
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # One connection shared across threads; all access goes through self._lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        expired = self.evict_expired()
+        old = 0
+        if retention_days is not None:
+            old = self.evict_before(date.today() - timedelta(days=retention_days))
+        if expired or old:
+            logger.debug(f"Evicted {expired} expired and {old} old cache entries")
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        entry = self.get_entry(namespace, key)
+        return default if entry is None else entry.value
+
+    def get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry with its metadata, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, expires_at, cache_date FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at, expires_at, cache_date = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(namespace, key)
+            return None
+        try:
+            decoded = json.loads(value)
+        except ValueError as e:
+            logger.warning(f"Dropping unreadable cache entry {namespace}/{key}: {e}")
+            self.delete(namespace, key)
+            return None
+        return CacheEntry(
+            value=decoded,
+            created_at=datetime.fromtimestamp(created_at),
+            expires_at=datetime.fromtimestamp(expires_at) if expires_at is not None else None,
+            cache_date=date.fromisoformat(cache_date) if cache_date else None,
+        )
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: TTL = None,
+        cache_date: Optional[Union[date, str]] = None,
+    ) -> None:
+        """
+        Insert or replace one entry
+
+        Args:
+            namespace: Cache owner (e.g. "researcher", "lines")
+            key: Entry key within the namespace
+            value: JSON-serializable value (non-JSON types are stored via str())
+            ttl: Time to live (timedelta or seconds); None never expires
+            cache_date: Date the entry describes, used for date-based eviction
+        """
+        now = time.time()
+        seconds = _ttl_seconds(ttl)
+        payload = json.dumps(value, default=str, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, created_at, expires_at, cache_date) VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, payload, now, now + seconds if seconds is not None else None,
+                 _date_str(cache_date)),
+            )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Delete one entry; True if it existed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+        return cursor.rowcount > 0
+
+    def keys(self, namespace: str) -> List[str]:
+        """Unexpired keys in a namespace"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM cache_entries WHERE namespace = ? "
+                "AND (expires_at IS NULL OR expires_at > ?) ORDER BY key",
+                (namespace, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def evict_expired(self) -> int:
+        """Delete entries past their TTL; returns the number removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def evict_before(self, cutoff: Union[date, str], namespace: Optional[str] = None) -> int:
+        """Delete entries whose cache_date is before cutoff; returns the number removed"""
+        sql = "DELETE FROM cache_entries WHERE cache_date IS NOT NULL AND cache_date < ?"
+        params: list = [_date_str(cutoff)]
+        if namespace is not None:
+            sql += " AND namespace = ?"
+            params.append(namespace)
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        return cursor.rowcount
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Delete every entry (or every entry in one namespace)"""
+        with self._lock:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM cache_entries")
+            else:
+                cursor = self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[CacheStore] = None
+_store_lock = threading.Lock()
+
+
+def get_cache_store() -> CacheStore:
+    """Process-wide CacheStore configured from the `cache` config section"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                cache_config = config.get('cache', {}) or {}
+                _store = CacheStore(
+                    cache_config.get('path', DEFAULT_CACHE_PATH),
+                    retention_days=cache_config.get('retention_days', 7),
+                )
+    return _store
+
+
+def set_cache_store(store: Optional[CacheStore]) -> None:
+    """Replace the process-wide CacheStore (None resets to lazy creation from config)"""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,26 @@
+"""Background writer for LLMCallModel rows"""
+
+from typing import Any, Dict, List
+
+from src.data.agent_log_sink import AgentLogSink
+
+
+class LLMCallSink(AgentLogSink):
+    """
+    AgentLogSink for the llm_calls telemetry table: one row per provider call, queued from
+    the LLM client and bulk-inserted by the writer thread so recording never blocks a call.
+    """
+
+    label = "LLM call"
+    thread_name = "llm-call-sink"
+
+    def record(self, row: Dict[str, Any]) -> bool:
+        """Queue an llm_calls row (see src.utils.llm_telemetry.record_llm_call)"""
+        return self._enqueue(row)
+
+    def _table(self):
+        from src.data.storage import LLMCallModel
+        return LLMCallModel.__table__
+
+    def _prepare(self, rows: List[Dict[str, Any]]) -> None:
+        pass
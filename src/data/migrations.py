@@ -0,0 +1,330 @@
+"""
+Versioned schema migrations.
+
+The schema_version table records every migration applied to a database; its highest version is the
+schema's version. Opening a Database is a single SELECT of that version. Only when it is behind
+MIGRATIONS does the runner create missing tables and apply the pending steps, each in its own
+transaction together with its schema_version row, so every step runs exactly once.
+
+To change the schema, update the model in storage.py and append a Migration that brings existing
+databases to it. Steps run on SQLite and PostgreSQL: render column types from the models and branch
+on conn.dialect.name where the two need different DDL. Fresh databases are created from the models
+and stamped at the latest version. Steps may meet databases migrated by the old per-startup
+inspection, so they check before altering. Steps change the schema only: a step that needs rows
+deleted first refuses to run, and the cleanup is an explicit call (scripts/migrate_schema.py).
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import MetaData, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateTable
+
+from src.data.storage import Base, BettingLineModel, GameModel, PickModel, PredictionModel, SchemaVersionModel
+from src.utils.logging import get_logger
+
+logger = get_logger("data.migrations")
+
+
+class MigrationError(RuntimeError):
+    """A schema migration step failed; its transaction was rolled back"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema change; apply runs inside the transaction that records version"""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _columns(conn: Connection, table: str) -> Dict[str, dict]:
+    return {col['name']: col for col in inspect(conn).get_columns(table)}
+
+
+def add_column_ddl(dialect: Dialect, table: Table, name: str, default: Any = None) -> str:
+    """ALTER TABLE ... ADD COLUMN for a model column, with its type and default rendered for dialect"""
+    column_type = table.c[name].type
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type.compile(dialect=dialect)}"
+    if default is not None:
+        ddl += f" DEFAULT {column_type.literal_processor(dialect)(default)}"
+    return ddl
+
+
+def _add_missing_columns(conn: Connection, table: Table, columns: Dict[str, Any]):
+    """Add each name -> default column of the model that is not already on the table"""
+    existing = _columns(conn, table.name)
+    for name, default in columns.items():
+        if name not in existing:
+            conn.execute(text(add_column_ddl(conn.dialect, table, name, default)))
+            logger.info(f"✅ Added '{name}' column to {table.name} table")
+
+
+def _date_of(conn: Connection, column: str) -> str:
+    # SQLite stores datetimes as text, where CAST(... AS DATE) would yield the year as a number
+    if conn.dialect.name == 'sqlite':
+        return f"DATE({column})"
+    return f"CAST({column} AS DATE)"
+
+
+def _backfill_dates(conn: Connection, table: str, column: str) -> int:
+    """
+    Set column to the day of created_at on rows that lack it; returns how many were filled
+
+    (game_id, column) is unique, so only the newest undated row per game and day is filled, and
+    only when no row already holds that day. Older legacy duplicates keep a NULL date (the unique
+    index exempts them) and are reported rather than deleted.
+    """
+    day = _date_of(conn, f"{table}.created_at")
+    filled = conn.execute(text(
+        f"UPDATE {table} SET {column} = {day} "
+        f"WHERE {column} IS NULL AND created_at IS NOT NULL "
+        f"AND id IN (SELECT MAX(id) FROM {table} WHERE {column} IS NULL AND created_at IS NOT NULL "
+        f"GROUP BY game_id, {_date_of(conn, 'created_at')}) "
+        f"AND NOT EXISTS (SELECT 1 FROM {table} AS dated WHERE dated.game_id = {table}.game_id "
+        f"AND dated.{column} = {day})"
+    )).rowcount
+    conflicts = conn.execute(text(
+        f"SELECT COUNT(*) FROM {table} WHERE {column} IS NULL AND created_at IS NOT NULL"
+    )).scalar()
+    if conflicts:
+        logger.warning(
+            f"⚠️  {conflicts} {table} rows left without {column}: another row already holds that game and day"
+        )
+    return filled
+
+
+def _rebuild_table(conn: Connection, table: Table, where: Optional[str] = None):
+    """
+    Recreate table from its model and copy the rows across (optionally only those matching where).
+
+    For SQLite, which cannot drop columns or change NOT NULL in place. The copy is built under a new name and
+    renamed over the original, so foreign keys in other tables still point at it.
+    """
+    scratch = MetaData()
+    for other in Base.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(scratch)
+    new_table = table.to_metadata(scratch, name=f"{table.name}_new")
+
+    shared = [name for name in _columns(conn, table.name) if name in table.c]
+    column_list = ", ".join(shared)
+    conn.execute(CreateTable(new_table))
+    conn.execute(text(
+        f"INSERT INTO {new_table.name} ({column_list}) SELECT {column_list} FROM {table.name}"
+        + (f" WHERE {where}" if where else "")
+    ))
+    conn.execute(text(f"DROP TABLE {table.name}"))
+    conn.execute(text(f"ALTER TABLE {new_table.name} RENAME TO {table.name}"))
+    for index in table.indexes:
+        index.create(conn)
+
+
+def _add_game_line_and_pick_columns(conn: Connection):
+    _add_missing_columns(conn, GameModel.__table__, {'game_time_est': None})
+    _add_missing_columns(conn, BettingLineModel.__table__, {'team': None})
+    _add_missing_columns(conn, PickModel.__table__, {
+        'favorite': False,
+        'confidence_score': 5,
+        'best_bet': False,
+        'selection_text': None,
+    })
+
+
+def _add_pick_and_prediction_dates(conn: Connection):
+    for table, column in (('picks', 'pick_date'), ('predictions', 'prediction_date')):
+        if column not in _columns(conn, table):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} DATE"))
+            _backfill_dates(conn, table, column)
+            logger.info(f"✅ Added '{column}' column to {table} table")
+
+
+def _add_one_per_game_per_day_indexes(conn: Connection):
+    for table, column, name in (
+        ('picks', 'pick_date', 'uq_picks_game_date'),
+        ('predictions', 'prediction_date', 'uq_predictions_game_date'),
+    ):
+        inspector = inspect(conn)
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        existing |= {uc['name'] for uc in inspector.get_unique_constraints(table)}
+        if name not in existing:
+            # Partial unique index: rows without a date (pre-migration) are exempt
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX {name} ON {table}(game_id, {column}) WHERE {column} IS NOT NULL"
+            ))
+            logger.info(f"✅ Added unique index {name} on {table} (game_id, {column})")
+
+
+def _make_ev_estimate_nullable(conn: Connection):
+    # Was scripts/migrate_make_ev_estimate_nullable.py
+    if not _columns(conn, 'predictions')['ev_estimate']['nullable']:
+        if conn.dialect.name == 'sqlite':
+            _rebuild_table(conn, PredictionModel.__table__)
+        else:
+            conn.execute(text("ALTER TABLE predictions ALTER COLUMN ev_estimate DROP NOT NULL"))
+        logger.info("✅ Made predictions.ev_estimate nullable")
+
+
+GAMES_WITHOUT_TEAM_IDS = "team1_id IS NULL OR team2_id IS NULL"
+
+
+def delete_games_without_team_ids(engine: Engine) -> int:
+    """
+    Delete games that predate the teams table and never got team ids; returns how many.
+
+    Destructive, so it is never part of migrate(): run it (scripts/migrate_schema.py
+    --delete-games-without-team-ids) when migration 5 reports such games and they cannot be
+    given ids by scripts/migrate_to_teams_table.py.
+    """
+    with _transaction(engine) as conn:
+        deleted = conn.execute(text(f"DELETE FROM games WHERE {GAMES_WITHOUT_TEAM_IDS}")).rowcount
+    logger.warning(f"Deleted {deleted} games without team ids")
+    return deleted
+
+
+def _drop_legacy_game_team_names(conn: Connection):
+    # Was scripts/migrate_remove_team_columns.py, which silently dropped games without team ids
+    if 'team1' in _columns(conn, 'games'):
+        orphaned = conn.execute(text(f"SELECT COUNT(*) FROM games WHERE {GAMES_WITHOUT_TEAM_IDS}")).scalar()
+        if orphaned:
+            raise MigrationError(
+                f"{orphaned} games have no team ids; assign them with scripts/migrate_to_teams_table.py "
+                f"or delete them with scripts/migrate_schema.py --delete-games-without-team-ids"
+            )
+        if conn.dialect.name == 'sqlite':
+            _rebuild_table(conn, GameModel.__table__)
+        else:
+            conn.execute(text("ALTER TABLE games DROP COLUMN team1, DROP COLUMN team2"))
+        logger.info("✅ Removed team1/team2 columns from games table")
+
+
+def _backfill_pick_date_and_add_indexes(conn: Connection):
+    backfilled = _backfill_dates(conn, 'picks', 'pick_date')
+    if backfilled:
+        logger.info(f"✅ Backfilled pick_date on {backfilled} picks")
+    # create_all only builds indexes for new tables; add any the models gained to existing ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# Rows the betting line upsert key would reject: all but the newest line per game, book, type and team
+# (NULL teams never conflict on a unique key)
+DUPLICATE_BETTING_LINES = (
+    "team IS NOT NULL AND id NOT IN "
+    "(SELECT MAX(id) FROM betting_lines WHERE team IS NOT NULL GROUP BY game_id, book, bet_type, team)"
+)
+
+
+def delete_duplicate_betting_lines(engine: Engine) -> int:
+    """
+    Keep only the newest betting line per (game_id, book, bet_type, team); returns how many were deleted.
+
+    Destructive, so it is never part of migrate(): run it (scripts/migrate_schema.py
+    --delete-duplicate-betting-lines) when migration 7 reports duplicate lines.
+    """
+    with _transaction(engine) as conn:
+        deleted = conn.execute(text(f"DELETE FROM betting_lines WHERE {DUPLICATE_BETTING_LINES}")).rowcount
+    logger.warning(f"Deleted {deleted} duplicate betting lines")
+    return deleted
+
+
+def _add_betting_line_upsert_key(conn: Connection):
+    # save_lines upserts ON CONFLICT (game_id, book, bet_type, team); tables that predate the team
+    # column lack the unique constraint that target needs
+    key = ['game_id', 'book', 'bet_type', 'team']
+    inspector = inspect(conn)
+    unique_keys = [uc['column_names'] for uc in inspector.get_unique_constraints('betting_lines')]
+    unique_keys += [ix['column_names'] for ix in inspector.get_indexes('betting_lines') if ix['unique']]
+    if any(sorted(columns) == sorted(key) for columns in unique_keys):
+        return
+    duplicates = conn.execute(text(f"SELECT COUNT(*) FROM betting_lines WHERE {DUPLICATE_BETTING_LINES}")).scalar()
+    if duplicates:
+        raise MigrationError(
+            f"{duplicates} duplicate betting lines share a (game_id, book, bet_type, team) key; keep only the "
+            f"newest of each with scripts/migrate_schema.py --delete-duplicate-betting-lines"
+        )
+    conn.execute(text(
+        "CREATE UNIQUE INDEX uq_betting_lines_game_book_type_team ON betting_lines(game_id, book, bet_type, team)"
+    ))
+    logger.info("✅ Added unique index on betting_lines (game_id, book, bet_type, team)")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Add games.game_time_est, betting_lines.team and pick flag columns", _add_game_line_and_pick_columns),
+    Migration(2, "Add picks.pick_date and predictions.prediction_date", _add_pick_and_prediction_dates),
+    Migration(3, "Unique (game_id, date) indexes on picks and predictions", _add_one_per_game_per_day_indexes),
+    Migration(4, "Make predictions.ev_estimate nullable", _make_ev_estimate_nullable),
+    Migration(5, "Drop legacy games.team1/team2 columns", _drop_legacy_game_team_names),
+    Migration(6, "Backfill picks.pick_date and add date-range indexes", _backfill_pick_date_and_add_indexes),
+    Migration(7, "Unique (game_id, book, bet_type, team) key for betting line upserts", _add_betting_line_upsert_key),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> Optional[int]:
+    """Highest applied migration, or None if the database predates schema_version (or is empty)"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(SchemaVersionModel.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+@contextmanager
+def _transaction(engine: Engine) -> Iterator[Connection]:
+    with engine.begin() as conn:
+        if conn.dialect.name == 'sqlite':
+            # pysqlite only opens a transaction before DML; start it here so DDL rolls back too
+            conn.exec_driver_sql("BEGIN")
+        yield conn
+
+
+def _record(conn: Connection, version: int, description: str):
+    conn.execute(SchemaVersionModel.__table__.insert().values(
+        version=version, description=description, applied_at=datetime.now()
+    ))
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Bring the database up to LATEST_VERSION and return the version it ends at.
+
+    A step that fails is rolled back and raises MigrationError, leaving the database at the
+    last step that succeeded; the failed step is retried the next time migrate runs.
+    """
+    version = current_version(engine)
+    if version == LATEST_VERSION:
+        return version
+    if version is not None and version > LATEST_VERSION:
+        logger.warning(f"Database schema is at version {version}, newer than this code ({LATEST_VERSION})")
+        return version
+
+    is_new = version is None and not inspect(engine).get_table_names()
+    Base.metadata.create_all(engine)
+    if is_new:
+        with _transaction(engine) as conn:
+            _record(conn, LATEST_VERSION, "Created from models")
+        logger.info(f"Created database schema at version {LATEST_VERSION}")
+        return LATEST_VERSION
+
+    version = version or 0
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        try:
+            with _transaction(engine) as conn:
+                migration.apply(conn)
+                _record(conn, migration.version, migration.description)
+        except Exception as e:
+            message = f"Schema migration {migration.version} ({migration.description}) failed: {e}"
+            logger.error(f"{message} (database left at version {version})")
+            raise MigrationError(message) from e
+        version = migration.version
+        logger.info(f"Applied schema migration {version}: {migration.description}")
+    return version
@@ -10,6 +10,7 @@ from pathlib import Path
 from datetime import date, datetime, timedelta
 from urllib.parse import urljoin
 
+from src.data.cache_store import get_cache_store
 from src.utils.logging import get_logger
 from src.utils.config import config
 from src.utils.team_normalizer import (
@@ -22,6 +23,10 @@ from src.prompts import kenpom_match_prompts
 
 logger = get_logger("scrapers.kenpom")
 
+CACHE_NAMESPACE = "kenpom"
+FOUR_FACTORS_NAMESPACE = "kenpom_four_factors"
+TEAMS_CACHE_KEY = "teams"
+
 
 class KenPomScraper:
     """Scraper for KenPom.com with authentication support"""
@@ -46,11 +51,13 @@ class KenPomScraper:
         # Cache configuration
         self.cache_dir = Path("data/cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_file = self.cache_dir / "kenpom_cache.json"
+        self.cache_file = self.cache_dir / "kenpom_cache.json"  # Legacy JSON cache, imported once
         self.cache_ttl = timedelta(hours=24)  # Cache for 24 hours
+        self.cache = get_cache_store()
         self._team_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_date: Optional[date] = None
-        # Four Factors cache: maps team name -> {four_factors: {...}, cache_date: date}
+        # Four Factors read-through cache: maps team name -> {four_factors: {...}, cache_date: date}
+        # Entries are loaded from the cache store on first lookup and written one team at a time
         self._four_factors_cache: Dict[str, Dict[str, Any]] = {}
         
         # Track suspicious AdjD/AdjO parsing warnings
@@ -168,33 +175,42 @@ class KenPomScraper:
         return positive_count >= 2
     
     def _load_cache(self) -> None:
-        """Load cached team data from file"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                    self._team_cache = cache_data.get('teams', {})
-                    cache_date_str = cache_data.get('cache_date')
-                    if cache_date_str:
-                        self._cache_date = date.fromisoformat(cache_date_str)
-                    # Load Four Factors cache
-                    self._four_factors_cache = cache_data.get('four_factors', {})
-                    # Convert cache_date strings to date objects
-                    for team_name, team_data in self._four_factors_cache.items():
-                        if 'cache_date' in team_data and isinstance(team_data['cache_date'], str):
-                            try:
-                                team_data['cache_date'] = date.fromisoformat(team_data['cache_date'])
-                            except (ValueError, TypeError):
-                                pass
-                    logger.info(f"Loaded KenPom cache with {len(self._team_cache)} teams (cached on {self._cache_date}), {len(self._four_factors_cache)} Four Factors entries")
-            except Exception as e:
-                logger.warning(f"Failed to load KenPom cache: {e}")
-                self._team_cache = {}
-                self._cache_date = None
-                self._four_factors_cache = {}
+        """Load the cached homepage team data (Four Factors are read lazily per team)"""
+        try:
+            entry = self.cache.get_entry(CACHE_NAMESPACE, TEAMS_CACHE_KEY)
+            if entry is None and self.cache_file.exists():
+                self._import_legacy_cache()
+                entry = self.cache.get_entry(CACHE_NAMESPACE, TEAMS_CACHE_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to load KenPom cache: {e}")
+            entry = None
+        if entry is None:
+            self._team_cache = {}
+            self._cache_date = None
+            return
+        self._team_cache = entry.value or {}
+        self._cache_date = entry.cache_date
+        logger.info(f"Loaded KenPom cache with {len(self._team_cache)} teams (cached on {self._cache_date})")
+    
+    def _import_legacy_cache(self) -> None:
+        """Copy a kenpom_cache.json file from older versions into an empty cache store"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache_data = json.load(f)
+            cache_date = cache_data.get('cache_date')
+            teams = cache_data.get('teams', {})
+            if teams and cache_date:
+                self.cache.set(CACHE_NAMESPACE, TEAMS_CACHE_KEY, teams, cache_date=cache_date)
+            for team_name, team_data in cache_data.get('four_factors', {}).items():
+                if team_data.get('four_factors') and team_data.get('cache_date'):
+                    self.cache.set(FOUR_FACTORS_NAMESPACE, team_name, team_data['four_factors'],
+                                   cache_date=team_data['cache_date'])
+            logger.info(f"Imported legacy KenPom cache with {len(teams)} teams from {self.cache_file}")
+        except Exception as e:
+            logger.warning(f"Failed to import legacy KenPom cache: {e}")
     
     def _save_cache(self, target_date: Optional[date] = None) -> None:
-        """Save team data to cache file for a specific date
+        """Save homepage team data to the cache store for a specific date
         
         Args:
             target_date: Date to save cache for (defaults to today)
@@ -203,27 +219,40 @@ class KenPomScraper:
             target_date = date.today()
         
         try:
-            # Only store one day's data at a time - overwrite previous cache
-            # Convert four_factors cache dates to strings for JSON serialization
-            four_factors_for_save = {}
-            for team_name, team_data in self._four_factors_cache.items():
-                team_data_copy = team_data.copy()
-                if 'cache_date' in team_data_copy and isinstance(team_data_copy['cache_date'], date):
-                    team_data_copy['cache_date'] = team_data_copy['cache_date'].isoformat()
-                four_factors_for_save[team_name] = team_data_copy
-            
-            cache_data = {
-                'cache_date': target_date.isoformat(),
-                'teams': self._team_cache,
-                'four_factors': four_factors_for_save
+            # Only keep one day's data - overwrite the teams entry and drop older Four Factors
+            self.cache.set(CACHE_NAMESPACE, TEAMS_CACHE_KEY, self._team_cache, cache_date=target_date)
+            self.cache.evict_before(target_date, namespace=FOUR_FACTORS_NAMESPACE)
+            self._four_factors_cache = {
+                key: data for key, data in self._four_factors_cache.items()
+                if data.get('cache_date') == target_date
             }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
             self._cache_date = target_date
-            logger.info(f"Saved KenPom cache with {len(self._team_cache)} teams and {len(self._four_factors_cache)} Four Factors entries for {target_date}")
+            logger.info(f"Saved KenPom cache with {len(self._team_cache)} teams for {target_date}")
         except Exception as e:
             logger.error(f"Failed to save KenPom cache: {e}")
     
+    def _get_cached_four_factors(self, key: str) -> Optional[Dict[str, Any]]:
+        """Four Factors cache entry for one team, reading through to the cache store"""
+        cached_data = self._four_factors_cache.get(key)
+        if cached_data is None:
+            entry = self.cache.get_entry(FOUR_FACTORS_NAMESPACE, key)
+            if entry is None:
+                return None
+            cached_data = {'four_factors': entry.value, 'cache_date': entry.cache_date}
+            self._four_factors_cache[key] = cached_data
+        return cached_data
+    
+    def _cache_four_factors(self, key: str, four_factors: Dict[str, Any], target_date: date) -> None:
+        """Store one team's Four Factors"""
+        self._four_factors_cache[key] = {
+            'four_factors': four_factors,
+            'cache_date': target_date
+        }
+        try:
+            self.cache.set(FOUR_FACTORS_NAMESPACE, key, four_factors, cache_date=target_date)
+        except Exception as e:
+            logger.error(f"Failed to save KenPom Four Factors cache: {e}")
+    
     def _is_cache_for_date(self, target_date: date) -> bool:
         """Check if cache is for the specified date"""
         if not self._cache_date:
@@ -895,8 +924,8 @@ class KenPomScraper:
         # Check cache - try canonical_name first, then normalized
         cache_key = None
         for key in [canonical_name, normalized]:
-            if key in self._four_factors_cache:
-                cached_data = self._four_factors_cache[key]
+            cached_data = self._get_cached_four_factors(key)
+            if cached_data is not None:
                 cached_date = cached_data.get('cache_date')
                 if isinstance(cached_date, str):
                     try:
@@ -929,11 +958,7 @@ class KenPomScraper:
             
             if four_factors:
                 # Cache the result
-                self._four_factors_cache[cache_key] = {
-                    'four_factors': four_factors,
-                    'cache_date': target_date
-                }
-                self._save_cache(target_date)
+                self._cache_four_factors(cache_key, four_factors, target_date)
                 logger.info(f"✓ Cached Four Factors for {team_name}")
                 return four_factors
             else:
@@ -7,17 +7,19 @@ from bs4 import BeautifulSoup
 import time
 import hashlib
 import os
-import json
-from pathlib import Path
 import pytz
 
+from src.data.cache_store import get_cache_store
 from src.data.models import BettingLine, BetType, Game
 from src.utils.logging import get_logger
 from src.utils.config import config
-from src.utils.team_normalizer import normalize_team_name, are_teams_matching, remove_mascot_from_team_name
+from src.utils.team_normalizer import normalize_team_name, remove_mascot_from_team_name
+from src.utils.team_resolver import get_team_resolver
 
 logger = get_logger("scrapers.lines")
 
+CACHE_NAMESPACE = "lines"
+
 
 class LinesScraper:
     """Scraper for betting lines"""
@@ -29,52 +31,23 @@ class LinesScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.team_resolver = get_team_resolver()
         # Cache configuration
         self.cache_ttl = timedelta(hours=1)  # Cache for 1 hour
-        self.cache_file = Path("data/cache/lines_cache.json")
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self.cache = self._load_cache()
-    
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache from file"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load cache: {e}")
-        return {}
-    
-    def _save_cache(self) -> None:
-        """Save cache to file"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, default=str)
-        except Exception as e:
-            logger.warning(f"Failed to save cache: {e}")
+        self.cache = get_cache_store()
     
     def _get_cache_key(self, book: str, game_date: date) -> str:
         """Generate cache key for book and date"""
         return f"{book}_{game_date.isoformat()}"
     
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Check if cache entry is still valid (less than 1 hour old)"""
-        try:
-            cached_time = datetime.fromisoformat(cache_entry.get('timestamp', ''))
-            age = datetime.now() - cached_time
-            return age < self.cache_ttl
-        except Exception as e:
-            logger.debug(f"Invalid cache timestamp format: {e}")
-            return False
-    
     def _get_cached_lines(self, book: str, game_date: date) -> Optional[List[Dict[str, Any]]]:
         """Get cached lines if available and valid"""
         cache_key = self._get_cache_key(book, game_date)
-        cache_entry = self.cache.get(cache_key)
+        cache_entry = self.cache.get_entry(CACHE_NAMESPACE, cache_key)
         
-        if cache_entry and self._is_cache_valid(cache_entry):
-            logger.info(f"Using cached lines for {book} on {game_date} (age: {datetime.now() - datetime.fromisoformat(cache_entry['timestamp'])})")
-            return cache_entry.get('lines', [])
+        if cache_entry:
+            logger.info(f"Using cached lines for {book} on {game_date} (age: {datetime.now() - cache_entry.created_at})")
+            return cache_entry.value or []
         return None
     
     def _cache_lines(self, book: str, game_date: date, lines: List[BettingLine]) -> None:
@@ -94,11 +67,7 @@ class LinesScraper:
             for line in lines
         ]
         
-        self.cache[cache_key] = {
-            'timestamp': datetime.now().isoformat(),
-            'lines': lines_dict
-        }
-        self._save_cache()
+        self.cache.set(CACHE_NAMESPACE, cache_key, lines_dict, ttl=self.cache_ttl, cache_date=game_date)
         logger.debug(f"Cached {len(lines)} lines for {book} on {game_date}")
     
     def _convert_cached_lines_to_objects(self, cached_lines: List[Dict[str, Any]], games: List[Game]) -> List[BettingLine]:
@@ -135,10 +104,14 @@ class LinesScraper:
         
         return lines
     
-    def scrape_lines(self, games: List[Game]) -> List[BettingLine]:
+    def scrape_lines(self, games: List[Game], use_cache: bool = True) -> List[BettingLine]:
         """Scrape betting lines for given games
         
         Uses DraftKings as primary source, FanDuel as fallback for games without DraftKings lines.
+        
+        Args:
+            games: Games to scrape lines for
+            use_cache: If False, skip cached lines and fetch fresh ones (results are still cached)
         """
         if not games:
             return []
@@ -165,7 +138,7 @@ class LinesScraper:
                 for source in primary_sources:
                     for game_date in game_dates:
                         # Check cache first
-                        cached_lines_data = self._get_cached_lines(source, game_date)
+                        cached_lines_data = self._get_cached_lines(source, game_date) if use_cache else None
                         if cached_lines_data:
                             # Convert cached data to BettingLine objects
                             cached_lines = self._convert_cached_lines_to_objects(cached_lines_data, games)
@@ -217,7 +190,7 @@ class LinesScraper:
                                     continue
                                 
                                 # Check cache first
-                                cached_lines_data = self._get_cached_lines(source, game_date)
+                                cached_lines_data = self._get_cached_lines(source, game_date) if use_cache else None
                                 if cached_lines_data:
                                     # Convert cached data to BettingLine objects
                                     cached_lines = self._convert_cached_lines_to_objects(cached_lines_data, games_for_date)
@@ -397,6 +370,13 @@ class LinesScraper:
             all_lines = []
             games_for_date = [g for g in games if g.date == game_date]
             
+            # Index games by their (unordered) canonical team pair so each event is an O(1) lookup
+            canonical = self.team_resolver.canonical
+            games_by_pair = {}
+            for game in games_for_date:
+                games_by_pair.setdefault(frozenset((canonical(game.team1), canonical(game.team2))), game)
+            slate_teams = [team for game in games_for_date for team in (game.team1, game.team2)]
+            
             for event in data:
                 # STEP 1: Extract raw team names from API
                 raw_home_team = event.get('home_team', '').strip()
@@ -406,12 +386,21 @@ class LinesScraper:
                 event_home_team = normalize_team_name(raw_home_team, for_matching=True) if raw_home_team else ''
                 event_away_team = normalize_team_name(raw_away_team, for_matching=True) if raw_away_team else ''
                 
-                # STEP 3: Find matching game using normalized names (normalized_name -> database lookup)
+                # STEP 3: Find matching game - canonical pair lookup first, full scan only for unresolved events
                 matched_game = None
-                for game in games_for_date:
-                    if self._matches_game(event, game.team1, game.team2):
-                        matched_game = game
-                        break
+                if raw_home_team and raw_away_team:
+                    matched_game = games_by_pair.get(frozenset((canonical(raw_home_team), canonical(raw_away_team))))
+                    if matched_game is None:
+                        # Unfamiliar spellings: snap each name to a slate team (pairwise rules, then fuzzy)
+                        home = self.team_resolver.resolve(raw_home_team, slate_teams)
+                        away = self.team_resolver.resolve(raw_away_team, slate_teams)
+                        if home and away:
+                            matched_game = games_by_pair.get(frozenset((canonical(home), canonical(away))))
+                if matched_game is None:
+                    for game in games_for_date:
+                        if self._matches_game(event, game.team1, game.team2):
+                            matched_game = game
+                            break
                 
                 if not matched_game:
                     continue
@@ -425,14 +414,14 @@ class LinesScraper:
                 
                 if event_home_team and event_away_team:
                     # Use centralized normalization for matching
-                    if are_teams_matching(event_home_team, matched_game.team1):
+                    if self.team_resolver.same_team(event_home_team, matched_game.team1):
                         home_team_mapped = matched_game.team1
-                    elif are_teams_matching(event_home_team, matched_game.team2):
+                    elif self.team_resolver.same_team(event_home_team, matched_game.team2):
                         home_team_mapped = matched_game.team2
                     
-                    if are_teams_matching(event_away_team, matched_game.team1):
+                    if self.team_resolver.same_team(event_away_team, matched_game.team1):
                         away_team_mapped = matched_game.team1
-                    elif are_teams_matching(event_away_team, matched_game.team2):
+                    elif self.team_resolver.same_team(event_away_team, matched_game.team2):
                         away_team_mapped = matched_game.team2
                 
                 # Extract bookmaker data
@@ -456,13 +445,13 @@ class LinesScraper:
                                 normalized_team_name = normalize_team_name(raw_team_name, for_matching=True) if raw_team_name else ''
                                 team_name = None
                                 if normalized_team_name:
-                                    if are_teams_matching(normalized_team_name, matched_game.team1):
+                                    if self.team_resolver.same_team(normalized_team_name, matched_game.team1):
                                         team_name = matched_game.team1
-                                    elif are_teams_matching(normalized_team_name, matched_game.team2):
+                                    elif self.team_resolver.same_team(normalized_team_name, matched_game.team2):
                                         team_name = matched_game.team2
-                                    elif are_teams_matching(normalized_team_name, event_home_team) and home_team_mapped:
+                                    elif self.team_resolver.same_team(normalized_team_name, event_home_team) and home_team_mapped:
                                         team_name = home_team_mapped
-                                    elif are_teams_matching(normalized_team_name, event_away_team) and away_team_mapped:
+                                    elif self.team_resolver.same_team(normalized_team_name, event_away_team) and away_team_mapped:
                                         team_name = away_team_mapped
                                 spread_outcomes.append({
                                     'line_value': line_value,
@@ -529,15 +518,15 @@ class LinesScraper:
                                 team_name = None
                                 if normalized_team_name:
                                     # Use normalized name for matching
-                                    if are_teams_matching(normalized_team_name, matched_game.team1):
+                                    if self.team_resolver.same_team(normalized_team_name, matched_game.team1):
                                         team_name = matched_game.team1
-                                    elif are_teams_matching(normalized_team_name, matched_game.team2):
+                                    elif self.team_resolver.same_team(normalized_team_name, matched_game.team2):
                                         team_name = matched_game.team2
                                     else:
                                         # If can't match, try using mapped home/away teams
-                                        if are_teams_matching(normalized_team_name, event_home_team) and home_team_mapped:
+                                        if self.team_resolver.same_team(normalized_team_name, event_home_team) and home_team_mapped:
                                             team_name = home_team_mapped
-                                        elif are_teams_matching(normalized_team_name, event_away_team) and away_team_mapped:
+                                        elif self.team_resolver.same_team(normalized_team_name, event_away_team) and away_team_mapped:
                                             team_name = away_team_mapped
                                 
                                 # Do not infer team from odds (favorite can be home or away).
@@ -640,14 +629,14 @@ class LinesScraper:
                 
                 if event_home_team and event_away_team:
                     # Use normalized names for matching
-                    if are_teams_matching(event_home_team, game.team1):
+                    if self.team_resolver.same_team(event_home_team, game.team1):
                         home_team_mapped = game.team1
-                    elif are_teams_matching(event_home_team, game.team2):
+                    elif self.team_resolver.same_team(event_home_team, game.team2):
                         home_team_mapped = game.team2
                     
-                    if are_teams_matching(event_away_team, game.team1):
+                    if self.team_resolver.same_team(event_away_team, game.team1):
                         away_team_mapped = game.team1
-                    elif are_teams_matching(event_away_team, game.team2):
+                    elif self.team_resolver.same_team(event_away_team, game.team2):
                         away_team_mapped = game.team2
                 
                 # Extract bookmaker data
@@ -661,7 +650,7 @@ class LinesScraper:
                         
                         if market_key == 'spreads':
                             # Spread bets: match each outcome to a team by normalized name only (no fallbacks).
-                            # Outcome names and event home/away are normalized; matching is via are_teams_matching.
+                            # Outcome names and event home/away are normalized; matching is via the team resolver.
                             spread_outcomes = []
                             for outcome in market.get('outcomes', []):
                                 line_value = outcome.get('point', 0)
@@ -670,13 +659,13 @@ class LinesScraper:
                                 normalized_team_name = normalize_team_name(raw_team_name, for_matching=True) if raw_team_name else ''
                                 team_name = None
                                 if normalized_team_name:
-                                    if are_teams_matching(normalized_team_name, game.team1):
+                                    if self.team_resolver.same_team(normalized_team_name, game.team1):
                                         team_name = game.team1
-                                    elif are_teams_matching(normalized_team_name, game.team2):
+                                    elif self.team_resolver.same_team(normalized_team_name, game.team2):
                                         team_name = game.team2
-                                    elif are_teams_matching(normalized_team_name, event_home_team) and home_team_mapped:
+                                    elif self.team_resolver.same_team(normalized_team_name, event_home_team) and home_team_mapped:
                                         team_name = home_team_mapped
-                                    elif are_teams_matching(normalized_team_name, event_away_team) and away_team_mapped:
+                                    elif self.team_resolver.same_team(normalized_team_name, event_away_team) and away_team_mapped:
                                         team_name = away_team_mapped
                                 spread_outcomes.append({
                                     'line_value': line_value,
@@ -743,15 +732,15 @@ class LinesScraper:
                                 team_name = None
                                 if normalized_team_name:
                                     # Use normalized name for matching
-                                    if are_teams_matching(normalized_team_name, game.team1):
+                                    if self.team_resolver.same_team(normalized_team_name, game.team1):
                                         team_name = game.team1
-                                    elif are_teams_matching(normalized_team_name, game.team2):
+                                    elif self.team_resolver.same_team(normalized_team_name, game.team2):
                                         team_name = game.team2
                                     else:
                                         # If can't match, try using mapped home/away teams
-                                        if are_teams_matching(normalized_team_name, event_home_team) and home_team_mapped:
+                                        if self.team_resolver.same_team(normalized_team_name, event_home_team) and home_team_mapped:
                                             team_name = home_team_mapped
-                                        elif are_teams_matching(normalized_team_name, event_away_team) and away_team_mapped:
+                                        elif self.team_resolver.same_team(normalized_team_name, event_away_team) and away_team_mapped:
                                             team_name = away_team_mapped
                                 
                                 # Do not infer team from odds (favorite can be home or away).
@@ -796,10 +785,10 @@ class LinesScraper:
             
             # Use centralized normalization for matching
             # Check if teams match in either order
-            team1_matches_home = are_teams_matching(team1, home_team)
-            team1_matches_away = are_teams_matching(team1, away_team)
-            team2_matches_home = are_teams_matching(team2, home_team)
-            team2_matches_away = are_teams_matching(team2, away_team)
+            team1_matches_home = self.team_resolver.same_team(team1, home_team)
+            team1_matches_away = self.team_resolver.same_team(team1, away_team)
+            team2_matches_home = self.team_resolver.same_team(team2, home_team)
+            team2_matches_away = self.team_resolver.same_team(team2, away_team)
             
             # Both teams must match (in either order)
             exact_match = (
@@ -1,17 +1,25 @@
 """Database storage and models"""
 
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Date, Boolean, JSON, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Iterable, Sequence
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Date, Boolean, JSON, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
 from sqlalchemy.orm import scoped_session
+from sqlalchemy.engine import Engine, make_url
 import json
+import os
+import threading
+import weakref
 
 from src.data.models import BetType, GameStatus, BetResult
 from src.utils.config import config
 from src.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from src.data.agent_log_sink import AgentLogSink
+    from src.data.llm_call_sink import LLMCallSink
+
 logger = get_logger("data.storage")
 
 Base = declarative_base()
@@ -38,7 +46,7 @@ class GameModel(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     team1_id = Column(Integer, ForeignKey('teams.id'), nullable=False)
     team2_id = Column(Integer, ForeignKey('teams.id'), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     venue = Column(String, nullable=True)
     status = Column(SQLEnum(GameStatus), default=GameStatus.SCHEDULED)
     result = Column(JSON, nullable=True)
@@ -59,7 +67,7 @@ class BettingLineModel(Base):
     __tablename__ = 'betting_lines'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    game_id = Column(Integer, ForeignKey('games.id'), nullable=False)
+    game_id = Column(Integer, ForeignKey('games.id'), nullable=False, index=True)
     book = Column(String, nullable=False)
     bet_type = Column(SQLEnum(BetType), nullable=False)
     line = Column(Float, nullable=False)
@@ -133,6 +141,7 @@ class PredictionModel(Base):
     # Unique constraint: only one prediction per game_id per date
     __table_args__ = (
         UniqueConstraint('game_id', 'prediction_date', name='uq_predictions_game_date'),
+        Index('ix_predictions_game_id_created_at', 'game_id', 'created_at'),  # Latest prediction per game
     )
     
     # Relationships
@@ -164,7 +173,7 @@ class PickModel(Base):
     favorite = Column(Boolean, default=False)  # Deprecated: use best_bet instead. Kept for backwards compatibility
     confidence_score = Column(Integer, default=5)  # 1-10 confidence score
     created_at = Column(DateTime, default=datetime.now)
-    pick_date = Column(Date, nullable=True)  # Date of the pick (for unique constraint)
+    pick_date = Column(Date, nullable=True, index=True)  # Date of the pick (for unique constraint and date queries)
     
     # Unique constraint: only one pick per game_id per date
     __table_args__ = (
@@ -230,6 +239,32 @@ class AgentLogModel(Base):
     timestamp = Column(DateTime, default=datetime.now)
     action = Column(String, nullable=False)
     data_json = Column(JSON, nullable=True)
+    
+    __table_args__ = (
+        Index('ix_agent_logs_timestamp_agent_name', 'timestamp', 'agent_name'),
+    )
+
+
+class LLMCallModel(Base):
+    """One LLM provider call (token usage, latency, retries, cost) for run telemetry"""
+    __tablename__ = 'llm_calls'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String, nullable=True, index=True)  # Workflow run the call belongs to
+    timestamp = Column(DateTime, default=datetime.now, index=True)
+    agent_name = Column(String, nullable=True)
+    model = Column(String, nullable=False)
+    provider = Column(String, nullable=True)
+    batch_id = Column(String, nullable=True)  # Agent batch (e.g. "researcher-2")
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float, nullable=True)
+    retries = Column(Integer, default=0)
+    status = Column(String, nullable=False, default='ok')  # ok, error, cache_hit, batch
+    error = Column(String, nullable=True)
+    cost_usd = Column(Float, nullable=True)  # None when the model has no llm.pricing entry
 
 
 class RevisionRequestModel(Base):
@@ -262,6 +297,15 @@ class CardReviewModel(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+class SchemaVersionModel(Base):
+    """Applied schema migrations (see src/data/migrations.py); the highest version is the schema's"""
+    __tablename__ = 'schema_version'
+    
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.now)
+
+
 class DailyReportModel(Base):
     """Daily report database model"""
     __tablename__ = 'daily_reports'
@@ -283,25 +327,236 @@ class DailyReportModel(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+def _is_file_sqlite(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def create_sqlite_engine(database_url: str, read_only: bool = False) -> Engine:
+    """
+    Engine for a file-backed SQLite database, tuned by the database.sqlite config section
+    
+    Every pooled connection gets WAL journaling (readers and the writer no longer block each other),
+    synchronous=NORMAL, a larger page cache, memory-mapped reads and a busy timeout so concurrent
+    writers wait for the lock instead of failing. read_only connections also set query_only.
+    """
+    sqlite_config = config.get('database.sqlite', {}) or {}
+    busy_timeout_ms = int(sqlite_config.get('busy_timeout_ms', 5000))
+    pragmas = {
+        'journal_mode': sqlite_config.get('journal_mode', 'wal'),
+        'synchronous': sqlite_config.get('synchronous', 'normal'),
+        'busy_timeout': busy_timeout_ms,
+        'cache_size': -1024 * int(sqlite_config.get('cache_size_mb', 64)),  # Negative = KiB
+        'mmap_size': 1024 * 1024 * int(sqlite_config.get('mmap_size_mb', 256)),
+    }
+    if read_only:
+        pragmas['query_only'] = 'on'
+    
+    engine = create_engine(
+        database_url,
+        echo=False,
+        pool_size=int(config.get('database.pool_size', 5)),
+        max_overflow=int(config.get('database.max_overflow', 10)),
+        connect_args={'check_same_thread': False, 'timeout': busy_timeout_ms / 1000},
+    )
+    
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+    
+    return engine
+
+
+# Engines whose pools a forked child must not reuse; weak, so disposed engines can be collected
+_pooled_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _drop_inherited_pools():
+    for engine in list(_pooled_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_drop_inherited_pools)
+
+
+def create_postgres_engine(database_url: str) -> Engine:
+    """
+    Pooled engine for PostgreSQL, sized by database.pool_size/max_overflow and the database.postgres section
+    
+    Several worker processes can share one server. Stale connections are detected before use and
+    recycled, and a forked child drops the pool it inherited instead of sharing the parent's sockets.
+    """
+    pg_config = config.get('database.postgres', {}) or {}
+    engine = create_engine(
+        database_url,
+        echo=False,
+        pool_size=int(config.get('database.pool_size', 5)),
+        max_overflow=int(config.get('database.max_overflow', 10)),
+        pool_timeout=float(pg_config.get('pool_timeout_s', 30)),
+        pool_recycle=int(pg_config.get('pool_recycle_s', 1800)),
+        pool_pre_ping=bool(pg_config.get('pool_pre_ping', True)),
+        connect_args={'application_name': pg_config.get('application_name', 'terrarium')},
+    )
+    
+    _pooled_engines.add(engine)
+    return engine
+
+
+# Dialects upsert_statement can build INSERT ... ON CONFLICT for; callers fall back to ORM lookups otherwise
+UPSERT_DIALECTS = frozenset({'postgresql', 'sqlite'})
+
+
+def upsert_statement(
+    dialect_name: str,
+    model,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Iterable[str],
+    conflict_where=None,
+):
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO UPDATE for SQLite or PostgreSQL
+    
+    Rows that collide with an existing row on conflict_columns overwrite its update_columns.
+    conflict_where lets the conflict target match a partial unique index (legacy SQLite picks).
+    Keys in rows must be unique on conflict_columns: PostgreSQL refuses to update one row twice.
+    """
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported for the {dialect_name} dialect")
+    
+    stmt = dialect_insert(model).values(list(rows))
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        index_where=conflict_where,
+        set_={name: stmt.excluded[name] for name in update_columns},
+    )
+
+
 class Database:
     """Database interface"""
     
     def __init__(self, database_url: Optional[str] = None):
         """Initialize database connection"""
         self.database_url = database_url or config.get_database_url()
-        self.engine = create_engine(self.database_url, echo=False)
+        url = make_url(self.database_url)
+        if _is_file_sqlite(url):
+            self.engine = create_sqlite_engine(self.database_url)
+        elif url.get_backend_name() == 'postgresql':
+            self.engine = create_postgres_engine(self.database_url)
+        else:
+            self.engine = create_engine(self.database_url, echo=False)
         self.SessionLocal = scoped_session(sessionmaker(bind=self.engine))
-        Base.metadata.create_all(self.engine)
-        # Run migrations for schema updates
-        self._migrate_schema()
+        # One version check; tables are created and migrations applied only when the schema is behind
+        from src.data.migrations import migrate
+        self.schema_version = migrate(self.engine)
+        # Background agent log and LLM call writers (created on first use)
+        self._agent_log_sink = None
+        self._llm_call_sink = None
+        # Read-only engine for reporting (created on first use)
+        self._read_engine: Optional[Engine] = None
+        self._read_sessions: Optional[sessionmaker] = None
+        # Guards first use of the sinks and the read-only engine
+        self._lazy_init_lock = threading.Lock()
     
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
     
+    @property
+    def read_engine(self) -> Engine:
+        """
+        Separate connection pool for read-only reporting queries (email, sheets, reports).
+        
+        For file-backed SQLite its connections are query_only and, with WAL, never block or wait on
+        the pipeline's writes. Other databases (and in-memory SQLite) share the main engine.
+        """
+        if self._read_engine is None:
+            with self._lazy_init_lock:
+                if self._read_engine is None:
+                    if _is_file_sqlite(self.engine.url):
+                        self._read_engine = create_sqlite_engine(self.database_url, read_only=True)
+                    else:
+                        self._read_engine = self.engine
+        return self._read_engine
+    
+    def get_read_session(self) -> Session:
+        """New session on read_engine; the caller must close it and must not write through it"""
+        if self._read_sessions is None:
+            self._read_sessions = sessionmaker(bind=self.read_engine)
+        return self._read_sessions()
+    
+    def get_agent_log_sink(self) -> Optional['AgentLogSink']:
+        """
+        Get the background AgentLogModel writer, starting it on first use.
+        
+        Returns:
+            AgentLogSink, or None if agent_logs.async_writes is disabled in config
+        """
+        if not config.get('agent_logs.async_writes', True):
+            return None
+        if self._agent_log_sink is None:
+            with self._lazy_init_lock:
+                if self._agent_log_sink is None:
+                    from src.data.agent_log_sink import AgentLogSink
+                    self._agent_log_sink = AgentLogSink(
+                        self.engine,
+                        batch_size=config.get('agent_logs.batch_size', 100),
+                        flush_interval_ms=config.get('agent_logs.flush_interval_ms', 500),
+                        max_queue_size=config.get('agent_logs.max_queue_size', 10000)
+                    )
+        return self._agent_log_sink
+    
+    def get_llm_call_sink(self) -> Optional['LLMCallSink']:
+        """
+        Get the background LLMCallModel writer, starting it on first use.
+        
+        Returns:
+            LLMCallSink, or None if llm.telemetry.enabled is false in config
+        """
+        if not config.get('llm.telemetry.enabled', True):
+            return None
+        if self._llm_call_sink is None:
+            with self._lazy_init_lock:
+                if self._llm_call_sink is None:
+                    from src.data.llm_call_sink import LLMCallSink
+                    self._llm_call_sink = LLMCallSink(
+                        self.engine,
+                        batch_size=config.get('agent_logs.batch_size', 100),
+                        flush_interval_ms=config.get('agent_logs.flush_interval_ms', 500),
+                        max_queue_size=config.get('agent_logs.max_queue_size', 10000)
+                    )
+        return self._llm_call_sink
+    
+    def flush_agent_logs(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until queued agent log and LLM call rows are written. Returns True if nothing was left pending."""
+        flushed = True
+        for sink in (self._agent_log_sink, self._llm_call_sink):
+            if sink is not None:
+                flushed = sink.flush(timeout) and flushed
+        return flushed
+    
     def close(self):
         """Close database connection"""
+        with self._lazy_init_lock:
+            for attr in ('_agent_log_sink', '_llm_call_sink'):
+                sink = getattr(self, attr)
+                if sink is not None:
+                    sink.close()
+                    setattr(self, attr, None)
         self.SessionLocal.remove()
+        if self._read_engine is not None and self._read_engine is not self.engine:
+            self._read_engine.dispose()
+            self._read_engine = None
+            self._read_sessions = None
     
     def create_tables(self):
         """Create all tables"""
@@ -311,154 +566,6 @@ class Database:
         """Drop all tables (use with caution)"""
         Base.metadata.drop_all(self.engine)
     
-    def _migrate_schema(self):
-        """Migrate database schema to add new columns"""
-        from sqlalchemy import inspect, text
-        
-        inspector = inspect(self.engine)
-        table_names = inspector.get_table_names()
-        
-        # Migrate games table
-        if 'games' in table_names:
-            existing_columns = [col['name'] for col in inspector.get_columns('games')]
-            
-            # Add game_time_est column if missing
-            if 'game_time_est' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE games ADD COLUMN game_time_est DATETIME"))
-                        conn.commit()
-                    logger.info("✅ Added 'game_time_est' column to games table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'game_time_est' column to games: {e}")
-        
-        # Migrate betting_lines table
-        if 'betting_lines' in table_names:
-            existing_columns = [col['name'] for col in inspector.get_columns('betting_lines')]
-            
-            # Add team column if missing
-            if 'team' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE betting_lines ADD COLUMN team VARCHAR"))
-                        conn.commit()
-                    logger.info("✅ Added 'team' column to betting_lines table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'team' column to betting_lines: {e}")
-        
-        # Migrate picks table
-        if 'picks' in table_names:
-            # Get existing columns
-            existing_columns = [col['name'] for col in inspector.get_columns('picks')]
-            
-            # Add favorite column if missing
-            if 'favorite' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        # SQLite uses INTEGER for booleans (0/1)
-                        conn.execute(text("ALTER TABLE picks ADD COLUMN favorite INTEGER DEFAULT 0"))
-                        conn.commit()
-                    logger.info("✅ Added 'favorite' column to picks table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'favorite' column: {e}")
-            
-            # Add confidence_score column if missing
-            if 'confidence_score' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE picks ADD COLUMN confidence_score INTEGER DEFAULT 5"))
-                        conn.commit()
-                    logger.info("✅ Added 'confidence_score' column to picks table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'confidence_score' column: {e}")
-            
-            # Add best_bet column if missing
-            if 'best_bet' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        # SQLite uses INTEGER for booleans (0/1)
-                        conn.execute(text("ALTER TABLE picks ADD COLUMN best_bet INTEGER DEFAULT 0"))
-                        conn.commit()
-                    logger.info("✅ Added 'best_bet' column to picks table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'best_bet' column: {e}")
-            
-            # Add selection_text column if missing
-            if 'selection_text' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE picks ADD COLUMN selection_text VARCHAR"))
-                        conn.commit()
-                    logger.info("✅ Added 'selection_text' column to picks table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'selection_text' column: {e}")
-            
-            # Add pick_date column if missing and migrate existing data
-            if 'pick_date' not in existing_columns:
-                try:
-                    with self.engine.connect() as conn:
-                        # Add pick_date column
-                        conn.execute(text("ALTER TABLE picks ADD COLUMN pick_date DATE"))
-                        # Populate pick_date from created_at for existing records
-                        conn.execute(text("UPDATE picks SET pick_date = DATE(created_at) WHERE pick_date IS NULL"))
-                        conn.commit()
-                    logger.info("Added 'pick_date' column to picks table")
-                except Exception as e:
-                    logger.warning(f"Could not add 'pick_date' column: {e}")
-            
-            # Add prediction_date column to predictions table if missing
-            if 'predictions' in table_names:
-                existing_columns = [col['name'] for col in inspector.get_columns('predictions')]
-                
-                if 'prediction_date' not in existing_columns:
-                    try:
-                        with self.engine.connect() as conn:
-                            conn.execute(text("ALTER TABLE predictions ADD COLUMN prediction_date DATE"))
-                            conn.execute(text("UPDATE predictions SET prediction_date = DATE(created_at) WHERE prediction_date IS NULL"))
-                            conn.commit()
-                        logger.info("Added 'prediction_date' column to predictions table")
-                    except Exception as e:
-                        logger.warning(f"Could not add 'prediction_date' column: {e}")
-                
-                # Add unique constraint on predictions if it doesn't exist
-                try:
-                    with self.engine.connect() as conn:
-                        inspector = inspect(self.engine)
-                        indexes = inspector.get_indexes('predictions')
-                        constraint_exists = any(idx.get('name') == 'uq_predictions_game_date' for idx in indexes)
-                        
-                        if not constraint_exists:
-                            conn.execute(text("""
-                                CREATE UNIQUE INDEX IF NOT EXISTS uq_predictions_game_date 
-                                ON predictions(game_id, prediction_date)
-                                WHERE prediction_date IS NOT NULL
-                            """))
-                            conn.commit()
-                            logger.info("Added unique constraint on predictions (game_id, prediction_date)")
-                except Exception as e:
-                    logger.warning(f"Could not add unique constraint on predictions: {e}")
-            
-            # Add unique constraint on picks if it doesn't exist
-            try:
-                with self.engine.connect() as conn:
-                    # Check if constraint already exists
-                    inspector = inspect(self.engine)
-                    indexes = inspector.get_indexes('picks')
-                    constraint_exists = any(idx.get('name') == 'uq_picks_game_date' for idx in indexes)
-                    
-                    if not constraint_exists:
-                        # SQLite doesn't support adding unique constraints directly, so we use a unique index
-                        conn.execute(text("""
-                            CREATE UNIQUE INDEX IF NOT EXISTS uq_picks_game_date 
-                            ON picks(game_id, pick_date)
-                            WHERE pick_date IS NOT NULL
-                        """))
-                        conn.commit()
-                        logger.info("Added unique constraint on picks (game_id, pick_date)")
-            except Exception as e:
-                logger.warning(f"Could not add unique constraint on picks: {e}")
-
-
     # Query helper methods (moved from AnalyticsService)
     def get_picks_for_date(self, target_date: date) -> List['PickModel']:
         """
@@ -472,21 +579,11 @@ class Database:
         """
         session = self.get_session()
         try:
-            from sqlalchemy import or_, func
-            # Query by pick_date, with fallback to DATE(created_at) for legacy records without pick_date
+            # pick_date is backfilled for legacy rows by schema migration 6, so this uses ix_picks_pick_date
             picks = session.query(PickModel).filter(
-                or_(
-                    PickModel.pick_date == target_date,
-                    func.date(PickModel.created_at) == target_date
-                )
+                PickModel.pick_date == target_date
             ).order_by(PickModel.created_at.desc()).all()
             
-            # Ensure pick_date is set for any legacy records without it
-            for pick in picks:
-                if not pick.pick_date:
-                    pick.pick_date = target_date
-                    session.commit()
-            
             logger.debug(f"Retrieved {len(picks)} picks for {target_date}")
             return picks
         except Exception as e:
@@ -709,6 +806,24 @@ class Database:
             session.close()
 
 
-# Global database instance
-db = Database()
+# Global database instance, created on first use (import no longer connects or migrates)
+_default_db: Optional[Database] = None
+_default_db_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """Shared Database for the configured URL, created on first call"""
+    global _default_db
+    if _default_db is None:
+        with _default_db_lock:
+            if _default_db is None:
+                _default_db = Database()
+    return _default_db
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from src.data.storage import db` working without building the database at import
+    if name == "db":
+        return get_database()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
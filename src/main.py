@@ -5,11 +5,7 @@ import argparse
 import logging
 from datetime import date
 from typing import Optional
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
-import pytz
 
-from src.orchestration.coordinator import Coordinator
 from src.utils.logging import setup_logging
 from src.utils.config import config
 from datetime import timedelta
@@ -56,7 +52,7 @@ def run_performance_analysis():
         logger.warning(f"Failed to run performance analysis: {e}")
 
 
-def run_daily(target_date: date = None, test_limit: Optional[int] = None, force_refresh: bool = False, debug: bool = False, single_game_id: Optional[int] = None):
+def run_daily(target_date: date = None, test_limit: Optional[int] = None, force_refresh: bool = False, debug: bool = False, single_game_id: Optional[int] = None, refresh_lines: bool = False, profile: bool = False):
     """Run daily workflow
     
     Args:
@@ -65,16 +61,25 @@ def run_daily(target_date: date = None, test_limit: Optional[int] = None, force_
         force_refresh: If True, bypass cache and fetch fresh data
         debug: If True, enable debug mode with detailed data logging
         single_game_id: If set, process only this specific game ID
+        refresh_lines: If True, only re-run games whose lines moved since the last run
+        profile: If True, save cProfile stats for each workflow step
     """
     import os
+    from src.orchestration.coordinator import Coordinator
+    
     if debug:
         os.environ['DEBUG'] = 'true'
         logger.setLevel(logging.DEBUG)
         for handler in logger.handlers:
             handler.setLevel(logging.DEBUG)
     
-    coordinator = Coordinator()
+    coordinator = Coordinator(profile=profile)
     try:
+        if refresh_lines:
+            review = coordinator.run_refresh_workflow(target_date, test_limit=test_limit, single_game_id=single_game_id)
+            logger.info(f"Line refresh completed. Card approved: {review.approved}")
+            return review
+        
         review = coordinator.run_daily_workflow(target_date, test_limit=test_limit, force_refresh=force_refresh, single_game_id=single_game_id)
         logger.info(f"Daily workflow completed. Card approved: {review.approved}")
         
@@ -89,6 +94,10 @@ def run_daily(target_date: date = None, test_limit: Optional[int] = None, force_
 
 def setup_scheduler():
     """Set up daily scheduler"""
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    import pytz
+    
     run_time = config.get('scheduler.run_time', '09:00')
     timezone_str = config.get('scheduler.timezone', 'America/New_York')
     
@@ -109,6 +118,55 @@ def setup_scheduler():
     return scheduler
 
 
+def run_backtest_command(date_range, param_args, workers: Optional[int] = None) -> int:
+    """Run a modeler backtest from CLI arguments; returns the process exit code"""
+    from src.agents.modeler_backtest import format_backtest_report, run_backtest
+    from src.agents.modeler_slate import ModelParams
+
+    try:
+        start_date, end_date = (date.fromisoformat(d) for d in date_range)
+    except ValueError:
+        logger.error(f"Invalid backtest dates: {date_range}. Use YYYY-MM-DD")
+        return 1
+
+    overrides = {}
+    for item in param_args:
+        name, sep, value = item.partition('=')
+        if not sep:
+            logger.error(f"Invalid --param '{item}'. Use NAME=VALUE")
+            return 1
+        overrides[name.strip()] = value.strip()
+    try:
+        params = ModelParams.from_overrides(overrides)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    summary = run_backtest(start_date, end_date, params=params, workers=workers)
+    print(format_backtest_report(summary))
+    return 0
+
+
+def run_stats_command(end_date_str: Optional[str], days: int) -> int:
+    """Print LLM spend/latency breakdowns for the `days` days ending on end_date_str (default today)"""
+    from src.data.storage import Database
+    from src.utils.reporting.llm_stats import format_llm_stats, load_llm_calls
+
+    try:
+        end_date = date.fromisoformat(end_date_str) if end_date_str else date.today()
+    except ValueError:
+        logger.error(f"Invalid date format: {end_date_str}. Use YYYY-MM-DD")
+        return 1
+    start_date = end_date - timedelta(days=max(1, days) - 1)
+
+    db = Database()
+    try:
+        print(format_llm_stats(load_llm_calls(db, start_date, end_date), start_date, end_date))
+    finally:
+        db.close()
+    return 0
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Terrarium Sports Gambling Agent System')
@@ -150,10 +208,53 @@ def main():
         type=int,
         help='Single game mode: Process only the specified game ID'
     )
+    parser.add_argument(
+        '--refresh-lines',
+        action='store_true',
+        help='Intraday refresh: rescrape lines and re-run only games whose lines moved since the last run'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile mode: save cProfile stats for each workflow step under timing.profile_dir'
+    )
+    parser.add_argument(
+        '--backtest',
+        nargs=2,
+        metavar=('START', 'END'),
+        help='Re-run the modeler over stored games between START and END (YYYY-MM-DD) and report results'
+    )
+    parser.add_argument(
+        '--param',
+        action='append',
+        default=[],
+        metavar='NAME=VALUE',
+        help='Backtest: override an engine constant, e.g. --param WIN_PROB_SCALE=8.0 (repeatable)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Backtest: worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Show LLM token, cost and latency breakdowns per day, run and agent, then exit'
+    )
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=7,
+        help='Stats: number of days to include, ending on --date (default: 7)'
+    )
     
     args = parser.parse_args()
     
-    if args.schedule:
+    if args.backtest:
+        sys.exit(run_backtest_command(args.backtest, args.param, args.workers))
+    elif args.stats:
+        sys.exit(run_stats_command(args.date, args.days))
+    elif args.schedule:
         # Run as scheduled daemon
         scheduler = setup_scheduler()
         logger.info("Starting scheduler...")
@@ -186,8 +287,14 @@ def main():
         if args.game_id:
             logger.info(f"🎯 SINGLE GAME MODE: Processing game ID {args.game_id}")
         
+        if args.refresh_lines:
+            logger.info("🔁 LINE REFRESH MODE: Re-running only games whose lines moved")
+        
+        if args.profile:
+            logger.info("🔬 PROFILE MODE ENABLED: Saving cProfile stats per step")
+        
         logger.info("Running daily workflow once...")
-        review = run_daily(target_date, test_limit=test_limit, force_refresh=args.force_refresh, debug=args.debug, single_game_id=args.game_id)
+        review = run_daily(target_date, test_limit=test_limit, force_refresh=args.force_refresh, debug=args.debug, single_game_id=args.game_id, refresh_lines=args.refresh_lines, profile=args.profile)
         
         if review.approved:
             logger.info(f"Card approved with {len(review.picks_approved)} picks")
@@ -1,5 +1,6 @@
 """Coordinator for agent workflow"""
 
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 
@@ -18,10 +19,15 @@ from src.agents.president import President
 from src.agents.auditor import Auditor
 from src.agents.results_processor import ResultsProcessor
 from src.orchestration.data_converter import DataConverter
+from src.orchestration.line_movement import LineMoveThresholds, find_line_moves, game_sides, snapshot_lines
 from src.orchestration.prediction_persistence import PredictionPersistenceService
 from src.orchestration.persistence_service import PersistenceService
+from src.orchestration.research_stream import ResearchStream
+from src.orchestration.step_timing import StepTimer, save_run_summary, timed_step
+from src.utils.llm import set_response_cache_bypass
+from src.utils.llm_telemetry import current_run_id, set_telemetry_sink
 from src.utils.logging import get_logger
-from src.utils.team_normalizer import are_teams_matching
+from src.utils.team_normalizer import are_teams_matching, get_normalization_cache_stats
 from src.utils.reporting import ReportGenerator
 from src.utils.google_sheets import GoogleSheetsService
 
@@ -31,31 +37,81 @@ logger = get_logger("orchestration.coordinator")
 class Coordinator:
     """Coordinates agent workflow"""
     
-    def __init__(self, db: Optional[Database] = None):
-        """Initialize coordinator"""
+    def __init__(self, db: Optional[Database] = None, profile: bool = False, streaming: Optional[bool] = None):
+        """Initialize coordinator
+
+        Args:
+            db: Database to use (default: configured database)
+            profile: If True, run each workflow step under cProfile and save its stats
+            streaming: If True, model and pick research batches as they complete
+                (default: pipeline.streaming in config)
+        """
+        from src.utils.config import config
         self.db = db or Database()
+        self.profile = profile
+        self.streaming = bool(config.get('pipeline.streaming', False)) if streaming is None else streaming
+        self.step_timer: Optional[StepTimer] = None
         
-        # Initialize scrapers
-        self.games_scraper = GamesScraper()
-        self.lines_scraper = LinesScraper()
-        
-        # Initialize agents
-        self.results_processor = ResultsProcessor(self.db)
-        self.researcher = Researcher(self.db)
-        self.modeler = Modeler(self.db)
-        self.picker = Picker(self.db)
-        self.president = President(self.db)
-        self.auditor = Auditor(self.db)
-        
-        # Initialize utilities (create once, reuse throughout)
+        # Scrapers, agents (each with its own LLM client) and services are built on first use
         self.data_converter = DataConverter()
-        self.report_generator = ReportGenerator(self.db)
-        self.google_sheets_service = GoogleSheetsService(self.db)
-        
-        # Initialize persistence services
         self.persistence_service = PersistenceService(self.db)
         self.prediction_persistence_service = PredictionPersistenceService(self.db)
     
+    # Scrapers
+    @cached_property
+    def games_scraper(self) -> GamesScraper:
+        return GamesScraper()
+    
+    @cached_property
+    def lines_scraper(self) -> LinesScraper:
+        return LinesScraper()
+    
+    # Agents
+    @cached_property
+    def results_processor(self) -> ResultsProcessor:
+        return ResultsProcessor(self.db)
+    
+    @cached_property
+    def researcher(self) -> Researcher:
+        return Researcher(self.db)
+    
+    @cached_property
+    def modeler(self) -> Modeler:
+        return Modeler(self.db)
+    
+    @cached_property
+    def picker(self) -> Picker:
+        return Picker(self.db)
+    
+    @cached_property
+    def president(self) -> President:
+        return President(self.db)
+    
+    @cached_property
+    def auditor(self) -> Auditor:
+        return Auditor(self.db)
+    
+    # Utilities
+    @cached_property
+    def report_generator(self) -> ReportGenerator:
+        return ReportGenerator(self.db)
+    
+    @cached_property
+    def google_sheets_service(self) -> GoogleSheetsService:
+        return GoogleSheetsService(self.db)
+    
+    def _constructed_agents(self) -> List[tuple]:
+        """(name, agent) for the agents this coordinator has built so far"""
+        names = [
+            ("ResultsProcessor", "results_processor"),
+            ("Researcher", "researcher"),
+            ("Modeler", "modeler"),
+            ("Picker", "picker"),
+            ("President", "president"),
+            ("Auditor", "auditor"),
+        ]
+        return [(name, self.__dict__[attr]) for name, attr in names if attr in self.__dict__]
+    
     def run_daily_workflow(self, target_date: Optional[date] = None, max_revisions: int = 2, test_limit: Optional[int] = None, force_refresh: bool = False, single_game_id: Optional[int] = None) -> CardReview:
         """Run the daily betting workflow with revision support
         
@@ -82,6 +138,10 @@ class Coordinator:
         
         # Reset token usage tracking at start of workflow
         self._reset_all_agent_token_usage()
+        self._start_telemetry_run("daily", target_date)
+        self._start_step_timing()
+        # --force-refresh also bypasses cached LLM responses
+        set_response_cache_bypass(force_refresh)
         
         try:
             # Step 0: Process yesterday's results
@@ -130,17 +190,23 @@ class Coordinator:
             review = None
             president_response = None
             
-            # Step 3: Researcher researches games
-            insights = self._step_research(games, target_date, lines, force_refresh)
-            
-            # Step 4: Modeler generates predictions
-            predictions = self._step_model(insights, lines, target_date, force_refresh)
-            
             # Get historical performance data for learning
             historical_performance = self.db.get_historical_performance(target_date)
             
-            # Step 5: Picker selects picks (one per game)
-            picks, candidate_picks = self._step_pick(predictions, insights, lines, games, target_date, historical_performance)
+            if self.streaming:
+                # Steps 3-5 overlapped: model and pick research batches as they complete
+                insights, predictions, picks, candidate_picks = self._step_research_stream(
+                    games, target_date, lines, force_refresh, historical_performance
+                )
+            else:
+                # Step 3: Researcher researches games
+                insights = self._step_research(games, target_date, lines, force_refresh)
+                
+                # Step 4: Modeler generates predictions
+                predictions = self._step_model(insights, lines, target_date, force_refresh)
+                
+                # Step 5: Picker selects picks (one per game)
+                picks, candidate_picks = self._step_pick(predictions, insights, lines, games, target_date, historical_performance)
             if picks is None:
                 logger.warning("No picks selected. Ending workflow.")
                 return CardReview(
@@ -181,7 +247,129 @@ class Coordinator:
                 picks_rejected=[],
                 review_notes=f"Workflow error: {str(e)}"
             )
+        finally:
+            self._finish_step_timing("daily", target_date)
+    
+    def run_refresh_workflow(self, target_date: Optional[date] = None, test_limit: Optional[int] = None, single_game_id: Optional[int] = None, thresholds: Optional[LineMoveThresholds] = None) -> CardReview:
+        """Intraday refresh: re-run the card only for games whose lines moved
+        
+        Rescrapes lines (bypassing the lines cache), diffs them against the stored betting lines,
+        and sends only games that moved beyond the thresholds - or that have no stored research
+        yet - through research, modeling, picking and the President. Yesterday's results and the
+        audit step are skipped.
+        
+        Args:
+            target_date: Date to refresh (default: today)
+            test_limit: If set, limit processing to this many games
+            single_game_id: If set, refresh only this specific game ID
+            thresholds: Minimum line moves (default: `refresh` config section)
+        """
+        if target_date is None:
+            target_date = date.today()
+        thresholds = thresholds or LineMoveThresholds.from_config()
+        
+        logger.info("=" * 80)
+        logger.info(f"🔁 STARTING LINE REFRESH FOR {target_date}")
+        logger.info(
+            f"Thresholds: spread {thresholds.spread} pts, total {thresholds.total} pts, "
+            f"moneyline {thresholds.moneyline:.1%} implied probability"
+        )
+        logger.info("=" * 80)
+        
+        self._reset_all_agent_token_usage()
+        self._start_telemetry_run("refresh", target_date)
+        self._start_step_timing()
+        
+        try:
+            games = self._step_scrape_games(target_date, test_limit, single_game_id)
+            if not games:
+                logger.warning("No games found. Ending refresh.")
+                return CardReview(
+                    date=target_date,
+                    approved=False,
+                    picks_approved=[],
+                    picks_rejected=[],
+                    review_notes="No games found for today."
+                )
+            
+            lines, moves = self._step_refresh_lines(games, thresholds)
+            games_with_lines = set(line.game_id for line in lines if line.game_id)
+            games = [g for g in games if g.id in games_with_lines]
+            
+            # Games that moved, plus games that were never researched (e.g. added since the last run)
+            unresearched = self._games_without_insights([g.id for g in games])
+            affected = [g for g in games if g.id in moves or g.id in unresearched]
+            for game in affected:
+                reasons = moves.get(game.id) or ["no stored research"]
+                logger.info(f"📈 {game.team2} @ {game.team1} (game {game.id}): {'; '.join(reasons)}")
+            
+            if not affected:
+                logger.info("✅ No lines moved beyond refresh thresholds - existing card unchanged")
+                self._log_token_usage_summary()
+                return CardReview(
+                    date=target_date,
+                    approved=True,
+                    picks_approved=[],
+                    picks_rejected=[],
+                    review_notes="No lines moved beyond refresh thresholds; existing card unchanged."
+                )
+            
+            logger.info(f"🔁 Refreshing {len(affected)}/{len(games)} games")
+            affected_ids = {g.id for g in affected}
+            affected_lines = [line for line in lines if line.game_id in affected_ids]
+            
+            # Research is cached per game on its inputs, so only games with changed inputs hit the LLM
+            insights = self._step_research(affected, target_date, affected_lines, force_refresh=False)
+            # The modeler cache is keyed on games, not lines, so bypass it for moved markets
+            predictions = self._step_model(insights, affected_lines, target_date, force_refresh=True)
+            
+            historical_performance = self.db.get_historical_performance(target_date)
+            picks, candidate_picks = self._step_pick(
+                predictions, insights, affected_lines, affected, target_date, historical_performance
+            )
+            if picks is None:
+                # Keep the existing card: None also covers Picker failures (LLM unavailable, unparseable)
+                logger.warning("No refreshed picks selected. Ending refresh.")
+                self._log_token_usage_summary()
+                return CardReview(
+                    date=target_date,
+                    approved=False,
+                    picks_approved=[],
+                    picks_rejected=[],
+                    review_notes="No refreshed picks met selection criteria."
+                )
+            # Earlier picks for refreshed games the Picker no longer takes would otherwise stay on the card
+            self.persistence_service.delete_picks(affected_ids - {p.game_id for p in picks}, target_date)
+            
+            review, president_response = self._step_president(
+                candidate_picks, insights, predictions, target_date, historical_performance
+            )
+            self._step_finalize(
+                review, picks, candidate_picks, insights, predictions, president_response, target_date,
+                report_filename=f"presidents_report_{target_date.isoformat()}_refresh_{datetime.now():%H%M}.txt"
+            )
+            
+            self._log_token_usage_summary()
+            
+            logger.info("=" * 80)
+            logger.info(f"✅ LINE REFRESH COMPLETED - {len(picks)} picks updated for {len(affected)} games")
+            logger.info("=" * 80)
+            return review
+            
+        except Exception as e:
+            logger.error(f"❌ Error in line refresh: {e}", exc_info=True)
+            self._log_token_usage_summary()
+            return CardReview(
+                date=target_date,
+                approved=False,
+                picks_approved=[],
+                picks_rejected=[],
+                review_notes=f"Refresh error: {str(e)}"
+            )
+        finally:
+            self._finish_step_timing("refresh", target_date)
     
+    @timed_step("process_results")
     def _step_process_results(self, target_date: date, force_refresh: bool) -> Dict[str, Any]:
         """Step 0: Process yesterday's results"""
         yesterday = target_date - timedelta(days=1)
@@ -201,12 +389,11 @@ class Coordinator:
         session = self.db.get_session()
         try:
             from src.data.storage import GameModel
-            from sqlalchemy import func
             
             # Get all games from yesterday that have results
             # Use with_entities to select only the ID column to avoid detached instance errors
             game_ids = session.query(GameModel.id).filter(
-                func.date(GameModel.date) == yesterday,
+                GameModel.date == yesterday,
                 GameModel.result.isnot(None)
             ).all()
             
@@ -226,6 +413,7 @@ class Coordinator:
         
         return yesterday_stats
     
+    @timed_step("scrape_games")
     def _step_scrape_games(self, target_date: date, test_limit: Optional[int], single_game_id: Optional[int] = None) -> List[Game]:
         """Step 1: Scrape games"""
         from src.utils.logging import log_data_object
@@ -270,6 +458,7 @@ class Coordinator:
         
         return games
     
+    @timed_step("scrape_lines")
     def _step_scrape_lines(self, games: List[Game]) -> List[BettingLine]:
         """Step 2: Scrape betting lines"""
         self.researcher.interaction_logger.log_agent_start("LinesScraper", f"Scraping lines for {len(games)} games")
@@ -282,6 +471,48 @@ class Coordinator:
         
         return lines
     
+    @timed_step("refresh_lines")
+    def _step_refresh_lines(self, games: List[Game], thresholds: LineMoveThresholds) -> tuple[List[BettingLine], Dict[int, List[str]]]:
+        """Rescrape lines, diff them against the stored lines, then save them
+        
+        Returns:
+            Tuple of (fresh lines, {game_id: move reasons} for games that moved)
+        """
+        game_ids = [g.id for g in games if g.id]
+        sides = game_sides(games)
+        session = self.db.get_session()
+        try:
+            previous = snapshot_lines(
+                session.query(BettingLineModel).filter(BettingLineModel.game_id.in_(game_ids)).all(), sides
+            ) if game_ids else {}
+        finally:
+            session.close()
+        
+        self.researcher.interaction_logger.log_agent_start("LinesScraper", f"Rescraping lines for {len(games)} games")
+        lines = self.lines_scraper.scrape_lines(games, use_cache=False)
+        moves = find_line_moves(previous, lines, thresholds, sides)
+        lines = self.persistence_service.save_lines(lines, games)
+        self.researcher.interaction_logger.log_agent_complete(
+            "LinesScraper", f"Found {len(lines)} betting lines, {len(moves)} games moved"
+        )
+        return lines, moves
+    
+    def _games_without_insights(self, game_ids: List[int]) -> set:
+        """Subset of game_ids with no stored GameInsightModel row"""
+        if not game_ids:
+            return set()
+        from src.data.storage import GameInsightModel
+        session = self.db.get_session()
+        try:
+            researched = {
+                game_id for (game_id,) in
+                session.query(GameInsightModel.game_id).filter(GameInsightModel.game_id.in_(game_ids)).all()
+            }
+        finally:
+            session.close()
+        return set(game_ids) - researched
+    
+    @timed_step("research")
     def _step_research(self, games: List[Game], target_date: date, lines: List[BettingLine], force_refresh: bool) -> Dict[str, Any]:
         """Step 3: Researcher researches games"""
         from src.utils.logging import log_data_object
@@ -295,6 +526,13 @@ class Coordinator:
             log_data_object(logger, "Betting lines input to Researcher", lines)
         
         insights = self.researcher.process(games, target_date=target_date, betting_lines=lines, force_refresh=force_refresh)
+        self._finish_research(insights, games, target_date)
+        return insights
+    
+    def _finish_research(self, insights: Dict[str, Any], games: List[Game], target_date: date) -> None:
+        """Validate, report and save Researcher output"""
+        from src.utils.logging import log_data_object
+        from src.utils.config import config
         
         if config.is_debug_mode():
             log_data_object(logger, "Researcher insights output", insights)
@@ -328,8 +566,6 @@ class Coordinator:
         
         # Update odds analytics now that we have home/away information
         # Odds are now stored directly in BettingLineModel - no need for separate analytics table
-        
-        return insights
     
     def _extract_and_save_home_away(self, insights: Dict[str, Any], games: List[Game], target_date: date) -> None:
         """Extract home/away teams and conferences from researcher output and save to analytics"""
@@ -499,6 +735,7 @@ class Coordinator:
         finally:
             session.close()
     
+    @timed_step("model")
     def _step_model(self, insights: Dict[str, Any], lines: List[BettingLine], target_date: date, force_refresh: bool = False) -> Dict[str, Any]:
         """Step 4: Modeler generates predictions"""
         insights_games = insights.get("games", [])
@@ -507,8 +744,14 @@ class Coordinator:
         predictions = self.modeler.process(insights, betting_lines=lines, target_date=target_date, force_refresh=force_refresh)
         
         # Save predictions using persistence service
-        game_models = predictions.get("game_models", [])
         self.prediction_persistence_service.save_predictions(predictions, target_date)
+        self._finish_model(predictions, insights, target_date)
+        return predictions
+    
+    def _finish_model(self, predictions: Dict[str, Any], insights: Dict[str, Any], target_date: date) -> None:
+        """Validate and report Modeler output"""
+        insights_games = insights.get("games", [])
+        game_models = predictions.get("game_models", [])
         
         # CRITICAL VALIDATION: Ensure all games from Researcher are modeled
         if len(game_models) != len(insights_games):
@@ -531,8 +774,8 @@ class Coordinator:
             target_date,
             metadata={"games_modeled": len(insights_games), "predictions_generated": len(game_models)}
         )
-        return predictions
     
+    @timed_step("pick")
     def _step_pick(self, predictions: Dict[str, Any], insights: Dict[str, Any], lines: List[BettingLine], games: List[Game], target_date: date, historical_performance: Optional[Dict[str, Any]] = None) -> tuple[Optional[List[Pick]], List[Dict[str, Any]]]:
         """Step 5: Picker selects picks
         
@@ -544,6 +787,10 @@ class Coordinator:
         
         # Pass arguments: researcher_output, modeler_output, historical_performance
         picker_response = self.picker.process(insights, predictions, historical_performance)
+        return self._finish_pick(picker_response, games, target_date)
+    
+    def _finish_pick(self, picker_response: Dict[str, Any], games: List[Game], target_date: date) -> tuple[Optional[List[Pick]], List[Dict[str, Any]]]:
+        """Report Picker output and convert it to Pick objects ((None, []) if nothing was picked)"""
         candidate_picks = picker_response.get("candidate_picks", [])
         self.picker.interaction_logger.log_agent_complete("Picker", f"Selected {len(candidate_picks)} picks")
         
@@ -562,6 +809,42 @@ class Coordinator:
         picks = self.data_converter.picks_from_json(candidate_picks, games)
         return picks, candidate_picks
     
+    @timed_step("research_stream")
+    def _step_research_stream(self, games: List[Game], target_date: date, lines: List[BettingLine], force_refresh: bool,
+                              historical_performance: Optional[Dict[str, Any]] = None) -> tuple[Dict[str, Any], Dict[str, Any], Optional[List[Pick]], List[Dict[str, Any]]]:
+        """Steps 3-5 overlapped: each research batch is modeled and saved as it completes, and
+        picker-sized chunks are picked while later research batches are still in flight
+        
+        Returns:
+            Tuple of (insights, predictions, picks, candidate_picks); picks is None if nothing was picked
+        """
+        from src.utils.logging import log_data_object
+        from src.utils.config import config
+        
+        self.researcher.interaction_logger.log_agent_start("Researcher", f"Researching {len(games)} games (streaming)")
+        self.researcher.interaction_logger.log_handoff("GamesScraper", "Researcher", "Games", len(games))
+        if config.is_debug_mode():
+            log_data_object(logger, "Games input to Researcher", games)
+            log_data_object(logger, "Betting lines input to Researcher", lines)
+        
+        with ResearchStream(
+            self.modeler, self.picker, self.prediction_persistence_service, lines, target_date,
+            historical_performance, max_concurrent_picks=int(config.get('pipeline.max_concurrent_picks', 2))
+        ) as stream:
+            insights = self.researcher.process(
+                games, target_date=target_date, betting_lines=lines, force_refresh=force_refresh,
+                on_insights=stream.on_insights
+            )
+            predictions, picker_response = stream.finish(insights)
+        
+        self._finish_research(insights, games, target_date)
+        self.modeler.interaction_logger.log_handoff("Researcher", "Modeler", "GameInsights", len(insights.get("games", [])))
+        self._finish_model(predictions, insights, target_date)
+        self.picker.interaction_logger.log_handoff("Modeler", "Picker", "Predictions", len(predictions.get("game_models", [])))
+        picks, candidate_picks = self._finish_pick(picker_response, games, target_date)
+        return insights, predictions, picks, candidate_picks
+    
+    @timed_step("president")
     def _step_president(self, candidate_picks: List[Dict[str, Any]], 
                        insights: Dict[str, Any], predictions: Dict[str, Any], 
                        target_date: date, historical_performance: Optional[Dict[str, Any]] = None) -> tuple[CardReview, Dict[str, Any]]:
@@ -592,8 +875,10 @@ class Coordinator:
         
         return review, president_response
     
+    @timed_step("finalize")
     def _step_finalize(self, review: CardReview, picks: List[Pick], candidate_picks: List[Dict[str, Any]], 
-                      insights: Dict[str, Any], predictions: Dict[str, Any], president_response: Dict[str, Any], target_date: date) -> None:
+                      insights: Dict[str, Any], predictions: Dict[str, Any], president_response: Dict[str, Any], target_date: date,
+                      report_filename: Optional[str] = None) -> None:
         """Step 7: Save betting card and place bets"""
         # Update picks with units and best_bet flags from President response
         approved_picks_data = president_response.get("approved_picks", [])
@@ -737,11 +1022,12 @@ class Coordinator:
         )
         report_path = self.report_generator.save_report_to_file(
             presidents_report,
-            f"presidents_report_{target_date.isoformat()}.txt",
+            report_filename or f"presidents_report_{target_date.isoformat()}.txt",
             output_dir="data/reports/president"
         )
         logger.info(f"📝 President's report saved to {report_path}")
     
+    @timed_step("audit")
     def _step_audit(self, target_date: date) -> None:
         """Step 10: Generate daily report (review previous day's results)"""
         logger.info("📊 Generating daily performance report")
@@ -777,32 +1063,46 @@ class Coordinator:
     
     def _reset_all_agent_token_usage(self) -> None:
         """Reset token usage tracking for all agents"""
-        agents = [
-            self.results_processor,
-            self.researcher,
-            self.modeler,
-            self.picker,
-            self.president,
-            self.auditor
-        ]
-        for agent in agents:
+        # Agents not built yet have no usage to reset
+        for _, agent in self._constructed_agents():
             if hasattr(agent, 'llm_client') and agent.llm_client:
                 agent.llm_client.reset_usage_stats()
+            if hasattr(agent, 'reset_payload_stats'):
+                agent.reset_payload_stats()
+    
+    def _start_telemetry_run(self, kind: str, target_date: date) -> None:
+        """Record this run's LLM calls in the llm_calls table under a new run id"""
+        run_id = f"{kind}-{target_date}-{datetime.now().strftime('%H%M%S')}"
+        set_telemetry_sink(self.db.get_llm_call_sink(), run_id)
+        logger.debug(f"LLM call telemetry run id: {run_id}")
+    
+    def _start_step_timing(self) -> None:
+        """Time each step of this run (and profile it with --profile)"""
+        if self.step_timer is not None:
+            self.step_timer.detach()
+        self.step_timer = StepTimer(
+            engine=self.db.engine, read_engine=self.db.read_engine, profile=self.profile, run_id=current_run_id()
+        )
+    
+    def _finish_step_timing(self, kind: str, target_date: date) -> None:
+        """Log step timings, flag regressions against recent runs and save the run summary"""
+        timer, self.step_timer = self.step_timer, None
+        if timer is None:
+            return
+        timer.detach()
+        if timer.steps:
+            save_run_summary(timer, kind, target_date)
     
     def _log_token_usage_summary(self) -> None:
         """Log token usage summary for all agents"""
-        agents = [
-            ("ResultsProcessor", self.results_processor),
-            ("Researcher", self.researcher),
-            ("Modeler", self.modeler),
-            ("Picker", self.picker),
-            ("President", self.president),
-            ("Auditor", self.auditor)
-        ]
+        agents = self._constructed_agents()
         
         total_tokens = 0
         total_prompt = 0
         total_completion = 0
+        total_cache_hits = 0
+        total_saved = 0
+        total_cached_prompt = 0
         agent_usage = []
         
         for agent_name, agent in agents:
@@ -811,6 +1111,9 @@ class Coordinator:
                 tokens = stats["total_tokens"]
                 prompt = stats["prompt_tokens"]
                 completion = stats["completion_tokens"]
+                total_cache_hits += stats.get("cache_hits", 0)
+                total_saved += stats.get("tokens_saved", 0)
+                total_cached_prompt += stats.get("cached_tokens", 0)
                 
                 if tokens > 0:
                     total_tokens += tokens
@@ -845,6 +1148,36 @@ class Coordinator:
             logger.info("=" * 80)
         else:
             logger.info("📊 No token usage recorded (all agents may have used cache)")
+        
+        if total_cached_prompt and total_prompt:
+            logger.info(
+                f"⚡ Provider prompt cache: {total_cached_prompt:,} of {total_prompt:,} prompt tokens "
+                f"({total_cached_prompt / total_prompt:.0%}) served from cache"
+            )
+        if total_cache_hits:
+            logger.info(f"💾 LLM response cache: {total_cache_hits} hits saved {total_saved:,} tokens")
+
+        run_id = current_run_id()
+        if run_id and self.db.get_llm_call_sink() is not None:
+            from src.utils.reporting.llm_stats import run_summary
+            self.db.flush_agent_logs()
+            run = run_summary(self.db, run_id)
+            if run["calls"]:
+                p95 = f"{run['p95_ms'] / 1000:.1f}s" if run["p95_ms"] is not None else "-"
+                logger.info(
+                    f"💵 LLM cost this run: ${run['cost_usd']:.4f} over {run['calls']} calls "
+                    f"({run['retries']} retries, p95 latency {p95})"
+                )
+
+        for agent_name, agent in agents:
+            if not hasattr(agent, 'get_payload_savings'):
+                continue
+            savings = agent.get_payload_savings()
+            if isinstance(savings, dict) and savings["calls"] and savings["pretty_chars"]:
+                logger.info(
+                    f"🗜️  {agent_name} payload encoding: ~{savings['saved_tokens']:,} prompt tokens saved "
+                    f"over {savings['calls']} calls ({savings['saved_chars'] / savings['pretty_chars']:.0%} smaller)"
+                )
     
     def _deduplicate_games_by_matchup(self, games: List[Game]) -> List[Game]:
         """
@@ -915,7 +1248,15 @@ class Coordinator:
         return deduplicated
     
     def close(self):
-        """Close database connection"""
+        """Flush queued agent logs and close database connection"""
+        for name, stats in get_normalization_cache_stats().items():
+            logger.debug(
+                f"Team name cache {name}: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['size']}/{stats['maxsize']} entries"
+            )
+        set_telemetry_sink(None)
         if self.db:
+            if not self.db.flush_agent_logs():
+                logger.warning("Timed out flushing agent logs before close")
             self.db.close()
 
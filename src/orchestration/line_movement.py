@@ -0,0 +1,133 @@
+"""Detect betting line moves between a stored snapshot and a fresh scrape"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.odds import american_odds_to_profit_multiplier
+from src.utils.team_resolver import get_team_resolver
+
+LineKey = Tuple[int, str, str, str]  # (game_id, book, bet_type, side)
+GameSides = Dict[int, Tuple[str, str]]  # game_id -> (home team, away team)
+
+
+@dataclass(frozen=True)
+class LineMoveThresholds:
+    """Minimum change that counts as a line move, per market"""
+    spread: float = 0.5       # Points
+    total: float = 1.0        # Points
+    moneyline: float = 0.02   # Implied win probability
+
+    @classmethod
+    def from_config(cls) -> "LineMoveThresholds":
+        """Thresholds from the `refresh` config section (missing keys keep the defaults)"""
+        refresh_config = config.get('refresh', {}) or {}
+        defaults = cls()
+        return cls(
+            spread=float(refresh_config.get('spread_threshold', defaults.spread)),
+            total=float(refresh_config.get('total_threshold', defaults.total)),
+            moneyline=float(refresh_config.get('moneyline_threshold', defaults.moneyline)),
+        )
+
+
+def _bet_type_value(bet_type: Any) -> str:
+    return bet_type.value if hasattr(bet_type, 'value') else str(bet_type)
+
+
+def game_sides(games: Iterable[Any]) -> GameSides:
+    """Map game id -> (home, away) team names for Game objects"""
+    return {game.id: (game.team1, game.team2) for game in games if game.id}
+
+
+def _side(line: Any, sides: Optional[GameSides]) -> str:
+    """Game side (home or away) of a spread or moneyline team, else the lowercased team"""
+    team = line.team or ""
+    names = sides.get(line.game_id) if sides else None
+    if names and _bet_type_value(line.bet_type) != "total":
+        resolver = get_team_resolver()
+        for side, name in zip(("home", "away"), names):
+            if resolver.same_team(team, name):
+                return side
+    return team.lower()
+
+
+def line_key(line: Any, sides: Optional[GameSides] = None) -> LineKey:
+    """
+    Identity of a line; matches the betting_lines unique constraint
+
+    With sides, spread and moneyline teams are keyed by game side, since the same team is
+    stored as the display name on a game's first save and the normalized name afterwards.
+    """
+    return (
+        line.game_id,
+        (line.book or "").lower(),
+        _bet_type_value(line.bet_type),
+        _side(line, sides),
+    )
+
+
+def snapshot_lines(lines: Iterable[Any], sides: Optional[GameSides] = None) -> Dict[LineKey, Tuple[float, int]]:
+    """Map line key -> (line, odds) for BettingLine or BettingLineModel objects"""
+    return {line_key(line, sides): (line.line, line.odds) for line in lines if line.game_id}
+
+
+def _implied_probability(odds: Optional[int]) -> Optional[float]:
+    if not odds:
+        return None
+    return 1.0 / (1.0 + american_odds_to_profit_multiplier(odds))
+
+
+def find_line_moves(
+    previous: Dict[LineKey, Tuple[float, int]],
+    current: Iterable[Any],
+    thresholds: LineMoveThresholds = LineMoveThresholds(),
+    sides: Optional[GameSides] = None,
+) -> Dict[int, List[str]]:
+    """
+    Find games whose lines moved at least the threshold since the previous snapshot
+
+    A market that was not in the snapshot counts as a move. Spreads and totals compare the
+    number; moneylines compare implied probability.
+
+    Args:
+        previous: Snapshot taken before the new lines were saved (see snapshot_lines)
+        current: Freshly scraped lines
+        thresholds: Minimum move per market
+        sides: Home/away team names per game (see game_sides); must match the snapshot's
+
+    Returns:
+        Mapping of game_id to human-readable reasons, for moved games only
+    """
+    moves: Dict[int, List[str]] = {}
+    for line in current:
+        if not line.game_id:
+            continue
+        key = line_key(line, sides)
+        _, book, bet_type, _ = key
+        team = (line.team or "").lower()
+        label = f"{book} {bet_type}{f' {team}' if team else ''}"
+        before = previous.get(key)
+        if before is None:
+            moves.setdefault(line.game_id, []).append(f"new {label}")
+            continue
+
+        old_line, old_odds = before
+        if bet_type == "moneyline":
+            old_prob = _implied_probability(old_odds)
+            new_prob = _implied_probability(line.odds)
+            if old_prob is None or new_prob is None:
+                moved = old_odds != line.odds
+            else:
+                moved = abs(new_prob - old_prob) >= thresholds.moneyline
+            if moved:
+                moves.setdefault(line.game_id, []).append(f"{label} {old_odds} -> {line.odds}")
+            continue
+
+        threshold = thresholds.total if bet_type == "total" else thresholds.spread
+        if old_line is None or line.line is None:
+            moved = old_line != line.line
+        else:
+            moved = abs(line.line - old_line) >= threshold
+        if moved:
+            moves.setdefault(line.game_id, []).append(f"{label} {old_line} -> {line.line}")
+    return moves
@@ -1,18 +1,22 @@
 """Service for persisting games, picks, and bets to the database"""
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from sqlalchemy.orm import Session
 
 from src.data.models import Game, Pick, Bet, BetType, BetResult
 from src.data.storage import (
-    Database, GameModel, BettingLineModel, BetModel, PickModel, TeamModel
+    Database, GameModel, BettingLineModel, BetModel, PickModel, TeamModel, UPSERT_DIALECTS, upsert_statement
 )
-from src.utils.team_normalizer import normalize_team_name, remove_mascot_from_team_name, are_teams_matching
+from src.utils.team_normalizer import normalize_team_name, remove_mascot_from_team_name
+from src.utils.team_resolver import get_team_resolver
 from src.utils.logging import get_logger
 
 logger = get_logger("orchestration.persistence_service")
 
+# Rows per INSERT ... ON CONFLICT statement (keeps bound parameters under SQLite's limit)
+UPSERT_BATCH_SIZE = 500
+
 
 class PersistenceService:
     """Service for persisting games, picks, and bets"""
@@ -142,59 +146,59 @@ class PersistenceService:
             )
     
     def save_lines(self, lines: List, games: List[Game]) -> List:
-        """Save betting lines to database using upsert pattern to prevent duplicates"""
+        """Save betting lines to database, upserting on (game_id, book, bet_type, team)"""
         if not self.db:
             return lines
         
         session = self.db.get_session()
         try:
-            upserted_count = 0
-            created_count = 0
-            updated_count = 0
-            
+            keyed_rows = {}
+            unkeyed_rows = []
             for line in lines:
-                # Check if betting line already exists (upsert pattern)
-                # Unique key: (game_id, book, bet_type, team)
+                row = {
+                    'game_id': line.game_id,
+                    'book': line.book.lower() if line.book else line.book,
+                    'bet_type': line.bet_type,
+                    'line': line.line,
+                    'odds': line.odds,
+                    'team': line.team,
+                    'timestamp': line.timestamp,
+                }
+                if row['team'] is None:
+                    unkeyed_rows.append(row)
+                else:
+                    # Last line for a key wins, as with one update per line
+                    keyed_rows[(row['game_id'], row['book'], row['bet_type'], row['team'])] = row
+            
+            rows = list(keyed_rows.values())
+            dialect_name = session.get_bind().dialect.name
+            if dialect_name in UPSERT_DIALECTS:
+                # One INSERT ... ON CONFLICT DO UPDATE per batch instead of a lookup per line
+                for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                    session.execute(upsert_statement(
+                        dialect_name, BettingLineModel, rows[start:start + UPSERT_BATCH_SIZE],
+                        conflict_columns=('game_id', 'book', 'bet_type', 'team'),
+                        update_columns=('line', 'odds', 'timestamp'),
+                    ))
+                matched_rows = unkeyed_rows
+            else:
+                # No ON CONFLICT on this dialect: every line is looked up
+                matched_rows = rows + unkeyed_rows
+            
+            # NULLs never collide in a unique constraint, so lines without a team are matched explicitly
+            for row in matched_rows:
                 existing = session.query(BettingLineModel).filter_by(
-                    game_id=line.game_id,
-                    book=line.book.lower() if line.book else None,
-                    bet_type=line.bet_type,
-                    team=line.team
+                    game_id=row['game_id'], book=row['book'], bet_type=row['bet_type'], team=row['team']
                 ).first()
-                
                 if existing:
-                    # Update existing record with latest line data
-                    existing.line = line.line
-                    existing.odds = line.odds
-                    existing.timestamp = line.timestamp
-                    updated_count += 1
-                    logger.debug(
-                        f"Updated betting line: game_id={line.game_id}, book={line.book}, "
-                        f"bet_type={line.bet_type.value}, team={line.team}, line={line.line}"
-                    )
+                    existing.line = row['line']
+                    existing.odds = row['odds']
+                    existing.timestamp = row['timestamp']
                 else:
-                    # Create new record
-                    line_model = BettingLineModel(
-                        game_id=line.game_id,
-                        book=line.book.lower() if line.book else line.book,
-                        bet_type=line.bet_type,
-                        line=line.line,
-                        odds=line.odds,
-                        team=line.team,
-                        timestamp=line.timestamp
-                    )
-                    session.add(line_model)
-                    created_count += 1
-                    logger.debug(
-                        f"Created betting line: game_id={line.game_id}, book={line.book}, "
-                        f"bet_type={line.bet_type.value}, team={line.team}, line={line.line}"
-                    )
+                    session.add(BettingLineModel(**row))
             
             session.commit()
-            upserted_count = created_count + updated_count
-            logger.info(
-                f"Upserted {upserted_count} betting lines: {created_count} created, {updated_count} updated"
-            )
+            logger.info(f"Upserted {len(rows) + len(unkeyed_rows)} betting lines")
             return lines
             
         except Exception as e:
@@ -267,18 +271,18 @@ class PersistenceService:
                 game_team1 = session.query(TeamModel).filter_by(id=game_model.team1_id).first()
                 game_team2 = session.query(TeamModel).filter_by(id=game_model.team2_id).first()
 
-                # Check if pick team name matches one of the game's teams using are_teams_matching
+                # Check if pick team name matches one of the game's teams via the team resolver
                 # This handles normalization differences like "grambling" vs "grambling st"
                 team_id_from_game = None
 
                 # Evaluate match against team1
                 if game_team1:
-                    if are_teams_matching(pick.team_name, game_team1.normalized_team_name):
+                    if get_team_resolver().same_team(pick.team_name, game_team1.normalized_team_name):
                         team_id_from_game = game_model.team1_id
 
                 # Evaluate match against team2 (only if team1 didn't match)
                 if team_id_from_game is None and game_team2:
-                    if are_teams_matching(pick.team_name, game_team2.normalized_team_name):
+                    if get_team_resolver().same_team(pick.team_name, game_team2.normalized_team_name):
                         team_id_from_game = game_model.team2_id
 
                 # Only accept a match if we found one
@@ -336,55 +340,48 @@ class PersistenceService:
                 if match:
                     odds_from_db = int(match.group(1))
             
-            # Check if pick already exists (upsert pattern)
-            existing = session.query(PickModel).filter_by(
-                game_id=pick.game_id,
-                pick_date=pick_date
-            ).first()
-            
-            if existing:
-                # Update existing record
-                existing.bet_type = pick.bet_type
-                existing.line = line_from_db  # Use line from betting line database
-                existing.odds = odds_from_db  # Use odds from betting line database
-                existing.stake_units = pick.stake_units
-                existing.stake_amount = pick.stake_amount
-                existing.rationale = pick.rationale
-                existing.confidence = pick.confidence
-                existing.expected_value = pick.expected_value
-                existing.book = pick.book
-                existing.parlay_legs = pick.parlay_legs
-                existing.selection_text = pick.selection_text
-                existing.team_id = team_id
-                existing.best_bet = pick.best_bet
-                existing.confidence_score = pick.confidence_score
-                # Note: favorite field is deprecated in favor of best_bet
-                pick.id = existing.id
+            # Insert, or update the existing pick for this game and day (ON CONFLICT on uq_picks_game_date)
+            values = {
+                'game_id': pick.game_id,
+                'bet_type': pick.bet_type,
+                'line': line_from_db,  # Use line from betting line database
+                'odds': odds_from_db,  # Use odds from betting line database
+                'stake_units': pick.stake_units,
+                'stake_amount': pick.stake_amount,
+                'rationale': pick.rationale,
+                'confidence': pick.confidence,
+                'expected_value': pick.expected_value,
+                'book': pick.book,
+                'parlay_legs': pick.parlay_legs,
+                'selection_text': pick.selection_text,
+                'team_id': team_id,
+                'best_bet': pick.best_bet,
+                'confidence_score': pick.confidence_score,
+                # Note: favorite field is deprecated in favor of best_bet (defaults to False in schema)
+                'pick_date': pick_date,
+                'created_at': pick.created_at if pick.created_at else datetime.now(),
+            }
+            update_columns = [name for name in values if name not in ('game_id', 'pick_date', 'created_at')]
+            dialect_name = session.get_bind().dialect.name
+            if dialect_name in UPSERT_DIALECTS:
+                stmt = upsert_statement(
+                    dialect_name, PickModel, [values],
+                    conflict_columns=('game_id', 'pick_date'),
+                    update_columns=update_columns,
+                    # Legacy databases enforce uniqueness with a partial index on rows that have a pick_date
+                    conflict_where=PickModel.pick_date.isnot(None),
+                ).returning(PickModel.id)
+                pick.id = session.execute(stmt).scalar_one()
             else:
-                # Create new record
-                pick_model = PickModel(
-                    game_id=pick.game_id,
-                    bet_type=pick.bet_type,
-                    line=line_from_db,  # Use line from betting line database
-                    odds=odds_from_db,  # Use odds from betting line database
-                    stake_units=pick.stake_units,
-                    stake_amount=pick.stake_amount,
-                    rationale=pick.rationale,
-                    confidence=pick.confidence,
-                    expected_value=pick.expected_value,
-                    book=pick.book,
-                    parlay_legs=pick.parlay_legs,
-                    selection_text=pick.selection_text,
-                    team_id=team_id,
-                    best_bet=pick.best_bet,
-                    confidence_score=pick.confidence_score,
-                    # Note: favorite field is deprecated in favor of best_bet (defaults to False in schema)
-                    pick_date=pick_date,
-                    created_at=pick.created_at if pick.created_at else datetime.now()
-                )
-                session.add(pick_model)
-                session.flush()
-                pick.id = pick_model.id
+                existing = session.query(PickModel).filter_by(game_id=pick.game_id, pick_date=pick_date).first()
+                if existing:
+                    for name in update_columns:
+                        setattr(existing, name, values[name])
+                else:
+                    existing = PickModel(**values)
+                    session.add(existing)
+                    session.flush()
+                pick.id = existing.id
             
             session.commit()
             
@@ -417,6 +414,47 @@ class PersistenceService:
         finally:
             session.close()
     
+    def delete_picks(self, game_ids: Iterable[int], target_date: date) -> int:
+        """
+        Delete the picks for these games on target_date, with their pending bets
+        
+        A line refresh re-picks only the games whose lines moved; an earlier pick for one of
+        them that the Picker no longer takes must not stay on the card. Picks whose bet has
+        already settled are kept.
+        
+        Returns:
+            Number of picks deleted
+        """
+        game_ids = [game_id for game_id in game_ids if game_id is not None]
+        if not self.db or not game_ids:
+            return 0
+        
+        session = self.db.get_session()
+        try:
+            deleted = 0
+            for pick_model in session.query(PickModel).filter(
+                PickModel.game_id.in_(game_ids), PickModel.pick_date == target_date
+            ).all():
+                if pick_model.bet is not None:
+                    if pick_model.bet.result != BetResult.PENDING:
+                        logger.warning(f"Keeping pick {pick_model.id} for game_id={pick_model.game_id}: bet already settled")
+                        continue
+                    session.delete(pick_model.bet)
+                if pick_model.compliance_result is not None:
+                    session.delete(pick_model.compliance_result)
+                session.delete(pick_model)
+                deleted += 1
+            session.commit()
+            if deleted:
+                logger.info(f"Deleted {deleted} picks no longer on the {target_date} card")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting picks: {e}", exc_info=True)
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+    
     def place_bets(self, picks: List[Pick]) -> List[Bet]:
         """Place bets (simulation mode)"""
         if not self.db:
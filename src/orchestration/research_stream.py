@@ -0,0 +1,112 @@
+"""Streaming Researcher -> Modeler -> Picker stage: model and pick each research batch as it lands"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.agents.modeler import Modeler
+from src.agents.picker import Picker
+from src.data.models import BettingLine
+from src.orchestration.prediction_persistence import PredictionPersistenceService
+from src.utils.logging import get_logger
+
+logger = get_logger("orchestration.research_stream")
+
+
+class ResearchStream:
+    """
+    Consumes Researcher output batch by batch (pass on_insights to Researcher.process).
+
+    Each delivered group of insights is modeled right away (the modeler is deterministic and
+    needs only a game's insight and lines) and its predictions are saved. Once picker_batch_size
+    games have been modeled they are handed to a Picker call on a worker thread, so picking
+    overlaps the research batches still in flight. finish() picks the remainder and returns
+    the merged Modeler and Picker outputs.
+    """
+
+    def __init__(
+        self,
+        modeler: Modeler,
+        picker: Picker,
+        prediction_persistence: PredictionPersistenceService,
+        betting_lines: List[BettingLine],
+        target_date: date,
+        historical_performance: Optional[Dict[str, Any]] = None,
+        max_concurrent_picks: int = 2,
+    ):
+        self.modeler = modeler
+        self.picker = picker
+        self.prediction_persistence = prediction_persistence
+        self.target_date = target_date
+        self.historical_performance = historical_performance
+        self.lines_by_game: Dict[str, List[BettingLine]] = {}
+        for line in betting_lines:
+            self.lines_by_game.setdefault(str(line.game_id), []).append(line)
+
+        self.game_models: List[Dict[str, Any]] = []
+        self._models_by_id: Dict[str, Dict[str, Any]] = {}
+        self._pending: List[Dict[str, Any]] = []  # Modeled insights not yet sent to the Picker
+        self._pick_futures: List[Future] = []
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent_picks), thread_name_prefix="picker")
+
+    def __enter__(self) -> "ResearchStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._executor.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+
+    def on_insights(self, insights: List[Dict[str, Any]]) -> None:
+        """Model, save and queue one group of finished insights"""
+        game_lines = [line for insight in insights for line in self.lines_by_game.get(str(insight.get("game_id")), [])]
+        try:
+            models = self.modeler.model_games(insights, game_lines)
+        except Exception as e:
+            logger.error(f"Error modeling streamed research batch: {e}", exc_info=True)
+            models = []
+        if models:
+            try:
+                self.prediction_persistence.save_predictions({"game_models": models}, self.target_date)
+            except Exception as e:
+                logger.error(f"Error saving streamed predictions: {e}", exc_info=True)
+        for model in models:
+            self._models_by_id[str(model.get("game_id"))] = model
+        self.game_models.extend(models)
+        logger.info(f"🌊 Modeled {len(models)}/{len(insights)} streamed games ({len(self.game_models)} total)")
+
+        self._pending.extend(insights)
+        while len(self._pending) >= self.picker.batch_size:
+            chunk, self._pending = self._pending[:self.picker.batch_size], self._pending[self.picker.batch_size:]
+            self._submit_picks(chunk)
+
+    def _submit_picks(self, insights: List[Dict[str, Any]]) -> None:
+        batch_num = len(self._pick_futures) + 1
+        models = [self._models_by_id[gid] for gid in (str(g.get("game_id")) for g in insights) if gid in self._models_by_id]
+        logger.debug(f"Submitting picker batch {batch_num} ({len(insights)} games, {len(models)} models)")
+        self._pick_futures.append(self._executor.submit(
+            self.picker.pick_batch, insights, models, self.historical_performance, batch_num
+        ))
+
+    def finish(self, insights: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Pick any remaining games and wait for all Picker calls
+
+        Args:
+            insights: The Researcher's full output (fixes the order of the returned game models)
+
+        Returns:
+            Tuple of (modeler_output, picker_response) shaped like Modeler.process / Picker.process
+        """
+        if self._pending:
+            self._submit_picks(self._pending)
+            self._pending = []
+
+        candidate_picks: List[Dict[str, Any]] = []
+        for batch_num, future in enumerate(self._pick_futures, start=1):
+            try:
+                candidate_picks.extend(future.result())
+            except Exception as e:
+                logger.error(f"Picker batch {batch_num} failed: {e}", exc_info=True)
+
+        positions = {str(g.get("game_id")): i for i, g in enumerate(insights.get("games", []))}
+        game_models = sorted(self.game_models, key=lambda m: positions.get(str(m.get("game_id")), len(positions)))
+        return {"game_models": game_models}, {"candidate_picks": candidate_picks, "overall_strategy_summary": []}
@@ -0,0 +1,228 @@
+"""Per-step timing for Coordinator workflows: wall/CPU time, DB queries, LLM time and optional cProfile dumps"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from src.utils.llm_telemetry import llm_time_totals
+from src.utils.logging import get_logger
+
+logger = get_logger("orchestration.step_timing")
+
+
+def _timing_config() -> Dict[str, Any]:
+    from src.utils.config import config
+    return config.get('timing', {}) or {}
+
+
+@dataclass
+class StepTiming:
+    """Resources one workflow step used"""
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0            # Process CPU time (includes agent worker threads)
+    db_queries: int = 0
+    llm_calls: int = 0
+    llm_s: float = 0.0            # Summed LLM call latency; exceeds wall_s when calls run concurrently
+    error: Optional[str] = None
+
+
+@dataclass
+class StepTimer:
+    """
+    Times the steps of one workflow run.
+
+    Wrap a step in `with timer.step("research"):` (or decorate a Coordinator method with
+    @timed_step). DB statements are counted with a SQLAlchemy cursor listener on engine and,
+    when it is a separate engine (file-backed SQLite), on the reporting read_engine; LLM time
+    comes from the telemetry totals. With profile=True each step also runs under cProfile and
+    its stats are dumped to <profile_dir>/<run_id>/<step>.pstats (cProfile sees only the
+    coordinator thread, so time spent in agent worker pools shows up as waits).
+    """
+    engine: Any = None
+    read_engine: Any = None
+    profile: bool = False
+    run_id: Optional[str] = None
+    steps: List[StepTiming] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.now)
+    _queries: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _depth: int = 0
+
+    def __post_init__(self):
+        for engine in self._engines():
+            event.listen(engine, "before_cursor_execute", self._count_query)
+
+    def _engines(self) -> List[Any]:
+        engines = [self.engine] if self.engine is not None else []
+        if self.read_engine is not None and self.read_engine is not self.engine:
+            engines.append(self.read_engine)
+        return engines
+
+    def _count_query(self, *args, **kwargs) -> None:
+        with self._lock:
+            self._queries += 1
+
+    def detach(self) -> None:
+        """Stop counting queries on the engines"""
+        for engine in self._engines():
+            if event.contains(engine, "before_cursor_execute", self._count_query):
+                event.remove(engine, "before_cursor_execute", self._count_query)
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[StepTiming]:
+        """Measure the block as step name (steps nested in another step are not recorded separately)"""
+        timing = StepTiming(name=name)
+        if self._depth:
+            yield timing
+            return
+        self._depth += 1
+        llm_before = llm_time_totals()
+        queries_before = self._queries
+        profiler = cProfile.Profile() if self.profile else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield timing
+        except Exception as e:
+            timing.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            timing.wall_s = time.perf_counter() - wall_start
+            timing.cpu_s = time.process_time() - cpu_start
+            timing.db_queries = self._queries - queries_before
+            llm_after = llm_time_totals()
+            timing.llm_calls = int(llm_after["calls"] - llm_before["calls"])
+            timing.llm_s = (llm_after["latency_ms"] - llm_before["latency_ms"]) / 1000
+            self._depth -= 1
+            self.steps.append(timing)
+            logger.info(
+                f"⏱️  {name}: {timing.wall_s:.1f}s wall, {timing.cpu_s:.1f}s CPU, "
+                f"{timing.db_queries} queries, {timing.llm_calls} LLM calls ({timing.llm_s:.1f}s)"
+            )
+            if profiler is not None:
+                self._dump_profile(name, profiler)
+
+    def _dump_profile(self, name: str, profiler: cProfile.Profile) -> None:
+        profile_dir = Path(_timing_config().get('profile_dir', 'data/profiles')) / (self.run_id or "run")
+        try:
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            path = profile_dir / f"{name}.pstats"
+            profiler.dump_stats(str(path))
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+            logger.debug(f"Top functions for {name} by cumulative time:\n{out.getvalue()}")
+            logger.info(f"🔬 Profile for {name} saved to {path}")
+        except OSError as e:
+            logger.warning(f"Could not save profile for {name}: {e}")
+
+    def summary(self, kind: str, target_date: Any) -> Dict[str, Any]:
+        """JSON-serializable run summary"""
+        return {
+            "run_id": self.run_id,
+            "kind": kind,
+            "target_date": str(target_date),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_wall_s": round(sum(s.wall_s for s in self.steps), 3),
+            "steps": [
+                {k: (round(v, 3) if isinstance(v, float) else v) for k, v in asdict(s).items()}
+                for s in self.steps
+            ],
+        }
+
+
+def timed_step(name: str) -> Callable:
+    """Run a Coordinator method under self.step_timer.step(name) when a timer is active"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = getattr(self, "step_timer", None)
+            if timer is None:
+                return method(self, *args, **kwargs)
+            with timer.step(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_run_summaries(kind: str, limit: int, summary_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """The most recent saved summaries of this workflow kind, newest first"""
+    summary_dir = summary_dir or Path(_timing_config().get('summary_dir', 'data/runs'))
+    if not summary_dir.exists():
+        return []
+    summaries = []
+    for path in sorted(summary_dir.glob(f"{kind}-*.json"), reverse=True):
+        try:
+            summaries.append(json.loads(path.read_text()))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skipping unreadable run summary {path}: {e}")
+        if len(summaries) >= limit:
+            break
+    return summaries
+
+
+def find_regressions(summary: Dict[str, Any], history: List[Dict[str, Any]], factor: float,
+                     min_seconds: float) -> List[str]:
+    """Steps whose wall time exceeds factor x their median over history (ignoring steps under min_seconds)"""
+    previous: Dict[str, List[float]] = {}
+    for run in history:
+        for step in run.get("steps", []):
+            if not step.get("error"):
+                previous.setdefault(step["name"], []).append(step["wall_s"])
+    regressions = []
+    for step in summary["steps"]:
+        times = previous.get(step["name"])
+        if not times or step["wall_s"] < min_seconds:
+            continue
+        median = statistics.median(times)
+        if median > 0 and step["wall_s"] > factor * median:
+            regressions.append(
+                f"{step['name']} took {step['wall_s']:.1f}s vs {median:.1f}s median over the last {len(times)} runs"
+            )
+    return regressions
+
+
+def save_run_summary(timer: StepTimer, kind: str, target_date: Any) -> Optional[Path]:
+    """Write the run's step timings to <summary_dir>/<run_id>.json and log steps that regressed"""
+    settings = _timing_config()
+    summary_dir = Path(settings.get('summary_dir', 'data/runs'))
+    summary = timer.summary(kind, target_date)
+    history = load_run_summaries(kind, int(settings.get('regression_window', 7)), summary_dir)
+
+    logger.info("⏱️  STEP TIMINGS")
+    for step in summary["steps"]:
+        logger.info(
+            f"  {step['name']:16} {step['wall_s']:>8.1f}s wall {step['cpu_s']:>7.1f}s CPU "
+            f"{step['db_queries']:>6} queries {step['llm_calls']:>4} LLM calls {step['llm_s']:>7.1f}s LLM"
+            + (" (failed)" if step["error"] else "")
+        )
+    for message in find_regressions(summary, history, float(settings.get('regression_factor', 1.5)),
+                                    float(settings.get('regression_min_seconds', 5.0))):
+        logger.warning(f"🐢 Step slower than usual: {message}")
+
+    name = timer.run_id or f"{kind}-{target_date}-{timer.started_at:%H%M%S}"
+    path = summary_dir / f"{name}.json"
+    try:
+        summary_dir.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(summary, indent=2))
+    except OSError as e:
+        logger.warning(f"Could not save run summary: {e}")
+        return None
+    logger.debug(f"Run summary saved to {path}")
+    return path
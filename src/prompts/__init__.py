@@ -22,7 +22,7 @@ from .email_prompts import (
     watch_description_prompts,
 )
 from .scrapers_prompts import kenpom_match_prompts
-from .utils_prompts import generic_agent_user_prompt
+from .utils_prompts import compose_user_prompt, generic_agent_user_prompt
 
 __all__ = [
     "AUDITOR_PROMPT",
@@ -45,6 +45,7 @@ __all__ = [
     "watch_blurbs_prompts",
     "watch_description_prompts",
     "kenpom_match_prompts",
+    "compose_user_prompt",
     "generic_agent_user_prompt",
 ]
 
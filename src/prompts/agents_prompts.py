@@ -1,5 +1,7 @@
 """Agent prompts for the multi-agent sports betting system."""
 
+from .utils_prompts import compose_user_prompt
+
 PLANNING_AGENT_PROMPT = """
 You are the PLANNING AGENT for a multi-agent sports betting system.
 
@@ -257,10 +259,10 @@ If data cannot be found, state so in dq array.
 """
 
 RESEARCHER_BATCH_PROMPT = """
-Research the following {num_games} games and return JSON with insights for ALL games.
+Research the games in the input data and return JSON with insights for ALL of them.
 
 === CRITICAL BATCH REQUIREMENTS ===
-- Response MUST contain a games[] array covering ALL {num_games} game_ids from the input data.
+- Response MUST contain a games[] array covering EVERY game_id from the input data.
 - Do not skip any games, even if data is limited or confidence is low.
 - For games with limited data, use lower confidence scores and note limitations in dq array.
 
@@ -592,7 +594,7 @@ Focus on:
 - Positive expected value (edge > 0) when possible
 - Reasonable confidence levels
 - Clear reasoning that combines model edge with contextual factors
-{historical_context}
+
 Provide clear, detailed justification for each pick that explains:
 - Why this specific bet type was chosen (spread vs total vs moneyline)
 - How the model edge supports this pick
@@ -600,12 +602,12 @@ Provide clear, detailed justification for each pick that explains:
 - How historical performance patterns informed this selection"""
 
 
-def build_picker_user_prompt(historical_performance, serializable_input_data):
+def build_picker_user_prompt(historical_performance, serializable_input_data, encoding=None):
     """Build the full Picker user prompt with optional historical context and input JSON.
 
     Caller must pass already JSON-serializable input (e.g. via _make_json_serializable).
+    encoding is the agent's PayloadEncoding; None writes the input as indented JSON.
     """
-    import json
 
     historical_context = ""
     if historical_performance:
@@ -621,11 +623,10 @@ def build_picker_user_prompt(historical_performance, serializable_input_data):
             bet_type_performance=hp.get("bet_type_performance", {}),
             recent_recommendations=hp.get("recent_recommendations", []),
         )
-    user_prompt = PICKER_USER_INSTRUCTIONS.format(historical_context=historical_context)
-    return f"""{user_prompt}
-
-Input data:
-{json.dumps(serializable_input_data, indent=2)}"""
+    # Historical context changes between runs, so it follows the static instructions
+    return compose_user_prompt(
+        PICKER_USER_INSTRUCTIONS, serializable_input_data, context=historical_context, encoding=encoding
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -720,26 +721,21 @@ def build_president_user_prompt(auditor_feedback):
 # Researcher final prompt (after tool calls, instruct LLM to return JSON only)
 # ---------------------------------------------------------------------------
 
-RESEARCHER_FINAL_INSTRUCTIONS_TEMPLATE = """{user_prompt}
-
-CRITICAL INSTRUCTIONS - YOU MUST FOLLOW THESE EXACTLY:
+RESEARCHER_FINAL_INSTRUCTIONS = """CRITICAL INSTRUCTIONS - YOU MUST FOLLOW THESE EXACTLY:
 1. You have received the results from your web searches. DO NOT request additional tool calls.
 2. You MUST return ONLY valid JSON in the exact format specified by the response schema.
 3. DO NOT include any explanatory text, tool call instructions, or markdown formatting.
 4. DO NOT write "Now searching..." or "Calling..." - just return the JSON directly.
-5. Your response must be a valid JSON object starting with {{ and ending with }}.
-6. Return game insights for ALL {num_games} games in the "games" array.
+5. Your response must be a valid JSON object starting with { and ending with }.
+6. Return game insights for ALL games in the input data in the "games" array.
 7. **CRITICAL: If adv.away or adv.home fields already have values (kp_rank, adjo, adjd, adjt, net, conference, wins, losses, w_l, luck, sos, ncsos), DO NOT CHANGE THEM. These are pre-populated programmatically and are authoritative. Only add missing fields or populate fields that are empty.**
 
 Return your JSON response now:"""
 
 
-def build_researcher_final_prompt(user_prompt: str, num_games: int) -> str:
-    """Build the Researcher follow-up prompt after tool results (JSON-only instruction)."""
-    return RESEARCHER_FINAL_INSTRUCTIONS_TEMPLATE.format(
-        user_prompt=user_prompt,
-        num_games=num_games,
-    )
+def build_researcher_final_prompt() -> str:
+    """Researcher follow-up prompt sent after tool results (JSON-only instruction)."""
+    return RESEARCHER_FINAL_INSTRUCTIONS
 
 
 __all__ = [
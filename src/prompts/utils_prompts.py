@@ -1,7 +1,7 @@
 """Generic utility prompts (e.g. agent user prompt template)."""
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 GENERIC_AGENT_USER_TEMPLATE = """Please process the following input data and provide your response in the specified JSON format.
 
@@ -17,4 +17,33 @@ def generic_agent_user_prompt(input_data: Dict[str, Any]) -> str:
     )
 
 
-__all__ = ["generic_agent_user_prompt"]
+def compose_user_prompt(
+    instructions: str,
+    input_data: Optional[Any] = None,
+    context: Optional[str] = None,
+    encoding: Optional[Any] = None,
+) -> str:
+    """Build a user prompt as a stable prefix followed by per-call content.
+
+    Providers cache prompt prefixes (OpenAI automatically above 1024 tokens), and a cache hit
+    needs the prefix to be byte-identical. The system prompt and fixed instructions therefore
+    come first. Anything that changes between calls comes after them: context such as the
+    batch size or recent performance, then the input data.
+
+    encoding is a PayloadEncoding (src.utils.payload_encoding). Its legend depends only on the
+    agent, so it joins the static prefix; without one the data is written as indented JSON.
+    """
+    parts = [instructions.rstrip()]
+    if encoding is not None and input_data is not None:
+        legend = encoding.legend()
+        if legend:
+            parts.append(legend)
+    if context:
+        parts.append(context.strip())
+    if input_data is not None:
+        data_text = encoding.encode(input_data) if encoding is not None else json.dumps(input_data, indent=2)
+        parts.append(f"Input data:\n{data_text}")
+    return "\n\n".join(parts)
+
+
+__all__ = ["compose_user_prompt", "generic_agent_user_prompt"]
@@ -1,38 +1,59 @@
 """Configuration management"""
 
 import os
-import yaml
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
 from src.utils.logging import get_logger
 
-load_dotenv()
-
 logger = get_logger("utils.config")
 
+_dotenv_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def load_env() -> None:
+    """Load .env into the environment once, on first config access"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _dotenv_loaded = True
+
 
 class Config:
-    """Configuration manager"""
+    """Configuration manager (config.yaml and .env are read on first access, not at import)"""
     
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize configuration"""
         self.config_path = Path(config_path)
-        self._config: Dict[str, Any] = {}
-        self.load()
+        self._config: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
     
     def load(self) -> None:
         """Load configuration from YAML file"""
+        import yaml
+        load_env()
         if self.config_path.exists():
             with open(self.config_path, 'r') as f:
                 self._config = yaml.safe_load(f) or {}
         else:
             self._config = {}
     
+    def _loaded(self) -> Dict[str, Any]:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self.load()
+        return self._config
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation"""
         keys = key.split('.')
-        value = self._config
+        value = self._loaded()
         for k in keys:
             if isinstance(value, dict):
                 value = value.get(k)
@@ -44,6 +65,7 @@ class Config:
     
     def get_kenpom_credentials(self) -> Optional[Dict[str, str]]:
         """Get KenPom credentials from environment variables"""
+        load_env()
         email = os.getenv('KENPOM_EMAIL')
         password = os.getenv('KENPOM_PASSWORD')
         
@@ -59,14 +81,17 @@ class Config:
     
     def get_database_url(self) -> str:
         """Get database URL from environment or config"""
+        load_env()
         return os.getenv('DATABASE_URL', 'sqlite:///data/db/terrarium.db')
     
     def get_log_level(self) -> str:
         """Get log level"""
+        load_env()
         return os.getenv('LOG_LEVEL', 'INFO')
     
     def is_debug_mode(self) -> bool:
         """Check if debug mode is enabled"""
+        load_env()
         return os.getenv('DEBUG', '').lower() in ('true', '1', 'yes') or self.get('debug', False)
     
     def get_agent_model(self, agent_name: str) -> str:
@@ -0,0 +1,182 @@
+"""Preloaded database rows for one day's email, so sections render without per-row queries"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import or_
+
+from src.data.models import BetResult, BetType
+from src.data.storage import (
+    BetModel, BettingLineModel, Database, GameInsightModel, GameModel, PickModel, PredictionModel, TeamModel
+)
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.email_data")
+
+# First day counted in year-to-date results
+YTD_START_DATE = date(2025, 11, 23)
+
+
+def _day(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _first_by_key(rows: Iterable, key: str) -> Dict[int, object]:
+    """Map key -> first row (rows ordered by id), matching query(...).filter_by(key=...).first()"""
+    mapped: Dict[int, object] = {}
+    for row in rows:
+        mapped.setdefault(getattr(row, key), row)
+    return mapped
+
+
+class EmailDataContext:
+    """
+    Games, teams, insights, predictions, spread lines, picks and bets for target_date and the day
+    before, plus year-to-date picks through target_date, loaded in seven queries.
+
+    Rows are detached from the session once loaded; every email section reads from here.
+    """
+
+    def __init__(
+        self,
+        target_date: date,
+        games: List[GameModel],
+        teams: List[TeamModel],
+        insights: List[GameInsightModel],
+        predictions: List[PredictionModel],
+        spread_lines: List[BettingLineModel],
+        picks: List[PickModel],
+        ytd_picks: List[PickModel],
+        bets: List[BetModel],
+    ):
+        self.target_date = target_date
+        self.yesterday = target_date - timedelta(days=1)
+        self.games: Dict[int, GameModel] = {g.id: g for g in games}
+        self.teams: Dict[int, TeamModel] = {t.id: t for t in teams}
+        self.insights = _first_by_key(insights, "game_id")
+        self.predictions = _first_by_key(predictions, "game_id")
+        self.picks = picks
+        self.ytd_picks = ytd_picks
+        self.bets: Dict[int, BetModel] = {b.pick_id: b for b in bets}
+        self._spread_lines: Dict[int, List[BettingLineModel]] = {}
+        for line in spread_lines:
+            self._spread_lines.setdefault(line.game_id, []).append(line)
+
+    @classmethod
+    def load(cls, db: Database, target_date: date, ytd_start: date = YTD_START_DATE) -> "EmailDataContext":
+        """Load everything the email needs for target_date (and the day before)"""
+        yesterday = target_date - timedelta(days=1)
+        days = [yesterday, target_date]
+        session = db.get_read_session()
+        try:
+            # One range scan on ix_picks_pick_date covers both today's/yesterday's picks and the YTD window
+            window_start = min(ytd_start, yesterday)
+            all_picks = session.query(PickModel).filter(
+                PickModel.pick_date >= window_start,
+                PickModel.pick_date <= target_date
+            ).order_by(PickModel.id).all()
+            picks = [p for p in all_picks if p.pick_date in days]
+            ytd_picks = [p for p in all_picks if p.pick_date >= ytd_start]
+
+            pick_game_ids = {p.game_id for p in picks}
+            games = session.query(GameModel).filter(
+                or_(GameModel.date.in_(days), GameModel.id.in_(pick_game_ids))
+            ).all()
+            game_ids = [g.id for g in games]
+
+            team_ids = {g.team1_id for g in games} | {g.team2_id for g in games} | {p.team_id for p in picks if p.team_id}
+            teams = session.query(TeamModel).filter(TeamModel.id.in_(team_ids)).all()
+            insights = session.query(GameInsightModel).filter(
+                GameInsightModel.game_id.in_(game_ids)
+            ).order_by(GameInsightModel.id).all()
+            predictions = session.query(PredictionModel).filter(
+                PredictionModel.game_id.in_(game_ids),
+                PredictionModel.prediction_date == target_date
+            ).order_by(PredictionModel.id).all()
+            spread_lines = session.query(BettingLineModel).filter(
+                BettingLineModel.game_id.in_(game_ids),
+                BettingLineModel.bet_type == BetType.SPREAD
+            ).order_by(BettingLineModel.timestamp.desc()).all()
+
+            bets = session.query(BetModel).filter(BetModel.pick_id.in_([p.id for p in all_picks])).all()
+        finally:
+            session.close()
+
+        logger.debug(
+            f"Email data for {target_date}: {len(games)} games, {len(picks)} picks, "
+            f"{len(ytd_picks)} YTD picks, {len(bets)} bets"
+        )
+        return cls(target_date, games, teams, insights, predictions, spread_lines, picks, ytd_picks, bets)
+
+    def games_on(self, day: date) -> List[GameModel]:
+        """Games scheduled on day"""
+        return [g for g in self.games.values() if _day(g.date) == day]
+
+    def game(self, game_id: Optional[int]) -> Optional[GameModel]:
+        return self.games.get(game_id)
+
+    def team_name(self, team_id: Optional[int]) -> str:
+        """Official team name for team_id"""
+        if not team_id:
+            return "Unknown Team"
+        team = self.teams.get(team_id)
+        if team:
+            return team.normalized_team_name
+        return f"Unknown Team #{team_id}"
+
+    def insight(self, game_id: Optional[int]) -> Optional[GameInsightModel]:
+        return self.insights.get(game_id)
+
+    def prediction(self, game_id: Optional[int]) -> Optional[PredictionModel]:
+        """Prediction made on target_date for the game"""
+        return self.predictions.get(game_id)
+
+    def spread_lines(self, game_id: Optional[int]) -> List[BettingLineModel]:
+        """Spread lines for the game, newest first"""
+        return self._spread_lines.get(game_id, [])
+
+    def picks_for_day(self, day: date) -> List[PickModel]:
+        """Picks dated day, highest confidence first"""
+        picks = [p for p in self.picks if p.pick_date == day]
+        return sorted(picks, key=lambda p: (p.confidence is None, -(p.confidence or 0.0)))
+
+    def picks_created_on(self, day: date) -> List[PickModel]:
+        """Picks created on day"""
+        return [p for p in self.picks if _day(p.created_at) == day]
+
+    def bet(self, pick_id: Optional[int]) -> Optional[BetModel]:
+        return self.bets.get(pick_id)
+
+    def results_for_day(self, day: date) -> Dict[str, Any]:
+        """Picks dated day with their bets, shaped like Database.get_results_for_date"""
+        picks = sorted(
+            (p for p in self.picks if p.pick_date == day),
+            key=lambda p: p.created_at or datetime.min, reverse=True
+        )
+        bets = [self.bets[p.id] for p in picks if p.id in self.bets]
+        return {
+            'picks': picks,
+            'bets': bets,
+            'bet_map': {bet.pick_id: bet for bet in bets},
+            'stats': {
+                'total_picks': len(picks),
+                'settled_bets': len([b for b in bets if b.result != BetResult.PENDING]),
+                'wins': len([b for b in bets if b.result == BetResult.WIN]),
+                'losses': len([b for b in bets if b.result == BetResult.LOSS]),
+                'pushes': len([b for b in bets if b.result == BetResult.PUSH]),
+                'pending': len([b for b in bets if b.result == BetResult.PENDING])
+            }
+        }
+
+    def settled_ytd_picks(self, best_bets_only: bool = False) -> List[tuple]:
+        """(pick, bet) for year-to-date picks whose bet has settled"""
+        settled = []
+        for pick in self.ytd_picks:
+            if best_bets_only and not pick.best_bet:
+                continue
+            bet = self.bets.get(pick.id)
+            if bet and bet.result != BetResult.PENDING:
+                settled.append((pick, bet))
+        return settled
@@ -11,11 +11,9 @@ from email.mime.text import MIMEText
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import func, or_, and_
-
 from src.agents.results_processor import ResultsProcessor
 from src.data.models import BetResult, BetType
-from src.data.storage import BetModel, Database, GameModel, PickModel, GameInsightModel, PredictionModel, BettingLineModel, TeamModel
+from src.data.storage import Database, GameModel, PickModel, GameInsightModel, PredictionModel
 from src.prompts import (
     best_bet_summary_prompts,
     daily_recap_prompts,
@@ -25,6 +23,7 @@ from src.prompts import (
     watch_description_prompts,
 )
 from src.utils.config import config
+from src.utils.email.email_data import EmailDataContext
 from src.utils.llm import LLMClient, get_llm_client
 from src.utils.logging import get_logger
 from src.utils.odds import american_odds_to_profit_multiplier
@@ -50,22 +49,18 @@ class EmailGenerator:
             else:
                 model_name = config.get("llm.model", "gemini-2.5-flash")
 
-            self.llm_client = LLMClient(model=model_name)
+            self.llm_client = LLMClient(model=model_name, agent_name="email")
         except Exception as e:
             logger.warning(f"Could not initialize LLM client: {e}. Recap generation will be disabled.")
             self.llm_client = None
+        # Preloaded rows for the email being generated (see _get_context)
+        self._context: Optional[EmailDataContext] = None
     
-    def _get_team_name(self, team_id: Optional[int], session) -> str:
-        """Get official team name from database using team_id"""
-        if not team_id or not session:
-            return "Unknown Team"
-        try:
-            team = session.query(TeamModel).filter_by(id=team_id).first()
-            if team:
-                return team.normalized_team_name
-        except Exception as e:
-            logger.debug(f"Error getting team name for team_id {team_id}: {e}")
-        return f"Unknown Team #{team_id}"
+    def _get_context(self, target_date: date) -> EmailDataContext:
+        """Rows for target_date's email, loaded once and reused by every section"""
+        if self._context is None or self._context.target_date != target_date:
+            self._context = EmailDataContext.load(self.db, target_date)
+        return self._context
     
     def _format_game_time_est(self, game_time_est: Optional[datetime]) -> str:
         """
@@ -122,7 +117,7 @@ class EmailGenerator:
             return f"({kp_rank}) {team_name}"
         return team_name
     
-    def _get_kenpom_ranks(self, game: GameModel, session) -> Tuple[Optional[int], Optional[int]]:
+    def _get_kenpom_ranks(self, game: GameModel, context: EmailDataContext) -> Tuple[Optional[int], Optional[int]]:
         """
         Get KenPom ranks for both teams in a game
         
@@ -132,7 +127,7 @@ class EmailGenerator:
         
         Args:
             game: GameModel instance
-            session: Database session
+            context: Preloaded email data holding the game's insight
             
         Returns:
             Tuple of (team1_kp_rank, team2_kp_rank) or (None, None) if not available
@@ -142,7 +137,7 @@ class EmailGenerator:
         
         # First, try GameInsightModel
         try:
-            insight = session.query(GameInsightModel).filter_by(game_id=game.id).first()
+            insight = context.insight(game.id)
             if insight:
                 team1_stats = insight.team1_stats if insight.team1_stats else {}
                 team2_stats = insight.team2_stats if insight.team2_stats else {}
@@ -244,14 +239,11 @@ class EmailGenerator:
         if not self.db:
             return None
         
-        session = self.db.get_session()
         try:
-            from sqlalchemy import func
+            context = self._get_context(target_date)
             
             # Get all games for target date
-            games = session.query(GameModel).filter(
-                func.date(GameModel.date) == target_date
-            ).all()
+            games = context.games_on(target_date)
             
             if not games:
                 return {
@@ -268,9 +260,9 @@ class EmailGenerator:
             missing_data_count = 0
             
             for game in games:
-                team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 
                 matchup_info = {
                     'home': team1_name,
@@ -374,8 +366,6 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error generating slate summary: {e}")
             return None
-        finally:
-            session.close()
     
     def _gather_email_data(
         self,
@@ -427,6 +417,9 @@ class EmailGenerator:
         
         yesterday = target_date - timedelta(days=1)
         
+        # Drop rows preloaded for an earlier email; the context is reloaded on first use below
+        self._context = None
+        
         # Get yesterday's results (for games that happened on yesterday)
         yesterday_results = self._get_yesterday_results(target_date)
         
@@ -477,6 +470,9 @@ class EmailGenerator:
         
         yesterday = target_date - timedelta(days=1)
         
+        # Drop rows preloaded for an earlier email; the context is reloaded on first use below
+        self._context = None
+        
         # Get yesterday's results
         yesterday_results = self._get_yesterday_results(target_date)
         
@@ -999,8 +995,8 @@ class EmailGenerator:
         yesterday = target_date - timedelta(days=1)
         
         try:
-            # Get results from database
-            results = self.db.get_results_for_date(yesterday)
+            # Get results from the email's preloaded database rows
+            results = self._get_context(target_date).results_for_day(yesterday)
             
             if not results or not results.get('picks'):
                 return None
@@ -1165,17 +1161,16 @@ class EmailGenerator:
                 # Try to get matchup from database
                 matchup = "Matchup TBD"
                 if self.db and game_id:
-                    session = self.db.get_session()
+                    context = self._get_context(target_date)
                     try:
-                        from src.data.storage import GameModel
-                        game = session.query(GameModel).filter(GameModel.id == int(game_id)).first()
+                        game = context.game(int(game_id))
                         if game:
                             # Get official team names from database using team_id
-                            team1_name = self._get_team_name(game.team1_id, session)
-                            team2_name = self._get_team_name(game.team2_id, session)
+                            team1_name = context.team_name(game.team1_id)
+                            team2_name = context.team_name(game.team2_id)
                             
                             # Get KenPom ranks
-                            team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
+                            team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
                             
                             # Format teams with ranks
                             team1_formatted = self._format_team_with_rank(team1_name, team1_kp)
@@ -1192,8 +1187,6 @@ class EmailGenerator:
                                 matchup += f" ({game.venue})"
                     except (ValueError, TypeError):
                         pass
-                    finally:
-                        session.close()
                 
                 return {
                     'matchup': matchup,
@@ -1233,32 +1226,24 @@ class EmailGenerator:
         if not self.db:
             return []
         
-        session = self.db.get_session()
         try:
             # Get all picks for the target date, ordered by confidence descending (higher confidence = higher confidence_score)
             # Use pick_date with fallback to created_at for legacy records
-            from sqlalchemy import or_
-            from src.utils.team_normalizer import normalize_team_name
-            
-            picks = session.query(PickModel).filter(
-                or_(
-                    PickModel.pick_date == target_date,
-                    func.date(PickModel.created_at) == target_date
-                )
-            ).order_by(PickModel.confidence.desc()).all()
+            context = self._get_context(target_date)
+            picks = context.picks_for_day(target_date)
             
             picks_data = []
             matchup_map = {}  # Map normalized matchup key -> best pick data
             
             for pick in picks:
                 # Get game info
-                game = session.query(GameModel).filter_by(id=pick.game_id).first()
+                game = context.game(pick.game_id)
                 if not game:
                     continue
                 
                 # Format matchup - get official team names from database using team_id
-                team1_name_raw = self._get_team_name(game.team1_id, session)
-                team2_name_raw = self._get_team_name(game.team2_id, session)
+                team1_name_raw = context.team_name(game.team1_id)
+                team2_name_raw = context.team_name(game.team2_id)
                 
                 # Normalize team names for display (remove mascots) to ensure consistency
                 # This handles cases where the same team has multiple entries with different names
@@ -1273,7 +1258,7 @@ class EmailGenerator:
                 matchup_key = tuple(sorted([norm_team1, norm_team2]))
                 
                 # Get KenPom ranks
-                team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
+                team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
                 
                 # Format teams with ranks (using normalized names without mascots)
                 team1_formatted = self._format_team_with_rank(team1_name, team1_kp)
@@ -1294,7 +1279,7 @@ class EmailGenerator:
                 if pick.bet_type == BetType.SPREAD:
                     # Determine which team based on line and team_id
                     if pick.team_id:
-                        pick_team_name_raw = self._get_team_name(pick.team_id, session)
+                        pick_team_name_raw = context.team_name(pick.team_id)
                         # Normalize team name for display (remove mascots)
                         pick_team_name = remove_mascot_from_team_name(pick_team_name_raw)
                         # Get KenPom rank for the picked team
@@ -1334,7 +1319,7 @@ class EmailGenerator:
                     # Use team_id to get official name
                     # Don't include odds in selection text since they're shown in separate column
                     if pick.team_id:
-                        pick_team_name_raw = self._get_team_name(pick.team_id, session)
+                        pick_team_name_raw = context.team_name(pick.team_id)
                         # Normalize team name for display (remove mascots)
                         pick_team_name = remove_mascot_from_team_name(pick_team_name_raw)
                         # Get KenPom rank for the picked team
@@ -1364,16 +1349,11 @@ class EmailGenerator:
                     # Convert 0.0-1.0 to 1-10 scale: 0.1->1, 0.3->3, 0.5->5, 0.7->7, 1.0->10
                     confidence_score = max(1, min(10, int(round(confidence_value * 10))))
                 
-                # For best bets, create a concise summary using LLM
+                # Best bet rationales are summarized by the LLM after deduplication (one batch)
                 rationale = pick.rationale or ""
-                if pick.best_bet and rationale:
-                    rationale = self._summarize_best_bet_rationale(rationale, matchup, selection)
                 
                 # Get prediction for this game
-                prediction = session.query(PredictionModel).filter_by(
-                    game_id=game.id,
-                    prediction_date=target_date
-                ).first()
+                prediction = context.prediction(game.id)
                 
                 # Calculate predicted scores from predicted_spread and predicted_total
                 predicted_score_html = None
@@ -1427,6 +1407,14 @@ class EmailGenerator:
             picks_data = list(matchup_map.values())
             picks_data.sort(key=lambda x: (x['best_bet'], x['confidence_score']), reverse=True)
             
+            # For best bets, create concise summaries using LLM
+            best_bets = [p for p in picks_data if p['best_bet'] and p['rationale']]
+            summaries = self._summarize_best_bet_rationales(
+                [(p['rationale'], p['matchup'], p['selection']) for p in best_bets]
+            )
+            for pick_data, summary in zip(best_bets, summaries):
+                pick_data['rationale'] = summary
+            
             # Remove 'confidence' field before returning (it was only for comparison)
             for pick_data in picks_data:
                 pick_data.pop('confidence', None)
@@ -1435,25 +1423,21 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error getting today's picks: {e}")
             return []
-        finally:
-            session.close()
     
     def _get_today_games(self, target_date: date) -> List[Dict[str, Any]]:
         """Get games scheduled for today"""
         if not self.db:
             return []
         
-        session = self.db.get_session()
         try:
-            games = session.query(GameModel).filter(
-                func.date(GameModel.date) == target_date
-            ).all()
+            context = self._get_context(target_date)
+            games = context.games_on(target_date)
             
             game_list = []
             for game in games:
                 # Get official team names from database using team_id
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 game_time_str = self._format_game_time_est(game.game_time_est)
                 game_list.append({
                     'id': game.id,
@@ -1466,25 +1450,22 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error getting today's games: {e}")
             return []
-        finally:
-            session.close()
     
     def _get_yesterday_games(self, yesterday: date) -> List[Dict[str, Any]]:
         """Get games from yesterday with results"""
         if not self.db:
             return []
         
-        session = self.db.get_session()
         try:
-            games = session.query(GameModel).filter(
-                func.date(GameModel.date) == yesterday
-            ).all()
+            context = self._get_context(yesterday + timedelta(days=1))
+            games = context.games_on(yesterday)
+            yesterday_picks = context.picks_created_on(yesterday)
             
             game_list = []
             for game in games:
                 # Get official team names from database using team_id
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 game_data = {
                     'id': game.id,
                     'team1': team1_name,
@@ -1494,14 +1475,11 @@ class EmailGenerator:
                 }
                 
                 # Get picks for this game to determine favorites/underdogs
-                picks = session.query(PickModel).filter(
-                    PickModel.game_id == game.id,
-                    func.date(PickModel.created_at) == yesterday
-                ).all()
+                picks = [p for p in yesterday_picks if p.game_id == game.id]
                 
                 game_data['picks'] = []
                 for pick in picks:
-                    bet = session.query(BetModel).filter_by(pick_id=pick.id).first()
+                    bet = context.bet(pick.id)
                     if bet:
                         profit_units, profit_dollars = (self._calculate_bet_profit_loss(pick, bet.result)
                             if bet.result != BetResult.PENDING else (None, None))
@@ -1527,22 +1505,20 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error getting yesterday's games: {e}")
             return []
-        finally:
-            session.close()
     
     def _generate_best_bets_review(self, yesterday: date) -> str:
         """Generate detailed HTML review of yesterday's best bets"""
         if not self.db:
             return ""
         
-        session = self.db.get_session()
         try:
             # Get all best bets from yesterday
             # Get the most recent pick per game_id (database constraint ensures uniqueness)
-            all_picks = session.query(PickModel).filter(
-                PickModel.best_bet == True,
-                func.date(PickModel.created_at) == yesterday
-            ).order_by(PickModel.created_at.desc()).all()
+            context = self._get_context(yesterday + timedelta(days=1))
+            all_picks = sorted(
+                (p for p in context.picks_created_on(yesterday) if p.best_bet),
+                key=lambda p: p.created_at, reverse=True
+            )
             
             # Keep only the most recent pick per game_id
             seen_game_ids = set()
@@ -1567,8 +1543,8 @@ class EmailGenerator:
             pending = 0
             
             for pick in picks:
-                game = session.query(GameModel).filter_by(id=pick.game_id).first()
-                bet = session.query(BetModel).filter_by(pick_id=pick.id).first()
+                game = context.game(pick.game_id)
+                bet = context.bet(pick.id)
                 
                 if not game:
                     continue
@@ -1578,11 +1554,11 @@ class EmailGenerator:
                 home_score = game_result.get('home_score', 0)
                 away_score = game_result.get('away_score', 0)
                 # Get official team names from database using team_id
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 
                 # Get KenPom ranks
-                team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
+                team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
                 
                 # Format teams with ranks (use result team names if available, otherwise use database names)
                 home_team_raw = game_result.get('home_team', team1_name)
@@ -1628,7 +1604,7 @@ class EmailGenerator:
                     if pick.bet_type == BetType.SPREAD:
                         # Determine which team based on line and team_id
                         if pick.team_id:
-                            pick_team_name = self._get_team_name(pick.team_id, session)
+                            pick_team_name = context.team_name(pick.team_id)
                             # Get KenPom rank for the picked team
                             pick_team_kp = team1_kp if pick.team_id == game.team1_id else (team2_kp if pick.team_id == game.team2_id else None)
                             pick_team_formatted = self._format_team_with_rank(pick_team_name, pick_team_kp)
@@ -1646,7 +1622,7 @@ class EmailGenerator:
                     elif pick.bet_type == BetType.MONEYLINE:
                         # Use team_id to get official name
                         if pick.team_id:
-                            pick_team_name = self._get_team_name(pick.team_id, session)
+                            pick_team_name = context.team_name(pick.team_id)
                             # Get KenPom rank for the picked team
                             pick_team_kp = team1_kp if pick.team_id == game.team1_id else (team2_kp if pick.team_id == game.team2_id else None)
                             pick_team_formatted = self._format_team_with_rank(pick_team_name, pick_team_kp)
@@ -1738,21 +1714,16 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error generating best bets review: {e}", exc_info=True)
             return ""
-        finally:
-            session.close()
     
     def _generate_best_bets_review_plain(self, yesterday: date) -> str:
         """Generate plain text review of yesterday's best bets"""
         if not self.db:
             return ""
         
-        session = self.db.get_session()
         try:
             # Get all best bets from yesterday
-            picks = session.query(PickModel).filter(
-                PickModel.best_bet == True,
-                func.date(PickModel.created_at) == yesterday
-            ).all()
+            context = self._get_context(yesterday + timedelta(days=1))
+            picks = [p for p in context.picks_created_on(yesterday) if p.best_bet]
             
             if not picks:
                 return ""
@@ -1769,8 +1740,8 @@ class EmailGenerator:
             pending = 0
             
             for pick in picks:
-                game = session.query(GameModel).filter_by(id=pick.game_id).first()
-                bet = session.query(BetModel).filter_by(pick_id=pick.id).first()
+                game = context.game(pick.game_id)
+                bet = context.bet(pick.id)
                 
                 if not game:
                     continue
@@ -1780,11 +1751,11 @@ class EmailGenerator:
                 home_score = game_result.get('home_score', 0)
                 away_score = game_result.get('away_score', 0)
                 # Get official team names from database using team_id
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 
                 # Get KenPom ranks
-                team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
+                team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
                 
                 # Format teams with ranks (use result team names if available, otherwise use database names)
                 home_team_raw = game_result.get('home_team', team1_name)
@@ -1830,7 +1801,7 @@ class EmailGenerator:
                     if pick.bet_type == BetType.SPREAD:
                         # Determine which team based on line and team_id
                         if pick.team_id:
-                            pick_team_name = self._get_team_name(pick.team_id, session)
+                            pick_team_name = context.team_name(pick.team_id)
                             # Get KenPom rank for the picked team
                             pick_team_kp = team1_kp if pick.team_id == game.team1_id else (team2_kp if pick.team_id == game.team2_id else None)
                             pick_team_formatted = self._format_team_with_rank(pick_team_name, pick_team_kp)
@@ -1848,7 +1819,7 @@ class EmailGenerator:
                     elif pick.bet_type == BetType.MONEYLINE:
                         # Use team_id to get official name
                         if pick.team_id:
-                            pick_team_name = self._get_team_name(pick.team_id, session)
+                            pick_team_name = context.team_name(pick.team_id)
                             # Get KenPom rank for the picked team
                             pick_team_kp = team1_kp if pick.team_id == game.team1_id else (team2_kp if pick.team_id == game.team2_id else None)
                             pick_team_formatted = self._format_team_with_rank(pick_team_name, pick_team_kp)
@@ -1923,8 +1894,6 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error generating best bets review: {e}", exc_info=True)
             return ""
-        finally:
-            session.close()
     
     def _generate_slate_description(self, games: List[Dict[str, Any]], target_date: date) -> str:
         """Generate 1-2 sentence description of today's slate with ranking"""
@@ -1974,11 +1943,9 @@ class EmailGenerator:
             logger.warning("LLM client not available - cannot generate best games to watch")
             return []
         
-        session = self.db.get_session()
         try:
-            games = session.query(GameModel).filter(
-                func.date(GameModel.date) == target_date
-            ).all()
+            context = self._get_context(target_date)
+            games = context.games_on(target_date)
             
             if not games:
                 logger.warning(f"Best Games -- No games found for {target_date}")
@@ -1988,11 +1955,11 @@ class EmailGenerator:
             games_data = []
             for game in games:
                 # Get official team names from database using team_id
-                team1_name = self._get_team_name(game.team1_id, session)
-                team2_name = self._get_team_name(game.team2_id, session)
+                team1_name = context.team_name(game.team1_id)
+                team2_name = context.team_name(game.team2_id)
                 
                 # Get insights for rankings
-                insight = session.query(GameInsightModel).filter_by(game_id=game.id).first()
+                insight = context.insight(game.id)
                 team1_stats = insight.team1_stats if insight and insight.team1_stats else {}
                 team2_stats = insight.team2_stats if insight and insight.team2_stats else {}
                 
@@ -2001,14 +1968,11 @@ class EmailGenerator:
                 team2_kp = team2_stats.get('kp_rank') or team2_stats.get('rank')
                 
                 # Get prediction
-                prediction = session.query(PredictionModel).filter_by(
-                    game_id=game.id,
-                    prediction_date=target_date
-                ).first()
+                prediction = context.prediction(game.id)
                 
                 # Build game info
                 # Get KenPom ranks
-                team1_kp, team2_kp = self._get_kenpom_ranks(game, session)
+                team1_kp, team2_kp = self._get_kenpom_ranks(game, context)
                 
                 # Format teams with ranks
                 team1_formatted = self._format_team_with_rank(team1_name, team1_kp)
@@ -2040,8 +2004,6 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error getting best games to watch: {e}")
             return []
-        finally:
-            session.close()
     
     def _llm_select_best_games(self, games_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Use LLM to select the 3 most exciting games and generate descriptions"""
@@ -2285,54 +2247,77 @@ class EmailGenerator:
     
     def _summarize_best_bet_rationale(self, full_rationale: str, matchup: str, selection: str) -> str:
         """Use LLM to create a concise 1-2 bullet point summary of best bet rationale"""
+        return self._summarize_best_bet_rationales([(full_rationale, matchup, selection)])[0]
+    
+    def _summarize_best_bet_rationales(self, items: List[Tuple[str, str, str]]) -> List[str]:
+        """
+        Summarize several best bet rationales in one LLM batch
+        
+        Args:
+            items: (full_rationale, matchup, selection) per best bet
+            
+        Returns:
+            Summaries in input order (cleaned rationale where the LLM is unavailable or fails)
+        """
+        if not items:
+            return []
         if not self.llm_client:
             # Fallback: remove historical adjustment and president's analysis
-            return self._clean_rationale_fallback(full_rationale)
+            return [self._clean_rationale_fallback(rationale) for rationale, _, _ in items]
         
         try:
-            # Remove historical adjustment and president's analysis sections
-            cleaned = self._remove_unwanted_sections(full_rationale)
-            
-            system_prompt, user_prompt = best_bet_summary_prompts(
-                matchup, selection, cleaned
-            )
-            
-            response = self.llm_client.call(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                temperature=0.7,
-                max_tokens=100,
-                parse_json=False
-            )
-            
-            # Extract summary
-            if isinstance(response, dict):
-                summary = response.get('raw_response', response.get('content', ''))
-            elif isinstance(response, str):
-                summary = response
-            else:
-                summary = ""
-            
-            summary = summary.strip()
-            
-            # Ensure it's formatted as bullets if not already
-            if summary and not summary.startswith('•') and not summary.startswith('-'):
-                # Split into sentences and format as bullets
-                sentences = [s.strip() for s in summary.split('.') if s.strip()]
-                if len(sentences) <= 2:
-                    summary = ' • '.join(sentences)
-                else:
-                    summary = ' • '.join(sentences[:2])
-            
-            # Fallback if summary is too short or empty
-            if len(summary) < 20:
-                return self._clean_rationale_fallback(full_rationale)
-            
-            return summary
-            
+            requests = []
+            for full_rationale, matchup, selection in items:
+                # Remove historical adjustment and president's analysis sections
+                cleaned = self._remove_unwanted_sections(full_rationale)
+                system_prompt, user_prompt = best_bet_summary_prompts(
+                    matchup, selection, cleaned
+                )
+                requests.append({
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    "temperature": 0.7,
+                    "max_tokens": 100,
+                    "parse_json": False,
+                })
+            responses = self.llm_client.call_batch(requests)
         except Exception as e:
             logger.warning(f"Error summarizing best bet rationale: {e}. Using fallback.")
+            return [self._clean_rationale_fallback(rationale) for rationale, _, _ in items]
+        
+        return [
+            self._format_best_bet_summary(response, full_rationale)
+            for response, (full_rationale, _, _) in zip(responses, items)
+        ]
+    
+    def _format_best_bet_summary(self, response: Any, full_rationale: str) -> str:
+        """Turn an LLM summary response into 1-2 bullets (cleaned rationale if unusable)"""
+        # Extract summary
+        if isinstance(response, dict):
+            summary = response.get('raw_response', response.get('content', '')) or ''
+        elif isinstance(response, str):
+            summary = response
+        else:
+            summary = ""
+        
+        summary = summary.strip()
+        
+        # Ensure it's formatted as bullets if not already
+        if summary and not summary.startswith('•') and not summary.startswith('-'):
+            # Split into sentences and format as bullets
+            sentences = [s.strip() for s in summary.split('.') if s.strip()]
+            if len(sentences) <= 2:
+                summary = ' • '.join(sentences)
+            else:
+                summary = ' • '.join(sentences[:2])
+        
+        # Fallback if summary is too short or empty
+        if len(summary) < 20:
             return self._clean_rationale_fallback(full_rationale)
+        
+        return summary
     
     def _remove_unwanted_sections(self, rationale: str) -> str:
         """Remove 'Historical adjustment' and 'President's Analysis' sections"""
@@ -2439,6 +2424,9 @@ class EmailGenerator:
             # Fallback to empty if LLM not available
             return {}
         
+        # Games come from _get_yesterday_games, so their rows are already in the email's context
+        context = self._context if self.db else None
+        
         # Build game results data for LLM
         games_data = []
         for game in games_with_results:
@@ -2462,15 +2450,13 @@ class EmailGenerator:
             # Get KenPom ranks if available
             home_team = home_team_raw
             away_team = away_team_raw
-            if self.db and game.get('id'):
-                session = self.db.get_session()
+            if context and game.get('id'):
                 try:
-                    from src.data.storage import GameModel
-                    game_model = session.query(GameModel).filter_by(id=game['id']).first()
+                    game_model = context.game(game['id'])
                     if game_model:
-                        team1_kp, team2_kp = self._get_kenpom_ranks(game_model, session)
-                        team1_name = self._get_team_name(game_model.team1_id, session)
-                        team2_name = self._get_team_name(game_model.team2_id, session)
+                        team1_kp, team2_kp = self._get_kenpom_ranks(game_model, context)
+                        team1_name = context.team_name(game_model.team1_id)
+                        team2_name = context.team_name(game_model.team2_id)
                         
                         # Match result team names to team1/team2 to get correct rank
                         if are_teams_matching(home_team_raw, team1_name):
@@ -2484,20 +2470,13 @@ class EmailGenerator:
                             away_team = self._format_team_with_rank(away_team_raw, team1_kp)
                 except Exception as e:
                     logger.debug(f"Error getting ranks for game {game.get('id')}: {e}")
-                finally:
-                    session.close()
             
             # Get betting lines for this game to determine favorites/underdogs
             spread_info = None
             winner_spread = None  # Track winning team's spread
-            if self.db:
-                session = self.db.get_session()
+            if context:
                 try:
-                    from src.data.storage import BettingLineModel
-                    spread_lines = session.query(BettingLineModel).filter(
-                        BettingLineModel.game_id == game['id'],
-                        BettingLineModel.bet_type == BetType.SPREAD
-                    ).order_by(BettingLineModel.timestamp.desc()).all()
+                    spread_lines = context.spread_lines(game['id'])
                     
                     if spread_lines:
                         # Determine which team won
@@ -2558,8 +2537,6 @@ class EmailGenerator:
                             spread_info = " | ".join(spreads)
                 except Exception as e:
                     logger.debug(f"Error getting spread info for game {game.get('id')}: {e}")
-                finally:
-                    session.close()
             
             games_data.append({
                 'matchup': f"{away_team} @ {home_team}",
@@ -2788,8 +2765,6 @@ class EmailGenerator:
             - pushes: number of pushes
             - profit_loss_units: profit/loss in units
         """
-        ytd_start_date = date(2025, 11, 23)
-        
         band_results = {
             'HIGH': {'wins': 0, 'losses': 0, 'pushes': 0, 'profit_loss_units': 0.0},
             'Medium': {'wins': 0, 'losses': 0, 'pushes': 0, 'profit_loss_units': 0.0},
@@ -2799,43 +2774,13 @@ class EmailGenerator:
         if not self.db:
             return band_results
         
-        session = self.db.get_session()
         try:
-            # Query all picks from YTD start date through target_date
-            # Use pick_date if available, otherwise use created_at date
-            picks = session.query(PickModel).filter(
-                or_(
-                    and_(
-                        PickModel.pick_date.isnot(None),
-                        PickModel.pick_date >= ytd_start_date,
-                        PickModel.pick_date <= target_date
-                    ),
-                    and_(
-                        PickModel.pick_date.is_(None),
-                        func.date(PickModel.created_at) >= ytd_start_date,
-                        func.date(PickModel.created_at) <= target_date
-                    )
-                )
-            ).all()
-            
-            # Get all bets for these picks
-            pick_ids = [p.id for p in picks if p.id]
-            if not pick_ids:
-                return band_results
-            
-            bets = session.query(BetModel).filter(
-                BetModel.pick_id.in_(pick_ids),
-                BetModel.result != BetResult.PENDING
-            ).all()
-            
-            bet_map = {bet.pick_id: bet for bet in bets}
+            # All settled picks from YTD start date through target_date
+            # (pick_date if available, otherwise created_at date)
+            settled = self._get_context(target_date).settled_ytd_picks()
             
             # Calculate YTD stats by confidence band
-            for pick in picks:
-                bet = bet_map.get(pick.id)
-                if not bet:
-                    continue
-                
+            for pick, bet in settled:
                 # Convert confidence (0.0-1.0) to confidence_score (1-10)
                 confidence_value = pick.confidence or 0.5
                 if confidence_value == 0.0:
@@ -2894,8 +2839,6 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error calculating YTD confidence band results: {e}", exc_info=True)
             return band_results
-        finally:
-            session.close()
     
     def _calculate_ytd_best_bets(self, target_date: date) -> Dict[str, Any]:
         """
@@ -2909,50 +2852,17 @@ class EmailGenerator:
             - profit_loss_units: profit/loss in units
             - win_rate: win rate percentage
         """
-        ytd_start_date = date(2025, 11, 23)
-        
         result = {'wins': 0, 'losses': 0, 'pushes': 0, 'profit_loss_units': 0.0, 'win_rate': 0.0}
         
         if not self.db:
             return result
         
-        session = self.db.get_session()
         try:
-            # Query all best bets from YTD start date through target_date
-            picks = session.query(PickModel).filter(
-                PickModel.best_bet == True,
-                or_(
-                    and_(
-                        PickModel.pick_date.isnot(None),
-                        PickModel.pick_date >= ytd_start_date,
-                        PickModel.pick_date <= target_date
-                    ),
-                    and_(
-                        PickModel.pick_date.is_(None),
-                        func.date(PickModel.created_at) >= ytd_start_date,
-                        func.date(PickModel.created_at) <= target_date
-                    )
-                )
-            ).all()
-            
-            # Get all bets for these picks
-            pick_ids = [p.id for p in picks if p.id]
-            if not pick_ids:
-                return result
-            
-            bets = session.query(BetModel).filter(
-                BetModel.pick_id.in_(pick_ids),
-                BetModel.result != BetResult.PENDING
-            ).all()
-            
-            bet_map = {bet.pick_id: bet for bet in bets}
+            # All settled best bets from YTD start date through target_date
+            settled = self._get_context(target_date).settled_ytd_picks(best_bets_only=True)
             
             # Calculate YTD stats for best bets
-            for pick in picks:
-                bet = bet_map.get(pick.id)
-                if not bet:
-                    continue
-                
+            for pick, bet in settled:
                 # Count wins/losses/pushes
                 if bet.result == BetResult.WIN:
                     result['wins'] += 1
@@ -2975,8 +2885,6 @@ class EmailGenerator:
         except Exception as e:
             logger.error(f"Error calculating YTD best bets: {e}", exc_info=True)
             return result
-        finally:
-            session.close()
     
     def _format_yesterday_performance(self, results: Dict[str, Any], target_date: date) -> str:
         """Format yesterday's performance summary with engaging language"""
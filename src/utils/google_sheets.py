@@ -140,7 +140,7 @@ class GoogleSheetsService:
             logger.info(f"Writing {len(picks)} picks to Google Sheets for {target_date} ({best_bet_count} best bets, {len(picks) - best_bet_count} others)")
             
             # Prepare rows
-            session = self.db.get_session()
+            session = self.db.get_read_session()
             try:
                 rows = []
                 skipped_count = 0
@@ -198,7 +198,7 @@ class GoogleSheetsService:
             logger.info(f"Writing {len(picks)} picks to Google Sheets for {target_date} ({best_bet_count} best bets, {len(picks) - best_bet_count} others)")
             
             # Prepare rows
-            session = self.db.get_session()
+            session = self.db.get_read_session()
             try:
                 rows = []
                 skipped_count = 0
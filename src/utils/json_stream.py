@@ -0,0 +1,146 @@
+"""Incremental parsing of streamed JSON responses"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.json_stream")
+
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+
+class StreamingArrayParser:
+    """
+    Pull completed objects out of one top-level array while a JSON response is still arriving.
+
+    The Picker and President answer with {"candidate_picks": [...], ...} style objects. Fed the
+    response text chunk by chunk, the parser tracks strings and nesting, and each time an
+    object inside array_key closes it is parsed and returned (and passed to on_item). Text
+    before the first "{" (e.g. a ```json fence) is skipped.
+
+    When the response is cut off or malformed after some elements, result() still returns
+    every element that completed, so a truncated tail costs the unfinished element instead
+    of the whole batch.
+    """
+
+    def __init__(self, array_key: str, on_item: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.array_key = array_key
+        self.on_item = on_item
+        self.items: List[Dict[str, Any]] = []
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._array_closed = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume the next piece of the response; returns the elements completed by it"""
+        if not chunk:
+            return []
+        self._text += chunk
+        completed = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:i]
+                continue
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                if c == "[" and self._depth == 1 and self._pending_key == self.array_key and not self._array_closed:
+                    self._array_depth = self._depth + 1
+                elif c == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 0:
+                    continue
+                self._depth -= 1
+                if self._array_depth is None:
+                    continue
+                if c == "}" and self._depth == self._array_depth and self._item_start is not None:
+                    item = self._parse_item(text[self._item_start:i + 1])
+                    self._item_start = None
+                    if item is not None:
+                        completed.append(item)
+                elif c == "]" and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+                    self._array_closed = True
+            elif c == ":" and self._depth == 1:
+                self._pending_key = self._last_string
+            elif c == "," and self._depth == 1:
+                self._pending_key = None
+        self._pos = len(text)
+
+        for item in completed:
+            self.items.append(item)
+            if self.on_item is not None:
+                try:
+                    self.on_item(item)
+                except Exception as e:
+                    logger.warning(f"Streamed {self.array_key} item handler failed: {e}")
+        return completed
+
+    def _parse_item(self, raw: str) -> Optional[Dict[str, Any]]:
+        for candidate in (raw, _TRAILING_COMMA.sub(r'\1', raw)):
+            try:
+                item = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            return item if isinstance(item, dict) else None
+        logger.warning(f"Skipping unparseable {self.array_key} element ({len(raw)} chars)")
+        return None
+
+    def result(self, parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Final response for the full text
+
+        parse is the client's usual JSON handling (json.loads, markdown and repair fallbacks).
+        If the full text does not parse, the elements streamed so far are kept and the
+        response is marked "truncated".
+        """
+        parsed = parse(self._text) if self._text.strip() else {"parse_error": "empty response"}
+        if isinstance(parsed, dict) and "parse_error" not in parsed:
+            return parsed
+        error = parsed.get("parse_error") if isinstance(parsed, dict) else "response is not an object"
+        logger.warning(
+            f"⚠️  Streamed response ended early ({error}); keeping {len(self.items)} complete "
+            f"{self.array_key} elements"
+        )
+        return {
+            self.array_key: list(self.items),
+            "truncated": True,
+            "parse_error": error,
+        }
+
+
+def deliver_items(
+    response: Dict[str, Any], array_key: str, on_item: Optional[Callable[[Dict[str, Any]], None]]
+) -> None:
+    """Pass a complete (non-streamed) response's elements to on_item, so callers have one code path"""
+    if on_item is None or not isinstance(response, dict):
+        return
+    for item in response.get(array_key) or []:
+        if isinstance(item, dict):
+            on_item(item)
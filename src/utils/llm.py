@@ -1,35 +1,96 @@
 """LLM client utilities for OpenAI and Google Gemini API"""
 
+import hashlib
 import json
 import os
-from typing import Optional, Dict, Any, List, Union
-
-# Try to import OpenAI
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-# Try to import Gemini
-try:
-    import google.generativeai as genai
-    from google.generativeai.types import HarmCategory, HarmBlockThreshold
-    from google.api_core import retry
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+import threading
+import time
+from typing import Callable, Optional, Dict, Any, List, Union
 
+# Provider SDKs are imported when the first client for that provider is created, so importing
+# this module (and every agent) stays cheap; google.generativeai alone takes ~0.6s to import
+openai = None
+genai = None
+
+from src.utils.json_stream import StreamingArrayParser, deliver_items
 from src.utils.logging import get_logger
+from src.utils.llm_telemetry import STATUS_BATCH, STATUS_CACHE_HIT, STATUS_ERROR, STATUS_OK, record_llm_call
+from src.utils.llm_batch import BatchJob, batch_enabled_for, build_batch_line
+from src.utils.llm_retry import (
+    FATAL,
+    LLMUnavailableError,
+    RetryPolicy,
+    classify_error,
+    describe_error,
+    get_circuit_breaker,
+    retry_after_seconds,
+)
 from src.prompts import generic_agent_user_prompt
 
 logger = get_logger("utils.llm")
 
 
+def _load_openai() -> bool:
+    """Import the OpenAI SDK on first use. Returns False if it is not installed."""
+    global openai
+    if openai is None:
+        try:
+            import openai as openai_sdk
+        except ImportError:
+            return False
+        openai = openai_sdk
+    return True
+
+
+def _load_gemini() -> bool:
+    """Import the Gemini SDK on first use. Returns False if it is not installed."""
+    global genai
+    if genai is None:
+        try:
+            import google.generativeai as genai_sdk
+        except ImportError:
+            return False
+        genai = genai_sdk
+    return True
+
+RESPONSE_CACHE_NAMESPACE = "llm_responses"
+
+# Set by --force-refresh for the whole run: skip cached responses (fresh ones are still stored)
+_response_cache_bypass = False
+
+
+def set_response_cache_bypass(bypass: bool) -> None:
+    """Make every LLMClient skip cached responses (used for --force-refresh)"""
+    global _response_cache_bypass
+    _response_cache_bypass = bypass
+
+
+def openai_cached_tokens(usage: Any) -> int:
+    """Prompt tokens OpenAI served from its prompt cache (0 when not reported)"""
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0)
+    return cached if isinstance(cached, int) else 0
+
+
+def _prompt_cache_key_enabled() -> bool:
+    from src.utils.config import config
+    return bool(config.get('llm', {}).get('prompt_cache_key', True))
+
+
+def _streaming_enabled() -> bool:
+    from src.utils.config import config
+    return bool((config.get('llm', {}).get('streaming', {}) or {}).get('enabled', True))
+
+
+def _response_cache_config() -> Dict[str, Any]:
+    from src.utils.config import config
+    return config.get('llm', {}).get('response_cache', {}) or {}
+
+
 class LLMClient:
     """Client for OpenAI and Google Gemini API calls"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini", provider: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini", provider: Optional[str] = None,
+                 agent_name: Optional[str] = None):
         """
         Initialize LLM client
         
@@ -37,6 +98,7 @@ class LLMClient:
             api_key: API key (defaults to OPENAI_API_KEY or GEMINI_API_KEY env var based on provider)
             model: Model to use (default: gpt-4o-mini for OpenAI, gemini-3-flash for Gemini)
             provider: "openai" or "gemini" (auto-detected from model name if not provided)
+            agent_name: Agent using this client (selects the response cache TTL)
         """
         # Auto-detect provider from model name if not specified
         if provider is None:
@@ -51,17 +113,22 @@ class LLMClient:
         
         self.provider = provider.lower()
         self.model = model
+        # API keys may come from .env
+        from src.utils.config import load_env
+        load_env()
         
         if self.provider == "openai":
-            if not OPENAI_AVAILABLE:
+            if not _load_openai():
                 raise ImportError("OpenAI package not installed. Install with: pip install openai")
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if not self.api_key:
                 raise ValueError("OpenAI API key required. Set OPENAI_API_KEY env var or pass api_key parameter.")
-            self.client = openai.OpenAI(api_key=self.api_key)
+            # Retries are handled in _dispatch_chat (backoff, circuit breaker, fallback), not by the SDK
+            self.client = openai.OpenAI(api_key=self.api_key, max_retries=0)
         elif self.provider == "gemini":
-            if not GEMINI_AVAILABLE:
+            if not _load_gemini():
                 raise ImportError("Google Generative AI package not installed. Install with: pip install google-generativeai")
+            from google.generativeai.types import HarmCategory, HarmBlockThreshold
             self.api_key = api_key or os.getenv("GEMINI_API_KEY")
             if not self.api_key:
                 raise ValueError("Gemini API key required. Set GEMINI_API_KEY env var or pass api_key parameter.")
@@ -77,10 +144,22 @@ class LLMClient:
             raise ValueError(f"Unknown provider: {provider}. Must be 'openai' or 'gemini'")
         
         self.logger = logger
+        self.agent_name = agent_name.lower() if agent_name else None
         # Token usage tracking
         self.total_tokens_used = 0
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
+        # Prompt tokens served from the provider's prompt cache (billed at a discount)
+        self.total_cached_tokens = 0
+        # Response cache statistics
+        self.cache_hits = 0
+        self.tokens_saved = 0
+        # Usage of the last provider call on this thread (stored with cached responses)
+        self._local = threading.local()
+        # Transport retry / circuit breaker settings (llm.retry)
+        self.retry_policy = RetryPolicy.from_config()
+        self._fallback_client: Optional["LLMClient"] = None
+        self._fallback_lock = threading.Lock()
     
     def call(
         self,
@@ -135,7 +214,356 @@ class LLMClient:
     ) -> Dict[str, Any]:
         """
         Make LLM Chat API call (supports both OpenAI and Gemini)
+        
+        When llm.response_cache is enabled, identical requests within the agent's TTL are served
+        from the cache store without calling the provider.
+        """
+        ttl = self._response_cache_ttl()
+        if ttl is None:
+            return self._dispatch_chat(messages, response_format, temperature, max_tokens, parse_json, tools, **kwargs)
+        
+        cache_key = self._response_cache_key(messages, response_format, temperature, max_tokens, parse_json, tools, kwargs)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        self._local.last_usage = None
+        response = self._dispatch_chat(messages, response_format, temperature, max_tokens, parse_json, tools, **kwargs)
+        self._store_cached_response(cache_key, response, ttl)
+        return response
+    
+    def call_streaming(
+        self,
+        messages: List[Dict[str, Any]],
+        array_key: str,
+        on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        JSON chat call that streams the response and parses the array at array_key as it arrives
+        
+        Each element of response[array_key] is passed to on_item as soon as it is complete. If the
+        response is cut off or its tail is malformed, the complete elements are returned with
+        "truncated": True instead of a parse error, so the caller keeps them rather than
+        re-sending the whole batch. A stream that fails after delivering elements is not retried
+        (that would deliver them twice).
+        
+        Gemini, and OpenAI with llm.streaming.enabled off, make a normal call and then pass the
+        elements to on_item.
+        
+        Returns:
+            Parsed response, as call_chat with parse_json=True
+        """
+        if self.provider != "openai" or not _streaming_enabled():
+            response = self.call_chat(messages=messages, response_format=response_format,
+                                      temperature=temperature, max_tokens=max_tokens, parse_json=True)
+            deliver_items(response, array_key, on_item)
+            return response
+        
+        ttl = self._response_cache_ttl()
+        cache_key = None
+        if ttl is not None:
+            # Same key as the equivalent call_chat request: streaming does not change the answer
+            cache_key = self._response_cache_key(messages, response_format, temperature, max_tokens, True, None, {})
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                deliver_items(cached, array_key, on_item)
+                return cached
+        
+        self._local.last_usage = None
+        response = self._dispatch_chat(messages, response_format, temperature, max_tokens, True, None,
+                                       stream_array=array_key, on_item=on_item)
+        if cache_key is not None and not response.get("truncated"):
+            self._store_cached_response(cache_key, response, ttl)
+        return response
+    
+    def call_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
+        Run independent chat requests through the OpenAI Batch API (about half the token price)
+        
+        Only for work nobody waits on: a batch can take minutes to complete. Requests go through
+        the Batch API only when llm.batch is enabled and lists this client's agent. Otherwise
+        they are sent as direct calls, concurrently under llm.rate_limits. Requests the batch did
+        not answer, and whole batches that miss max_wait_seconds, also fall back to direct calls.
+        
+        Args:
+            requests: call_chat keyword arguments, one dict per request
+            
+        Returns:
+            Responses in request order, in the same format as call_chat
+        """
+        if not requests:
+            return []
+        if self.provider != "openai" or not batch_enabled_for(self.agent_name):
+            return self._call_direct(requests)
+        
+        from openai.types.chat import ChatCompletion
+        
+        ttl = self._response_cache_ttl()
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending: Dict[str, tuple] = {}  # custom_id -> (index, parse_json, cache_key)
+        lines = []
+        for index, request in enumerate(requests):
+            extra = dict(request)
+            messages = extra.pop("messages")
+            response_format = extra.pop("response_format", None)
+            temperature = extra.pop("temperature", 0.7)
+            max_tokens = extra.pop("max_tokens", None)
+            parse_json = extra.pop("parse_json", True)
+            tools = extra.pop("tools", None)
+            cache_key = None
+            if ttl is not None:
+                cache_key = self._response_cache_key(
+                    messages, response_format, temperature, max_tokens, parse_json, tools, extra
+                )
+                cached = self._get_cached_response(cache_key)
+                if cached is not None:
+                    responses[index] = cached
+                    continue
+            custom_id = f"request-{index}"
+            # Copy messages: building the request may append a JSON instruction to the last one
+            params = self._build_openai_request(
+                [dict(m) for m in messages], response_format, temperature, max_tokens, tools, **extra
+            )
+            lines.append(build_batch_line(custom_id, params))
+            pending[custom_id] = (index, parse_json, cache_key)
+        
+        if lines:
+            self.logger.info(f"📦 Sending {len(lines)} {self.model} requests through the Batch API")
+            try:
+                results = BatchJob(self.client).run(lines, label=self.agent_name or "batch")
+            except Exception as e:
+                self.logger.warning(f"Batch submission failed ({describe_error(e)}), using direct calls")
+                results = None
+            results = results or {}
+            unanswered = []
+            for custom_id, (index, parse_json, cache_key) in pending.items():
+                body, error = results.get(custom_id, (None, None))
+                if body is None:
+                    if error:
+                        self.logger.warning(f"Batch request {custom_id} failed ({error}), calling directly")
+                    unanswered.append(index)
+                    continue
+                self._local.last_usage = None
+                response = self._handle_openai_response(ChatCompletion.model_validate(body), parse_json)
+                record_llm_call(self.agent_name, self.model, self.provider,
+                                usage=self._local.last_usage, status=STATUS_BATCH)
+                if cache_key is not None:
+                    self._store_cached_response(cache_key, response, ttl)
+                responses[index] = response
+            direct = self._call_direct([requests[index] for index in unanswered])
+            for index, response in zip(unanswered, direct):
+                responses[index] = response
+        return responses
+    
+    def _call_direct(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send independent call_chat requests directly; several run concurrently via AsyncLLMClient"""
+        if len(requests) < 2:
+            return [self.call_chat(**request) for request in requests]
+        from src.utils.llm_async import AsyncLLMClient
+        return AsyncLLMClient(self).run_many(requests)
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for a request key (None on miss or under --force-refresh)"""
+        if _response_cache_bypass:
+            return None
+        from src.data.cache_store import get_cache_store
+        cached = get_cache_store().get(RESPONSE_CACHE_NAMESPACE, cache_key)
+        if cached is None:
+            return None
+        saved = cached.get("usage", {}).get("total_tokens", 0)
+        self.cache_hits += 1
+        self.tokens_saved += saved
+        self.logger.info(f"💾 LLM response cache hit ({self.model}): saved {saved:,} tokens")
+        record_llm_call(self.agent_name, self.model, self.provider, status=STATUS_CACHE_HIT)
+        return cached["response"]
+    
+    def _store_cached_response(self, cache_key: str, response: Any, ttl: float,
+                               usage: Optional[Dict[str, int]] = None) -> None:
+        """Cache a successful response with the usage of the call that produced it
+        
+        usage defaults to the last provider call made on this thread.
+        """
+        if not isinstance(response, dict) or "parse_error" in response:
+            return
+        if usage is None:
+            usage = getattr(self._local, "last_usage", None) or {}
+        from src.data.cache_store import get_cache_store
+        get_cache_store().set(
+            RESPONSE_CACHE_NAMESPACE,
+            cache_key,
+            {"response": response, "usage": usage},
+            ttl=ttl,
+        )
+    
+    def _response_cache_ttl(self) -> Optional[float]:
+        """Response cache TTL in seconds for this client's agent, or None when caching is off"""
+        cache_config = _response_cache_config()
+        if not cache_config.get('enabled', False):
+            return None
+        agent_ttls = cache_config.get('agent_ttl_seconds', {}) or {}
+        ttl = agent_ttls.get(self.agent_name, cache_config.get('ttl_seconds', 3600))
+        if not ttl or ttl <= 0:
+            return None
+        return float(ttl)
+    
+    def _response_cache_key(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int],
+        parse_json: bool,
+        tools: Optional[List[Dict[str, Any]]],
+        extra: Dict[str, Any]
+    ) -> str:
+        """Content address of a request: everything that can change the provider's answer"""
+        request = {
+            "provider": self.provider,
+            "model": self.model,
+            "messages": messages,
+            "response_format": response_format,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "parse_json": parse_json,
+            "tools": tools,
+            "extra": extra,
+        }
+        encoded = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+    
+    def _dispatch_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int],
+        parse_json: bool,
+        tools: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a chat request with transport-level retry
+        
+        Rate limits and transient errors (timeouts, connection drops, 5xx) are retried here with
+        jittered exponential backoff, honoring retry-after, so a provider blip costs one more
+        request instead of an agent re-sending its whole batch. Consecutive failures open the
+        model's circuit; while it is open, requests go to llm.retry.fallback_model if one is set.
+        Fatal errors (bad request, auth) are raised immediately.
+        
+        Raises:
+            LLMUnavailableError: Retries exhausted, or the circuit is open with no usable fallback
+        """
+        policy = self.retry_policy
+        target = self._route_request()
+        last_error: Optional[BaseException] = None
+        started = time.monotonic()
+        for attempt in range(1, policy.max_attempts + 1):
+            breaker = get_circuit_breaker(target.model, policy)
+            self._local.last_usage = None
+            try:
+                response = self._send_via(target, messages, response_format, temperature, max_tokens,
+                                          parse_json, tools, **kwargs)
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == FATAL:
+                    get_circuit_breaker(target.model, policy).release_trial()
+                    self._record_call(target, started, attempt - 1, STATUS_ERROR, e)
+                    raise
+                breaker.record_failure()
+                last_error = e
+                if attempt == policy.max_attempts:
+                    break
+                if breaker.is_open:
+                    target = self._route_request()
+                    self.logger.warning(f"⚠️  {describe_error(e)} - retrying on {target.model}")
+                    continue
+                delay = policy.backoff(attempt, retry_after_seconds(e))
+                self.logger.warning(
+                    f"⚠️  {target.model} {kind.replace('_', ' ')} (attempt {attempt}/{policy.max_attempts}): "
+                    f"{describe_error(e)} - retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+            breaker.record_success()
+            self._record_call(target, started, attempt - 1, STATUS_OK)
+            return response
+        self._record_call(target, started, policy.max_attempts - 1, STATUS_ERROR, last_error)
+        raise LLMUnavailableError(
+            f"{target.model} failed after {policy.max_attempts} attempts: {describe_error(last_error)}"
+        ) from last_error
+    
+    def _record_call(self, target: "LLMClient", started: float, retries: int, status: str,
+                     error: Optional[BaseException] = None) -> None:
+        """Write one llm_calls telemetry row for a dispatched request (usage from the last attempt)"""
+        record_llm_call(
+            self.agent_name,
+            target.model,
+            target.provider,
+            usage=getattr(self._local, "last_usage", None) if status == STATUS_OK else None,
+            latency_ms=(time.monotonic() - started) * 1000,
+            retries=retries,
+            status=status,
+            error=describe_error(error) if error is not None else None,
+        )
+    
+    def _route_request(self) -> "LLMClient":
+        """This client, or the fallback client while this model's circuit is open"""
+        if get_circuit_breaker(self.model, self.retry_policy).allow_request():
+            return self
+        fallback = self._get_fallback_client()
+        if fallback is not None and get_circuit_breaker(fallback.model, self.retry_policy).allow_request():
+            self.logger.warning(f"🔀 Circuit open for {self.model}, failing over to {fallback.model}")
+            return fallback
+        raise LLMUnavailableError(f"Circuit open for {self.model} and no fallback model available")
+    
+    def _get_fallback_client(self) -> Optional["LLMClient"]:
+        fallback_model = self.retry_policy.fallback_model
+        if not fallback_model or fallback_model == self.model:
+            return None
+        with self._fallback_lock:
+            if self._fallback_client is None:
+                try:
+                    self._fallback_client = LLMClient(model=fallback_model, agent_name=self.agent_name)
+                except (ImportError, ValueError) as e:
+                    self.logger.error(f"Fallback model {fallback_model} unavailable: {e}")
+                    return None
+            return self._fallback_client
+    
+    def _send_via(self, target: "LLMClient", *args, **kwargs) -> Dict[str, Any]:
+        """Send one request on target, crediting a fallback client's token usage to this client"""
+        if target is self:
+            return self._send_chat(*args, **kwargs)
+        before = (target.total_prompt_tokens, target.total_completion_tokens, target.total_tokens_used,
+                  target.total_cached_tokens)
+        target._local.last_usage = None
+        response = target._send_chat(*args, **kwargs)
+        self.total_prompt_tokens += target.total_prompt_tokens - before[0]
+        self.total_completion_tokens += target.total_completion_tokens - before[1]
+        self.total_tokens_used += target.total_tokens_used - before[2]
+        self.total_cached_tokens += target.total_cached_tokens - before[3]
+        self._local.last_usage = getattr(target._local, "last_usage", None)
+        return response
+    
+    def _send_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int],
+        parse_json: bool,
+        tools: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Send a chat request to the configured provider (single attempt)"""
+        stream_array = kwargs.pop("stream_array", None)
+        on_item = kwargs.pop("on_item", None)
+        if self.provider == "openai" and stream_array:
+            return self._stream_openai_chat(
+                messages, stream_array, on_item, response_format, temperature, max_tokens, **kwargs
+            )
         if self.provider == "openai":
             return self._call_openai_chat(
                 messages=messages,
@@ -147,7 +575,7 @@ class LLMClient:
                 **kwargs
             )
         elif self.provider == "gemini":
-            return self._call_gemini_chat(
+            response = self._call_gemini_chat(
                 messages=messages,
                 response_format=response_format,
                 temperature=temperature,
@@ -156,6 +584,9 @@ class LLMClient:
                 tools=tools,
                 **kwargs
             )
+            if stream_array:
+                deliver_items(response, stream_array, on_item)
+            return response
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
     
@@ -171,109 +602,185 @@ class LLMClient:
     ) -> Dict[str, Any]:
         """Make OpenAI Chat API call"""
         try:
-            # Prepare request parameters
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-            
-            # GPT-5.x models use max_completion_tokens instead of max_tokens
-            if max_tokens:
-                if self.model.startswith("gpt-5") or self.model.startswith("o1-") or self.model.startswith("o3-"):
-                    request_params["max_completion_tokens"] = max_tokens
-                else:
-                    request_params["max_tokens"] = max_tokens
-            
-            # Handle response format (JSON mode)
-            if response_format:
-                request_params["response_format"] = {"type": "json_object"}
-                # Also add instruction to prompt if not already there
-                if messages and messages[-1].get("role") == "user":
-                    user_msg = messages[-1]["content"]
-                    if "json" not in user_msg.lower():
-                        messages[-1]["content"] = f"{user_msg}\n\nRespond with valid JSON only."
-            
-            # Handle tools
-            if tools:
-                request_params["tools"] = tools
-                if "tool_choice" in kwargs:
-                    request_params["tool_choice"] = kwargs["tool_choice"]
-            
+            request_params = self._build_openai_request(
+                messages, response_format, temperature, max_tokens, tools, **kwargs
+            )
             self.logger.debug(f"Calling OpenAI {self.model} with {len(messages)} messages")
-            
             response = self.client.chat.completions.create(**request_params)
-            
-            # Extract usage
-            if response.usage:
-                prompt_tokens = response.usage.prompt_tokens
-                completion_tokens = response.usage.completion_tokens
-                total_tokens = response.usage.total_tokens
-                
-                self.total_prompt_tokens += prompt_tokens
-                self.total_completion_tokens += completion_tokens
-                self.total_tokens_used += total_tokens
-                
-                self.logger.info(
-                    f"📊 Token usage ({self.model}): "
-                    f"Prompt: {prompt_tokens:,} | "
-                    f"Completion: {completion_tokens:,} | "
-                    f"Total: {total_tokens:,}"
-                )
-            
-            # Handle response
-            choice = response.choices[0]
-            
-            # Check for tool calls
-            if choice.message.tool_calls:
-                tool_calls = []
-                for tc in choice.message.tool_calls:
-                    tool_calls.append({
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    })
-                return {
-                    "tool_calls": tool_calls,
-                    "content": None,
-                }
-            
-            content = choice.message.content or ""
-            
-            # Parse JSON if requested
-            if parse_json and content:
+            return self._handle_openai_response(response, parse_json)
+        except Exception as e:
+            if classify_error(e) == FATAL:
+                self.logger.error(f"Error calling OpenAI: {e}", exc_info=True)
+            raise
+    
+    def _stream_openai_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        array_key: str,
+        on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Make a streaming OpenAI Chat API call, parsing array_key elements as they arrive"""
+        request_params = self._build_openai_request(messages, response_format, temperature, max_tokens, **kwargs)
+        request_params["stream"] = True
+        request_params["stream_options"] = {"include_usage": True}
+        parser = StreamingArrayParser(array_key, on_item)
+        self.logger.debug(f"Streaming OpenAI {self.model} with {len(messages)} messages")
+        try:
+            for chunk in self.client.chat.completions.create(**request_params):
+                if chunk.usage:
+                    self._record_usage(
+                        chunk.usage.prompt_tokens,
+                        chunk.usage.completion_tokens,
+                        chunk.usage.total_tokens,
+                        openai_cached_tokens(chunk.usage),
+                    )
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parser.feed(chunk.choices[0].delta.content)
+        except Exception as e:
+            if not parser.items:
+                if classify_error(e) == FATAL:
+                    self.logger.error(f"Error streaming from OpenAI: {e}", exc_info=True)
+                raise
+            self.logger.warning(
+                f"⚠️  Stream from {self.model} failed after {len(parser.items)} {array_key} elements: "
+                f"{describe_error(e)}"
+            )
+        return parser.result(self._parse_json_content)
+    
+    def _build_openai_request(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat.completions.create parameters"""
+        # Prepare request parameters
+        request_params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        
+        # Route an agent's requests (which share a static prefix) to the same prompt cache
+        if self.agent_name and _prompt_cache_key_enabled():
+            request_params["prompt_cache_key"] = f"terrarium-{self.agent_name}"
+        
+        # GPT-5.x models use max_completion_tokens instead of max_tokens
+        if max_tokens:
+            if self.model.startswith("gpt-5") or self.model.startswith("o1-") or self.model.startswith("o3-"):
+                request_params["max_completion_tokens"] = max_tokens
+            else:
+                request_params["max_tokens"] = max_tokens
+        
+        # Handle response format (JSON mode)
+        if response_format:
+            request_params["response_format"] = {"type": "json_object"}
+            # Also add instruction to prompt if not already there
+            if messages and messages[-1].get("role") == "user":
+                user_msg = messages[-1]["content"]
+                if "json" not in user_msg.lower():
+                    messages[-1]["content"] = f"{user_msg}\n\nRespond with valid JSON only."
+        
+        # Handle tools
+        if tools:
+            request_params["tools"] = tools
+            if "tool_choice" in kwargs:
+                request_params["tool_choice"] = kwargs["tool_choice"]
+        return request_params
+    
+    def _record_usage(self, prompt_tokens: int, completion_tokens: int, total_tokens: int,
+                      cached_tokens: int = 0) -> None:
+        """Add one provider call's token usage to the running totals"""
+        self.total_prompt_tokens += prompt_tokens
+        self.total_completion_tokens += completion_tokens
+        self.total_tokens_used += total_tokens
+        self.total_cached_tokens += cached_tokens
+        self._local.last_usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
+        }
+        
+        cached = f" ({cached_tokens:,} cached)" if cached_tokens else ""
+        self.logger.info(
+            f"📊 Token usage ({self.model}): "
+            f"Prompt: {prompt_tokens:,}{cached} | "
+            f"Completion: {completion_tokens:,} | "
+            f"Total: {total_tokens:,}"
+        )
+    
+    def _handle_openai_response(self, response: Any, parse_json: bool = True) -> Dict[str, Any]:
+        """Record usage and convert an OpenAI chat completion to the client's response dict"""
+        # Extract usage
+        if response.usage:
+            self._record_usage(
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                response.usage.total_tokens,
+                openai_cached_tokens(response.usage),
+            )
+        
+        # Handle response
+        choice = response.choices[0]
+        
+        # Check for tool calls
+        if choice.message.tool_calls:
+            tool_calls = []
+            for tc in choice.message.tool_calls:
+                tool_calls.append({
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    },
+                })
+            return {
+                "tool_calls": tool_calls,
+                "content": None,
+            }
+        
+        content = choice.message.content or ""
+        
+        # Parse JSON if requested
+        if parse_json and content:
+            return self._parse_json_content(content)
+        
+        return {"raw_response": content}
+    
+    def _parse_json_content(self, content: str) -> Dict[str, Any]:
+        """Parse a JSON response, falling back to markdown extraction and _repair_json"""
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            # Try to extract JSON from markdown code blocks
+            import re
+            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
+            if json_match:
                 try:
-                    return json.loads(content)
-                except json.JSONDecodeError as e:
-                    # Try to extract JSON from markdown code blocks
-                    import re
-                    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-                    if json_match:
-                        try:
-                            return json.loads(json_match.group(1))
-                        except json.JSONDecodeError:
-                            pass
-                    
-                    # Try to repair JSON
-                    repaired = self._repair_json(content)
-                    if repaired:
-                        try:
-                            return json.loads(repaired)
-                        except json.JSONDecodeError:
-                            pass
-                    
-                    snippet = (content[:500] + "... [truncated]") if len(content) > 500 else content
-                    self.logger.warning(f"JSON parsing error: {e} | Raw content snippet: {snippet}")
-                    return {"raw_response": content, "parse_error": str(e)}
+                    return json.loads(json_match.group(1))
+                except json.JSONDecodeError:
+                    pass
             
-            return {"raw_response": content}
+            # Try to repair JSON
+            repaired = self._repair_json(content)
+            if repaired:
+                try:
+                    return json.loads(repaired)
+                except json.JSONDecodeError:
+                    pass
             
-        except Exception as e:
-            self.logger.error(f"Error calling OpenAI: {e}", exc_info=True)
-            raise
+            snippet = (content[:500] + "... [truncated]") if len(content) > 500 else content
+            self.logger.warning(f"JSON parsing error: {e} | Raw content snippet: {snippet}")
+            return {"raw_response": content, "parse_error": str(e)}
     
     def _call_gemini_chat(
         self,
@@ -387,19 +894,12 @@ class LLMClient:
             
             # Extract usage
             if response.usage_metadata:
-                prompt_tokens = response.usage_metadata.prompt_token_count
-                completion_tokens = response.usage_metadata.candidates_token_count
-                total_tokens = response.usage_metadata.total_token_count
-                
-                self.total_prompt_tokens += prompt_tokens
-                self.total_completion_tokens += completion_tokens
-                self.total_tokens_used += total_tokens
-                
-                self.logger.info(
-                    f"📊 Token usage ({self.model}): "
-                    f"Prompt: {prompt_tokens:,} | "
-                    f"Completion: {completion_tokens:,} | "
-                    f"Total: {total_tokens:,}"
+                self._record_usage(
+                    response.usage_metadata.prompt_token_count,
+                    response.usage_metadata.candidates_token_count,
+                    response.usage_metadata.total_token_count,
+                    # Implicit context caching (Gemini 2.5+) reports the cached part of the prompt
+                    getattr(response.usage_metadata, "cached_content_token_count", 0) or 0,
                 )
 
             # Handle response - check for safety blocks first
@@ -590,7 +1090,8 @@ class LLMClient:
             return {"raw_response": content}
 
         except Exception as e:
-            self.logger.error(f"Error calling Gemini: {e}", exc_info=True)
+            if classify_error(e) == FATAL:
+                self.logger.error(f"Error calling Gemini: {e}", exc_info=True)
             raise
 
     def _convert_to_gemini_contents(self, messages: List[Dict[str, Any]]) -> List[Any]:
@@ -733,7 +1234,10 @@ class LLMClient:
         return {
             "total_tokens": self.total_tokens_used,
             "prompt_tokens": self.total_prompt_tokens,
-            "completion_tokens": self.total_completion_tokens
+            "completion_tokens": self.total_completion_tokens,
+            "cached_tokens": self.total_cached_tokens,
+            "cache_hits": self.cache_hits,
+            "tokens_saved": self.tokens_saved
         }
     
     def reset_usage_stats(self) -> None:
@@ -741,6 +1245,9 @@ class LLMClient:
         self.total_tokens_used = 0
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
+        self.total_cached_tokens = 0
+        self.cache_hits = 0
+        self.tokens_saved = 0
     
     def _json_schema_to_gemini_schema(self, schema_dict: Dict[str, Any]) -> Any:
         """
@@ -804,4 +1311,4 @@ def get_llm_client(agent_name: Optional[str] = None) -> LLMClient:
         provider = "openai"
         logger.debug(f"🤖 Auto-detected provider 'openai' for model '{model}'")
     
-    return LLMClient(model=model, provider=provider)
+    return LLMClient(model=model, provider=provider, agent_name=agent_name)
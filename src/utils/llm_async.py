@@ -0,0 +1,355 @@
+"""Async LLM client with concurrent fan-out under per-model rate limits"""
+
+import asyncio
+import json
+import time
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from src.utils.llm import LLMClient, get_llm_client, openai_cached_tokens
+from src.utils.llm_retry import (
+    FATAL, RATE_LIMIT, LLMUnavailableError, classify_error, describe_error, get_circuit_breaker,
+    parse_reset_duration, retry_after_seconds,
+)
+from src.utils.llm_telemetry import STATUS_ERROR, STATUS_OK, record_llm_call
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.llm_async")
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int]) -> int:
+    """Rough request size (~4 characters per token) plus the completion allowance"""
+    prompt = len(json.dumps(messages, default=str)) // 4
+    return prompt + (max_tokens or 1000)
+
+
+def _rate_limit_config(model: str) -> Dict[str, Any]:
+    """Concurrency and tokens-per-minute limits for a model from llm.rate_limits"""
+    from src.utils.config import config
+    limits = config.get('llm', {}).get('rate_limits', {}) or {}
+    model_limits = (limits.get('models', {}) or {}).get(model, {}) or {}
+    return {
+        "max_concurrency": model_limits.get('max_concurrency', limits.get('max_concurrency', DEFAULT_MAX_CONCURRENCY)),
+        "tokens_per_minute": model_limits.get('tokens_per_minute', limits.get('tokens_per_minute')),
+    }
+
+
+class TokenBudget:
+    """Sliding one-minute window of tokens spent, shared by every request to one model"""
+
+    def __init__(self, tokens_per_minute: Optional[int], window_seconds: float = 60.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.window_seconds = window_seconds
+        self._spent: Deque[List[float]] = deque()  # [timestamp, tokens]
+        self._lock = asyncio.Lock()
+
+    def _used(self, now: float) -> float:
+        while self._spent and now - self._spent[0][0] >= self.window_seconds:
+            self._spent.popleft()
+        return sum(tokens for _, tokens in self._spent)
+
+    async def acquire(self, tokens: int) -> List[float]:
+        """Wait until `tokens` fit in the window, then reserve them; returns the reservation"""
+        reservation = [time.monotonic(), float(tokens)]
+        if not self.tokens_per_minute:
+            return reservation
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                # A single request larger than the budget still goes through once the window is empty
+                if not self._spent or self._used(now) + tokens <= self.tokens_per_minute:
+                    reservation[0] = now
+                    self._spent.append(reservation)
+                    return reservation
+                wait = self.window_seconds - (now - self._spent[0][0])
+                logger.debug(f"Token budget full ({self.tokens_per_minute:,}/min), waiting {wait:.1f}s")
+                await asyncio.sleep(max(wait, 0.01))
+
+    def settle(self, reservation: List[float], actual_tokens: Optional[int]) -> None:
+        """Replace a reservation's estimate with the tokens the request actually used"""
+        if actual_tokens is not None:
+            reservation[1] = float(actual_tokens)
+
+
+class ModelLimiter:
+    """Concurrency, token budget and provider rate-limit state for one model on one event loop"""
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: Optional[int]):
+        self.semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self.budget = TokenBudget(tokens_per_minute)
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float, reason: str) -> None:
+        """Hold new requests for `seconds` (extends, never shortens, an existing pause)"""
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_until = until
+            logger.warning(f"⏳ Backing off {seconds:.1f}s: {reason}")
+
+    async def wait_if_paused(self) -> None:
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Any, estimate: int) -> None:
+        """Pause proactively when the provider reports the request or token quota is exhausted"""
+        if not headers:
+            return
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_requests is not None and int(remaining_requests) <= 0:
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                self.pause(reset, "request quota exhausted")
+        if remaining_tokens is not None and int(remaining_tokens) < estimate:
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+            if reset:
+                self.pause(reset, f"only {int(remaining_tokens):,} tokens left in quota")
+
+
+# Limiters are per event loop (asyncio primitives cannot be shared across loops) and per model
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ModelLimiter]]" = weakref.WeakKeyDictionary()
+
+
+def get_model_limiter(model: str) -> ModelLimiter:
+    """Shared limiter for a model on the running event loop"""
+    loop = asyncio.get_running_loop()
+    by_model = _limiters.setdefault(loop, {})
+    limiter = by_model.get(model)
+    if limiter is None:
+        limits = _rate_limit_config(model)
+        limiter = ModelLimiter(limits["max_concurrency"], limits["tokens_per_minute"])
+        by_model[model] = limiter
+    return limiter
+
+
+class AsyncLLMClient:
+    """
+    Async front end for an LLMClient.
+
+    Requests run concurrently up to the model's max_concurrency and tokens-per-minute budget
+    (llm.rate_limits). OpenAI calls use the native async SDK and read x-ratelimit-* headers to
+    pause before the quota runs out; a 429 pauses every request to that model for the
+    provider's retry-after. Gemini calls run the blocking client in worker threads under the
+    same limits. Retries, circuit breakers and the fallback model follow the wrapped client's
+    llm.retry policy, exactly as LLMClient._dispatch_chat does. Usage statistics and the
+    response cache are shared with the wrapped client.
+    """
+
+    def __init__(self, llm_client: LLMClient):
+        """
+        Args:
+            llm_client: Configured client whose model, credentials, usage counters, retry
+                policy and response cache settings are used
+        """
+        self.client = llm_client
+        self.model = llm_client.model
+        self._async_openai: Dict[str, Any] = {}  # model -> AsyncOpenAI (primary and fallback)
+
+    def _openai_for(self, target: LLMClient) -> Any:
+        """Async OpenAI client for target (the wrapped client or its fallback)"""
+        client = self._async_openai.get(target.model)
+        if client is None:
+            import openai
+            # Retries are ours (RetryPolicy); SDK retries would multiply them and bypass the limiter
+            client = openai.AsyncOpenAI(api_key=target.api_key, max_retries=0)
+            self._async_openai[target.model] = client
+        return client
+
+    async def call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        parse_json: bool = True,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async equivalent of LLMClient.call"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        extra = {"tool_choice": tool_choice} if tool_choice else {}
+        return await self.call_chat(
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            parse_json=parse_json,
+            tools=tools,
+            **extra
+        )
+
+    async def call_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        parse_json: bool = True,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async equivalent of LLMClient.call_chat
+
+        Raises:
+            LLMUnavailableError: Retries exhausted, or the circuit is open with no usable fallback
+        """
+        ttl = self.client._response_cache_ttl()
+        cache_key = None
+        if ttl is not None:
+            cache_key = self.client._response_cache_key(
+                messages, response_format, temperature, max_tokens, parse_json, tools, kwargs
+            )
+            cached = self.client._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        response, usage = await self._dispatch(
+            messages, response_format, temperature, max_tokens, parse_json, tools, **kwargs
+        )
+        if cache_key is not None:
+            self.client._store_cached_response(cache_key, response, ttl, usage=usage or {})
+        return response
+
+    async def _dispatch(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int],
+        parse_json: bool,
+        tools: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> tuple:
+        """Send one request with the wrapped client's retry policy and circuit breakers; returns (response, usage)"""
+        policy = self.client.retry_policy
+        target = self.client._route_request()
+        estimate = _estimate_tokens(messages, max_tokens)
+        last_error: Optional[BaseException] = None
+        started = time.monotonic()
+        for attempt in range(1, policy.max_attempts + 1):
+            breaker = get_circuit_breaker(target.model, policy)
+            limiter = get_model_limiter(target.model)
+            reservation = await limiter.budget.acquire(estimate)
+            try:
+                async with limiter.semaphore:
+                    await limiter.wait_if_paused()
+                    response, usage = await self._send(
+                        target, limiter, estimate, messages, response_format, temperature, max_tokens,
+                        parse_json, tools, **kwargs
+                    )
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == FATAL:
+                    breaker.release_trial()
+                    self._record_call(target, started, attempt - 1, STATUS_ERROR, error=e)
+                    raise
+                breaker.record_failure()
+                last_error = e
+                retry_after = retry_after_seconds(e)
+                if kind == RATE_LIMIT:
+                    # Every request to this model waits, not just the one that got the 429
+                    limiter.pause(retry_after or policy.backoff(attempt), f"429 from {target.model}")
+                if attempt == policy.max_attempts:
+                    break
+                if breaker.is_open:
+                    target = self.client._route_request()
+                    logger.warning(f"⚠️  {describe_error(e)} - retrying on {target.model}")
+                    continue
+                if kind == RATE_LIMIT:
+                    continue
+                delay = policy.backoff(attempt, retry_after)
+                logger.warning(
+                    f"⚠️  {target.model} {kind.replace('_', ' ')} (attempt {attempt}/{policy.max_attempts}): "
+                    f"{describe_error(e)} - retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            limiter.budget.settle(reservation, usage.get("total_tokens") if usage else None)
+            breaker.record_success()
+            self._record_call(target, started, attempt - 1, STATUS_OK, usage=usage)
+            return response, usage
+        self._record_call(target, started, policy.max_attempts - 1, STATUS_ERROR, error=last_error)
+        raise LLMUnavailableError(
+            f"{target.model} failed after {policy.max_attempts} attempts: {describe_error(last_error)}"
+        ) from last_error
+
+    def _record_call(self, target: LLMClient, started: float, retries: int, status: str,
+                     usage: Optional[Dict[str, int]] = None, error: Optional[BaseException] = None) -> None:
+        record_llm_call(
+            self.client.agent_name, target.model, target.provider, usage=usage,
+            latency_ms=(time.monotonic() - started) * 1000, retries=retries, status=status,
+            error=describe_error(error) if error is not None else None,
+        )
+
+    async def gather(self, requests: List[Dict[str, Any]], return_exceptions: bool = False) -> List[Any]:
+        """
+        Run many call_chat requests concurrently, in input order
+
+        Args:
+            requests: call_chat keyword arguments, one dict per request
+            return_exceptions: Return failures in place instead of raising the first one
+        """
+        return await asyncio.gather(
+            *(self.call_chat(**request) for request in requests),
+            return_exceptions=return_exceptions
+        )
+
+    def run_many(self, requests: List[Dict[str, Any]], return_exceptions: bool = False) -> List[Any]:
+        """Blocking helper for synchronous callers: run gather() on a fresh event loop"""
+        return asyncio.run(self.gather(requests, return_exceptions=return_exceptions))
+
+    async def _send(
+        self,
+        target: LLMClient,
+        limiter: ModelLimiter,
+        estimate: int,
+        messages: List[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int],
+        parse_json: bool,
+        tools: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> tuple:
+        """One provider attempt on target; returns (response, usage)"""
+        if target.provider != "openai":
+            return await asyncio.to_thread(
+                self._call_blocking, target, messages, response_format, temperature, max_tokens,
+                parse_json, tools, **kwargs
+            )
+        request_params = target._build_openai_request(
+            messages, response_format, temperature, max_tokens, tools, **kwargs
+        )
+        raw = await self._openai_for(target).chat.completions.with_raw_response.create(**request_params)
+        limiter.update_from_headers(raw.headers, estimate)
+        completion = raw.parse()
+        usage = None
+        if completion.usage:
+            usage = {
+                "prompt_tokens": completion.usage.prompt_tokens,
+                "completion_tokens": completion.usage.completion_tokens,
+                "total_tokens": completion.usage.total_tokens,
+                "cached_tokens": openai_cached_tokens(completion.usage),
+            }
+        # Usage is credited to the wrapped client, also when the fallback model answered
+        return self.client._handle_openai_response(completion, parse_json), usage
+
+    def _call_blocking(self, target: LLMClient, *args, **kwargs) -> tuple:
+        """One provider attempt on target in a worker thread; returns (response, usage)"""
+        self.client._local.last_usage = None
+        response = self.client._send_via(target, *args, **kwargs)
+        return response, getattr(self.client._local, "last_usage", None)
+
+
+def get_async_llm_client(agent_name: Optional[str] = None) -> AsyncLLMClient:
+    """Get a configured AsyncLLMClient"""
+    return AsyncLLMClient(get_llm_client(agent_name))
@@ -0,0 +1,137 @@
+"""Offline submission of chat requests through the OpenAI Batch API"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.llm_batch")
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+DEFAULT_WORK_DIR = "data/batches"
+
+
+def _batch_config() -> Dict[str, Any]:
+    from src.utils.config import config
+    return config.get('llm', {}).get('batch', {}) or {}
+
+
+def batch_enabled_for(agent_name: Optional[str]) -> bool:
+    """True if llm.batch is enabled and lists this agent (or caller) under `agents`"""
+    batch_config = _batch_config()
+    if not batch_config.get('enabled', False) or not agent_name:
+        return False
+    return agent_name.lower() in [a.lower() for a in batch_config.get('agents', []) or []]
+
+
+def build_batch_line(custom_id: str, request_params: Dict[str, Any]) -> Dict[str, Any]:
+    """One JSONL line of a batch input file"""
+    return {"custom_id": custom_id, "method": "POST", "url": CHAT_ENDPOINT, "body": request_params}
+
+
+class BatchJob:
+    """
+    One Batch API round trip: write the JSONL input, upload and submit it, poll until the
+    batch reaches a terminal status, then download the output and map results by custom_id.
+
+    Batches complete asynchronously (OpenAI allows up to 24h) at about half the per-token price
+    of direct calls, so this is only for work nobody is waiting on. If the batch is not done
+    within max_wait_seconds it is cancelled and the caller falls back to direct calls.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        poll_interval: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        work_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            client: openai.OpenAI instance (its base_url decides which server is used)
+            poll_interval: Seconds between status checks (llm.batch.poll_interval_seconds)
+            max_wait: Seconds before giving up and cancelling (llm.batch.max_wait_seconds)
+            work_dir: Directory for JSONL input files (llm.batch.work_dir)
+        """
+        batch_config = _batch_config()
+        self.client = client
+        self.poll_interval = poll_interval if poll_interval is not None else float(
+            batch_config.get('poll_interval_seconds', 30))
+        self.max_wait = max_wait if max_wait is not None else float(batch_config.get('max_wait_seconds', 1800))
+        self.work_dir = Path(work_dir or batch_config.get('work_dir', DEFAULT_WORK_DIR))
+
+    def write_jsonl(self, lines: List[Dict[str, Any]], label: str = "batch") -> Path:
+        """Write batch input lines to a JSONL file and return its path"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        path = self.work_dir / f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl"
+        with open(path, "w") as f:
+            for line in lines:
+                f.write(json.dumps(line, default=str) + "\n")
+        return path
+
+    def submit(self, path: Path, label: str = "batch") -> str:
+        """Upload the input file and create the batch; returns the batch id"""
+        with open(path, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=CHAT_ENDPOINT,
+            completion_window="24h",
+            metadata={"source": "terrarium", "label": label},
+        )
+        logger.info(f"📦 Submitted batch {batch.id} ({path.name})")
+        return batch.id
+
+    def wait(self, batch_id: str) -> Optional[Any]:
+        """Poll until the batch is terminal; cancels and returns None after max_wait"""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() >= deadline:
+                logger.warning(f"⏳ Batch {batch_id} still {batch.status} after {self.max_wait:.0f}s, cancelling")
+                try:
+                    self.client.batches.cancel(batch_id)
+                except Exception as e:
+                    logger.warning(f"Could not cancel batch {batch_id}: {e}")
+                return None
+            time.sleep(self.poll_interval)
+
+    def results(self, batch: Any) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Map custom_id -> (chat completion body, error) from the batch output and error files"""
+        results: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+        for file_id in (getattr(batch, "output_file_id", None), getattr(batch, "error_file_id", None)):
+            if not file_id:
+                continue
+            content = self.client.files.content(file_id).text
+            for raw in content.splitlines():
+                if not raw.strip():
+                    continue
+                line = json.loads(raw)
+                response = line.get("response") or {}
+                if line.get("error") or response.get("status_code", 200) >= 400:
+                    error = line.get("error") or response.get("body", {}).get("error")
+                    results[line["custom_id"]] = (None, json.dumps(error, default=str))
+                else:
+                    results[line["custom_id"]] = (response.get("body"), None)
+        return results
+
+    def run(
+        self, lines: List[Dict[str, Any]], label: str = "batch"
+    ) -> Optional[Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]]:
+        """Write, submit, wait and collect; None if the batch did not complete"""
+        path = self.write_jsonl(lines, label)
+        batch_id = self.submit(path, label)
+        batch = self.wait(batch_id)
+        if batch is None:
+            return None
+        if batch.status != "completed":
+            logger.warning(f"⚠️  Batch {batch_id} ended with status {batch.status}")
+            return None
+        path.unlink(missing_ok=True)
+        return self.results(batch)
@@ -0,0 +1,217 @@
+"""Transport-level retry, backoff and circuit breaking for LLM provider calls"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.llm_retry")
+
+# Error classes
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Provider still failing after transport retries (and fallback), or its circuit is open"""
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset headers ("1s", "6m0s", "250ms") or a bare seconds value into seconds"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    # openai.APIStatusError has status_code; google.api_core exceptions carry the HTTP code in .code
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify a provider error as RATE_LIMIT, TRANSIENT (worth retrying) or FATAL
+
+    429s are rate limits; timeouts, connection failures, 408/409 and 5xx are transient;
+    everything else (bad requests, auth, our own bugs) is fatal and retrying would not help.
+    """
+    try:
+        import openai
+        if isinstance(error, openai.RateLimitError):
+            return RATE_LIMIT
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+            return TRANSIENT
+    except ImportError:
+        pass
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    status = _status_code(error)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and (status >= 500 or status in (408, 409)):
+        return TRANSIENT
+    return FATAL
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-requested wait from retry-after-ms / retry-after headers, if the error carries them"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        seconds = parse_reset_duration(retry_after_ms)
+        return seconds / 1000.0 if seconds is not None else None
+    return parse_reset_duration(headers.get("retry-after"))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How LLMClient retries a single provider request"""
+    max_attempts: int = 4
+    base_delay: float = 1.0           # Seconds; doubles per attempt before jitter
+    max_delay: float = 30.0           # Cap on computed backoff (retry-after is honored as given)
+    failure_threshold: int = 5        # Consecutive retryable failures that open a model's circuit
+    cooldown_seconds: float = 60.0    # How long an open circuit rejects requests before a trial call
+    fallback_model: Optional[str] = None
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        """Policy from the `llm.retry` config section (missing keys keep the defaults)"""
+        from src.utils.config import config
+        retry_config = config.get('llm', {}).get('retry', {}) or {}
+        defaults = cls()
+        return cls(
+            max_attempts=max(1, int(retry_config.get('max_attempts', defaults.max_attempts))),
+            base_delay=float(retry_config.get('base_delay_seconds', defaults.base_delay)),
+            max_delay=float(retry_config.get('max_delay_seconds', defaults.max_delay)),
+            failure_threshold=int(retry_config.get('failure_threshold', defaults.failure_threshold)),
+            cooldown_seconds=float(retry_config.get('cooldown_seconds', defaults.cooldown_seconds)),
+            fallback_model=retry_config.get('fallback_model') or None,
+        )
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before retry number `attempt` (1-based)
+
+        Full jitter over an exponential ceiling, so concurrent batches that failed together do
+        not retry together. A server retry-after is a floor, with a little jitter on top.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit: closed -> open after failure_threshold consecutive retryable failures,
+    open -> half-open after cooldown (one trial request), half-open -> closed on success or
+    back to open on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, model: str, failure_threshold: int, cooldown_seconds: float):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent to this model now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ Circuit for {self.model} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"🔌 Circuit for {self.model} opened after {self.failures} consecutive failures "
+                        f"(cooldown {self.cooldown_seconds:.0f}s)"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        End a half-open trial that neither succeeded nor counted as a failure (a fatal error is
+        the caller's fault, not the model's), so the next request becomes the trial
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(model: str, policy: Optional[RetryPolicy] = None) -> CircuitBreaker:
+    """Process-wide circuit breaker for a model (shared by every agent using it)"""
+    with _breakers_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            policy = policy or RetryPolicy()
+            breaker = CircuitBreaker(model, policy.failure_threshold, policy.cooldown_seconds)
+            _breakers[model] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all circuit state (new run, or tests)"""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def describe_error(error: Any) -> str:
+    status = _status_code(error)
+    return f"{type(error).__name__}{f' {status}' if status else ''}: {error}"
@@ -0,0 +1,142 @@
+"""Per-call LLM telemetry: token usage, latency, retries and cost, written to the llm_calls table"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from src.utils.logging import get_logger
+
+logger = get_logger("utils.llm_telemetry")
+
+# Status of a recorded call
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_CACHE_HIT = "cache_hit"
+STATUS_BATCH = "batch"
+
+# Set by the Coordinator for the duration of a workflow run
+_sink = None
+_run_id: Optional[str] = None
+
+# Batch label of the agent batch currently making calls (per thread / task)
+_batch_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_batch_id", default=None)
+
+# Process-wide call count and summed latency, kept whether or not a sink is set (read by step timing)
+_totals_lock = threading.Lock()
+_totals = {"calls": 0, "latency_ms": 0.0}
+
+
+def set_telemetry_sink(sink: Any, run_id: Optional[str] = None) -> None:
+    """
+    Record every LLM call from now on into sink (an LLMCallSink) under run_id.
+    Pass sink=None to stop recording.
+    """
+    global _sink, _run_id
+    _sink = sink
+    _run_id = run_id
+
+
+def current_run_id() -> Optional[str]:
+    """Run id calls are currently recorded under"""
+    return _run_id
+
+
+@contextmanager
+def llm_batch_context(batch_id: str) -> Iterator[None]:
+    """Tag LLM calls made inside the block (on this thread) with an agent batch id"""
+    token = _batch_id.set(batch_id)
+    try:
+        yield
+    finally:
+        _batch_id.reset(token)
+
+
+def llm_time_totals() -> Dict[str, float]:
+    """Provider calls and their summed latency since process start (diff two reads for a window)"""
+    with _totals_lock:
+        return dict(_totals)
+
+
+def _pricing_config() -> Dict[str, Any]:
+    from src.utils.config import config
+    return config.get('llm', {}).get('pricing', {}) or {}
+
+
+def model_prices(model: str) -> Optional[Dict[str, float]]:
+    """
+    USD per million tokens for a model from llm.pricing.models, matched by longest prefix
+    (so "gpt-5" prices "gpt-5.2"). None if the model has no entry.
+    """
+    models = _pricing_config().get('models', {}) or {}
+    matches = [name for name in models if model.startswith(name)]
+    if not matches:
+        return None
+    return models[max(matches, key=len)]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0,
+                  batch: bool = False) -> Optional[float]:
+    """
+    Dollar cost of one call. Cached prompt tokens are billed at cached_input (input if not
+    set); Batch API calls get llm.pricing.batch_discount. None if the model is not priced.
+    """
+    prices = model_prices(model)
+    if prices is None:
+        return None
+    input_price = float(prices.get('input', 0.0))
+    cached_price = float(prices.get('cached_input', input_price))
+    output_price = float(prices.get('output', 0.0))
+    uncached = max(0, prompt_tokens - cached_tokens)
+    cost = (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+    if batch:
+        cost *= float(_pricing_config().get('batch_discount', 0.5))
+    return cost
+
+
+def record_llm_call(
+    agent_name: Optional[str],
+    model: str,
+    provider: str,
+    usage: Optional[Dict[str, int]] = None,
+    latency_ms: Optional[float] = None,
+    retries: int = 0,
+    status: str = STATUS_OK,
+    error: Optional[str] = None,
+) -> None:
+    """Queue one llm_calls row (no-op unless a sink is set)"""
+    if status != STATUS_CACHE_HIT:
+        with _totals_lock:
+            _totals["calls"] += 1
+            _totals["latency_ms"] += latency_ms or 0.0
+    sink = _sink
+    if sink is None:
+        return
+    usage = usage or {}
+    prompt_tokens = int(usage.get("prompt_tokens", 0) or 0)
+    completion_tokens = int(usage.get("completion_tokens", 0) or 0)
+    cached_tokens = int(usage.get("cached_tokens", 0) or 0)
+    cost = None
+    if status != STATUS_CACHE_HIT:
+        cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens, batch=status == STATUS_BATCH)
+    try:
+        sink.record({
+            "run_id": _run_id,
+            "timestamp": datetime.now(),
+            "agent_name": agent_name,
+            "model": model,
+            "provider": provider,
+            "batch_id": _batch_id.get(),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "total_tokens": int(usage.get("total_tokens", prompt_tokens + completion_tokens) or 0),
+            "latency_ms": latency_ms,
+            "retries": retries,
+            "status": status,
+            "error": error[:500] if error else None,
+            "cost_usd": cost,
+        })
+    except Exception as e:
+        logger.debug(f"Could not record LLM call telemetry: {e}")
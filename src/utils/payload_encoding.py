@@ -0,0 +1,226 @@
+"""Compact wire encoding for agent input payloads"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Union
+
+TABLE_COLUMNS = "_cols"
+TABLE_ROWS = "_rows"
+
+# Long keys that repeat once per game in agent inputs, grouped by the payload they come from.
+# The legend lists every alias an agent may see, so each agent only gets the groups in its
+# own input. Keys that also appear in an agent's output schema are dropped as well (see
+# get_payload_encoding), so the model never has to translate an alias back when echoing.
+RESEARCH_KEY_ALIASES: Dict[str, str] = {
+    "common_opponents": "co",
+    "efg_pct": "efg",
+    "turnover_pct": "tov",
+    "off_reb_pct": "orb",
+    "fta_per_fga": "ftr",
+}
+
+MODEL_KEY_ALIASES: Dict[str, str] = {
+    "game_models": "gm",
+    "predictions": "pr",
+    "predicted_score": "ps",
+    "away_score": "as",
+    "home_score": "hs",
+    "market_edges": "me",
+    "market_type": "mt",
+    "market_line": "mln",
+    "model_estimated_probability": "mep",
+    "implied_probability": "ip",
+    "edge_confidence": "ec",
+    "market_analysis": "ma",
+    "discrepancy_note": "dn",
+    "edge_magnitude": "em",
+    "ev_estimate": "ev",
+    "win_probs": "wp",
+    "base_pace": "bp",
+    "trend_adjustment": "ta",
+    "final_pace": "fp",
+    "base_margin": "bm",
+    "hca_adjustment": "hca",
+    "mismatch_adjustment": "mma",
+    "raw_margin": "rm",
+    "raw_total": "rt",
+    "calibrated_total": "ct",
+    "raw_away_score": "ras",
+    "raw_home_score": "rhs",
+    "dampening_applied": "da",
+    "garbage_time_applied": "gta",
+    "market_total_used": "mtu",
+    "market_spread_home": "msh",
+    "is_neutral_site": "ns",
+    "is_conference_game": "cg",
+}
+
+PICKER_KEY_ALIASES: Dict[str, str] = {
+    "researcher_output": "ro",
+    "modeler_output": "mo",
+    "historical_performance": "hp",
+    "bet_type_performance": "btp",
+    "recent_recommendations": "rr",
+}
+
+KEY_ALIASES: Dict[str, str] = {**RESEARCH_KEY_ALIASES, **MODEL_KEY_ALIASES, **PICKER_KEY_ALIASES}
+
+AGENT_KEY_ALIASES: Dict[str, Dict[str, str]] = {
+    "researcher": RESEARCH_KEY_ALIASES,
+    "picker": KEY_ALIASES,
+}
+
+
+def estimate_tokens(text: Union[str, int]) -> int:
+    """Rough token count (4 chars per token for English/JSON); accepts text or a char count"""
+    if isinstance(text, int):
+        return text // 4
+    return len(text) // 4
+
+
+def schema_keys(schema: Any) -> FrozenSet[str]:
+    """Every property name declared anywhere in a JSON schema"""
+    keys = set()
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            properties = node.get("properties")
+            if isinstance(properties, dict):
+                keys.update(properties)
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(schema)
+    return frozenset(keys)
+
+
+@dataclass(frozen=True)
+class PayloadEncoding:
+    """
+    How an agent's input data is written into its user prompt.
+
+    compact=False reproduces the old json.dumps(indent=2) output. compact=True writes minified
+    JSON with floats rounded to `precision` places, keys replaced by `aliases`, and lists of
+    two or more objects written as a table ({"_cols": [...], "_rows": [[...], ...]}) so each
+    game's keys are sent once per list instead of once per game.
+    """
+
+    compact: bool = True
+    precision: Optional[int] = 3
+    tabular: bool = True
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+    def legend(self) -> str:
+        """
+        Decoding notes for the model. Depends only on the encoding, never on the data, so it
+        can sit in the static part of the prompt (compose_user_prompt puts it right after the
+        instructions).
+        """
+        if not self.compact:
+            return ""
+        lines = ["Input data is compact JSON."]
+        if self.tabular:
+            lines.append(
+                f'A list of objects is sent as a table {{"{TABLE_COLUMNS}": [keys], "{TABLE_ROWS}": [[values]]}}; '
+                f"each row holds one object's values in column order (null = not present)."
+            )
+        if self.precision is not None:
+            lines.append(f"Decimals are rounded to {self.precision} places.")
+        if self.aliases:
+            pairs = ", ".join(f"{alias}={key}" for key, alias in sorted(self.aliases.items(), key=lambda kv: kv[1]))
+            lines.append(f"Abbreviated keys: {pairs}.")
+        return "\n".join(lines)
+
+    def encode(self, data: Any) -> str:
+        """Serialize input data for the prompt"""
+        if not self.compact:
+            return json.dumps(data, indent=2, default=str)
+        return json.dumps(self._pack(data), separators=(",", ":"), default=str, ensure_ascii=False)
+
+    def _pack(self, value: Any) -> Any:
+        if isinstance(value, float):
+            if self.precision is None:
+                return value
+            rounded = round(value, self.precision)
+            return int(rounded) if rounded.is_integer() else rounded
+        if isinstance(value, dict):
+            return {self.aliases.get(k, k): self._pack(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            if self.tabular and len(value) >= 2 and all(isinstance(item, dict) for item in value):
+                return self._table(value)
+            return [self._pack(item) for item in value]
+        return value
+
+    def _table(self, items: list) -> Dict[str, Any]:
+        columns = list(dict.fromkeys(key for item in items for key in item))
+        return {
+            TABLE_COLUMNS: [self.aliases.get(k, k) for k in columns],
+            TABLE_ROWS: [[self._pack(item.get(k)) for k in columns] for item in items],
+        }
+
+
+def decode_payload(data: Any, encoding: PayloadEncoding) -> Any:
+    """Invert PayloadEncoding._pack (tables back to lists, aliases back to keys); rounding is lossy"""
+    reverse = {alias: key for key, alias in encoding.aliases.items()}
+    if isinstance(data, dict):
+        if set(data) == {TABLE_COLUMNS, TABLE_ROWS}:
+            columns = [reverse.get(c, c) for c in data[TABLE_COLUMNS]]
+            return [
+                {k: decode_payload(v, encoding) for k, v in zip(columns, row) if v is not None}
+                for row in data[TABLE_ROWS]
+            ]
+        return {reverse.get(k, k): decode_payload(v, encoding) for k, v in data.items()}
+    if isinstance(data, list):
+        return [decode_payload(item, encoding) for item in data]
+    return data
+
+
+def _payload_config() -> Dict[str, Any]:
+    from src.utils.config import config
+    return config.get('llm', {}).get('payload_encoding', {}) or {}
+
+
+def _output_schema_keys(agent_name: str) -> FrozenSet[str]:
+    from src.utils import json_schemas
+    schema_fn = getattr(json_schemas, f"get_{agent_name.lower()}_schema", None)
+    return schema_keys(schema_fn()) if schema_fn else frozenset()
+
+
+def get_payload_encoding(agent_name: Optional[str] = None) -> PayloadEncoding:
+    """
+    Encoding for an agent's input payloads from llm.payload_encoding (with per-agent
+    overrides under `agents`). Aliases are the agent's AGENT_KEY_ALIASES minus every key
+    in its output schema.
+    """
+    settings = dict(_payload_config())
+    overrides = (settings.pop('agents', {}) or {}).get((agent_name or "").lower(), {}) or {}
+    settings.update(overrides)
+
+    if settings.get('mode', 'compact') != 'compact':
+        return PayloadEncoding(compact=False)
+
+    aliases: Dict[str, str] = {}
+    if settings.get('aliases', True):
+        echoed = _output_schema_keys(agent_name) if agent_name else frozenset()
+        candidates = AGENT_KEY_ALIASES.get((agent_name or "").lower(), {})
+        aliases = {k: v for k, v in candidates.items() if k not in echoed}
+    return PayloadEncoding(
+        compact=True,
+        precision=settings.get('precision', 3),
+        tabular=settings.get('tabular', True),
+        aliases=aliases,
+    )
+
+
+__all__ = [
+    "AGENT_KEY_ALIASES",
+    "KEY_ALIASES",
+    "PayloadEncoding",
+    "decode_payload",
+    "estimate_tokens",
+    "get_payload_encoding",
+    "schema_keys",
+]
@@ -1,6 +1,7 @@
 """Reporting package for daily and summary reports"""
 
+from src.utils.reporting.llm_stats import format_llm_stats, load_llm_calls
 from src.utils.reporting.report_generator import ReportGenerator
 
-__all__ = ['ReportGenerator']
+__all__ = ['ReportGenerator', 'format_llm_stats', 'load_llm_calls']
 
@@ -0,0 +1,116 @@
+"""LLM spend and latency report from the llm_calls telemetry table"""
+
+import math
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.data.storage import Database, LLMCallModel
+
+
+def _row_dict(row: LLMCallModel) -> Dict[str, Any]:
+    return {column.name: getattr(row, column.name) for column in LLMCallModel.__table__.columns}
+
+
+def load_llm_calls(db: Database, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """llm_calls rows with timestamps between start_date and end_date (inclusive)"""
+    session = db.get_read_session()
+    try:
+        rows = (
+            session.query(LLMCallModel)
+            .filter(LLMCallModel.timestamp >= datetime.combine(start_date, datetime.min.time()))
+            .filter(LLMCallModel.timestamp < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+            .order_by(LLMCallModel.timestamp)
+            .all()
+        )
+        return [_row_dict(row) for row in rows]
+    finally:
+        session.close()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (pct in 0-100); None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+def summarize_calls(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals and latency percentiles for a group of llm_calls rows"""
+    rows = list(rows)
+    latencies = [r["latency_ms"] for r in rows if r.get("latency_ms") is not None and r["status"] != "cache_hit"]
+    costs = [r["cost_usd"] for r in rows if r.get("cost_usd") is not None]
+    return {
+        "calls": sum(1 for r in rows if r["status"] != "cache_hit"),
+        "cache_hits": sum(1 for r in rows if r["status"] == "cache_hit"),
+        "errors": sum(1 for r in rows if r["status"] == "error"),
+        "retries": sum(r.get("retries") or 0 for r in rows),
+        "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in rows),
+        "completion_tokens": sum(r.get("completion_tokens") or 0 for r in rows),
+        "cached_tokens": sum(r.get("cached_tokens") or 0 for r in rows),
+        "cost_usd": sum(costs),
+        "unpriced_calls": sum(
+            1 for r in rows if r.get("cost_usd") is None and r["status"] in ("ok", "batch")
+        ),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def group_calls(rows: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any]) -> Dict[Any, Dict[str, Any]]:
+    """summarize_calls per group, in first-seen order"""
+    groups: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row)
+    return {name: summarize_calls(group) for name, group in groups.items()}
+
+
+def _format_row(label: str, s: Dict[str, Any]) -> str:
+    def ms(value: Optional[float]) -> str:
+        return f"{value / 1000:.1f}s" if value is not None else "-"
+
+    cost = f"${s['cost_usd']:.4f}" + ("*" if s["unpriced_calls"] else "")
+    return (
+        f"  {label:28} {s['calls']:>5} calls {s['prompt_tokens']:>10,} in {s['cached_tokens']:>9,} cached "
+        f"{s['completion_tokens']:>9,} out {cost:>10}  p50 {ms(s['p50_ms']):>6} p95 {ms(s['p95_ms']):>6}"
+        + (f"  {s['retries']} retries" if s["retries"] else "")
+        + (f"  {s['errors']} errors" if s["errors"] else "")
+        + (f"  {s['cache_hits']} cache hits" if s["cache_hits"] else "")
+    )
+
+
+def format_llm_stats(rows: List[Dict[str, Any]], start_date: date, end_date: date) -> str:
+    """Render per-day, per-run and per-agent breakdowns as plain text"""
+    lines = [f"LLM usage {start_date} to {end_date}"]
+    if not rows:
+        lines.append("  No LLM calls recorded.")
+        return "\n".join(lines)
+
+    total = summarize_calls(rows)
+    lines.append(_format_row("TOTAL", total))
+    sections = [
+        ("By day", lambda r: r["timestamp"].date().isoformat()),
+        ("By run", lambda r: r.get("run_id") or "(no run)"),
+        ("By agent", lambda r: f"{r.get('agent_name') or '-'} ({r['model']})"),
+    ]
+    for title, key in sections:
+        lines.append("")
+        lines.append(title)
+        for label, summary in group_calls(rows, key).items():
+            lines.append(_format_row(str(label), summary))
+    if total["unpriced_calls"]:
+        lines.append("")
+        lines.append(f"* {total['unpriced_calls']} calls used models without an llm.pricing entry (not costed)")
+    return "\n".join(lines)
+
+
+def run_summary(db: Database, run_id: str) -> Dict[str, Any]:
+    """summarize_calls for every row of one workflow run"""
+    session = db.get_read_session()
+    try:
+        rows = session.query(LLMCallModel).filter(LLMCallModel.run_id == run_id).all()
+        return summarize_calls(_row_dict(row) for row in rows)
+    finally:
+        session.close()
@@ -119,7 +119,7 @@ class ReportGenerator:
         if not self.db:
             return "No database available for summary report"
         
-        session = self.db.get_session()
+        session = self.db.get_read_session()
         try:
             # Get all reports in range
             reports = session.query(DailyReportModel).filter(
@@ -172,7 +172,7 @@ class ReportGenerator:
         if not self.db:
             return "No database available for bankroll report"
         
-        session = self.db.get_session()
+        session = self.db.get_read_session()
         try:
             # Get current bankroll
             bankroll = session.query(BankrollModel).order_by(
@@ -296,7 +296,7 @@ class ReportGenerator:
         
         if self.db:
             from src.data.storage import BettingLineModel
-            session = self.db.get_session()
+            session = self.db.get_read_session()
             try:
                 game_ids = [p.game_id for p in approved_picks if p.game_id]
                 # Also include underdog game_id if available
@@ -425,7 +425,7 @@ class ReportGenerator:
         game_info_map = {}
         if self.db:
             from src.data.storage import GameModel
-            session = self.db.get_session()
+            session = self.db.get_read_session()
             try:
                 from src.data.storage import TeamModel
                 from sqlalchemy.orm import aliased
@@ -1016,7 +1016,7 @@ class ReportGenerator:
             from src.data.storage import GameModel
             game_info_map = {}
             if self.db:
-                session = self.db.get_session()
+                session = self.db.get_read_session()
                 try:
                     rejected_game_ids = [pick_id for pick_id in card_review.picks_rejected]
                     # Get picks to find game_ids
@@ -1057,7 +1057,7 @@ class ReportGenerator:
                 # Try to get pick details from database
                 pick_details = None
                 if self.db:
-                    session = self.db.get_session()
+                    session = self.db.get_read_session()
                     try:
                         from src.data.storage import PickModel
                         pick_model = session.query(PickModel).filter(PickModel.id == pick_id).first()
@@ -2,6 +2,7 @@
 
 import re
 import unicodedata
+from functools import lru_cache
 from typing import List, Optional, Set, Dict, Tuple, Any
 
 try:
@@ -48,6 +49,13 @@ MASCOT_NAMES = [
     'seawolves', 'jaguars', 'griffins', 'lakers', 'cougars', 'cyclones', 'catamounts', 'phoenix', 'tritons', 'univ'
 ]
 
+# Bound for each memoized normalization function below. A season touches a few hundred
+# teams under a handful of spellings each, so this comfortably holds the working set.
+NORMALIZATION_CACHE_SIZE = 4096
+
+# Sorted once at import; callers strip the longest mascot first to handle compound names
+_MASCOTS_LONGEST_FIRST = sorted(MASCOT_NAMES, key=len, reverse=True)
+
 # Special mappings
 SPECIAL_TEAM_MAPPINGS = {
     'notre dame gators': 'notre dame (md)',
@@ -114,6 +122,7 @@ TEAM_NAME_MAPPING: Dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def remove_mascot_from_team_name(team_name: str) -> str:
     """
     Remove mascot names from team name.
@@ -137,12 +146,9 @@ def remove_mascot_from_team_name(team_name: str) -> str:
         if key in name_lower:
             return value
     
-    # Sort mascots by length (longest first) to handle compound names
-    sorted_mascots = sorted(MASCOT_NAMES, key=len, reverse=True)
-    
-    # Remove mascot names
+    # Remove mascot names (longest first to handle compound names)
     cleaned_name = team_name
-    for mascot in sorted_mascots:
+    for mascot in _MASCOTS_LONGEST_FIRST:
         name_lower = cleaned_name.lower()
         # Remove mascot if it appears at the end
         if name_lower.endswith(' ' + mascot):
@@ -156,6 +162,7 @@ def remove_mascot_from_team_name(team_name: str) -> str:
     return cleaned_name
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_team_name(team_name: str, for_matching: bool = True) -> str:
     """
     Normalize a team name for consistent matching across different data sources.
@@ -486,9 +493,7 @@ def normalize_team_name_for_lookup(team_name: str) -> str:
     
     # Remove mascot names using the MASCOT_NAMES list (sorted by length, longest first)
     # This ensures compound names like "fighting irish" are matched before single words
-    sorted_mascots = sorted(MASCOT_NAMES, key=len, reverse=True)
-    
-    for mascot in sorted_mascots:
+    for mascot in _MASCOTS_LONGEST_FIRST:
         name_lower = normalized.lower()
         # Remove mascot if it appears at the end (with or without leading space)
         if name_lower.endswith(' ' + mascot):
@@ -714,6 +719,13 @@ def get_team_name_variations(team_name: str) -> List[str]:
     Returns:
         List of possible team name variations
     """
+    # Cached as a tuple so callers can't mutate the shared entry
+    return list(_team_name_variations(team_name))
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def _team_name_variations(team_name: str) -> Tuple[str, ...]:
+    """Memoized body of get_team_name_variations (returns a sorted tuple)"""
     variations = set()
     
     # Add normalized version
@@ -771,7 +783,7 @@ def get_team_name_variations(team_name: str) -> List[str]:
     
     # Remove empty strings and return as sorted list
     variations.discard('')
-    return sorted(list(variations))
+    return tuple(sorted(variations))
 
 
 def map_team_name_to_canonical(team_name: str) -> str:
@@ -814,11 +826,6 @@ def determine_home_away_from_result(
     """
     from src.data.storage import TeamModel
     
-    home_team_id = result_data.get('home_team_id')
-    away_team_id = result_data.get('away_team_id')
-    home_team_name = result_data.get('home_team', '')
-    away_team_name = result_data.get('away_team', '')
-    
     # Get database team names
     db_team1 = session.query(TeamModel).filter_by(id=team1_id).first()
     db_team2 = session.query(TeamModel).filter_by(id=team2_id).first()
@@ -826,8 +833,35 @@ def determine_home_away_from_result(
     if not db_team1 or not db_team2:
         return None
     
-    db_team1_name = db_team1.normalized_team_name
-    db_team2_name = db_team2.normalized_team_name
+    return determine_home_away_from_team_names(
+        team1_id, team2_id, db_team1.normalized_team_name, db_team2.normalized_team_name, result_data
+    )
+
+
+def determine_home_away_from_team_names(
+    team1_id: int,
+    team2_id: int,
+    db_team1_name: str,
+    db_team2_name: str,
+    result_data: Dict[str, Any]
+) -> Optional[Tuple[bool, bool]]:
+    """
+    Same as determine_home_away_from_result, for callers that already loaded the team names.
+    
+    Args:
+        team1_id: Database team1_id
+        team2_id: Database team2_id
+        db_team1_name: normalized_team_name of team1
+        db_team2_name: normalized_team_name of team2
+        result_data: Result dictionary containing 'home_team', 'away_team', 'home_team_id', 'away_team_id'
+    
+    Returns:
+        Tuple of (team1_is_home: bool, team2_is_home: bool) if determined, None otherwise
+    """
+    home_team_id = result_data.get('home_team_id')
+    away_team_id = result_data.get('away_team_id')
+    home_team_name = result_data.get('home_team', '')
+    away_team_name = result_data.get('away_team', '')
     
     # First try team IDs if available (most reliable)
     if home_team_id:
@@ -979,3 +1013,37 @@ def get_home_away_scores(
     else:
         # If we assume team2 is home, swap scores
         return (result_away_score, result_home_score)
+
+
+_CACHED_FUNCTIONS = {
+    "normalize_team_name": normalize_team_name,
+    "remove_mascot_from_team_name": remove_mascot_from_team_name,
+    "get_team_name_variations": _team_name_variations,
+}
+
+
+def get_normalization_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get hit/miss counters for the memoized normalization functions.
+    
+    Returns:
+        Dict keyed by function name with hits, misses, size, maxsize and hit_rate
+    """
+    stats = {}
+    for name, func in _CACHED_FUNCTIONS.items():
+        info = func.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def clear_normalization_caches() -> None:
+    """Empty the normalization caches and reset their counters (e.g. between tests)."""
+    for func in _CACHED_FUNCTIONS.values():
+        func.cache_clear()
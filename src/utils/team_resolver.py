@@ -0,0 +1,144 @@
+"""Precompiled team name resolution.
+
+normalize_team_name / are_teams_matching re-run a long chain of substring checks and mascot
+stripping on every call, and callers invoke them inside nested loops (events x games x
+outcomes). TeamResolver compiles TEAM_NAME_MAPPING and SPECIAL_TEAM_MAPPINGS into one
+alias -> canonical key hash map, memoizes every name it has resolved, and only falls back to
+are_teams_matching, then rapidfuzz, for names the map cannot resolve.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+from src.utils.logging import get_logger
+from src.utils.team_normalizer import (
+    SPECIAL_TEAM_MAPPINGS,
+    TEAM_NAME_MAPPING,
+    are_teams_matching,
+    normalize_team_name_for_lookup,
+)
+
+logger = get_logger("utils.team_resolver")
+
+DEFAULT_FUZZY_THRESHOLD = 90
+
+
+@lru_cache(maxsize=65536)
+def _teams_match(team1: str, team2: str) -> bool:
+    """Memoized are_teams_matching (pure function of its two strings)."""
+    return are_teams_matching(team1, team2)
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_key(key: str, candidate_keys: Tuple[str, ...], threshold: int) -> Optional[str]:
+    """Memoized closest candidate key by rapidfuzz token_sort_ratio (None below threshold)."""
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        logger.warning("rapidfuzz not available, fuzzy team matching disabled")
+        return None
+    match = process.extractOne(key, candidate_keys, scorer=fuzz.token_sort_ratio, score_cutoff=threshold)
+    return match[0] if match else None
+
+
+class TeamResolver:
+    """
+    Resolve team names to a canonical key in O(1) after first sight.
+
+    The canonical key is normalize_team_name_for_lookup (normalization + mascot removal)
+    passed through TEAM_NAME_MAPPING, so "UConn Huskies", "Connecticut" and "UConn" share a key.
+    """
+
+    def __init__(self, fuzzy_threshold: int = DEFAULT_FUZZY_THRESHOLD):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.Lock()
+        self._aliases: Dict[str, str] = {}
+        self._compile()
+
+    def _compile(self) -> None:
+        """Seed the alias map with the static mapping tables"""
+        aliases: Dict[str, str] = {}
+        for alias, canonical in TEAM_NAME_MAPPING.items():
+            aliases[alias] = canonical
+        for alias, canonical in SPECIAL_TEAM_MAPPINGS.items():
+            aliases[alias] = TEAM_NAME_MAPPING.get(canonical, canonical)
+        self._aliases = aliases
+
+    def canonical(self, name: str) -> str:
+        """Canonical key for a team name ("" for empty input)"""
+        if not name:
+            return ""
+        alias = name.strip().lower()
+        key = self._aliases.get(alias)
+        if key is not None:
+            return key
+        lookup = normalize_team_name_for_lookup(name)
+        key = TEAM_NAME_MAPPING.get(lookup, lookup)
+        with self._lock:
+            self._aliases[alias] = key
+        return key
+
+    def same_team(self, team1: str, team2: str) -> bool:
+        """True if both names refer to the same team (canonical key, then are_teams_matching)"""
+        if not team1 or not team2:
+            return False
+        if self.canonical(team1) == self.canonical(team2):
+            return True
+        return _teams_match(team1, team2)
+
+    def resolve(self, name: str, candidates: Sequence[str]) -> Optional[str]:
+        """
+        Find the candidate that refers to the same team as name
+
+        Tries the canonical key, then are_teams_matching, and only for names neither resolves,
+        the closest candidate key by rapidfuzz at fuzzy_threshold or above.
+
+        Args:
+            name: Team name from any source
+            candidates: Names to choose from (e.g. the teams on a slate)
+
+        Returns:
+            Matching candidate name, or None
+        """
+        if not name:
+            return None
+        by_key: Dict[str, str] = {}
+        for candidate in candidates:
+            if candidate:
+                # First name wins if two candidates share a key
+                by_key.setdefault(self.canonical(candidate), candidate)
+        key = self.canonical(name)
+        hit = by_key.get(key)
+        if hit is not None:
+            return hit
+        for candidate in by_key.values():
+            if _teams_match(name, candidate):
+                return candidate
+        match = _fuzzy_key(key, tuple(sorted(by_key)), self.fuzzy_threshold)
+        return by_key[match] if match is not None else None
+
+    def alias_count(self) -> int:
+        """Number of aliases currently in the map"""
+        return len(self._aliases)
+
+    def clear(self) -> None:
+        """Drop learned aliases and memoized matches (static tables are kept)"""
+        with self._lock:
+            self._compile()
+        _teams_match.cache_clear()
+        _fuzzy_key.cache_clear()
+
+
+_resolver: Optional[TeamResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_team_resolver() -> TeamResolver:
+    """Process-wide TeamResolver"""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = TeamResolver()
+    return _resolver
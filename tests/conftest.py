@@ -8,9 +8,13 @@ from typing import Dict, Any, Optional, List
 from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 
+from src.data.cache_store import CacheStore, set_cache_store
 from src.data.models import Game, BettingLine, BetType, GameStatus
 from src.data.storage import Database, TeamModel
+from src.utils.json_stream import deliver_items
 from src.utils.llm import LLMClient
+from src.utils.llm_retry import reset_circuit_breakers
+from src.utils.llm_telemetry import set_telemetry_sink
 from src.utils.team_normalizer import normalize_team_name_for_lookup
 
 
@@ -98,7 +102,17 @@ class MockLLMClient:
             return response
             
         return {"raw_response": json.dumps(response) if isinstance(response, dict) else str(response)}
-    
+
+    def call_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Mock batch call (one call_chat per request)"""
+        return [self.call_chat(**request) for request in requests]
+
+    def call_streaming(self, messages: List[Dict[str, Any]], array_key: str, on_item=None, **kwargs) -> Dict[str, Any]:
+        """Mock streaming call (call_chat, then each array element to on_item)"""
+        response = self.call_chat(messages=messages, **kwargs)
+        deliver_items(response, array_key, on_item)
+        return response
+
     def get_usage_stats(self) -> Dict[str, int]:
         """Get token usage statistics"""
         return {
@@ -114,6 +128,31 @@ class MockLLMClient:
         self.total_completion_tokens = 0
 
 
+@pytest.fixture(autouse=True)
+def cache_store(tmp_path):
+    """Isolate the shared cache store per test so tests never read or write data/cache"""
+    store = CacheStore(tmp_path / "cache.db")
+    set_cache_store(store)
+    yield store
+    set_cache_store(None)
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def llm_telemetry_sink():
+    """Never carry a run's LLM call telemetry sink over into the next test"""
+    yield
+    set_telemetry_sink(None)
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers():
+    """Start every test with all LLM circuits closed"""
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
 @pytest.fixture
 def mock_llm_client():
     """Fixture providing a mock LLM client for unit tests"""
@@ -0,0 +1,99 @@
+"""Tests for the background agent log writer"""
+
+import threading
+
+from src.agents.base import BaseAgent
+from src.data.agent_log_sink import AgentLogSink
+from src.data.storage import AgentLogModel
+
+
+class _LoggingAgent(BaseAgent):
+    """Minimal agent for exercising BaseAgent logging"""
+
+    def process(self, *args, **kwargs):
+        return None
+
+
+def _count_logs(db):
+    session = db.get_session()
+    try:
+        return session.query(AgentLogModel).count()
+    finally:
+        session.close()
+
+
+class TestAgentLogSink:
+    """Unit tests for AgentLogSink"""
+
+    def test_flush_writes_all_rows(self, mock_database):
+        sink = AgentLogSink(mock_database.engine, batch_size=50, flush_interval_ms=10000)
+        for i in range(120):
+            assert sink.submit("Researcher", "info", {"message": f"line {i}"})
+        assert sink.flush()
+        assert _count_logs(mock_database) == 120
+        assert sink.get_stats()["written"] == 120
+        sink.close()
+
+    def test_interval_flush_without_explicit_flush(self, mock_database):
+        sink = AgentLogSink(mock_database.engine, batch_size=1000, flush_interval_ms=20)
+        sink.submit("Modeler", "warning", {"message": "slow"})
+        sink.close()
+        assert _count_logs(mock_database) == 1
+
+    def test_non_serializable_payload_is_stringified(self, mock_database):
+        sink = AgentLogSink(mock_database.engine)
+        sink.submit("Picker", "error", {"message": "boom", "obj": object()})
+        sink.close()
+        session = mock_database.get_session()
+        try:
+            row = session.query(AgentLogModel).one()
+            assert row.data_json["message"] == "boom"
+            assert isinstance(row.data_json["obj"], str)
+        finally:
+            session.close()
+
+    def test_full_queue_drops_and_counts(self, mock_database):
+        entered = threading.Event()
+        release = threading.Event()
+        sink = AgentLogSink(mock_database.engine, batch_size=1, max_queue_size=2)
+        original_write = sink._write
+
+        def blocking_write(rows):
+            entered.set()
+            release.wait(5)
+            original_write(rows)
+
+        sink._write = blocking_write
+        assert sink.submit("Researcher", "info", {"message": "first"})
+        assert entered.wait(5)
+        # Writer is stuck on the first row; two more fit in the queue, the rest are dropped
+        assert sink.submit("Researcher", "info", {"message": "second"})
+        assert sink.submit("Researcher", "info", {"message": "third"})
+        assert not sink.submit("Researcher", "info", {"message": "fourth"})
+        assert not sink.submit("Researcher", "info", {"message": "fifth"})
+        assert sink.dropped_count == 2
+        release.set()
+        sink.close()
+        assert _count_logs(mock_database) == 3
+
+    def test_submit_after_close_is_rejected(self, mock_database):
+        sink = AgentLogSink(mock_database.engine)
+        sink.close()
+        assert not sink.submit("Auditor", "info", {"message": "late"})
+
+
+class TestBaseAgentLogging:
+    """BaseAgent log_* routes through the database's sink"""
+
+    def test_agent_logs_are_queued_then_flushed(self, mock_database, mock_llm_client):
+        agent = _LoggingAgent("Researcher", db=mock_database, llm_client=mock_llm_client)
+        agent.log_info("hello")
+        agent.log_warning("careful")
+        agent.log_error("oops")
+        assert mock_database.flush_agent_logs()
+        session = mock_database.get_session()
+        try:
+            actions = sorted(r.action for r in session.query(AgentLogModel).all())
+        finally:
+            session.close()
+        assert actions == ["error", "info", "warning"]
@@ -179,7 +179,8 @@ class TestAuditorUnit:
                 expected_value=0.05,
                 confidence=0.7,
                 rationale="Test pick",
-                book="DraftKings"
+                book="DraftKings",
+                pick_date=date.today()
             )
             session.add(pick)
             session.flush()
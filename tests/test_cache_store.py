@@ -0,0 +1,87 @@
+"""Tests for the SQLite cache store"""
+
+import threading
+from datetime import date, timedelta
+
+from src.data.cache_store import CacheStore, get_cache_store
+
+
+def test_set_get_and_namespaces(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+    store.set("researcher", "k1", {"games": [1, 2]}, cache_date=date(2026, 1, 5))
+    store.set("lines", "k1", [{"line": -3.5}])
+
+    assert store.get("researcher", "k1") == {"games": [1, 2]}
+    assert store.get("lines", "k1") == [{"line": -3.5}]
+    assert store.get("modeler", "k1", default="missing") == "missing"
+    assert store.get_entry("researcher", "k1").cache_date == date(2026, 1, 5)
+    assert store.keys("researcher") == ["k1"]
+
+    store.set("researcher", "k1", {"games": []})
+    assert store.get("researcher", "k1") == {"games": []}
+    assert store.delete("researcher", "k1")
+    assert store.get("researcher", "k1") is None
+    store.close()
+
+
+def test_ttl_expiry(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+    store.set("lines", "stale", [1], ttl=-1)
+    store.set("lines", "fresh", [2], ttl=timedelta(hours=1))
+    store.set("lines", "forever", [3])
+
+    assert store.get("lines", "stale") is None
+    assert store.keys("lines") == ["forever", "fresh"]
+    store.set("lines", "stale", [1], ttl=-1)
+    assert store.evict_expired() == 1
+    store.close()
+
+
+def test_date_eviction_and_retention(tmp_path):
+    path = tmp_path / "cache.db"
+    store = CacheStore(path)
+    today = date.today()
+    store.set("researcher", "old", 1, cache_date=today - timedelta(days=30))
+    store.set("researcher", "recent", 2, cache_date=today - timedelta(days=1))
+    store.set("kenpom_four_factors", "old", 3, cache_date=today - timedelta(days=30))
+    store.set("researcher", "undated", 4)
+
+    assert store.evict_before(today - timedelta(days=7), namespace="researcher") == 1
+    assert store.get("kenpom_four_factors", "old") == 3
+    store.close()
+
+    # Reopening with a retention window drops everything older than it
+    reopened = CacheStore(path, retention_days=7)
+    assert reopened.get("kenpom_four_factors", "old") is None
+    assert reopened.keys("researcher") == ["recent", "undated"]
+    reopened.close()
+
+
+def test_concurrent_writers(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+
+    def write(worker):
+        for i in range(50):
+            store.set("researcher", f"{worker}-{i}", {"i": i})
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.keys("researcher")) == 200
+    store.close()
+
+
+def test_agent_caches_share_isolated_store(cache_store):
+    from src.data.scrapers.lines_scraper import LinesScraper
+    from src.data.models import BettingLine, BetType
+
+    assert get_cache_store() is cache_store
+    scraper = LinesScraper()
+    line = BettingLine(game_id=1, book="draftkings", bet_type=BetType.SPREAD, line=-3.5, odds=-110, team="Duke")
+    scraper._cache_lines("draftkings", date(2026, 1, 5), [line])
+
+    cached = LinesScraper()._get_cached_lines("draftkings", date(2026, 1, 5))
+    assert cached[0]["line"] == -3.5 and cached[0]["team"] == "Duke"
+    assert cache_store.get_entry("lines", "draftkings_2026-01-05").expires_at is not None
@@ -0,0 +1,74 @@
+"""SQLite engine profile: WAL and pragmas on every connection, a query_only reporting engine"""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.data.storage import Database, TeamModel
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    db = Database(database_url=f"sqlite:///{tmp_path / 'engine.db'}")
+    yield db
+    db.close()
+    db.engine.dispose()
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_connections_use_wal_and_tuned_pragmas(file_db):
+    assert pragma(file_db.engine, "journal_mode") == "wal"
+    assert pragma(file_db.engine, "synchronous") == 1  # NORMAL
+    assert pragma(file_db.engine, "busy_timeout") == 5000
+    assert pragma(file_db.engine, "cache_size") == -64 * 1024
+    assert pragma(file_db.engine, "query_only") == 0
+
+
+def test_read_sessions_cannot_write(file_db):
+    assert file_db.read_engine is not file_db.engine
+    assert pragma(file_db.read_engine, "query_only") == 1
+    session = file_db.get_read_session()
+    try:
+        session.add(TeamModel(normalized_team_name="Duke"))
+        with pytest.raises(OperationalError, match="readonly"):
+            session.commit()
+    finally:
+        session.close()
+
+
+def test_open_read_transaction_does_not_block_writes(file_db):
+    with file_db.read_engine.connect() as reader:
+        reader.exec_driver_sql("BEGIN")
+        assert reader.execute(text("SELECT COUNT(*) FROM teams")).scalar() == 0
+
+        def write():
+            session = file_db.get_session()
+            try:
+                session.add(TeamModel(normalized_team_name="Duke"))
+                session.commit()
+            finally:
+                session.close()
+                file_db.SessionLocal.remove()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        writer.join(timeout=2)
+        assert not writer.is_alive()
+        # The reader keeps its snapshot until its transaction ends
+        assert reader.execute(text("SELECT COUNT(*) FROM teams")).scalar() == 0
+        reader.exec_driver_sql("COMMIT")
+        assert reader.execute(text("SELECT COUNT(*) FROM teams")).scalar() == 1
+
+
+def test_in_memory_database_shares_one_engine():
+    db = Database(database_url="sqlite://")
+    try:
+        assert db.read_engine is db.engine
+    finally:
+        db.close()
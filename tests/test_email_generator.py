@@ -1,10 +1,16 @@
-"""Tests for EmailGenerator (_calculate_bet_profit_loss, _get_team_name)"""
+"""Tests for EmailGenerator (_calculate_bet_profit_loss, EmailDataContext, query count)"""
+
+from datetime import date, datetime, timedelta
 
 import pytest
+from sqlalchemy import event
 from unittest.mock import Mock, MagicMock, patch
 
 from src.data.models import BetResult, BetType
-from src.data.storage import PickModel, TeamModel
+from src.data.storage import (
+    BetModel, BettingLineModel, GameInsightModel, GameModel, PickModel, PredictionModel, TeamModel
+)
+from src.utils.email.email_data import EmailDataContext
 from src.utils.email.email_generator import EmailGenerator
 
 
@@ -54,29 +60,79 @@ class TestCalculateBetProfitLoss:
         assert profit_dollars == 0.0
 
 
-class TestGetTeamName:
-    """Test _get_team_name with None, valid id, not found, and exception."""
-
-    def test_none_team_id_returns_unknown_team(self, email_generator_no_db):
-        assert email_generator_no_db._get_team_name(None, Mock()) == "Unknown Team"
-
-    def test_none_session_returns_unknown_team(self, email_generator_no_db):
-        assert email_generator_no_db._get_team_name(1, None) == "Unknown Team"
-
-    def test_valid_team_id_returns_name(self, email_generator_no_db):
-        session = Mock()
-        team = Mock(normalized_team_name="Duke")
-        session.query.return_value.filter_by.return_value.first.return_value = team
-        assert email_generator_no_db._get_team_name(1, session) == "Duke"
-        session.query.assert_called_once_with(TeamModel)
-        session.query.return_value.filter_by.assert_called_once_with(id=1)
-
-    def test_team_id_not_in_db_returns_unknown_team_hash_id(self, email_generator_no_db):
-        session = Mock()
-        session.query.return_value.filter_by.return_value.first.return_value = None
-        assert email_generator_no_db._get_team_name(42, session) == "Unknown Team #42"
-
-    def test_exception_during_query_returns_unknown_team_hash_id(self, email_generator_no_db):
-        session = Mock()
-        session.query.return_value.filter_by.return_value.first.side_effect = RuntimeError("db error")
-        assert email_generator_no_db._get_team_name(7, session) == "Unknown Team #7"
+class TestEmailDataContextTeamName:
+    """Test EmailDataContext.team_name with None, valid id, and not found."""
+
+    @pytest.fixture
+    def context(self):
+        return EmailDataContext(
+            date(2025, 12, 1), games=[], teams=[Mock(id=1, normalized_team_name="Duke")],
+            insights=[], predictions=[], spread_lines=[], picks=[], ytd_picks=[], bets=[],
+        )
+
+    def test_none_team_id_returns_unknown_team(self, context):
+        assert context.team_name(None) == "Unknown Team"
+
+    def test_valid_team_id_returns_name(self, context):
+        assert context.team_name(1) == "Duke"
+
+    def test_team_id_not_loaded_returns_unknown_team_hash_id(self, context):
+        assert context.team_name(42) == "Unknown Team #42"
+
+
+class TestEmailQueryCount:
+    """Email generation reads from one preloaded context instead of querying per row."""
+
+    @pytest.fixture
+    def seeded_db(self, mock_database):
+        today = date(2025, 12, 2)
+        yesterday = today - timedelta(days=1)
+        session = mock_database.get_session()
+        teams = [TeamModel(normalized_team_name=f"Team {i}") for i in range(12)]
+        session.add_all(teams)
+        session.flush()
+        for i, day in enumerate([yesterday] * 3 + [today] * 3):
+            game = GameModel(
+                team1_id=teams[2 * i].id, team2_id=teams[2 * i + 1].id, date=day,
+                result={"home_score": 70, "away_score": 65} if day == yesterday else None,
+            )
+            session.add(game)
+            session.flush()
+            session.add(GameInsightModel(game_id=game.id, team1_stats={"kp_rank": 10 + i}, team2_stats={"kp_rank": 50 + i}))
+            session.add(PredictionModel(
+                game_id=game.id, prediction_date=today, model_type="test", predicted_spread=3.0,
+                predicted_total=140.0, win_probability_team1=0.6, win_probability_team2=0.4, confidence_score=0.6,
+            ))
+            session.add(BettingLineModel(game_id=game.id, book="test", bet_type=BetType.SPREAD, line=-3.0, odds=-110, team=f"Team {2 * i}"))
+            pick = PickModel(
+                game_id=game.id, bet_type=BetType.SPREAD, line=-3.0, odds=-110, stake_units=1.0, stake_amount=10.0,
+                rationale="edge", confidence=0.7, expected_value=0.05, book="test", team_id=teams[2 * i].id,
+                best_bet=i % 3 == 0, pick_date=day, created_at=datetime.combine(day, datetime.min.time()),
+            )
+            session.add(pick)
+            session.flush()
+            session.add(BetModel(pick_id=pick.id, result=BetResult.WIN if day == yesterday else BetResult.PENDING))
+        session.commit()
+        session.close()
+        return mock_database, today
+
+    def test_both_formats_render_in_under_ten_queries(self, seeded_db, tmp_path):
+        db, today = seeded_db
+        with patch("src.utils.email.email_generator.LLMClient"):
+            generator = EmailGenerator(db=db)
+        generator.llm_client = None
+        generator.reports_dir = tmp_path
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        engines = {db.engine, db.read_engine}
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", listener)
+        try:
+            _, html, plain = generator.generate_email_both_formats(today)
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", listener)
+
+        assert "Team 6" in html and "Team 6" in plain
+        assert 0 < len(statements) < 10
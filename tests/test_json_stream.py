@@ -0,0 +1,106 @@
+"""Tests for streamed JSON parsing of Picker/President responses"""
+
+import inspect
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src.agents.president import President
+from src.utils.json_stream import StreamingArrayParser
+from src.utils.llm import LLMClient
+
+PICKS = [
+    {"game_id": "1", "selection": "Duke -3.5", "rationale": "Says \"}]\" and {braces}"},
+    {"game_id": "2", "selection": "Over 141.5", "nested": {"legs": [{"a": 1}]}},
+    {"game_id": "3", "selection": "UNC ML"},
+]
+RESPONSE = json.dumps({"candidate_picks": PICKS, "overall_strategy_summary": ["done"]})
+
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_elements_are_emitted_as_soon_as_they_close():
+    received = []
+    parser = StreamingArrayParser("candidate_picks", on_item=received.append)
+
+    cut = RESPONSE.index('{"game_id": "2"')
+    for chunk in _chunks("```json\n" + RESPONSE[:cut]):
+        parser.feed(chunk)
+    assert received == PICKS[:1]
+
+    for chunk in _chunks(RESPONSE[cut:] + "\n```"):
+        parser.feed(chunk)
+    assert received == PICKS
+    assert parser.result(LLMClient(api_key="test")._parse_json_content) == json.loads(RESPONSE)
+
+
+def test_truncated_tail_keeps_complete_elements():
+    parser = StreamingArrayParser("candidate_picks")
+    parser.feed(RESPONSE[:RESPONSE.index('"UNC ML"')])
+
+    result = parser.result(lambda text: {"raw_response": text, "parse_error": "Unterminated string"})
+
+    assert result == {"candidate_picks": PICKS[:2], "truncated": True, "parse_error": "Unterminated string"}
+
+
+def _stream(text, usage=True, fail_after=None):
+    for i, chunk in enumerate(_chunks(text)):
+        if fail_after is not None and i == fail_after:
+            raise ConnectionError("stream reset")
+        yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+    if usage:
+        yield SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=40, total_tokens=140),
+            choices=[],
+        )
+
+
+def test_call_streaming_parses_openai_stream():
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="picker")
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = _stream(RESPONSE)
+    received = []
+
+    response = client.call_streaming([{"role": "user", "content": "Pick in JSON."}], "candidate_picks",
+                                     on_item=received.append, response_format={"type": "json_object"})
+
+    assert response == json.loads(RESPONSE)
+    assert received == PICKS
+    params = client.client.chat.completions.create.call_args.kwargs
+    assert params["stream"] is True
+    assert params["stream_options"] == {"include_usage": True}
+    # Covered by the openai>=1.98.0 floor in requirements.txt
+    from openai.resources.chat.completions import Completions
+    assert set(params) <= set(inspect.signature(Completions.create).parameters)
+    assert client.get_usage_stats()["total_tokens"] == 140
+
+
+def test_stream_failure_after_elements_is_not_retried():
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="picker")
+    client.client = Mock()
+    fail_after = len(_chunks(RESPONSE[:RESPONSE.index('{"game_id": "3"')])) + 1
+    client.client.chat.completions.create.side_effect = [_stream(RESPONSE, fail_after=fail_after)]
+
+    response = client.call_streaming([{"role": "user", "content": "json"}], "candidate_picks")
+
+    assert response["truncated"] is True
+    assert response["candidate_picks"] == PICKS[:2]
+    assert client.client.chat.completions.create.call_count == 1
+
+
+def test_president_gives_unreached_picks_default_units(mock_database, sample_sized_picks):
+    llm_client = Mock()
+    llm_client.get_usage_stats.return_value = {"total_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    candidates = [dict(sample_sized_picks[0], game_id=str(i)) for i in range(3)]
+    first = dict(candidates[0], units=2.0, best_bet=False)
+    llm_client.call_streaming.return_value = {"approved_picks": [first], "truncated": True, "parse_error": "cut off"}
+    president = President(db=mock_database, llm_client=llm_client)
+
+    result = president.process(candidates)
+
+    assert llm_client.call_streaming.call_args.kwargs["array_key"] == "approved_picks"
+    assert [p["game_id"] for p in result["approved_picks"]] == ["0", "1", "2"]
+    assert result["approved_picks"][0]["units"] == 2.0
+    assert all(p["units"] == 1.0 for p in result["approved_picks"][1:])
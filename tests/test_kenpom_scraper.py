@@ -130,24 +130,41 @@ class TestKenPomScraperCache:
         assert scraper._cache_date == date.today()
     
     @patch('src.data.scrapers.kenpom_scraper.config')
-    def test_cache_save(self, mock_config, tmp_path):
-        """Test saving cache to file"""
+    def test_cache_save(self, mock_config, cache_store):
+        """Test saving cache to the cache store"""
         mock_config.get_kenpom_credentials.return_value = None
         
-        cache_file = tmp_path / "kenpom_cache.json"
-        
         with patch('src.data.scrapers.kenpom_scraper.KenPomScraper._authenticate'):
             scraper = KenPomScraper()
-            scraper.cache_file = cache_file  # Set cache file to test file
             scraper._team_cache = {'Duke': {'team': 'Duke', 'kenpom_rank': 1}}
             scraper._save_cache()
         
-        assert cache_file.exists()
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
+        entry = cache_store.get_entry('kenpom', 'teams')
+        assert entry is not None
         # Cache may use normalized lowercase keys
-        assert 'Duke' in cache_data['teams'] or 'duke' in cache_data['teams']
-        assert cache_data['cache_date'] == date.today().isoformat()
+        assert 'Duke' in entry.value or 'duke' in entry.value
+        assert entry.cache_date == date.today()
+    
+    @patch('src.data.scrapers.kenpom_scraper.config')
+    def test_four_factors_cached_per_team(self, mock_config, cache_store):
+        """Four Factors are written one team at a time and read back lazily"""
+        mock_config.get_kenpom_credentials.return_value = None
+        
+        with patch('src.data.scrapers.kenpom_scraper.KenPomScraper._authenticate'):
+            scraper = KenPomScraper()
+            scraper._cache_four_factors('duke', {'efg_pct': 55.1}, date.today())
+            scraper._cache_four_factors('old team', {'efg_pct': 48.0}, date.today() - timedelta(days=1))
+            scraper._save_cache()
+            
+            fresh = KenPomScraper()
+        
+        assert fresh._four_factors_cache == {}
+        assert fresh._get_cached_four_factors('duke') == {
+            'four_factors': {'efg_pct': 55.1},
+            'cache_date': date.today()
+        }
+        # Saving a new day's teams drops Four Factors from earlier days
+        assert fresh._get_cached_four_factors('old team') is None
     
     @patch('src.data.scrapers.kenpom_scraper.config')
     def test_cache_stale_detection(self, mock_config):
@@ -197,18 +214,15 @@ class TestKenPomScraperCache:
                 duke_stats.get('adj_tempo') is not None), "At least one of adj_defense/adj_tempo should be parsed"
     
     @patch('src.data.scrapers.kenpom_scraper.config')
-    def test_refresh_homepage_cache(self, mock_config, mock_kenpom_html, tmp_path):
+    def test_refresh_homepage_cache(self, mock_config, mock_kenpom_html, cache_store):
         """Test refreshing cache from homepage"""
         mock_config.get_kenpom_credentials.return_value = {'email': 'test@test.com', 'password': 'test'}
         
-        cache_file = tmp_path / "kenpom_cache.json"
-        
         with patch('src.data.scrapers.kenpom_scraper.KenPomScraper._authenticate') as mock_auth:
             mock_auth.return_value = True
             
             scraper = KenPomScraper()
             scraper.authenticated = True
-            scraper.cache_file = cache_file  # Set cache file to test file
             
             # Mock the session.get response
             mock_response = Mock()
@@ -221,7 +235,7 @@ class TestKenPomScraperCache:
             
             assert result is True
             assert len(scraper._team_cache) >= 3
-            assert cache_file.exists()
+            assert cache_store.get_entry('kenpom', 'teams').cache_date == date.today()
     
     @patch('src.data.scrapers.kenpom_scraper.config')
     def test_get_team_stats_from_cache(self, mock_config, sample_cache_data, tmp_path):
@@ -280,14 +294,11 @@ class TestKenPomScraperCache:
         """Test that get_team_stats refreshes stale cache"""
         mock_config.get_kenpom_credentials.return_value = {'email': 'test@test.com', 'password': 'test'}
         
-        cache_file = tmp_path / "kenpom_cache.json"
-        
         with patch('src.data.scrapers.kenpom_scraper.KenPomScraper._authenticate') as mock_auth:
             mock_auth.return_value = True
             
             scraper = KenPomScraper()
             scraper.authenticated = True
-            scraper.cache_file = cache_file  # Set cache file to test file
             scraper._cache_date = date.today() - timedelta(days=2)  # Stale cache
             scraper._team_cache = {}
             
@@ -351,14 +362,11 @@ class TestKenPomScraperCache:
         """Test forcing cache refresh"""
         mock_config.get_kenpom_credentials.return_value = {'email': 'test@test.com', 'password': 'test'}
         
-        cache_file = tmp_path / "kenpom_cache.json"
-        
         with patch('src.data.scrapers.kenpom_scraper.KenPomScraper._authenticate') as mock_auth:
             mock_auth.return_value = True
             
             scraper = KenPomScraper()
             scraper.authenticated = True
-            scraper.cache_file = cache_file  # Set cache file to test file
             scraper._team_cache = {}  # Empty cache
             
             # Mock homepage response
@@ -0,0 +1,144 @@
+"""Tests for line movement detection used by --refresh-lines"""
+
+from datetime import date
+
+from src.data.models import BetType, BettingLine, CardReview, Game, Pick
+from src.data.storage import BetModel, GameModel, PickModel
+from src.orchestration.coordinator import Coordinator
+from src.orchestration.line_movement import LineMoveThresholds, find_line_moves, game_sides, snapshot_lines
+from tests.conftest import get_or_create_team
+
+
+def _line(game_id, bet_type, line, odds=-110, team=None, book="DraftKings"):
+    return BettingLine(game_id=game_id, book=book, bet_type=bet_type, line=line, odds=odds, team=team)
+
+
+def _morning():
+    return [
+        _line(1, BetType.SPREAD, -3.5, team="Duke"),
+        _line(1, BetType.TOTAL, 145.5, team="over"),
+        _line(2, BetType.MONEYLINE, 0.0, odds=-150, team="Kansas"),
+        _line(3, BetType.SPREAD, 7.0, team="Iowa"),
+    ]
+
+
+def test_moves_below_threshold_are_ignored():
+    previous = snapshot_lines(_morning())
+    current = [
+        _line(1, BetType.SPREAD, -3.0, odds=-115, team="Duke"),  # 0.5 at threshold -> move
+        _line(1, BetType.TOTAL, 146.0, team="over"),             # 0.5 < 1.0 total threshold
+        _line(2, BetType.MONEYLINE, 0.0, odds=-155, team="Kansas"),  # ~0.8% implied
+        _line(3, BetType.SPREAD, 7.0, team="iowa", book="draftkings"),  # same line, key case-insensitive
+    ]
+    moves = find_line_moves(previous, current, LineMoveThresholds())
+    assert list(moves) == [1]
+    assert moves[1] == ["draftkings spread duke -3.5 -> -3.0"]
+
+
+def test_moneyline_and_new_markets_count_as_moves():
+    previous = snapshot_lines(_morning())
+    current = [
+        _line(2, BetType.MONEYLINE, 0.0, odds=-200, team="Kansas"),
+        _line(4, BetType.SPREAD, -1.5, team="Purdue"),
+    ]
+    moves = find_line_moves(previous, current, LineMoveThresholds(moneyline=0.05))
+    assert moves == {
+        2: ["draftkings moneyline kansas -150 -> -200"],
+        4: ["new draftkings spread purdue"],
+    }
+
+
+def test_display_and_normalized_team_names_key_the_same_side():
+    # A game's first save stores the ESPN display name; later runs store the normalized name
+    sides = game_sides([Game(id=1, team1="Duke Blue Devils", team2="North Carolina Tar Heels", date=date(2026, 3, 1))])
+    previous = snapshot_lines([
+        _line(1, BetType.SPREAD, -3.5, team="Duke Blue Devils"),
+        _line(1, BetType.MONEYLINE, 0.0, odds=180, team="North Carolina Tar Heels"),
+        _line(1, BetType.TOTAL, 145.5, team="over"),
+    ], sides)
+    current = [
+        _line(1, BetType.SPREAD, -3.5, team="Duke"),
+        _line(1, BetType.MONEYLINE, 0.0, odds=180, team="North Carolina"),
+        _line(1, BetType.TOTAL, 145.5, team="over"),
+    ]
+    assert find_line_moves(previous, current, LineMoveThresholds(), sides) == {}
+
+
+def test_thresholds_from_config(monkeypatch):
+    from src.orchestration import line_movement
+
+    class FakeConfig:
+        def get(self, key, default=None):
+            return {"spread_threshold": 1, "moneyline_threshold": "0.03"} if key == "refresh" else default
+
+    monkeypatch.setattr(line_movement, "config", FakeConfig())
+    assert LineMoveThresholds.from_config() == LineMoveThresholds(spread=1.0, total=1.0, moneyline=0.03)
+
+
+def _seed_morning_card(mock_database, target):
+    """Three games, each with a morning spread pick and its pending bet; returns the game ids"""
+    session = mock_database.get_session()
+    try:
+        game_ids = []
+        for home, away in [("Duke", "UNC"), ("Kansas", "Baylor"), ("Purdue", "Iowa")]:
+            game = GameModel(team1_id=get_or_create_team(session, home), team2_id=get_or_create_team(session, away),
+                             date=target)
+            session.add(game)
+            session.flush()
+            pick = PickModel(game_id=game.id, bet_type=BetType.SPREAD, line=-3.5, odds=-110, rationale="morning",
+                             confidence=0.6, expected_value=0.05, book="draftkings", pick_date=target)
+            session.add(pick)
+            session.flush()
+            session.add(BetModel(pick_id=pick.id))
+            game_ids.append(game.id)
+        session.commit()
+    finally:
+        session.close()
+    return game_ids
+
+
+def _refresh(mock_database, monkeypatch, target, game_ids, moved, step_pick_result):
+    coordinator = Coordinator(db=mock_database)
+    games = [Game(id=game_id, team1="Home", team2="Away", date=target) for game_id in game_ids]
+    lines = [_line(game_id, BetType.SPREAD, -4.5, team="Home") for game_id in game_ids]
+    monkeypatch.setattr(coordinator, "_step_scrape_games", lambda *args: games)
+    monkeypatch.setattr(coordinator, "_step_refresh_lines", lambda *args: (lines, {g: ["moved"] for g in moved}))
+    monkeypatch.setattr(coordinator, "_games_without_insights", lambda ids: set())
+    monkeypatch.setattr(coordinator, "_step_research", lambda *args, **kwargs: {})
+    monkeypatch.setattr(coordinator, "_step_model", lambda *args, **kwargs: {})
+    monkeypatch.setattr(coordinator, "_step_pick", lambda *args: step_pick_result)
+    monkeypatch.setattr(coordinator, "_step_president", lambda *args: (CardReview(approved=True), {}))
+    monkeypatch.setattr(coordinator, "_step_finalize", lambda *args, **kwargs: None)
+    return coordinator.run_refresh_workflow(target_date=target)
+
+
+def test_refresh_deletes_earlier_picks_the_picker_no_longer_takes(mock_database, monkeypatch):
+    target = date(2026, 3, 1)
+    repicked, dropped, unmoved = _seed_morning_card(mock_database, target)
+    refreshed_pick = Pick(game_id=repicked, bet_type=BetType.SPREAD, line=-4.5, odds=-110, rationale="refreshed",
+                          confidence=0.6, expected_value=0.05, book="draftkings")
+
+    _refresh(mock_database, monkeypatch, target, [repicked, dropped, unmoved], [repicked, dropped],
+             ([refreshed_pick], [{}]))
+
+    session = mock_database.get_session()
+    try:
+        assert {p.game_id for p in session.query(PickModel).filter_by(pick_date=target)} == {repicked, unmoved}
+        assert session.query(BetModel).count() == 2
+    finally:
+        session.close()
+
+
+def test_refresh_keeps_earlier_picks_when_the_picker_returns_nothing(mock_database, monkeypatch):
+    target = date(2026, 3, 1)
+    game_ids = _seed_morning_card(mock_database, target)
+
+    review = _refresh(mock_database, monkeypatch, target, game_ids, game_ids, (None, []))
+
+    assert not review.approved
+    session = mock_database.get_session()
+    try:
+        assert {p.game_id for p in session.query(PickModel).filter_by(pick_date=target)} == set(game_ids)
+        assert session.query(BetModel).count() == 3
+    finally:
+        session.close()
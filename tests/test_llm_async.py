@@ -0,0 +1,172 @@
+"""Tests for the async LLM client"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from src.utils import llm_async
+from src.utils.llm import LLMClient
+from src.utils.llm_async import AsyncLLMClient, ModelLimiter, TokenBudget, parse_reset_duration
+from src.utils.llm_retry import CircuitBreaker, LLMUnavailableError, RetryPolicy, get_circuit_breaker
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01, failure_threshold=2, cooldown_seconds=60)
+
+
+def _completion(content, total_tokens=120):
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=total_tokens - 20, completion_tokens=20, total_tokens=total_tokens),
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=None, content=content))],
+    )
+
+
+class FakeRawCompletions:
+    """Stands in for AsyncOpenAI().chat.completions.with_raw_response"""
+
+    def __init__(self, headers=None, failures=None, delay=0.02):
+        self.headers = headers or {}
+        self.failures = list(failures or [])
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **params):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        content = params["messages"][-1]["content"]
+        return SimpleNamespace(headers=self.headers, parse=lambda: _completion(f'{{"echo": "{content}"}}'))
+
+
+def _fake_openai(raw):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=raw)))
+
+
+def _async_client(monkeypatch, raw, max_concurrency=8, tokens_per_minute=None, policy=None):
+    monkeypatch.setattr(llm_async, "_rate_limit_config", lambda model: {
+        "max_concurrency": max_concurrency, "tokens_per_minute": tokens_per_minute,
+    })
+    llm_client = LLMClient(api_key="test", model="gpt-4o-mini")
+    if policy is not None:
+        llm_client.retry_policy = policy
+    client = AsyncLLMClient(llm_client)
+    client._async_openai["gpt-4o-mini"] = _fake_openai(raw)
+    return client
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _rate_limit_error(retry_after):
+    error = openai.RateLimitError.__new__(openai.RateLimitError)
+    error.response = SimpleNamespace(status_code=429, headers={"retry-after": retry_after})
+    return error
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("6m0s") == 360
+    assert parse_reset_duration("1s") == 1
+    assert parse_reset_duration("120ms") == pytest.approx(0.12)
+    assert parse_reset_duration("2") == 2
+    assert parse_reset_duration(None) is None
+    assert parse_reset_duration("soon") is None
+
+
+def test_gather_respects_concurrency_cap_and_keeps_order(monkeypatch):
+    raw = FakeRawCompletions()
+    client = _async_client(monkeypatch, raw, max_concurrency=3)
+    requests = [{"messages": [{"role": "user", "content": f"game {i}"}]} for i in range(10)]
+
+    results = client.run_many(requests)
+
+    assert [r["echo"] for r in results] == [f"game {i}" for i in range(10)]
+    assert raw.max_in_flight == 3
+    assert client.client.get_usage_stats()["total_tokens"] == 1200
+
+
+def test_rate_limit_retry_honors_retry_after(monkeypatch):
+    raw = FakeRawCompletions(failures=[_rate_limit_error("0.05")])
+    client = _async_client(monkeypatch, raw)
+
+    start = time.monotonic()
+    results = client.run_many([{"messages": [{"role": "user", "content": "x"}]}])
+
+    assert results == [{"echo": "x"}]
+    assert raw.calls == 2
+    assert time.monotonic() - start >= 0.05
+
+
+def test_sdk_retries_are_disabled():
+    client = AsyncLLMClient(LLMClient(api_key="test", model="gpt-4o-mini"))
+    assert client._openai_for(client.client).max_retries == 0
+
+
+def test_server_errors_are_retried_and_bad_requests_are_not(monkeypatch):
+    raw = FakeRawCompletions(failures=[FakeStatusError(503)])
+    client = _async_client(monkeypatch, raw, policy=FAST_RETRY)
+    assert client.run_many([{"messages": [{"role": "user", "content": "x"}]}]) == [{"echo": "x"}]
+    assert raw.calls == 2
+
+    raw = FakeRawCompletions(failures=[FakeStatusError(400)])
+    client = _async_client(monkeypatch, raw, policy=FAST_RETRY)
+    with pytest.raises(FakeStatusError):
+        client.run_many([{"messages": [{"role": "user", "content": "x"}]}])
+    assert raw.calls == 1
+
+
+def test_open_circuit_fails_over_to_fallback_model(monkeypatch):
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, failure_threshold=2, fallback_model="gpt-4.1-mini")
+    primary = FakeRawCompletions(failures=[FakeStatusError(500), FakeStatusError(500)])
+    client = _async_client(monkeypatch, primary, policy=policy)
+    fallback = FakeRawCompletions()
+    client._async_openai["gpt-4.1-mini"] = _fake_openai(fallback)
+
+    assert client.run_many([{"messages": [{"role": "user", "content": "x"}]}]) == [{"echo": "x"}]
+    assert (primary.calls, fallback.calls) == (2, 1)
+    assert get_circuit_breaker("gpt-4o-mini").state == CircuitBreaker.OPEN
+
+    # With no fallback configured, an open circuit rejects the request without calling the provider
+    client = _async_client(monkeypatch, primary, policy=FAST_RETRY)
+    with pytest.raises(LLMUnavailableError):
+        client.run_many([{"messages": [{"role": "user", "content": "x"}]}])
+    assert primary.calls == 2
+
+
+def test_exhausted_quota_headers_pause_the_model():
+    limiter = ModelLimiter(max_concurrency=4, tokens_per_minute=None)
+    limiter.update_from_headers({
+        "x-ratelimit-remaining-requests": "10",
+        "x-ratelimit-remaining-tokens": "500",
+        "x-ratelimit-reset-tokens": "2s",
+    }, estimate=1000)
+    assert limiter.paused_until - time.monotonic() == pytest.approx(2, abs=0.1)
+
+    relaxed = ModelLimiter(max_concurrency=4, tokens_per_minute=None)
+    relaxed.update_from_headers({
+        "x-ratelimit-remaining-requests": "10",
+        "x-ratelimit-remaining-tokens": "50000",
+        "x-ratelimit-reset-tokens": "2s",
+    }, estimate=1000)
+    assert relaxed.paused_until == 0
+
+
+def test_token_budget_waits_for_window():
+    async def scenario():
+        budget = TokenBudget(tokens_per_minute=1000, window_seconds=0.1)
+        first = await budget.acquire(800)
+        budget.settle(first, 900)
+        start = time.monotonic()
+        await budget.acquire(200)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.05
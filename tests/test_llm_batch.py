@@ -0,0 +1,182 @@
+"""Tests for Batch API submission, against a local stub of the OpenAI files/batches endpoints"""
+
+import json
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from src.utils import llm_batch
+from src.utils.llm import LLMClient
+from src.utils.llm_async import AsyncLLMClient
+
+
+class BatchStubServer:
+    """
+    Minimal OpenAI files + batches API. Batches complete on the first status check; each
+    request's reply echoes its user prompt, and prompts containing "FAIL" get a 400 error line.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.batches = {}
+        self.submitted_lines = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/v1/files":
+                    message = BytesParser().parsebytes(
+                        b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+                    )
+                    content = next(
+                        part.get_payload(decode=True) for part in message.get_payload()
+                        if part.get_filename()
+                    )
+                    self._json(stub.add_file(content.decode()))
+                elif self.path == "/v1/batches":
+                    self._json(stub.create_batch(json.loads(body)))
+                elif self.path.endswith("/cancel"):
+                    batch = stub.batches[self.path.split("/")[3]]
+                    batch["status"] = "cancelled"
+                    self._json(batch)
+                else:
+                    self._json({"error": {"message": "not found"}}, status=404)
+
+            def do_GET(self):
+                parts = self.path.split("/")
+                if self.path.startswith("/v1/batches/"):
+                    self._json(stub.batches[parts[3]])
+                elif self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+                    body = stub.files[parts[3]].encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self._json({"error": {"message": "not found"}}, status=404)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def add_file(self, content):
+        file_id = f"file-{len(self.files) + 1}"
+        self.files[file_id] = content
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+                "filename": "input.jsonl", "purpose": "batch", "status": "processed"}
+
+    def create_batch(self, params):
+        lines = [json.loads(line) for line in self.files[params["input_file_id"]].splitlines() if line]
+        self.submitted_lines.extend(lines)
+        output, errors = [], []
+        for line in lines:
+            prompt = line["body"]["messages"][-1]["content"]
+            if "FAIL" in prompt:
+                errors.append({"custom_id": line["custom_id"], "response": {
+                    "status_code": 400, "body": {"error": {"message": "bad request"}}}})
+                continue
+            output.append({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": {
+                "id": f"chatcmpl-{line['custom_id']}", "object": "chat.completion", "created": 0,
+                "model": line["body"]["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"summary of {prompt}"}}],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60},
+            }}})
+        batch_id = f"batch-{len(self.batches) + 1}"
+        output_id = self.add_file("\n".join(json.dumps(o) for o in output))["id"]
+        error_id = self.add_file("\n".join(json.dumps(e) for e in errors))["id"] if errors else None
+        self.batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": params["endpoint"],
+            "input_file_id": params["input_file_id"], "completion_window": "24h",
+            "status": "completed", "created_at": 0,
+            "output_file_id": output_id, "error_file_id": error_id,
+        }
+        return self.batches[batch_id]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    with BatchStubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def batch_client(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_batch, "_batch_config", lambda: {
+        "enabled": True, "agents": ["email"], "poll_interval_seconds": 0, "work_dir": str(tmp_path),
+    })
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="email")
+    client.client = openai.OpenAI(api_key="test", base_url=stub_server.base_url, max_retries=0)
+    return client
+
+
+def _request(prompt):
+    return {"messages": [{"role": "system", "content": "Summarize."}, {"role": "user", "content": prompt}],
+            "max_tokens": 100, "parse_json": False}
+
+
+def test_batch_results_mapped_back_in_order(batch_client, stub_server, tmp_path):
+    responses = batch_client.call_batch([_request("game one"), _request("game two"), _request("game three")])
+
+    assert [r["raw_response"] for r in responses] == [
+        "summary of game one", "summary of game two", "summary of game three"
+    ]
+    assert len(stub_server.submitted_lines) == 3
+    assert stub_server.submitted_lines[0]["url"] == "/v1/chat/completions"
+    assert batch_client.get_usage_stats()["total_tokens"] == 180
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+
+def test_failed_batch_request_falls_back_to_direct_call(batch_client, monkeypatch):
+    direct_calls = []
+
+    def direct(**request):
+        direct_calls.append(request)
+        return {"raw_response": "direct"}
+
+    monkeypatch.setattr(batch_client, "call_chat", direct)
+    responses = batch_client.call_batch([_request("fine"), _request("please FAIL")])
+
+    assert responses == [{"raw_response": "summary of fine"}, {"raw_response": "direct"}]
+    assert len(direct_calls) == 1
+
+
+def test_batch_disabled_for_agent_uses_direct_calls(stub_server, monkeypatch):
+    monkeypatch.setattr(llm_batch, "_batch_config", lambda: {"enabled": True, "agents": ["auditor"]})
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="email")
+    sent = []
+
+    async def direct(self, **request):
+        sent.append(request)
+        return {"raw_response": "direct"}
+
+    # Several direct calls fan out concurrently through the async client
+    monkeypatch.setattr(AsyncLLMClient, "call_chat", direct)
+
+    assert client.call_batch([_request("a"), _request("b")]) == [{"raw_response": "direct"}] * 2
+    assert len(sent) == 2
+    assert stub_server.submitted_lines == []
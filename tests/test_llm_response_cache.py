@@ -0,0 +1,97 @@
+"""Tests for the LLM response cache"""
+
+import inspect
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils import llm
+from src.utils.llm import LLMClient, set_response_cache_bypass
+
+
+def _completion(content, prompt_tokens=100, completion_tokens=20):
+    return SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=None, content=content))],
+    )
+
+
+@pytest.fixture
+def cached_client(monkeypatch):
+    monkeypatch.setattr(llm, "_response_cache_config", lambda: {
+        "enabled": True, "ttl_seconds": 600, "agent_ttl_seconds": {"picker": 0},
+    })
+    set_response_cache_bypass(False)
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="Researcher")
+    client.client = Mock()
+    client.client.chat.completions.create.return_value = _completion('{"games": []}')
+    yield client
+    set_response_cache_bypass(False)
+
+
+def test_identical_request_served_from_cache(cached_client):
+    first = cached_client.call("system", "user", response_format={"type": "json_object"})
+    second = cached_client.call("system", "user", response_format={"type": "json_object"})
+
+    assert first == second == {"games": []}
+    assert cached_client.client.chat.completions.create.call_count == 1
+    stats = cached_client.get_usage_stats()
+    assert stats["total_tokens"] == 120
+    assert stats["cache_hits"] == 1
+    assert stats["tokens_saved"] == 120
+
+
+def test_cache_key_covers_prompt_and_tools(cached_client):
+    cached_client.call("system", "user")
+    cached_client.call("system", "other user prompt")
+    cached_client.call("other system", "user")
+    cached_client.call("system", "user", tools=[{"type": "function", "function": {"name": "search"}}])
+    assert cached_client.client.chat.completions.create.call_count == 4
+
+
+def test_force_refresh_bypasses_and_parse_errors_are_not_cached(cached_client):
+    cached_client.call("system", "user")
+    set_response_cache_bypass(True)
+    cached_client.call("system", "user")
+    assert cached_client.client.chat.completions.create.call_count == 2
+
+    set_response_cache_bypass(False)
+    cached_client.client.chat.completions.create.return_value = _completion("not json")
+    assert "parse_error" in cached_client.call("system", "broken")
+    cached_client.call("system", "broken")
+    assert cached_client.client.chat.completions.create.call_count == 4
+
+
+def test_cache_disabled_per_agent_and_by_default(cached_client, monkeypatch):
+    picker = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="Picker")
+    picker.client = Mock()
+    picker.client.chat.completions.create.return_value = _completion('{}')
+    picker.call("system", "user")
+    picker.call("system", "user")
+    assert picker.client.chat.completions.create.call_count == 2
+
+    monkeypatch.setattr(llm, "_response_cache_config", lambda: {})
+    cached_client.call("system", "fresh")
+    cached_client.call("system", "fresh")
+    assert cached_client.client.chat.completions.create.call_count == 2
+
+
+def test_provider_prompt_cache_tokens_tracked(cached_client, monkeypatch):
+    monkeypatch.setattr(llm, "_response_cache_config", lambda: {})
+    completion = _completion('{"games": []}', prompt_tokens=2000)
+    completion.usage.prompt_tokens_details = SimpleNamespace(cached_tokens=1536)
+    cached_client.client.chat.completions.create.return_value = completion
+
+    cached_client.call("system", "user")
+
+    params = cached_client.client.chat.completions.create.call_args.kwargs
+    assert params["prompt_cache_key"] == "terrarium-researcher"
+    # The requirements floor must be an SDK whose create() accepts every kwarg we send
+    from openai.resources.chat.completions import Completions
+    assert set(params) <= set(inspect.signature(Completions.create).parameters)
+    assert cached_client.get_usage_stats()["cached_tokens"] == 1536
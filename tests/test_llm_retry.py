@@ -0,0 +1,147 @@
+"""Tests for transport-level LLM retry and circuit breaking"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils import llm_retry
+from src.utils.llm import LLMClient
+from src.utils.llm_retry import (
+    FATAL,
+    RATE_LIMIT,
+    TRANSIENT,
+    CircuitBreaker,
+    LLMUnavailableError,
+    RetryPolicy,
+    classify_error,
+    retry_after_seconds,
+)
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def _completion(content='{"ok": true}'):
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120),
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=None, content=content))],
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr("src.utils.llm.time.sleep", recorded.append)
+    return recorded
+
+
+def _client(model="gpt-4o-mini", **policy):
+    client = LLMClient(api_key="test", model=model)
+    client.retry_policy = RetryPolicy(**policy)
+    client.client = Mock()
+    return client
+
+
+def test_classify_error():
+    assert classify_error(FakeStatusError(429)) == RATE_LIMIT
+    assert classify_error(FakeStatusError(503)) == TRANSIENT
+    assert classify_error(TimeoutError()) == TRANSIENT
+    assert classify_error(FakeStatusError(400)) == FATAL
+    assert classify_error(ValueError("bug")) == FATAL
+    assert retry_after_seconds(FakeStatusError(429, {"retry-after": "3"})) == 3
+    assert retry_after_seconds(FakeStatusError(429, {"retry-after-ms": "250"})) == 0.25
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    delays = [policy.backoff(6) for _ in range(50)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.backoff(1, retry_after=10) >= 10
+
+
+def test_transient_error_retried_without_resending_batch(sleeps):
+    client = _client()
+    client.client.chat.completions.create.side_effect = [
+        FakeStatusError(503), FakeStatusError(429, {"retry-after": "2"}), _completion(),
+    ]
+
+    assert client.call("system", "user") == {"ok": True}
+    assert client.client.chat.completions.create.call_count == 3
+    assert len(sleeps) == 2
+    assert sleeps[1] >= 2
+
+
+def test_fatal_error_not_retried(sleeps):
+    client = _client()
+    client.client.chat.completions.create.side_effect = FakeStatusError(400)
+
+    with pytest.raises(FakeStatusError):
+        client.call("system", "user")
+    assert client.client.chat.completions.create.call_count == 1
+    assert sleeps == []
+
+
+def test_exhausted_retries_raise_unavailable(sleeps):
+    client = _client(max_attempts=3)
+    client.client.chat.completions.create.side_effect = FakeStatusError(500)
+
+    with pytest.raises(LLMUnavailableError):
+        client.call("system", "user")
+    assert client.client.chat.completions.create.call_count == 3
+
+
+def test_open_circuit_fails_over_to_fallback_model(sleeps, monkeypatch):
+    client = _client(failure_threshold=2, fallback_model="gpt-4.1-mini")
+    client.client.chat.completions.create.side_effect = FakeStatusError(503)
+    fallback = _client(model="gpt-4.1-mini")
+    fallback.client.chat.completions.create.return_value = _completion()
+    client._fallback_client = fallback
+
+    assert client.call("system", "user") == {"ok": True}
+    assert client.client.chat.completions.create.call_count == 2
+    assert fallback.client.chat.completions.create.call_args.kwargs["model"] == "gpt-4.1-mini"
+    assert client.get_usage_stats()["total_tokens"] == 120
+
+    # Circuit stays open: the next request goes straight to the fallback
+    client.call("system", "another")
+    assert client.client.chat.completions.create.call_count == 2
+
+
+def test_circuit_half_opens_after_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_retry.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("gpt-4o-mini", failure_threshold=2, cooldown_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now[0] += 31
+    assert breaker.allow_request()       # Single trial request
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.allow_request()
+
+
+def test_fatal_error_during_half_open_trial_releases_it(sleeps, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_retry.time, "monotonic", lambda: now[0])
+    client = _client(failure_threshold=1, cooldown_seconds=30, max_attempts=1)
+    client.client.chat.completions.create.side_effect = [
+        FakeStatusError(503), FakeStatusError(400), _completion(),
+    ]
+
+    with pytest.raises(LLMUnavailableError):
+        client.call("system", "user")
+    now[0] += 31
+    with pytest.raises(FakeStatusError):
+        client.call("system", "bad request")   # Fatal error during the half-open trial
+
+    assert client.call("system", "user") == {"ok": True}
+    assert client.client.chat.completions.create.call_count == 3
@@ -0,0 +1,90 @@
+"""Tests for per-call LLM telemetry and the stats report"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.data.storage import Database
+from src.utils import llm_telemetry
+from src.utils.llm import LLMClient
+from src.utils.llm_retry import RetryPolicy
+from src.utils.llm_telemetry import estimate_cost, llm_batch_context, set_telemetry_sink
+from src.utils.reporting.llm_stats import format_llm_stats, load_llm_calls, percentile, summarize_calls
+
+
+@pytest.fixture(autouse=True)
+def pricing(monkeypatch):
+    monkeypatch.setattr(llm_telemetry, "_pricing_config", lambda: {
+        "batch_discount": 0.5,
+        "models": {"gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+                   "gpt-5": {"input": 1.25, "output": 10.0}},
+    })
+
+
+def _completion(content='{"ok": true}'):
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=200, total_tokens=1200,
+                              prompt_tokens_details=SimpleNamespace(cached_tokens=400)),
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=None, content=content))],
+    )
+
+
+def test_cost_uses_cached_rate_longest_prefix_and_batch_discount():
+    assert estimate_cost("gpt-4o-mini", 1000, 200, cached_tokens=400) == pytest.approx(
+        (600 * 0.15 + 400 * 0.075 + 200 * 0.60) / 1_000_000
+    )
+    assert estimate_cost("gpt-5.2", 1_000_000, 0) == pytest.approx(1.25)
+    assert estimate_cost("gpt-5.2", 1_000_000, 0, batch=True) == pytest.approx(0.625)
+    assert estimate_cost("gemini-3-flash", 100, 100) is None
+
+
+def test_calls_are_written_to_llm_calls_table(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.llm.time.sleep", lambda seconds: None)
+    db = Database(f"sqlite:///{tmp_path / 'telemetry.db'}")
+    set_telemetry_sink(db.get_llm_call_sink(), run_id="daily-test")
+    client = LLMClient(api_key="test", model="gpt-4o-mini", agent_name="Picker")
+    client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    client.client = Mock()
+    client.client.chat.completions.create.side_effect = [TimeoutError("read timeout"), _completion()]
+
+    with llm_batch_context("picker-2"):
+        client.call("system", "user")
+    db.flush_agent_logs()
+
+    rows = load_llm_calls(db, date.today(), date.today())
+    db.close()
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row["run_id"], row["agent_name"], row["model"], row["batch_id"]) == (
+        "daily-test", "picker", "gpt-4o-mini", "picker-2"
+    )
+    assert (row["prompt_tokens"], row["completion_tokens"], row["cached_tokens"]) == (1000, 200, 400)
+    assert row["retries"] == 1
+    assert row["status"] == "ok"
+    assert row["latency_ms"] >= 0
+    assert row["cost_usd"] == pytest.approx(estimate_cost("gpt-4o-mini", 1000, 200, 400))
+
+
+def _row(run_id, agent, latency_ms, cost, status="ok", day=1):
+    return {
+        "run_id": run_id, "agent_name": agent, "model": "gpt-4o-mini", "timestamp": datetime(2026, 3, day, 9),
+        "latency_ms": latency_ms, "cost_usd": cost, "status": status, "retries": 0,
+        "prompt_tokens": 100, "completion_tokens": 10, "cached_tokens": 0,
+    }
+
+
+def test_stats_report_groups_by_day_run_and_agent():
+    rows = [_row("daily-a", "picker", ms, 0.01) for ms in range(100, 1100, 100)]
+    rows.append(_row("daily-b", "researcher", None, None, status="cache_hit", day=2))
+
+    summary = summarize_calls(rows)
+    report = format_llm_stats(rows, date(2026, 3, 1), date(2026, 3, 2))
+
+    assert summary["calls"] == 10 and summary["cache_hits"] == 1
+    assert summary["cost_usd"] == pytest.approx(0.10)
+    assert (summary["p50_ms"], summary["p95_ms"]) == (500, 1000)
+    assert percentile([], 50) is None
+    for label in ("By day", "2026-03-02", "By run", "daily-a", "By agent", "picker (gpt-4o-mini)"):
+        assert label in report
@@ -0,0 +1,185 @@
+"""Versioned schema migrations: fresh databases are stamped, legacy ones upgraded once, startup is one query"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, inspect, text
+
+from src.data import migrations
+from src.data.migrations import (
+    LATEST_VERSION, Migration, MigrationError, current_version, delete_duplicate_betting_lines,
+    delete_games_without_team_ids, migrate
+)
+from src.data.storage import Database
+
+# Schema of a database created before the teams table, pick/prediction dates and the later columns
+LEGACY_SCHEMA = """
+CREATE TABLE teams (id INTEGER PRIMARY KEY, normalized_team_name VARCHAR NOT NULL);
+CREATE TABLE games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, team1 VARCHAR, team2 VARCHAR, team1_id INTEGER, team2_id INTEGER,
+    date DATE NOT NULL, venue VARCHAR, status VARCHAR(9), result JSON, created_at DATETIME
+);
+CREATE TABLE predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER NOT NULL, model_type VARCHAR NOT NULL,
+    predicted_spread FLOAT NOT NULL, predicted_total FLOAT, win_probability_team1 FLOAT NOT NULL,
+    win_probability_team2 FLOAT NOT NULL, ev_estimate FLOAT NOT NULL, confidence_score FLOAT NOT NULL,
+    mispricing_detected BOOLEAN DEFAULT 0, created_at DATETIME
+);
+CREATE TABLE picks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER NOT NULL, bet_type VARCHAR(9) NOT NULL,
+    line FLOAT NOT NULL, odds INTEGER NOT NULL, stake_units FLOAT, stake_amount FLOAT, rationale VARCHAR NOT NULL,
+    confidence FLOAT NOT NULL, expected_value FLOAT NOT NULL, book VARCHAR NOT NULL, parlay_legs JSON,
+    team_id INTEGER, created_at DATETIME
+);
+CREATE TABLE betting_lines (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER NOT NULL, book VARCHAR NOT NULL, bet_type VARCHAR(9) NOT NULL,
+    line FLOAT NOT NULL, odds INTEGER NOT NULL, timestamp DATETIME
+);
+INSERT INTO teams VALUES (1, 'Duke'), (2, 'UNC');
+INSERT INTO betting_lines (game_id, book, bet_type, line, odds) VALUES
+    (1, 'draftkings', 'TOTAL', 145.5, -110), (1, 'draftkings', 'TOTAL', 146.0, -110);
+INSERT INTO games (id, team1, team2, team1_id, team2_id, date, created_at) VALUES
+    (1, 'Duke', 'UNC', 1, 2, '2025-12-01', '2025-12-01 09:00:00');
+INSERT INTO predictions (game_id, model_type, predicted_spread, win_probability_team1, win_probability_team2,
+    ev_estimate, confidence_score, created_at) VALUES (1, 'm', -3.5, 0.6, 0.4, 0.1, 0.7, '2025-12-01 10:00:00');
+INSERT INTO picks (game_id, bet_type, line, odds, rationale, confidence, expected_value, book, created_at)
+    VALUES (1, 'SPREAD', -3.5, -110, 'r', 0.6, 0.1, 'b', '2025-12-01 08:30:00'),
+           (1, 'SPREAD', -3.5, -110, 'r', 0.6, 0.1, 'b', '2025-12-01 18:30:00');
+"""
+
+
+@pytest.fixture
+def legacy_url(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+def open_database(url) -> Database:
+    db = Database(database_url=url)
+    db.close()
+    db.engine.dispose()
+    return db
+
+
+def test_new_database_is_created_at_latest_version(tmp_path):
+    db = open_database(f"sqlite:///{tmp_path / 'new.db'}")
+    assert db.schema_version == LATEST_VERSION
+    assert current_version(db.engine) == LATEST_VERSION
+
+
+def test_up_to_date_database_opens_with_one_query(tmp_path):
+    url = f"sqlite:///{tmp_path / 'new.db'}"
+    open_database(url)
+
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", listener)
+    try:
+        open_database(url)
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
+    assert len(statements) == 1
+    assert "schema_version" in statements[0]
+
+
+def test_legacy_database_is_upgraded_once(legacy_url):
+    db = open_database(legacy_url)
+    assert db.schema_version == LATEST_VERSION
+
+    inspector = inspect(db.engine)
+    game_columns = {col['name'] for col in inspector.get_columns('games')}
+    assert {'team1', 'team2'}.isdisjoint(game_columns) and 'game_time_est' in game_columns
+    assert {'best_bet', 'selection_text', 'pick_date'} <= {col['name'] for col in inspector.get_columns('picks')}
+    ev_estimate = next(col for col in inspector.get_columns('predictions') if col['name'] == 'ev_estimate')
+    assert ev_estimate['nullable']
+    assert 'ix_picks_pick_date' in {ix['name'] for ix in inspector.get_indexes('picks')}
+    assert 'uq_betting_lines_game_book_type_team' in {ix['name'] for ix in inspector.get_indexes('betting_lines')}
+
+    db = Database(database_url=legacy_url)
+    try:
+        # A legacy duplicate pick for the same game and day is left undated instead of failing the unique index
+        assert [p.id for p in db.get_picks_for_date(date(2025, 12, 1))] == [2]
+        with db.engine.connect() as conn:
+            assert conn.execute(text("SELECT team1_id, team2_id FROM games")).all() == [(1, 2)]
+            # Legacy lines without a team never conflict on the upsert key, so they are kept
+            assert conn.execute(text("SELECT line FROM betting_lines ORDER BY id")).scalars().all() == [145.5, 146.0]
+            assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == LATEST_VERSION
+    finally:
+        db.close()
+        db.engine.dispose()
+
+
+def test_failed_migration_is_rolled_back_and_retried(legacy_url, monkeypatch):
+    def broken(conn):
+        conn.execute(text("ALTER TABLE games ADD COLUMN half_done INTEGER"))
+        raise RuntimeError("boom")
+
+    steps = migrations.MIGRATIONS[:2] + [Migration(3, "broken", broken)]
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    monkeypatch.setattr(migrations, "LATEST_VERSION", 3)
+
+    with pytest.raises(MigrationError, match="boom"):
+        Database(database_url=legacy_url)
+    engine = create_engine(legacy_url)
+    assert current_version(engine) == 2
+    assert 'half_done' not in {col['name'] for col in inspect(engine).get_columns('games')}
+
+    steps[2] = Migration(3, "fixed", lambda conn: None)
+    assert migrate(engine) == 3
+    engine.dispose()
+
+
+def test_games_without_team_ids_block_migration_until_deleted_explicitly(legacy_url):
+    engine = create_engine(legacy_url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO games (id, team1, team2, date) VALUES (2, 'Old', 'Game', '2025-11-01')"
+        ))
+
+    with pytest.raises(MigrationError, match="1 games have no team ids"):
+        migrate(engine)
+    assert current_version(engine) == 4
+    with engine.connect() as conn:
+        # Nothing was deleted and the legacy columns are still there
+        assert conn.execute(text("SELECT id FROM games ORDER BY id")).scalars().all() == [1, 2]
+        assert 'team1' in {col['name'] for col in inspect(conn).get_columns('games')}
+
+    assert delete_games_without_team_ids(engine) == 1
+    assert migrate(engine) == LATEST_VERSION
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT id FROM games")).scalars().all() == [1]
+    engine.dispose()
+
+
+def test_duplicate_betting_lines_block_migration_until_deleted_explicitly(legacy_url, monkeypatch):
+    engine = create_engine(legacy_url)
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:6])
+    monkeypatch.setattr(migrations, "LATEST_VERSION", 6)
+    assert migrate(engine) == 6
+    monkeypatch.undo()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO betting_lines (game_id, book, bet_type, line, odds, team) VALUES "
+            "(1, 'draftkings', 'SPREAD', -3.5, -110, 'Duke'), (1, 'draftkings', 'SPREAD', -4.0, -110, 'Duke')"
+        ))
+
+    with pytest.raises(MigrationError, match="1 duplicate betting lines"):
+        migrate(engine)
+    assert current_version(engine) == 6
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM betting_lines")).scalar() == 4
+
+    assert delete_duplicate_betting_lines(engine) == 1
+    assert migrate(engine) == LATEST_VERSION
+    with engine.connect() as conn:
+        assert conn.execute(text(
+            "SELECT line FROM betting_lines WHERE team = 'Duke'"
+        )).scalars().all() == [-4.0]
+    engine.dispose()
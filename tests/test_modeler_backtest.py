@@ -0,0 +1,135 @@
+"""Tests for the modeler backtest harness"""
+
+from datetime import date, datetime
+
+import pytest
+
+from src.agents import modeler_engine as me
+from src.agents.modeler_backtest import evaluate_slate, iter_backtest_games, run_backtest
+from src.agents.modeler_slate import ModelParams
+from src.data.models import BetType, GameStatus
+from src.data.storage import BettingLineModel, GameInsightModel, GameModel, TeamModel
+from tests.conftest import get_or_create_team
+
+
+def _add_game(session, game_date, home, away, home_stats, away_stats, home_score, away_score,
+              spread_home=None, total=None, matchup_notes=None, spread_team=None):
+    game = GameModel(
+        team1_id=get_or_create_team(session, home),
+        team2_id=get_or_create_team(session, away),
+        date=game_date,
+        status=GameStatus.FINAL,
+        result={"home_score": home_score, "away_score": away_score},
+    )
+    session.add(game)
+    session.flush()
+    session.add(GameInsightModel(game_id=game.id, team1_stats=home_stats, team2_stats=away_stats,
+                                 matchup_notes=matchup_notes))
+    # Lines saved on a game's first run carry the display name rather than the normalized one
+    home_name = spread_team or session.get(TeamModel, game.team1_id).normalized_team_name
+    if spread_home is not None:
+        # An older line from another book; the latest one is the market the backtest should use
+        session.add(BettingLineModel(game_id=game.id, book="fanduel", bet_type=BetType.SPREAD,
+                                     line=spread_home + 3, odds=-110, team=home_name,
+                                     timestamp=datetime(2026, 1, 1, 8)))
+        session.add(BettingLineModel(game_id=game.id, book="draftkings", bet_type=BetType.SPREAD,
+                                     line=spread_home, odds=-105, team=home_name,
+                                     timestamp=datetime(2026, 1, 1, 9)))
+    if total is not None:
+        session.add(BettingLineModel(game_id=game.id, book="draftkings", bet_type=BetType.TOTAL,
+                                     line=total, odds=-110, team="over",
+                                     timestamp=datetime(2026, 1, 1, 9)))
+    return game
+
+
+@pytest.fixture
+def backtest_db(mock_database):
+    strong = {"adjo": 120.0, "adjd": 92.0, "adjt": 68.0}
+    weak = {"adjo": 100.0, "adjd": 108.0, "adjt": 66.0}
+    session = mock_database.get_session()
+    try:
+        # Strong home team, market too low on it: model takes home, home covers
+        _add_game(session, date(2026, 1, 5), "Duke", "Wake Forest", strong, weak, 85, 60,
+                  spread_home=-5.0, total=150.0)
+        # Same matchup reversed: model takes away (+big), home fails to cover
+        _add_game(session, date(2026, 1, 5), "Boston College", "North Carolina", weak, strong, 58, 80,
+                  spread_home=4.0, total=120.0, spread_team="Boston College Eagles")
+        # Different date, no lines, missing stats is skipped
+        _add_game(session, date(2026, 1, 20), "Kansas", "Baylor", strong, strong, 70, 72)
+        _add_game(session, date(2026, 1, 20), "Purdue", "Iowa", {"adjo": 110.0}, weak, 70, 60)
+        session.commit()
+    finally:
+        session.close()
+    return mock_database
+
+
+def test_iter_backtest_games_streams_by_date(backtest_db):
+    slates = list(iter_backtest_games(backtest_db, date(2026, 1, 1), date(2026, 1, 31), chunk_days=7))
+    assert [d for d, _ in slates] == [date(2026, 1, 5), date(2026, 1, 20)]
+    first = slates[0][1][0]
+    assert first.context.market_spread_home == -5.0  # latest line wins
+    assert first.spread_odds == {"home": -105}
+    assert first.context.market_total == 150.0
+    assert len(slates[1][1]) == 1  # game with incomplete stats is skipped
+
+
+def test_evaluate_slate_grades_model_side(backtest_db):
+    _, games = next(iter_backtest_games(backtest_db, date(2026, 1, 5), date(2026, 1, 5)))
+    records = evaluate_slate(games)
+    assert [r["ats_result"] for r in records] == [1, 1]
+    assert records[0]["ats_odds"] == -105
+    assert records[0]["predicted_margin"] == me.calculate_game_model(games[0].context, [])["predictions"]["margin"]
+
+
+def test_run_backtest_summary_in_process_and_parallel(backtest_db):
+    serial = run_backtest(date(2026, 1, 1), date(2026, 1, 31), db=backtest_db, workers=1)
+    parallel = run_backtest(date(2026, 1, 1), date(2026, 1, 31), db=backtest_db, workers=2)
+    assert serial["games"] == parallel["games"] == 3
+    assert serial["dates"] == 2
+    assert serial["ats"]["wins"] == 2 and serial["ats"]["losses"] == 0
+    # Home side priced at -105; no away line stored, so the away win pays the default -110
+    assert serial["ats"]["roi"] == pytest.approx(((100 / 105) + (100 / 110)) / 2)
+    for key in ("ats", "totals", "margin_mae", "total_mae", "brier_score", "calibration",
+                "ats_calibration", "totals_calibration"):
+        assert serial[key] == parallel[key]
+    assert sum(b["games"] for b in serial["calibration"]) == 3
+    assert sum(b["games"] for b in serial["ats_calibration"]) == 2
+
+
+def test_neutral_site_is_read_from_matchup_notes(mock_database):
+    stats = {"adjo": 110.0, "adjd": 100.0, "adjt": 67.0}
+    session = mock_database.get_session()
+    try:
+        _add_game(session, date(2026, 3, 20), "Duke", "UNC", stats, stats, 70, 68)
+        _add_game(session, date(2026, 3, 20), "Kansas", "Baylor", stats, stats, 70, 68,
+                  matchup_notes="NCAA Tournament | Neutral site game in Dallas")
+        session.commit()
+    finally:
+        session.close()
+
+    _, games = next(iter_backtest_games(mock_database, date(2026, 3, 20), date(2026, 3, 20)))
+    assert [g.context.is_neutral_site for g in games] == [False, True]
+    records = evaluate_slate(games)
+    assert records[0]["predicted_margin"] > 0
+    assert records[1]["predicted_margin"] == pytest.approx(0.0)  # evenly matched, no home court
+
+
+def test_margin_sd_override_changes_cover_calibration(backtest_db):
+    tight = run_backtest(date(2026, 1, 1), date(2026, 1, 31), db=backtest_db, workers=1,
+                         params=ModelParams.from_overrides({"MARGIN_SD": 6.0}))
+    wide = run_backtest(date(2026, 1, 1), date(2026, 1, 31), db=backtest_db, workers=1,
+                        params=ModelParams.from_overrides({"MARGIN_SD": 20.0}))
+    assert tight["ats"] == wide["ats"]  # same sides bet and graded
+    tight_prob = [b["mean_predicted"] for b in tight["ats_calibration"]]
+    wide_prob = [b["mean_predicted"] for b in wide["ats_calibration"]]
+    assert tight_prob != wide_prob
+    # A tighter margin distribution is more confident that the side it bets covers
+    assert min(tight_prob) > max(wide_prob)
+
+
+def test_param_overrides_change_model():
+    params = ModelParams.from_overrides({"WIN_PROB_SCALE": 10, "dampening_threshold": "15"})
+    assert params.win_prob_scale == 10.0
+    assert params.dampening_threshold == 15.0
+    with pytest.raises(ValueError):
+        ModelParams.from_overrides({"NOT_A_PARAM": 1})
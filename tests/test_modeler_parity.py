@@ -1,7 +1,12 @@
 """Parity tests for programmatic Modeler engine."""
 
+import random
+
+import pytest
+
 from src.agents import modeler_engine as me
 from src.agents.modeler_engine import GameContext, TeamContext
+from src.agents.modeler_slate import calculate_slate_models
 
 
 def test_pace_calculation():
@@ -371,3 +376,74 @@ def test_calculate_game_model_end_to_end():
     assert "final_pace" in model["meta"]
     assert 0.99 <= model["predictions"]["win_probs"]["away"] + model["predictions"]["win_probs"]["home"] <= 1.01
 
+
+
+# --- Vectorized slate engine ---
+
+
+def _random_slate(seed, n_games):
+    rng = random.Random(seed)
+    conferences = [None, "ACC", "SEC", "Big Ten", "Big 12", "Big East", "WCC", "Summit", "MEAC", "A-10"]
+    trends = [None, "faster", "slower", "Faster", "steady"]
+    contexts, lines = [], []
+    for i in range(n_games):
+        away = TeamContext(
+            name=f"Away {i}",
+            team_id=i * 2,
+            adjo=rng.uniform(90.0, 130.0),
+            adjd=rng.uniform(85.0, 120.0),
+            adjt=rng.uniform(60.0, 78.0),
+            pace_trend=rng.choice(trends),
+            conference=rng.choice(conferences),
+        )
+        home = TeamContext(
+            name=f"Home {i}",
+            team_id=i * 2 + 1,
+            adjo=rng.uniform(90.0, 130.0),
+            adjd=rng.uniform(85.0, 120.0),
+            adjt=rng.uniform(60.0, 78.0),
+            pace_trend=rng.choice(trends),
+            conference=rng.choice(conferences),
+        )
+        market_total = rng.choice([None, round(rng.uniform(125.0, 170.0) * 2) / 2])
+        market_spread = rng.choice([None, round(rng.uniform(-25.0, 25.0) * 2) / 2])
+        contexts.append(GameContext(
+            game_id=f"g{i}",
+            away=away,
+            home=home,
+            market_total=market_total,
+            market_spread_home=market_spread,
+            is_neutral_site=rng.random() < 0.2,
+            is_rivalry=rng.random() < 0.1,
+        ))
+        game_lines = []
+        if market_spread is not None:
+            game_lines.append({"bet_type": "spread", "line": market_spread, "team": "home", "odds": -110})
+            game_lines.append({"bet_type": "spread", "line": -market_spread, "team": "away", "odds": -105})
+        if market_total is not None:
+            game_lines.append({"bet_type": "total", "line": market_total, "odds": rng.choice([-110, 100, -120])})
+        game_lines.append({"bet_type": "moneyline", "team": "home", "odds": rng.choice([-250, 150, 0])})
+        game_lines.append({"bet_type": "moneyline", "team": "away", "odds": rng.randint(-400, 400)})
+        game_lines.append({"bet_type": "spread", "line": None, "team": "home"})
+        game_lines.append({"bet_type": "prop", "line": 1.5})
+        lines.append(rng.choice([game_lines, game_lines, []]))
+    return contexts, lines
+
+
+def test_slate_models_match_scalar_engine_exactly():
+    contexts, lines = _random_slate(seed=7, n_games=400)
+    expected = [me.calculate_game_model(ctx, game_lines) for ctx, game_lines in zip(contexts, lines)]
+    assert calculate_slate_models(contexts, lines) == expected
+
+
+def test_slate_models_without_adv_stats_or_lines():
+    contexts, _ = _random_slate(seed=11, n_games=50)
+    expected = [me.calculate_game_model(ctx, [], has_adv_stats=False) for ctx in contexts]
+    assert calculate_slate_models(contexts, has_adv_stats=False) == expected
+
+
+def test_slate_models_empty_and_misaligned():
+    assert calculate_slate_models([]) == []
+    contexts, lines = _random_slate(seed=3, n_games=3)
+    with pytest.raises(ValueError):
+        calculate_slate_models(contexts, lines[:2])
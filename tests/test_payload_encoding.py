@@ -0,0 +1,81 @@
+"""Tests for compact agent payload encoding"""
+
+import json
+from unittest.mock import Mock
+
+from src.agents.president import President
+from src.prompts import compose_user_prompt
+from src.utils import payload_encoding
+from src.utils.payload_encoding import KEY_ALIASES, PayloadEncoding, decode_payload, get_payload_encoding
+
+
+def _game_models():
+    return {
+        "game_models": [
+            {"game_id": "1", "predictions": {"spread": -3.4567, "total": 141.0},
+             "market_edges": [{"market_type": "SPREAD_HOME", "model_estimated_probability": 0.56789}]},
+            {"game_id": "2", "predictions": {"spread": 1.25, "total": 150.5}, "market_edges": []},
+        ]
+    }
+
+
+def test_compact_encoding_round_trips_through_legend():
+    encoding = get_payload_encoding("picker")
+    data = _game_models()
+
+    packed = json.loads(encoding.encode(data))
+
+    assert packed["gm"]["_cols"] == ["game_id", "pr", "me"]
+    assert packed["gm"]["_rows"][0][1] == {"spread": -3.457, "total": 141}
+    assert decode_payload(packed, encoding)["game_models"][0]["market_edges"] == [
+        {"market_type": "SPREAD_HOME", "model_estimated_probability": 0.568}
+    ]
+    assert len(encoding.encode(data)) < len(json.dumps(data, indent=2)) / 2
+
+
+def test_keys_in_output_schema_are_not_aliased(monkeypatch):
+    monkeypatch.setitem(payload_encoding.AGENT_KEY_ALIASES, "modeler", payload_encoding.MODEL_KEY_ALIASES)
+    modeler = get_payload_encoding("modeler")
+
+    assert "game_models" not in modeler.aliases
+    assert "model_estimated_probability" not in modeler.aliases
+    assert "base_pace" in modeler.aliases
+    assert get_payload_encoding("picker").aliases["game_models"] == KEY_ALIASES["game_models"]
+    assert get_payload_encoding("president").aliases == {}
+    assert len(set(KEY_ALIASES.values())) == len(KEY_ALIASES)
+
+
+def test_legend_is_part_of_static_prefix():
+    encoding = PayloadEncoding(aliases={"game_models": "gm"})
+
+    first = compose_user_prompt("Pick.", {"game_models": [{"a": 1}, {"a": 2}]}, "Batch 1", encoding)
+    second = compose_user_prompt("Pick.", {"game_models": []}, "Batch 2", encoding)
+
+    prefix = f"Pick.\n\n{encoding.legend()}\n\n"
+    assert first.startswith(prefix) and second.startswith(prefix)
+    assert "gm=game_models" in encoding.legend()
+    assert first.endswith('Input data:\n{"gm":{"_cols":["a"],"_rows":[[1],[2]]}}')
+
+
+def test_pretty_mode_keeps_indented_json(monkeypatch):
+    monkeypatch.setattr(payload_encoding, "_payload_config", lambda: {"agents": {"picker": {"mode": "pretty"}}})
+    data = _game_models()
+
+    assert get_payload_encoding("picker").encode(data) == json.dumps(data, indent=2)
+    assert get_payload_encoding("researcher").compact
+
+
+def test_agent_records_payload_savings():
+    llm_client = Mock()
+    llm_client.get_usage_stats.return_value = {"total_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    llm_client.call.return_value = {"approved_picks": []}
+    president = President(db=None, llm_client=llm_client)
+    picks = [{"game_id": str(i), "matchup": f"Team {i} @ Home {i}", "edge": 0.0412345} for i in range(6)]
+
+    president.call_llm("Assign units.", {"candidate_picks": picks})
+
+    savings = president.get_payload_savings()
+    assert savings["calls"] == 1
+    assert savings["saved_chars"] > 0
+    assert savings["saved_tokens"] > 0
+    assert '"_rows"' in llm_client.call.call_args.kwargs["user_prompt"]
@@ -287,3 +287,17 @@ class TestPickerIntegration:
                 assert isinstance(pick["justification"], list), "justification must be a list"
                 assert len(pick["justification"]) > 0, "justification should not be empty"
 
+
+
+def test_picker_prompt_puts_per_run_content_after_static_instructions():
+    from src.prompts import build_picker_user_prompt
+    from src.prompts.agents_prompts import PICKER_USER_INSTRUCTIONS
+
+    history = {"period": "7d", "wins": 10, "losses": 8, "pushes": 0, "win_rate": 55.6, "roi": 4.1, "total_profit": 120.0}
+    first = build_picker_user_prompt(history, {"games": [1]})
+    second = build_picker_user_prompt(None, {"games": [2, 3]})
+
+    assert first.startswith(PICKER_USER_INSTRUCTIONS)
+    assert second.startswith(PICKER_USER_INSTRUCTIONS)
+    assert first.index("HISTORICAL PERFORMANCE") > len(PICKER_USER_INSTRUCTIONS)
+    assert first.rstrip().endswith('"games": [\n    1\n  ]\n}')
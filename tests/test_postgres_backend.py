@@ -0,0 +1,151 @@
+"""PostgreSQL support without a server: SQL generated for the postgresql dialect, upserts exercised on SQLite"""
+
+import gc
+import weakref
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from src.data.migrations import add_column_ddl
+from src.data.models import BetType, BettingLine, Pick
+from src.data import storage
+from src.data.storage import Base, BettingLineModel, GameModel, PickModel, TeamModel, upsert_statement
+from src.orchestration import persistence_service
+from src.orchestration.persistence_service import PersistenceService
+
+LINE_ROW = {
+    'game_id': 1, 'book': 'draftkings', 'bet_type': BetType.SPREAD, 'line': -3.5, 'odds': -110,
+    'team': 'Duke', 'timestamp': datetime(2025, 12, 1, 9),
+}
+
+
+def compiled(stmt, dialect) -> str:
+    return " ".join(str(stmt.compile(dialect=dialect)).split())
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()], ids=["postgresql", "sqlite"])
+def test_line_upsert_renders_on_conflict(dialect):
+    stmt = upsert_statement(
+        dialect.name, BettingLineModel, [LINE_ROW, dict(LINE_ROW, team='UNC')],
+        conflict_columns=('game_id', 'book', 'bet_type', 'team'),
+        update_columns=('line', 'odds', 'timestamp'),
+    )
+    sql = compiled(stmt, dialect)
+    assert sql.count("INSERT INTO betting_lines") == 1
+    assert "ON CONFLICT (game_id, book, bet_type, team) DO UPDATE SET" in sql
+    assert "line = excluded.line, odds = excluded.odds, timestamp = excluded.timestamp" in sql
+
+
+def test_pick_upsert_targets_partial_index_and_returns_id():
+    stmt = upsert_statement(
+        'postgresql', PickModel, [{'game_id': 1, 'pick_date': date(2025, 12, 1), 'line': -3.5}],
+        conflict_columns=('game_id', 'pick_date'), update_columns=('line',),
+        conflict_where=PickModel.pick_date.isnot(None),
+    ).returning(PickModel.id)
+    sql = compiled(stmt, postgresql.dialect())
+    assert "ON CONFLICT (game_id, pick_date) WHERE pick_date IS NOT NULL DO UPDATE SET line = excluded.line" in sql
+    assert sql.endswith("RETURNING picks.id")
+
+
+def test_upsert_rejects_unsupported_dialects():
+    with pytest.raises(NotImplementedError):
+        upsert_statement('mysql', PickModel, [{}], ('game_id',), ())
+
+
+def test_forked_child_drops_inherited_pools_without_keeping_engines_alive(monkeypatch):
+    engines = weakref.WeakSet()
+    monkeypatch.setattr(storage, "_pooled_engines", engines)
+    engine = create_engine("sqlite://")
+    engines.add(engine)
+    inherited = engine.pool
+
+    storage._drop_inherited_pools()  # What the single at-fork hook runs in the child
+    assert engine.pool is not inherited
+
+    del engine, inherited
+    gc.collect()
+    assert len(engines) == 0
+
+
+def test_models_and_migrations_render_for_postgresql():
+    dialect = postgresql.dialect()
+    for table in Base.metadata.sorted_tables:
+        CreateTable(table).compile(dialect=dialect)
+    assert add_column_ddl(dialect, PickModel.__table__, 'best_bet', False) == (
+        "ALTER TABLE picks ADD COLUMN best_bet BOOLEAN DEFAULT false"
+    )
+    assert add_column_ddl(sqlite.dialect(), PickModel.__table__, 'best_bet', False) == (
+        "ALTER TABLE picks ADD COLUMN best_bet BOOLEAN DEFAULT 0"
+    )
+
+
+@pytest.fixture
+def game_id(mock_database):
+    session = mock_database.get_session()
+    try:
+        duke, unc = TeamModel(normalized_team_name="Duke"), TeamModel(normalized_team_name="UNC")
+        session.add_all([duke, unc])
+        session.flush()
+        game = GameModel(team1_id=duke.id, team2_id=unc.id, date=date(2025, 12, 1))
+        session.add(game)
+        session.commit()
+        return game.id
+    finally:
+        session.close()
+
+
+def make_line(game_id, line, team, bet_type=BetType.SPREAD):
+    return BettingLine(
+        game_id=game_id, book="DraftKings", bet_type=bet_type, line=line, odds=-110, team=team,
+        timestamp=datetime(2025, 12, 1, 9),
+    )
+
+
+@pytest.fixture(params=["upsert", "orm"])
+def upserts(request, monkeypatch):
+    """Run persistence tests with ON CONFLICT upserts and with the lookup fallback other dialects use"""
+    if request.param == "orm":
+        monkeypatch.setattr(persistence_service, "UPSERT_DIALECTS", frozenset())
+    return request.param
+
+
+def test_save_lines_upserts_on_the_line_key(mock_database, game_id, upserts):
+    service = PersistenceService(mock_database)
+    service.save_lines([make_line(game_id, -3.5, "Duke"), make_line(game_id, 145.5, None, BetType.TOTAL)], [])
+    service.save_lines([
+        make_line(game_id, -4.0, "Duke"),
+        make_line(game_id, -4.5, "Duke"),  # Same key twice in one batch: last one wins
+        make_line(game_id, 146.0, None, BetType.TOTAL),
+    ], [])
+
+    session = mock_database.get_session()
+    try:
+        lines = {(l.bet_type, l.team): l for l in session.query(BettingLineModel).all()}
+    finally:
+        session.close()
+    assert len(lines) == 2
+    assert lines[(BetType.SPREAD, "Duke")].line == -4.5
+    assert lines[(BetType.SPREAD, "Duke")].book == "draftkings"
+    assert lines[(BetType.TOTAL, None)].line == 146.0
+
+
+def test_save_pick_upserts_one_pick_per_game_per_day(mock_database, game_id, upserts):
+    service = PersistenceService(mock_database)
+
+    def make_pick(line, rationale):
+        return Pick(
+            game_id=game_id, bet_type=BetType.SPREAD, line=line, odds=-110, rationale=rationale,
+            confidence=0.6, expected_value=0.05, book="draftkings", team_name="Duke", selection_text="Duke -3.5",
+        )
+
+    first, second = make_pick(-3.5, "first"), make_pick(-4.0, "second")
+    service.save_pick(first, target_date=date(2025, 12, 1))
+    service.save_pick(second, target_date=date(2025, 12, 1))
+
+    assert first.id is not None and second.id == first.id
+    picks = mock_database.get_picks_for_date(date(2025, 12, 1))
+    assert [(p.id, p.line, p.rationale) for p in picks] == [(first.id, -4.0, "second")]
+    assert picks[0].team_id is not None
@@ -0,0 +1,165 @@
+"""EXPLAIN QUERY PLAN checks: the hot date-range queries must search an index, never scan the table"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+from src.agents.results_processor import ResultsProcessor
+from src.data.models import BetType
+from src.data.migrations import LATEST_VERSION
+from src.data.storage import AgentLogModel, BettingLineModel, Database, PickModel, PredictionModel
+from src.utils.email.email_data import EmailDataContext
+
+TODAY = date(2025, 12, 2)
+
+
+@contextmanager
+def captured_selects(db):
+    """Collect (statement, parameters) for every SELECT the engine runs"""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = {db.engine, db.read_engine}
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", listener)
+
+
+def query_plan(db, statement, parameters) -> str:
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(db, statements, table):
+    plans = [query_plan(db, s, p) for s, p in statements if f"FROM {table}" in s]
+    assert plans, f"no query against {table} was captured"
+    for plan in plans:
+        assert f"SCAN {table}" not in plan, plan
+        assert f"SEARCH {table}" in plan, plan
+
+
+def test_picks_for_date_uses_pick_date_index(mock_database):
+    with captured_selects(mock_database) as statements:
+        mock_database.get_picks_for_date(TODAY)
+    assert_uses_index(mock_database, statements, "picks")
+    assert "ix_picks_pick_date" in query_plan(mock_database, *statements[0])
+
+
+def test_lines_for_date_use_game_date_and_game_id_indexes(mock_database):
+    with captured_selects(mock_database) as statements:
+        mock_database.get_betting_lines_for_date(TODAY)
+    assert_uses_index(mock_database, statements, "games")
+
+    # get_betting_lines_for_date returns early without games, so check the lines lookup directly
+    session = mock_database.get_session()
+    try:
+        with captured_selects(mock_database) as statements:
+            session.query(BettingLineModel).filter(BettingLineModel.game_id.in_([1, 2])).all()
+    finally:
+        session.close()
+    assert_uses_index(mock_database, statements, "betting_lines")
+
+
+def test_statistics_bets_lookup_uses_pick_id_index(mock_database):
+    processor = ResultsProcessor(db=mock_database)
+    session = mock_database.get_session()
+    try:
+        session.add(PickModel(
+            game_id=1, bet_type=BetType.SPREAD, line=-3.0, odds=-110, rationale="r", confidence=0.6,
+            expected_value=0.1, book="b", pick_date=TODAY,
+        ))
+        session.commit()
+        picks = session.query(PickModel).all()
+        with captured_selects(mock_database) as statements:
+            processor._calculate_statistics(picks, session, TODAY)
+    finally:
+        session.close()
+    assert_uses_index(mock_database, statements, "bets")
+
+
+def test_email_context_queries_use_indexes(mock_database):
+    with captured_selects(mock_database) as statements:
+        EmailDataContext.load(mock_database, TODAY)
+    assert_uses_index(mock_database, statements, "picks")
+    assert_uses_index(mock_database, statements, "games")
+
+
+@pytest.mark.parametrize("query", [
+    lambda session: session.query(PredictionModel).filter_by(game_id=1).order_by(PredictionModel.created_at.desc()).first(),
+    lambda session: session.query(AgentLogModel).filter(
+        AgentLogModel.timestamp >= datetime.combine(TODAY, datetime.min.time()),
+        AgentLogModel.timestamp < datetime.combine(TODAY + timedelta(days=1), datetime.min.time()),
+    ).all(),
+])
+def test_reporting_lookups_use_composite_indexes(mock_database, query):
+    session = mock_database.get_session()
+    try:
+        with captured_selects(mock_database) as statements:
+            query(session)
+    finally:
+        session.close()
+    table = "predictions" if "FROM predictions" in statements[0][0] else "agent_logs"
+    assert_uses_index(mock_database, statements, table)
+
+
+def test_migration_backfills_pick_date_and_adds_missing_indexes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    db = Database(database_url=url)
+    with db.engine.begin() as conn:
+        # Roll the database back to before migration 6
+        conn.execute(text("DELETE FROM schema_version"))
+        conn.execute(text("INSERT INTO schema_version (version, description) VALUES (5, 'legacy')"))
+        conn.execute(text("DROP INDEX ix_picks_pick_date"))
+        conn.execute(text(
+            "INSERT INTO picks (game_id, bet_type, line, odds, rationale, confidence, expected_value, book, created_at) "
+            "VALUES (1, 'SPREAD', -3.0, -110, 'r', 0.6, 0.1, 'b', '2025-12-01 18:30:00')"
+        ))
+    db.engine.dispose()
+
+    db = Database(database_url=url)
+    try:
+        assert "ix_picks_pick_date" in {ix["name"] for ix in inspect(db.engine).get_indexes("picks")}
+        assert [p.id for p in db.get_picks_for_date(date(2025, 12, 1))] == [1]
+    finally:
+        db.close()
+        db.engine.dispose()
+
+
+def test_pick_date_backfill_leaves_legacy_duplicates_undated(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    db = Database(database_url=url)
+    insert = (
+        "INSERT INTO picks (id, game_id, bet_type, line, odds, rationale, confidence, expected_value, book, "
+        "created_at, pick_date) VALUES ({}, {}, 'SPREAD', -3.0, -110, 'r', 0.6, 0.1, 'b', '{}', {})"
+    )
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_version"))
+        conn.execute(text("INSERT INTO schema_version (version, description) VALUES (5, 'legacy')"))
+        # Game 1: two undated picks on one day; game 2: an undated pick for a day that already has one
+        conn.execute(text(insert.format(1, 1, '2025-12-01 18:30:00', 'NULL')))
+        conn.execute(text(insert.format(2, 1, '2025-12-01 19:00:00', 'NULL')))
+        conn.execute(text(insert.format(3, 2, '2025-12-02 09:00:00', "'2025-12-02'")))
+        conn.execute(text(insert.format(4, 2, '2025-12-02 10:00:00', 'NULL')))
+    db.engine.dispose()
+
+    db = Database(database_url=url)
+    try:
+        assert db.schema_version == LATEST_VERSION
+        assert [p.id for p in db.get_picks_for_date(date(2025, 12, 1))] == [2]
+        assert [p.id for p in db.get_picks_for_date(date(2025, 12, 2))] == [3]
+        with db.engine.connect() as conn:
+            undated = conn.execute(text("SELECT id FROM picks WHERE pick_date IS NULL ORDER BY id")).scalars().all()
+        assert undated == [1, 4]
+    finally:
+        db.close()
+        db.engine.dispose()
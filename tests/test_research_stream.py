@@ -0,0 +1,71 @@
+"""Tests for the streaming Researcher -> Modeler -> Picker stage"""
+
+import threading
+from datetime import date
+from unittest.mock import Mock
+
+from src.data.models import BettingLine, BetType
+from src.orchestration.research_stream import ResearchStream
+
+
+class FakeModeler:
+    def __init__(self):
+        self.calls = []
+
+    def model_games(self, games, betting_lines):
+        self.calls.append(([g["game_id"] for g in games], sorted(l.game_id for l in betting_lines)))
+        # Games without advanced stats are skipped, like the real modeler
+        return [{"game_id": g["game_id"], "model": True} for g in games if g.get("adv")]
+
+
+class FakePicker:
+    batch_size = 3
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+        self.batches = []
+
+    def pick_batch(self, researcher_games, modeler_games, historical_performance, batch_num):
+        self.release.wait(5)
+        self.batches.append(([g["game_id"] for g in researcher_games], [m["game_id"] for m in modeler_games]))
+        return [{"game_id": m["game_id"], "selection": "pick"} for m in modeler_games]
+
+
+def insight(game_id, adv=True):
+    return {"game_id": str(game_id), "adv": {"home": {}} if adv else {}}
+
+
+def test_batches_are_modeled_on_arrival_and_picked_in_chunks():
+    release = threading.Event()
+    modeler, picker, persistence = FakeModeler(), FakePicker(release), Mock()
+    lines = [BettingLine(game_id=i, book="draftkings", bet_type=BetType.SPREAD, line=-3.5, odds=-110) for i in range(1, 6)]
+
+    with ResearchStream(modeler, picker, persistence, lines, date(2026, 3, 1)) as stream:
+        stream.on_insights([insight(4), insight(5, adv=False)])
+        # Modeled and saved before the rest of the slate is researched
+        assert modeler.calls == [(["4", "5"], [4, 5])]
+        persistence.save_predictions.assert_called_once_with({"game_models": [{"game_id": "4", "model": True}]}, date(2026, 3, 1))
+        stream.on_insights([insight(1), insight(2)])
+        # A full picker chunk is in flight while research continues
+        assert len(stream._pick_futures) == 1
+        release.set()
+        predictions, picker_response = stream.finish({"games": [insight(i) for i in range(1, 6)]})
+
+    assert [m["game_id"] for m in predictions["game_models"]] == ["1", "2", "4"]
+    assert sorted(picker.batches) == [(["2"], ["2"]), (["4", "5", "1"], ["4", "1"])]
+    assert sorted(p["game_id"] for p in picker_response["candidate_picks"]) == ["1", "2", "4"]
+
+
+def test_modeling_errors_do_not_stop_the_stream():
+    release = threading.Event()
+    release.set()
+    modeler, picker = Mock(), FakePicker(release)
+    modeler.model_games.side_effect = ValueError("bad stats")
+
+    with ResearchStream(modeler, picker, Mock(), [], date(2026, 3, 1)) as stream:
+        stream.on_insights([insight(1)])
+        predictions, picker_response = stream.finish({"games": [insight(1)]})
+
+    assert predictions == {"game_models": []}
+    assert picker.batches == [(["1"], [])]
+    assert picker_response["candidate_picks"] == []
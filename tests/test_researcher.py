@@ -191,6 +191,103 @@ class TestResearcherUnit:
             # Fallback was created, verify it indicates unavailable data
             assert has_unavailable, f"Fallback entry should indicate unavailable data. adv={adv}, advanced_stats={advanced_stats}, dq={dq}, data_quality_notes={data_quality_notes}"
     
+    def test_concurrent_batches_preserve_game_order(self, mock_database, mock_llm_client):
+        """Test that concurrent batches merge back in input game order regardless of completion order"""
+        import time
+        games = [
+            Game(id=i, team1=f"Home {i}", team2=f"Away {i}", date=date.today(), status=GameStatus.SCHEDULED)
+            for i in range(1, 13)
+        ]
+        researcher = Researcher(db=mock_database, llm_client=mock_llm_client)
+        researcher.config = {"max_concurrent_batches": 3}
+
+        def fake_batch(batch_games, target_date, betting_lines, batch_num, max_retries=2):
+            # Later batches finish first
+            time.sleep(0.05 * (4 - batch_num))
+            return [{"game_id": str(g.id)} for g in reversed(batch_games)]
+
+        with patch.object(researcher, "_process_batch_with_retry", side_effect=fake_batch) as mock_batch:
+            result = researcher.process(games, target_date=date.today(), betting_lines=[], force_refresh=True)
+
+        assert mock_batch.call_count == 3
+        assert [g["game_id"] for g in result["games"]] == [str(g.id) for g in games]
+
+    def test_on_insights_streams_cached_batches_and_fallbacks(self, mock_database, mock_llm_client):
+        """on_insights receives cached games first, then each batch as it completes, then fallbacks"""
+        games = [
+            Game(id=i, team1=f"Home {i}", team2=f"Away {i}", date=date.today(), status=GameStatus.SCHEDULED)
+            for i in range(1, 13)
+        ]
+        researcher = Researcher(db=mock_database, llm_client=mock_llm_client)
+        researcher.config = {"max_concurrent_batches": 2}
+        researcher.cache.set("researcher", researcher._get_cache_key(games[0], date.today()), {
+            "fingerprint": researcher._input_fingerprint(games[0], []), "insight": {"game_id": "1", "cached": True}
+        })
+
+        def fake_batch(batch_games, target_date, betting_lines, batch_num, max_retries=2):
+            # Game 12 (third batch) fails and falls back
+            return [{"game_id": str(g.id)} for g in batch_games if g.id != 12]
+
+        streamed = []
+        with patch.object(researcher, "_process_batch_with_retry", side_effect=fake_batch):
+            result = researcher.process(games, target_date=date.today(), betting_lines=[],
+                                        on_insights=lambda batch: streamed.append([g["game_id"] for g in batch]))
+
+        assert streamed[0] == ["1"]
+        assert sorted(streamed[1:3]) == [[str(i) for i in range(2, 7)], [str(i) for i in range(7, 12)]]
+        assert streamed[3] == ["12"]
+        assert sorted(sum(streamed, []), key=int) == [g["game_id"] for g in result["games"]]
+
+    def test_per_game_cache_only_researches_new_or_changed_games(self, mock_database, mock_llm_client):
+        """Adding a game or moving a line re-researches only the affected games"""
+        games = [
+            Game(id=i, team1=f"Home {i}", team2=f"Away {i}", date=date.today(), status=GameStatus.SCHEDULED)
+            for i in range(1, 4)
+        ]
+        lines = [
+            BettingLine(game_id=g.id, book="draftkings", bet_type=BetType.SPREAD, line=-3.5, odds=-110, team=g.team1)
+            for g in games
+        ]
+        researcher = Researcher(db=mock_database, llm_client=mock_llm_client)
+        researched = []
+
+        def fake_batch(batch_games, target_date, betting_lines, batch_num, max_retries=2):
+            researched.append([g.id for g in batch_games])
+            return [{"game_id": str(g.id), "run": len(researched)} for g in batch_games]
+
+        with patch.object(researcher, "_process_batch_with_retry", side_effect=fake_batch):
+            first = researcher.process(games[:2], target_date=date.today(), betting_lines=lines)
+            # A late game joins the slate: only it is researched
+            second = researcher.process(games, target_date=date.today(), betting_lines=lines)
+            # Game 2's spread moves: only game 2 is researched again
+            moved = [BettingLine(game_id=2, book="draftkings", bet_type=BetType.SPREAD, line=-5.0, odds=-110,
+                                 team="Home 2")] + [l for l in lines if l.game_id != 2]
+            third = researcher.process(games, target_date=date.today(), betting_lines=moved)
+            # Only prices changed (juice and a new moneyline): no LLM batches at all
+            repriced = [BettingLine(game_id=l.game_id, book=l.book, bet_type=l.bet_type, line=l.line, odds=-125,
+                                    team=l.team) for l in moved]
+            repriced.append(BettingLine(game_id=1, book="draftkings", bet_type=BetType.MONEYLINE, line=0,
+                                        odds=-160, team="Home 1"))
+            with patch.object(researcher.cache, "set", wraps=researcher.cache.set) as cache_set:
+                fourth = researcher.process(games, target_date=date.today(), betting_lines=repriced)
+                researcher.process([games[0]], target_date=date.today(), betting_lines=lines, force_refresh=True)
+
+        assert researched == [[1, 2], [3], [2], [1]]
+        assert cache_set.call_args.kwargs["ttl"] == researcher.cache_ttl
+        assert [g["run"] for g in first["games"]] == [1, 1]
+        assert [g["game_id"] for g in second["games"]] == ["1", "2", "3"]
+        assert [g["run"] for g in second["games"]] == [1, 1, 2]
+        assert [g["run"] for g in third["games"]] == [1, 3, 2]
+        assert fourth == third
+
+    def test_fallback_insights_are_not_cached(self, mock_database, mock_llm_client, sample_game, sample_betting_lines):
+        """Games that fell back to placeholder data are retried on the next run"""
+        researcher = Researcher(db=mock_database, llm_client=mock_llm_client)
+        with patch.object(researcher, "_process_batch_with_retry", return_value=[]) as mock_batch:
+            researcher.process([sample_game], target_date=date.today(), betting_lines=sample_betting_lines)
+            researcher.process([sample_game], target_date=date.today(), betting_lines=sample_betting_lines)
+        assert mock_batch.call_count == 2
+
     def test_empty_input(self, mock_database, mock_llm_client):
         """Test researcher handles empty input"""
         researcher = Researcher(db=mock_database, llm_client=mock_llm_client)
@@ -305,3 +402,32 @@ class TestResearcherCreateFallbackInsight:
         result = researcher._create_fallback_insight(game, date.today(), betting_lines)
         assert result["market"]["moneyline"]["home"] == "-150"
 
+
+
+class TestResearcherPromptPrefix:
+    """Research requests keep a byte-identical prefix for provider prompt caching."""
+
+    def test_tool_results_call_resends_first_call_messages(self):
+        llm_client = Mock()
+        llm_client.get_usage_stats.return_value = {"total_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        llm_client.call.return_value = {"tool_calls": []}
+        llm_client.call_chat.return_value = {"games": []}
+        researcher = Researcher(db=None, llm_client=llm_client)
+        input_data = {"games": [{"game_id": "1"}]}
+
+        researcher.call_llm_with_tools("Research the games.", input_data, tools=[], context="This batch has 1 games.")
+        assistant = {"role": "assistant", "content": None, "tool_calls": []}
+        tool_result = {"role": "tool", "tool_call_id": "c1", "name": "search_web", "content": "{}"}
+        researcher.call_llm_with_tool_results(
+            "Research the games.", input_data, assistant, [tool_result],
+            context="This batch has 1 games.", follow_up_prompt="Return JSON now."
+        )
+
+        first = llm_client.call.call_args.kwargs
+        messages = llm_client.call_chat.call_args.kwargs["messages"]
+        assert messages[0] == {"role": "system", "content": first["system_prompt"]}
+        assert messages[1] == {"role": "user", "content": first["user_prompt"]}
+        assert first["user_prompt"].startswith(
+            f"Research the games.\n\n{researcher.payload_encoding.legend()}\n\nThis batch has 1 games.\n\nInput data:"
+        )
+        assert messages[2:] == [assistant, tool_result, {"role": "user", "content": "Return JSON now."}]
@@ -430,3 +430,56 @@ class TestResultsProcessorUnit:
         finally:
             session.close()
 
+    def test_settle_bets_in_bulk(self, mock_database):
+        """Settling many picks runs a fixed number of queries and creates missing bet rows"""
+        from sqlalchemy import event
+        from tests.conftest import get_or_create_team
+
+        processor = ResultsProcessor(db=mock_database)
+        pick_date = date.today() - timedelta(days=1)
+        games_with_results = {}
+        session = mock_database.get_session()
+        try:
+            for i in range(20):
+                team1_id = get_or_create_team(session, f"Home Team {i}")
+                team2_id = get_or_create_team(session, f"Away Team {i}")
+                result = {"home_team": f"Home Team {i}", "away_team": f"Away Team {i}", "home_score": 80, "away_score": 70}
+                game = GameModel(team1_id=team1_id, team2_id=team2_id, date=pick_date, status=GameStatus.FINAL, result=result)
+                session.add(game)
+                session.flush()
+                pick = PickModel(
+                    game_id=game.id, bet_type=BetType.SPREAD, line=-5.0 if i % 2 else 15.0, odds=-110,
+                    stake_amount=10.0, stake_units=1.0, rationale="spread", book="DraftKings",
+                    confidence=0.6, expected_value=0.05, team_id=team1_id if i % 2 else team2_id,
+                )
+                session.add(pick)
+                session.flush()
+                if i % 4:  # Every fourth pick has no bet record yet
+                    session.add(BetModel(pick_id=pick.id, result=BetResult.PENDING))
+                games_with_results[game.id] = {"game_id": game.id, "status": "final", "result": result}
+            session.commit()
+        finally:
+            session.close()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        session = mock_database.get_session()
+        event.listen(mock_database.engine, "before_cursor_execute", listener)
+        try:
+            picks = session.query(PickModel).all()
+            settled_count = processor._settle_bets(picks, games_with_results, session, pick_date)
+        finally:
+            event.remove(mock_database.engine, "before_cursor_execute", listener)
+            session.close()
+
+        assert settled_count == 20
+        assert len(statements) < 10
+
+        session = mock_database.get_session()
+        try:
+            bets = session.query(BetModel).all()
+            assert len(bets) == 20
+            # Odd picks: home -5 won by 10 (WIN); even picks: away +15 lost by 10 (WIN)
+            assert all(bet.result == BetResult.WIN and bet.payout > 10.0 for bet in bets)
+        finally:
+            session.close()
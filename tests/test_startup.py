@@ -0,0 +1,70 @@
+"""Import-time budget: the CLI and scripts must not pay for agents, LLM SDKs or the database at import"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.orchestration.coordinator import Coordinator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for a slow CI box; a cold import of the full agent stack takes ~2s
+IMPORT_BUDGET_US = 500_000
+
+HEAVY_MODULES = [
+    "openai",
+    "google.generativeai",
+    "gspread",
+    "apscheduler",
+    "sqlalchemy",
+    "src.orchestration.coordinator",
+]
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time (microseconds) of every module imported by `import module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_entry_point_imports_within_budget():
+    times = import_times("src.main")
+    assert times["src.main"] < IMPORT_BUDGET_US
+    assert [m for m in HEAVY_MODULES if m in times] == []
+
+
+def test_llm_module_does_not_import_provider_sdks():
+    times = import_times("src.utils.llm")
+    assert "openai" not in times
+    assert "google.generativeai" not in times
+
+
+def test_storage_import_does_not_build_the_database():
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.data.storage as s; print(s._default_db is None)"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "True"
+
+
+def test_coordinator_builds_agents_on_first_use(mock_database):
+    coordinator = Coordinator(db=mock_database)
+    assert coordinator._constructed_agents() == []
+    assert "google_sheets_service" not in coordinator.__dict__
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", "test-key")
+        modeler = coordinator.modeler
+    assert coordinator.modeler is modeler
+    assert coordinator._constructed_agents() == [("Modeler", modeler)]
@@ -0,0 +1,107 @@
+"""Tests for Coordinator step timing and run summaries"""
+
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from src.orchestration import step_timing
+from src.data.storage import Database
+from src.orchestration.step_timing import StepTimer, find_regressions, save_run_summary, timed_step
+from src.utils.llm_telemetry import record_llm_call
+
+
+@pytest.fixture
+def timing_dirs(tmp_path, monkeypatch):
+    settings = {
+        "summary_dir": str(tmp_path / "runs"),
+        "profile_dir": str(tmp_path / "profiles"),
+        "regression_window": 7,
+        "regression_factor": 1.5,
+        "regression_min_seconds": 0.0,
+    }
+    monkeypatch.setattr(step_timing, "_timing_config", lambda: settings)
+    return tmp_path
+
+
+class FakeCoordinator:
+    def __init__(self, timer, db):
+        self.step_timer = timer
+        self.db = db
+
+    @timed_step("research")
+    def _step_research(self):
+        with self.db.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        record_llm_call("researcher", "gpt-4o-mini", "openai", latency_ms=1500)
+        record_llm_call("researcher", "gpt-4o-mini", "openai", latency_ms=500)
+        return "insights"
+
+    @timed_step("model")
+    def _step_model(self):
+        raise ValueError("no predictions")
+
+
+def test_steps_record_queries_llm_time_and_errors(mock_database, timing_dirs):
+    timer = StepTimer(engine=mock_database.engine, profile=True, run_id="daily-2026-03-01-090000")
+    coordinator = FakeCoordinator(timer, mock_database)
+
+    assert coordinator._step_research() == "insights"
+    with pytest.raises(ValueError):
+        coordinator._step_model()
+    timer.detach()
+
+    research, model = timer.steps
+    assert (research.name, research.db_queries, research.llm_calls) == ("research", 2, 2)
+    assert research.llm_s == pytest.approx(2.0)
+    assert research.wall_s >= 0 and research.error is None
+    assert model.error == "ValueError: no predictions"
+    assert (timing_dirs / "profiles" / "daily-2026-03-01-090000" / "research.pstats").exists()
+
+
+def test_queries_on_the_read_engine_are_counted(tmp_path):
+    db = Database(database_url=f"sqlite:///{tmp_path / 'timing.db'}")
+    assert db.read_engine is not db.engine
+    timer = StepTimer(engine=db.engine, read_engine=db.read_engine)
+    try:
+        with timer.step("report"):
+            session = db.get_read_session()
+            try:
+                session.execute(text("SELECT 1"))
+            finally:
+                session.close()
+            with db.engine.connect() as conn:
+                conn.execute(text("SELECT 2"))
+    finally:
+        timer.detach()
+        db.close()
+    assert timer.steps[0].db_queries == 2
+    assert not event.contains(db.read_engine, "before_cursor_execute", timer._count_query)
+
+
+def test_methods_run_untimed_without_a_timer():
+    assert FakeCoordinator(None, None)._step_model.__name__ == "_step_model"
+    with pytest.raises(ValueError):
+        FakeCoordinator(None, None)._step_model()
+
+
+def test_run_summary_is_saved_and_regressions_flagged(timing_dirs):
+    history = [{"steps": [{"name": "research", "wall_s": s, "error": None}]} for s in (10.0, 12.0, 11.0)]
+    for i, run in enumerate(history):
+        (timing_dirs / "runs").mkdir(exist_ok=True)
+        (timing_dirs / "runs" / f"daily-2026-03-0{i + 1}-090000.json").write_text(json.dumps(run))
+
+    timer = StepTimer(run_id="daily-2026-03-04-090000")
+    with timer.step("research"):
+        pass
+    timer.steps[0].wall_s = 30.0
+    path = save_run_summary(timer, "daily", "2026-03-04")
+
+    saved = json.loads(path.read_text())
+    assert saved["run_id"] == "daily-2026-03-04-090000"
+    assert [s["name"] for s in saved["steps"]] == ["research"]
+    assert find_regressions(saved, history, 1.5, 0.0) == [
+        "research took 30.0s vs 11.0s median over the last 3 runs"
+    ]
+    assert find_regressions(saved, history, 3.0, 0.0) == []
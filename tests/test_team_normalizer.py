@@ -6,7 +6,10 @@ from src.utils.team_normalizer import (
     normalize_team_name_for_lookup,
     normalize_team_name_for_url,
     are_teams_matching,
-    get_team_name_variations
+    get_team_name_variations,
+    remove_mascot_from_team_name,
+    get_normalization_cache_stats,
+    clear_normalization_caches,
 )
 
 
@@ -197,3 +200,33 @@ class TestRealWorldExamples:
         assert are_teams_matching("North Carolina", "North Carolina Tar Heels") == True
         assert normalize_team_name("North Carolina Tar Heels", for_matching=True) == "north carolina"
 
+
+
+class TestNormalizationCache:
+    """Memoization of the normalization functions"""
+
+    def setup_method(self):
+        clear_normalization_caches()
+
+    def teardown_method(self):
+        clear_normalization_caches()
+
+    def test_repeat_calls_hit_cache(self):
+        assert normalize_team_name("Penn State Nittany Lions") == "penn st"
+        assert normalize_team_name("Penn State Nittany Lions") == "penn st"
+        stats = get_normalization_cache_stats()["normalize_team_name"]
+        assert stats["misses"] >= 1
+        assert stats["hits"] >= 1
+        assert 0.0 < stats["hit_rate"] <= 1.0
+
+    def test_variations_are_not_shared_between_callers(self):
+        first = get_team_name_variations("Penn State")
+        first.append("mutated")
+        assert "mutated" not in get_team_name_variations("Penn State")
+        assert get_normalization_cache_stats()["get_team_name_variations"]["hits"] == 1
+
+    def test_clear_resets_counters(self):
+        remove_mascot_from_team_name("Duke Blue Devils")
+        clear_normalization_caches()
+        for stats in get_normalization_cache_stats().values():
+            assert stats["hits"] == 0 and stats["misses"] == 0 and stats["size"] == 0
@@ -0,0 +1,89 @@
+"""Tests for the precompiled team name resolver"""
+
+import pytest
+
+from src.utils.team_normalizer import are_teams_matching
+from src.utils import team_resolver
+from src.utils.team_resolver import TeamResolver, get_team_resolver
+
+
+@pytest.fixture
+def resolver():
+    return TeamResolver()
+
+
+class TestCanonical:
+    """Canonical keys collapse source-specific spellings"""
+
+    def test_mascots_and_abbreviations_share_a_key(self, resolver):
+        assert resolver.canonical("UConn Huskies") == resolver.canonical("Connecticut") == "connecticut"
+        assert resolver.canonical("Penn State Nittany Lions") == resolver.canonical("Penn St.")
+        assert resolver.canonical("Duke Blue Devils") == resolver.canonical("Duke")
+
+    def test_static_tables_are_precompiled(self, resolver):
+        assert resolver.canonical("ole miss") == "mississippi"
+        assert resolver.canonical("notre dame fighting irish") == "notre dame"
+
+    def test_distinct_programs_stay_distinct(self, resolver):
+        assert resolver.canonical("NC State") != resolver.canonical("North Carolina")
+        assert resolver.canonical("Iowa State Cyclones") != resolver.canonical("Iowa Hawkeyes")
+        assert resolver.canonical("Purdue Fort Wayne") != resolver.canonical("Purdue")
+
+    def test_aliases_are_memoized(self, resolver):
+        before = resolver.alias_count()
+        resolver.canonical("Gonzaga Bulldogs")
+        resolver.canonical("Gonzaga Bulldogs")
+        assert resolver.alias_count() == before + 1
+        resolver.clear()
+        assert resolver.alias_count() == before
+
+
+class TestSameTeam:
+    """same_team agrees with are_teams_matching on the guarded pairs"""
+
+    @pytest.mark.parametrize("team1,team2", [
+        ("Northwestern State", "Northwestern"),
+        ("NC State", "North Carolina"),
+        ("UNC Greensboro", "North Carolina"),
+        ("Miami (OH)", "Miami Hurricanes"),
+        ("Texas Tech", "Texas"),
+        ("Western Kentucky", "Kentucky"),
+    ])
+    def test_never_matching_pairs(self, resolver, team1, team2):
+        assert not are_teams_matching(team1, team2)
+        assert not resolver.same_team(team1, team2)
+
+    @pytest.mark.parametrize("team1,team2", [
+        ("Kansas Jayhawks", "kansas"),
+        ("St. John's Red Storm", "St John's"),
+        ("Grambling", "grambling st"),
+    ])
+    def test_matching_pairs(self, resolver, team1, team2):
+        assert resolver.same_team(team1, team2)
+
+    def test_empty_names_never_match(self, resolver):
+        assert not resolver.same_team("", "Duke")
+
+
+class TestResolve:
+    """Resolving a name against a slate of candidate names"""
+
+    SLATE = ["duke", "north carolina", "grambling st", "stephen f austin"]
+
+    def test_resolve_by_key_then_fallback(self, resolver):
+        assert resolver.resolve("Duke Blue Devils", self.SLATE) == "duke"
+        assert resolver.resolve("UNC Tar Heels", self.SLATE) == "north carolina"
+        assert resolver.resolve("Grambling", self.SLATE) == "grambling st"  # are_teams_matching fallback
+        assert resolver.resolve("Gonzaga", self.SLATE) is None
+
+    def test_unresolved_names_fall_back_to_fuzzy_matching(self, resolver):
+        resolver.clear()
+        assert resolver.resolve("Stephen F Austn", self.SLATE) == "stephen f austin"
+        assert resolver.resolve("Stephen F Austn", self.SLATE) == "stephen f austin"
+        assert team_resolver._fuzzy_key.cache_info().hits == 1
+        # Below the threshold nothing is guessed
+        assert resolver.resolve("Stetson", self.SLATE) is None
+
+
+def test_process_wide_resolver_is_shared():
+    assert get_team_resolver() is get_team_resolver()